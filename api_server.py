@@ -0,0 +1,524 @@
+"""
+API Server - Headless HTTP API for text processing, export and resume injection.
+
+A small asyncio HTTP/1.1 server (standard library only) for integrations that
+don't go through the Streamlit UI. Request bodies are read in chunks into a
+spooled temporary file (memory up to 1 MB, then disk) and responses are written
+in chunks with backpressure. The CPU-bound work runs on a bounded worker pool;
+requests beyond the pool wait in a bounded queue and get 503 when it is full.
+
+Endpoints (bodies are raw bytes unless noted):
+    GET  /health                  status and counters (JSON)
+    POST /process?points=2&dedup=none|exact|fuzzy|global&format=text|docx|pdf
+                                  structured text -> processed cycles
+    POST /dedup?mode=exact|fuzzy&threshold=0.95
+                                  one point per line -> deduplicated points
+    POST /export?format=docx|pdf  processed text -> document
+    POST /bookmarks               DOCX -> {"bookmarks": [...]}
+    POST /inject                  multipart/form-data: resume (DOCX), text -> DOCX
+    POST /match                   JSON {"job_description", "technologies"?, "top_n"?}
+                                  -> ranked catalog resumes
+
+Usage:
+    python api_server.py --port 8080 --workers 4
+    python api_server.py --executor process --workers 4   # DOCX/PDF work on processes
+"""
+
+import argparse
+import asyncio
+import email.parser
+import email.policy
+import io
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from utils.text_input import TextSource
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+SPOOL_SIZE = 1024 * 1024
+
+MIME_TYPES = {
+    "text": "text/plain; charset=utf-8",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "pdf": "application/pdf",
+    "json": "application/json",
+}
+
+REASONS = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    408: "Request Timeout", 411: "Length Required", 413: "Payload Too Large",
+    500: "Internal Server Error", 503: "Service Unavailable",
+}
+
+
+class HTTPError(Exception):
+    """Error answered with an HTTP status and a JSON {"error": ...} body"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+# ---- Work functions (run on the worker pool; module-level so processes can run them) ----
+
+# Per-worker pipeline and cache (created on first use in each thread pool / worker process)
+_worker_processor = None
+_worker_lock = threading.Lock()
+
+
+def _processor():
+    global _worker_processor
+    with _worker_lock:
+        if _worker_processor is None:
+            from utils.batch_processor import BatchProcessor
+            _worker_processor = BatchProcessor()
+    return _worker_processor
+
+
+def process_text(text: str, points: int, dedup: str, fmt: str) -> bytes:
+    """Process structured text (cached like Tab 1) and return it as text, DOCX or PDF."""
+    processor = _processor()
+    key, document = processor.process_document(text, points, dedup != "none", dedup)
+    if not document:
+        raise ValueError("No output was generated. Please check your input format.")
+    if fmt == "docx":
+        return processor.export_docx(key, document)
+    if fmt == "pdf":
+        return processor.export_pdf(key, document)
+    return document.render().encode("utf-8")
+
+
+def dedup_points(text: str, mode: str, threshold: float) -> bytes:
+    from utils.deduplicator import PointDeduplicator
+
+    points = [line for line in text.splitlines() if line.strip()]
+    if mode == "fuzzy":
+        unique = PointDeduplicator.deduplicate_points(points, similarity_threshold=threshold)
+    else:
+        unique = PointDeduplicator.deduplicate_points_exact(points)
+    return "\n".join(unique).encode("utf-8")
+
+
+def export_text(text: str, fmt: str) -> bytes:
+    from utils.export_handler import ExportHandler
+
+    handler = ExportHandler()
+    output = handler.generate_docx(text) if fmt == "docx" else handler.generate_pdf(text)
+    return output.getvalue()
+
+
+def detect_bookmarks(resume: bytes) -> bytes:
+    from utils.bookmark_manager import BookmarkManager
+
+    bookmarks = BookmarkManager().detect_bookmarks(io.BytesIO(resume))
+    return json.dumps({"bookmarks": bookmarks}).encode("utf-8")
+
+
+def inject_points(resume: bytes, text: str) -> bytes:
+    from utils.resume_injector import ResumeInjector
+
+    output, _ = ResumeInjector().inject_points_into_resume(io.BytesIO(resume), text)
+    return output.getvalue()
+
+
+def match_resumes(job_description: str, technologies: Optional[list], top_n: int) -> bytes:
+    """Rank catalog resumes; technologies skip the LLM extraction step when given."""
+    from utils.resume_catalog import ResumeCatalog
+    from utils.resume_matcher import ResumeMatcher
+
+    if technologies is None:
+        matcher = ResumeMatcher(ResumeCatalog())
+        success, technologies, message = matcher.extract_job_tech_stacks(job_description)
+        if not success:
+            raise ValueError(message)
+    else:
+        # Scoring only: a non-None generator stops the matcher from creating an LLM client
+        matcher = ResumeMatcher(ResumeCatalog(), points_generator=False)
+
+    ranked = []
+    for resume in matcher.catalog.list_resumes():
+        resume_techs = resume.get("technologies", [])
+        ranked.append({
+            "name": resume["name"],
+            "person_name": resume.get("person_name"),
+            "score": round(matcher.calculate_match_score(technologies, resume_techs), 1),
+            "matching_techs": sorted(matcher._get_matching_techs(technologies, resume_techs)),
+        })
+    ranked.sort(key=lambda r: r["score"], reverse=True)
+    return json.dumps({"technologies": technologies, "resumes": ranked[:top_n]}).encode("utf-8")
+
+
+# ---- HTTP plumbing -------------------------------------------------------------------------
+
+class Request:
+    __slots__ = ("method", "path", "query", "headers", "body")
+
+    def __init__(self, method: str, target: str, headers: Dict[str, str], body):
+        parts = urlsplit(target)
+        self.method = method
+        self.path = parts.path
+        self.query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+        self.headers = headers
+        self.body = body  # SpooledTemporaryFile positioned at 0
+
+    def read(self) -> bytes:
+        return self.body.read()
+
+    def text(self) -> str:
+        with TextSource.open(self.body) as source:
+            return source.read_text()
+
+    def int_param(self, name: str, default: int, low: int, high: int) -> int:
+        try:
+            value = int(self.query.get(name, default))
+        except ValueError:
+            raise HTTPError(400, f"'{name}' must be an integer")
+        if not low <= value <= high:
+            raise HTTPError(400, f"'{name}' must be between {low} and {high}")
+        return value
+
+    def choice_param(self, name: str, default: str, choices: Tuple[str, ...]) -> str:
+        value = self.query.get(name, default)
+        if value not in choices:
+            raise HTTPError(400, f"'{name}' must be one of {', '.join(choices)}")
+        return value
+
+
+class ApiServer:
+    """Asyncio HTTP server with a bounded worker pool."""
+
+    def __init__(self, workers: int = 4, max_queue: int = 64, executor: str = "thread",
+                 max_body: int = 20 * 1024 * 1024, request_timeout: float = 30.0,
+                 idle_timeout: float = 15.0):
+        """
+        Args:
+            workers: Requests processed at once (worker pool size)
+            max_queue: Requests allowed to wait for a worker before 503 is returned
+            executor: 'thread' or 'process' (processes run DOCX/PDF work in parallel)
+            max_body: Largest accepted request body in bytes
+            request_timeout: Seconds allowed to receive one request
+            idle_timeout: Seconds a keep-alive connection may sit idle
+        """
+        self.workers = workers
+        self.max_queue = max_queue
+        self.executor_kind = executor
+        self.max_body = max_body
+        self.request_timeout = request_timeout
+        self.idle_timeout = idle_timeout
+        self.executor: Optional[Executor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._waiting = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.stats = {"requests": 0, "errors": 0, "rejected": 0, "in_flight": 0,
+                      "bytes_in": 0, "bytes_out": 0}
+        self.routes: Dict[Tuple[str, str], Callable] = {
+            ("GET", "/health"): self.health,
+            ("POST", "/process"): self.process,
+            ("POST", "/dedup"): self.dedup,
+            ("POST", "/export"): self.export,
+            ("POST", "/bookmarks"): self.bookmarks,
+            ("POST", "/inject"): self.inject,
+            ("POST", "/match"): self.match,
+        }
+
+    # ---- Handlers ----------------------------------------------------------
+
+    async def health(self, request: Request):
+        return 200, "json", json.dumps({
+            "status": "ok", "workers": self.workers, "queued": self._waiting, **self.stats
+        }).encode("utf-8")
+
+    async def process(self, request: Request):
+        points = request.int_param("points", 2, 1, 10)
+        dedup = request.choice_param("dedup", "none", ("none", "exact", "fuzzy", "global"))
+        fmt = request.choice_param("format", "text", ("text", "docx", "pdf"))
+        data = await self.run(process_text, request.text(), points, dedup, fmt)
+        return 200, fmt, data
+
+    async def dedup(self, request: Request):
+        mode = request.choice_param("mode", "exact", ("exact", "fuzzy"))
+        try:
+            threshold = float(request.query.get("threshold", 0.95))
+        except ValueError:
+            raise HTTPError(400, "'threshold' must be a number")
+        return 200, "text", await self.run(dedup_points, request.text(), mode, threshold)
+
+    async def export(self, request: Request):
+        fmt = request.choice_param("format", "docx", ("docx", "pdf"))
+        return 200, fmt, await self.run(export_text, request.text(), fmt)
+
+    async def bookmarks(self, request: Request):
+        return 200, "json", await self.run(detect_bookmarks, request.read())
+
+    async def inject(self, request: Request):
+        content_type = request.headers.get("content-type", "")
+        if not content_type.startswith("multipart/form-data"):
+            raise HTTPError(400, "Send multipart/form-data with 'resume' and 'text' fields")
+        message = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(
+            f"Content-Type: {content_type}\r\n\r\n".encode("latin-1") + request.read()
+        )
+        fields = {}
+        for part in message.iter_parts():
+            name = part.get_param("name", header="content-disposition")
+            if name:
+                fields[name] = part.get_payload(decode=True)
+        if "resume" not in fields or "text" not in fields:
+            raise HTTPError(400, "Both 'resume' and 'text' fields are required")
+        return 200, "docx", await self.run(inject_points, fields["resume"], fields["text"].decode("utf-8"))
+
+    async def match(self, request: Request):
+        try:
+            payload = json.loads(request.read() or b"{}")
+        except json.JSONDecodeError as e:
+            raise HTTPError(400, f"Invalid JSON: {e}")
+        if not isinstance(payload, dict) or not payload.get("job_description"):
+            raise HTTPError(400, "'job_description' is required")
+        technologies = payload.get("technologies")
+        if technologies is not None and not isinstance(technologies, list):
+            raise HTTPError(400, "'technologies' must be a list")
+        top_n = int(payload.get("top_n", 3))
+        return 200, "json", await self.run(match_resumes, payload["job_description"], technologies, top_n)
+
+    async def run(self, fn: Callable, *args) -> bytes:
+        """Run fn on the worker pool once a slot is free (503 if the wait queue is full)."""
+        if self._slots.locked() and self._waiting >= self.max_queue:
+            self.stats["rejected"] += 1
+            raise HTTPError(503, "Server busy, retry later")
+        self._waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self._waiting -= 1
+        self.stats["in_flight"] += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+        finally:
+            self.stats["in_flight"] -= 1
+            self._slots.release()
+
+    # ---- Connection handling -----------------------------------------------
+
+    async def _read_body(self, reader: asyncio.StreamReader, headers: Dict[str, str]):
+        """Stream the request body into a spooled temp file (Content-Length or chunked)."""
+        body = tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE)
+        total = 0
+
+        async def copy(size: int):
+            nonlocal total
+            total += size
+            if total > self.max_body:
+                raise HTTPError(413, f"Request body larger than {self.max_body} bytes")
+            while size:
+                chunk = await reader.read(min(size, CHUNK_SIZE))
+                if not chunk:
+                    raise HTTPError(400, "Connection closed before the body was complete")
+                body.write(chunk)
+                size -= len(chunk)
+
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            while True:
+                size_line = await reader.readline()
+                try:
+                    size = int(size_line.split(b";")[0].strip(), 16)
+                except ValueError:
+                    raise HTTPError(400, "Invalid chunk size")
+                if size == 0:
+                    # Skip trailers up to the blank line
+                    while (await reader.readline()).strip():
+                        pass
+                    break
+                await copy(size)
+                await reader.readexactly(2)
+        else:
+            try:
+                length = int(headers.get("content-length", 0))
+            except ValueError:
+                raise HTTPError(400, "Invalid Content-Length")
+            await copy(length)
+
+        self.stats["bytes_in"] += total
+        body.seek(0)
+        return body
+
+    async def _write_response(self, writer: asyncio.StreamWriter, status: int, kind: str,
+                              data: bytes, keep_alive: bool):
+        head = (
+            f"HTTP/1.1 {status} {REASONS.get(status, 'OK')}\r\n"
+            f"Content-Type: {MIME_TYPES[kind]}\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+        )
+        if status == 503:
+            head += "Retry-After: 1\r\n"
+        writer.write((head + "\r\n").encode("latin-1"))
+        # Large documents go out in chunks so a slow client applies backpressure
+        view = memoryview(data)
+        for offset in range(0, len(data), CHUNK_SIZE):
+            writer.write(view[offset:offset + CHUNK_SIZE])
+            await writer.drain()
+        await writer.drain()
+        self.stats["bytes_out"] += len(data)
+
+    async def _handle_one(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> bool:
+        """Serve one request; returns whether the connection stays open."""
+        request_line = await asyncio.wait_for(reader.readline(), self.idle_timeout)
+        if not request_line:
+            return False
+        start = time.perf_counter()
+        keep_alive = False
+        body = None
+        try:
+            try:
+                method, target, version = request_line.decode("latin-1").split()
+            except ValueError:
+                raise HTTPError(400, "Malformed request line")
+            headers = {}
+            while True:
+                line = await asyncio.wait_for(reader.readline(), self.request_timeout)
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            keep_alive = (version == "HTTP/1.1"
+                          and headers.get("connection", "").lower() != "close")
+
+            handler = self.routes.get((method, urlsplit(target).path))
+            if handler is None:
+                known = any(path == urlsplit(target).path for _, path in self.routes)
+                raise HTTPError(405 if known else 404, f"No route for {method} {target}")
+
+            body = await asyncio.wait_for(self._read_body(reader, headers), self.request_timeout)
+            self.stats["requests"] += 1
+            status, kind, data = await handler(Request(method, target, headers, body))
+        except HTTPError as e:
+            status, kind, data = e.status, "json", json.dumps({"error": str(e)}).encode("utf-8")
+            # An unread body would be parsed as the next request
+            keep_alive = keep_alive and body is not None
+        except asyncio.TimeoutError:
+            status, kind, data = 408, "json", b'{"error": "Request timed out"}'
+            keep_alive = False
+        except ValueError as e:
+            status, kind, data = 400, "json", json.dumps({"error": str(e)}).encode("utf-8")
+        except Exception as e:
+            logger.error(f"API: {request_line!r} failed: {e}", exc_info=True)
+            status, kind, data = 500, "json", json.dumps({"error": f"{type(e).__name__}: {e}"}).encode("utf-8")
+        finally:
+            if body is not None:
+                body.close()
+
+        if status >= 400:
+            self.stats["errors"] += 1
+        await self._write_response(writer, status, kind, data, keep_alive)
+        logger.debug(f"API: {request_line.strip()!r} -> {status} in {(time.perf_counter() - start) * 1000:.1f} ms")
+        return keep_alive
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while await self._handle_one(reader, writer):
+                pass
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    # ---- Lifecycle ---------------------------------------------------------
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8080) -> int:
+        """Start listening; returns the bound port (useful with port=0)."""
+        if self.executor_kind == "process":
+            self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        else:
+            self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="api")
+        self._slots = asyncio.Semaphore(self.workers)
+        self._loop = asyncio.get_running_loop()
+        self._server = await asyncio.start_server(self._handle_connection, host, port,
+                                                  limit=CHUNK_SIZE, backlog=1024)
+        bound = self._server.sockets[0].getsockname()[1]
+        logger.info(f"API: listening on http://{host}:{bound} ({self.workers} {self.executor_kind} workers)")
+        return bound
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def start_in_thread(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """Run the server on a background event loop (tests, benchmarks); returns the port."""
+        started = threading.Event()
+        result = {}
+
+        def run():
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            result["port"] = loop.run_until_complete(self.start(host, port))
+            started.set()
+            loop.run_forever()
+            loop.run_until_complete(self.stop())
+            # Close keep-alive connections still waiting for their next request
+            pending = asyncio.all_tasks(loop)
+            for task in pending:
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            loop.close()
+
+        self._thread = threading.Thread(target=run, name="api-server", daemon=True)
+        self._thread.start()
+        started.wait(30)
+        return result["port"]
+
+    def stop_thread(self):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless HTTP API for processing and injection")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind")
+    parser.add_argument("--port", type=int, default=8080, help="Port to listen on")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4,
+                        help="Requests processed at once")
+    parser.add_argument("--max-queue", type=int, default=64,
+                        help="Requests waiting for a worker before 503 is returned")
+    parser.add_argument("--executor", choices=["thread", "process"], default="thread",
+                        help="Worker pool type (process: parallel DOCX/PDF work)")
+    parser.add_argument("--max-body-mb", type=float, default=20, help="Largest request body (MB)")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO,
+                        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    server = ApiServer(workers=args.workers, max_queue=args.max_queue, executor=args.executor,
+                       max_body=int(args.max_body_mb * 1024 * 1024))
+
+    async def serve():
+        await server.start(args.host, args.port)
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await server.stop()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -19,7 +19,7 @@ import os
 import logging
 from datetime import datetime
 from pathlib import Path
-from typing import Tuple, Optional, Dict
+from typing import Tuple, Optional, Dict, List
 import io
 
 # Import internal modules
@@ -28,8 +28,13 @@ from utils.resume_matcher import ResumeMatcher
 from utils.gemini_points_generator import GeminiPointsGenerator
 from utils.resume_injector import ResumeInjector
 from utils.text_processor import TextProcessor
+from utils.cycle_document import CycleDocument
 from utils.email_sender import GmailSender
 from utils.bookmark_manager import BookmarkManager
+from utils.workflow_checkpoint import RunCheckpoint
+from utils.workflow_tracer import WorkflowTracer
+from utils.email_outbox import EmailOutbox
+from utils.point_history import PointHistoryStore
 
 # Setup logging
 logging.basicConfig(
@@ -42,40 +47,84 @@ logger = logging.getLogger(__name__)
 class AutomationWorkflow:
     """Orchestrates the complete resume automation workflow."""
     
-    def __init__(self):
-        """Initialize all components."""
-        self.catalog = ResumeCatalog()
-        self.matcher = ResumeMatcher()
-        self.points_generator = GeminiPointsGenerator()
+    def __init__(self, points_generator: Optional[GeminiPointsGenerator] = None,
+                 catalog: Optional[ResumeCatalog] = None,
+                 output_folder: Optional[str] = None, checkpoints: bool = True,
+                 outbox: Optional[EmailOutbox] = None,
+                 point_history: Optional[PointHistoryStore] = None):
+        """
+        Initialize all components.
+        
+        Args:
+            points_generator: Generator to use (e.g. one backed by FakeLLMBackend);
+                shared with the matcher so extraction and generation use one backend
+            catalog: Resume catalog (default: loaded from resume_catalog.json)
+            output_folder: Where resumes and logs are written (default: ./automation_output)
+            checkpoints: Persist stage outputs so failed runs can resume
+            outbox: Queue emails here for background sending instead of sending inline
+            point_history: Per-recruiter history of points already sent; points of every
+                sent or queued email are recorded, and global_dedup runs skip them
+        """
+        self.catalog = catalog or ResumeCatalog()
+        self.points_generator = points_generator or GeminiPointsGenerator()
+        self.matcher = ResumeMatcher(self.catalog, self.points_generator)
         self.injector = ResumeInjector()
         self.text_processor = TextProcessor()
         self.email_sender = None  # Initialized later with credentials
+        self.email_provider = "gmail"
+        self.outbox = outbox
+        self.point_history = point_history
         
-        # Workflow logs
+        # Workflow logs and timing spans
         self.workflow_log = []
-        self.output_folder = Path("./automation_output")
+        self.tracer = WorkflowTracer()
+        self._open_steps = {}
+        self.output_folder = Path(output_folder or "./automation_output")
         self.output_folder.mkdir(parents=True, exist_ok=True)
+        self.checkpoints = checkpoints
     
     def log_step(self, step: str, status: str, details: str = ""):
-        """Log a workflow step."""
+        """
+        Log a workflow step.
+        
+        A START entry opens a timing span for the step; the next entry for the same
+        step closes it and records its duration_ms.
+        """
         log_entry = {
             "timestamp": datetime.now().isoformat(),
+            "elapsed_ms": self.tracer.elapsed_ms(),
             "step": step,
             "status": status,
             "details": details
         }
+        if status == "START":
+            self._open_steps[step] = self.tracer.start_span(step)
+        elif step in self._open_steps:
+            span = self.tracer.end_span(self._open_steps.pop(step), status)
+            log_entry["duration_ms"] = span.duration_ms
         self.workflow_log.append(log_entry)
-        logger.info(f"[{step}] {status}: {details}")
+        logger.info(f"[{step}] {status}: {details}" +
+                    (f" ({log_entry['duration_ms']:.0f} ms)" if "duration_ms" in log_entry else ""))
     
     def save_workflow_log(self, job_title: str):
-        """Save workflow log to file."""
+        """
+        Save workflow log to file.
+        
+        The JSON log holds the steps, every timing span and a summary table; the
+        spans are also exported as JSON lines next to it (workflow_spans_*.jsonl).
+        """
         try:
-            log_filename = f"workflow_log_{job_title}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-            log_path = self.output_folder / log_filename
+            stamp = f"{job_title}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            log_path = self.output_folder / f"workflow_log_{stamp}.json"
             
             import json
             with open(log_path, 'w') as f:
-                json.dump(self.workflow_log, f, indent=2)
+                json.dump({
+                    "steps": self.workflow_log,
+                    "spans": self.tracer.to_dicts(),
+                    "summary_table": self.tracer.summary_table()
+                }, f, indent=2)
+            self.tracer.export_jsonl(self.output_folder / f"workflow_spans_{stamp}.jsonl")
             
             logger.info(f"Workflow log saved: {log_path}")
             return str(log_path)
@@ -119,19 +168,260 @@ Best regards,
         """Initialize Gmail sender with credentials."""
         try:
             self.email_sender = GmailSender(gmail_address, app_password)
+            if self.outbox:
+                self.outbox.register_sender(self.email_provider, self.email_sender)
             self.log_step("Email Setup", "SUCCESS", f"Gmail initialized: {gmail_address}")
             return True, "✅ Gmail configured successfully"
         except Exception as e:
             self.log_step("Email Setup", "FAILED", str(e))
             return False, f"❌ Failed to initialize Gmail: {str(e)}"
     
+    def select_resume(self, job_description: str, job_title: str,
+                      override_resume: Optional[str] = None) -> Tuple[Dict, str, List[str]]:
+        """
+        Pick the resume to use for a job.
+        
+        Returns:
+            (resume entry, log message, job technologies found while matching).
+            Technologies are empty when an override is used.
+            
+        Raises:
+            ValueError: With a user-facing message if no resume can be selected
+        """
+        if override_resume:
+            selected_resume = self.catalog.get_resume_by_name(override_resume)
+            if not selected_resume:
+                raise ValueError(f"❌ Resume not found: {override_resume}")
+            return selected_resume, f"Using specified resume: {override_resume}", []
+        
+        success, best_match, match_msg = self.matcher.find_best_resume(
+            job_description, job_title
+        )
+        if not success:
+            raise ValueError(match_msg)
+        
+        return best_match['resume'], f"Match score: {best_match['score']:.1f}%", best_match['job_techs']
+    
+    def generate_job_points(self, job_description: str, job_title: str,
+                            points_per_tech: int, job_techs: Optional[List[str]] = None) -> str:
+        """
+        Generate resume points for a job.
+        
+        Args:
+            job_techs: Technologies already extracted during matching (skips a second LLM call)
+        """
+        if not job_techs:
+            success, job_techs, _ = self.matcher.extract_job_tech_stacks(job_description)
+            
+            if not success or not job_techs:
+                raise Exception("Could not extract technologies from job description")
+        
+        return self.points_generator.generate_points(
+            job_description=job_description,
+            job_title=job_title,
+            tech_stacks=job_techs,
+            num_points=points_per_tech
+        )
+    
+    def load_resume_bytes(self, selected_resume: Dict) -> io.BytesIO:
+        """Load a catalog resume from its source."""
+        if selected_resume['source'] == 'local':
+            resume_path = Path(selected_resume['path'])
+            if not resume_path.exists():
+                raise Exception(f"Resume file not found: {resume_path}")
+            
+            with open(resume_path, 'rb') as f:
+                return io.BytesIO(f.read())
+        
+        elif selected_resume['source'] == 'google_drive':
+            success, resume_content = self.catalog.download_gdrive_resume(
+                selected_resume['name']
+            )
+            if not success:
+                raise Exception(f"Failed to download from Google Drive: {resume_content}")
+            return resume_content
+        
+        raise Exception(f"Unknown resume source: {selected_resume['source']}")
+    
+    def save_resume(self, job_title: str, selected_resume: Dict,
+                    updated_resume_bytes: io.BytesIO, name_suffix: str = "") -> Path:
+        """Save an updated resume to the output folder."""
+        resume_filename = f"{job_title.replace(' ', '_')}_{selected_resume['person_name']}_{datetime.now().strftime('%Y%m%d_%H%M%S')}{name_suffix}.docx"
+        resume_filepath = self.output_folder / resume_filename
+        
+        with open(resume_filepath, 'wb') as f:
+            f.write(updated_resume_bytes.getvalue())
+        
+        return resume_filepath
+    
+    def build_email(self, job_title: str, selected_resume: Dict, personal_message: str,
+                    updated_resume_bytes: io.BytesIO) -> Dict:
+        """Build send_email keyword arguments for a recruiter email."""
+        subject = f"Resume - {job_title} - {selected_resume['person_name']}"
+        
+        # Add resume info to message
+        email_body = (
+            f"{personal_message}\n\n"
+            f"Position: {job_title}\n"
+            f"Resume: {selected_resume['person_name']}\n"
+            f"Technologies: {', '.join(selected_resume.get('technologies', []))}\n\n"
+            "Best regards"
+        )
+        
+        updated_resume_bytes.seek(0)
+        return {
+            "subject": subject,
+            "body": email_body,
+            "attachments": [
+                (f"{selected_resume['person_name']}_Resume.docx", updated_resume_bytes)
+            ],
+            "from_name": selected_resume['person_name']
+        }
+    
+    def resolve_message(self, job_title: str, selected_resume: Dict,
+                        personal_message: str = "") -> Tuple[str, bool]:
+        """Return (message, auto_generated) using the default message when none was provided."""
+        if not personal_message or len(personal_message.strip()) < 5:
+            person_name = selected_resume.get('person_name', 'Candidate')
+            return self.generate_default_message(job_title, person_name), True
+        return personal_message, False
+    
+    def record_sent_points(self, recruiter_email: str, processed_points: CycleDocument) -> int:
+        """Add the points of a sent resume to the recruiter's history (no-op without one)."""
+        if not self.point_history:
+            return 0
+        try:
+            added = self.point_history.get(recruiter_email).add_points(
+                TextProcessor.cycle_points(processed_points)
+            )
+            logger.info(f"Recorded {added} new points for {recruiter_email}")
+            return added
+        except Exception as e:
+            # The email already went out; a history failure must not fail the run
+            logger.warning(f"Could not record sent points for {recruiter_email}: {e}")
+            return 0
+    
+    def open_checkpoint(self, job_description: str, job_title: str, points_per_tech: int,
+                        recruiter_email: str, override_resume: Optional[str] = None,
+                        run_id: Optional[str] = None, global_dedup: bool = False,
+                        rerun_completed: bool = False) -> RunCheckpoint:
+        """
+        Open the run checkpoint for a job (the same run for the same inputs).
+        
+        Raises:
+            ValueError: If run_id belongs to a run with different inputs
+        """
+        return RunCheckpoint.open_for(
+            self.output_folder, run_id, rerun_completed=rerun_completed,
+            job_description=job_description, job_title=job_title,
+            points_per_tech=points_per_tech, recruiter_email=recruiter_email,
+            override_resume=override_resume,
+            **({'global_dedup': True} if global_dedup else {})
+        )
+    
+    def deliver_email(self, checkpoint: Optional[RunCheckpoint], job_title: str,
+                      recruiter_email: str, selected_resume: Dict, personal_message: str,
+                      updated_resume_bytes: io.BytesIO, processed_points: CycleDocument,
+                      result: Dict):
+        """
+        Email stage of a run: send (or queue in the outbox) once per checkpointed run.
+        
+        An email already sent or queued by an earlier attempt is skipped, sent
+        points are added to the recruiter's history, and the outcome is written
+        to result ("email_sent", "email_queued", "errors").
+        """
+        sent_record = None
+        if checkpoint and checkpoint.is_complete('email'):
+            sent_record = checkpoint.load('email') or {}
+            if sent_record.get('skipped') and self.email_sender:
+                sent_record = None  # finished without email earlier; send now that it is configured
+        if sent_record is not None:
+            if sent_record.get('skipped'):
+                self.log_step("Email Sending", "SKIPPED", "Email not configured")
+            elif sent_record.get('outbox_id'):
+                self.log_step("Email Sending", "SKIPPED",
+                             f"Already queued in outbox (#{sent_record['outbox_id']})")
+                result["email_queued"] = sent_record['outbox_id']
+            else:
+                self.log_step("Email Sending", "SKIPPED", 
+                             f"Already sent to {sent_record.get('recipient', recruiter_email)} "
+                             f"at {sent_record.get('sent_at', 'an earlier attempt')}")
+                result["email_sent"] = True
+        elif self.email_sender and self.outbox:
+            # The outbox dedups on the run ID, so a resumed run never queues twice
+            email = self.build_email(
+                job_title, selected_resume, personal_message, updated_resume_bytes
+            )
+            template = self.email_sender.create_template(
+                email["subject"], email["body"], email["attachments"], email["from_name"]
+            )
+            dedup_key = f"run:{checkpoint.run_id}" if checkpoint else None
+            outbox_id, _ = self.outbox.enqueue(
+                self.email_provider, recruiter_email, template, dedup_key=dedup_key
+            )
+            self.log_step("Email Sending", "QUEUED", f"Outbox message #{outbox_id} for {recruiter_email}")
+            result["email_queued"] = outbox_id
+            self.record_sent_points(recruiter_email, processed_points)
+            if checkpoint:
+                checkpoint.save('email', {'recipient': recruiter_email, 'outbox_id': outbox_id})
+        elif self.email_sender:
+            self.log_step("Email Sending", "START", f"Sending to: {recruiter_email}")
+            
+            try:
+                if checkpoint:
+                    checkpoint.begin_email(recruiter_email)
+                
+                email = self.build_email(
+                    job_title, selected_resume, personal_message, updated_resume_bytes
+                )
+                
+                email_success = False
+                try:
+                    with self.tracer.span("email.send",
+                                          bytes=len(updated_resume_bytes.getvalue())):
+                        email_success = self.email_sender.send_email(
+                            recipient=recruiter_email,
+                            **email
+                        )
+                finally:
+                    if checkpoint:
+                        checkpoint.finish_email(recruiter_email, bool(email_success))
+                
+                if email_success:
+                    self.log_step("Email Sending", "SUCCESS", 
+                                 f"Email sent to {recruiter_email}")
+                    result["email_sent"] = True
+                    self.record_sent_points(recruiter_email, processed_points)
+                else:
+                    self.log_step("Email Sending", "FAILED", "Email send failed")
+                    result["errors"].append("Failed to send email")
+            
+            except Exception as e:
+                msg = f"Error sending email: {str(e)}"
+                self.log_step("Email Sending", "FAILED", msg)
+                result["errors"].append(msg)
+        else:
+            self.log_step("Email Sending", "SKIPPED", "Email not configured")
+            if checkpoint:
+                # Nothing left to do: the run is finished, so rerun_completed starts a new one
+                checkpoint.save('email', {'recipient': recruiter_email, 'skipped': True})
+    
     def run_workflow(self, job_description: str, job_title: str, 
                     points_per_tech: int, recruiter_email: str,
                     personal_message: str = "", 
-                    override_resume: Optional[str] = None) -> Tuple[bool, Dict]:
+                    override_resume: Optional[str] = None,
+                    run_id: Optional[str] = None,
+                    global_dedup: bool = False,
+                    rerun_completed: bool = False) -> Tuple[bool, Dict]:
         """
         Run complete automation workflow.
         
+        Each stage's output is checkpointed under automation_output/runs/<run_id>/.
+        Rerunning the same job (or passing the same run_id) resumes from the first
+        incomplete stage, and an email that was already sent is never sent again. A
+        run without an email sender is finished after injection (email recorded as
+        skipped); a later plain rerun sends it once a sender is configured.
+        
         Args:
             job_description: Full job description text
             job_title: Job title
@@ -139,6 +429,11 @@ Best regards,
             recruiter_email: Recruiter email address
             personal_message: Personalized email message (optional - auto-generated if not provided)
             override_resume: Optional resume name to use instead of auto-match
+            run_id: Optional run ID (default: derived from the job inputs)
+            global_dedup: Drop points repeated across technologies, and points already
+                sent to this recruiter when a point history is configured
+            rerun_completed: Start a fresh run (new points, new email) if this job
+                already finished; an unfinished run still resumes
             
         Returns:
             (success: bool, result: Dict with all workflow outputs)
@@ -146,14 +441,19 @@ Best regards,
         result = {
             "success": False,
             "job_title": job_title,
+            "run_id": None,
+            "resumed_from": None,
             "selected_resume": None,
             "extracted_points": None,
             "updated_resume": None,
             "email_sent": False,
+            "email_queued": None,
             "errors": []
         }
         
         self.workflow_log = []  # Reset log
+        self.tracer = WorkflowTracer()
+        self._open_steps = {}
         
         try:
             # Step 1: Validate inputs
@@ -170,35 +470,46 @@ Best regards,
             
             self.log_step("Input Validation", "SUCCESS", msg)
             
-            # Step 2: Find best resume
-            self.log_step("Resume Matching", "START", "Analyzing job description...")
-            
-            if override_resume:
-                # Use specified resume
-                selected_resume = self.catalog.get_resume_by_name(override_resume)
-                if not selected_resume:
-                    msg = f"❌ Resume not found: {override_resume}"
-                    self.log_step("Resume Matching", "FAILED", msg)
+            checkpoint = None
+            if self.checkpoints:
+                try:
+                    checkpoint = self.open_checkpoint(
+                        job_description, job_title, points_per_tech, recruiter_email,
+                        override_resume, run_id=run_id, global_dedup=global_dedup,
+                        rerun_completed=rerun_completed
+                    )
+                except ValueError as e:
+                    msg = f"❌ {str(e)}"
+                    self.log_step("Checkpoint", "FAILED", msg)
                     result["errors"].append(msg)
                     return False, result
                 
-                match_msg = f"Using specified resume: {override_resume}"
-                self.log_step("Resume Matching", "SUCCESS", match_msg)
+                result["run_id"] = checkpoint.run_id
+                result["resumed_from"] = checkpoint.first_incomplete_stage()
+                if checkpoint.manifest['stages']:
+                    self.log_step("Checkpoint", "RESUMED",
+                                 f"Run {checkpoint.run_id} resuming at: {result['resumed_from'] or 'done'}")
+            
+            # Step 2: Find best resume
+            cached = checkpoint.load('match') if checkpoint else None
+            if cached:
+                selected_resume, job_techs = cached['resume'], cached['job_techs']
+                self.log_step("Resume Matching", "RESUMED", f"Using checkpoint: {selected_resume['name']}")
             else:
-                # Auto-find best resume
-                success, best_match, match_msg = self.matcher.find_best_resume(
-                    job_description, job_title
-                )
+                self.log_step("Resume Matching", "START", "Analyzing job description...")
                 
-                if not success:
-                    self.log_step("Resume Matching", "FAILED", match_msg)
-                    result["errors"].append(match_msg)
+                try:
+                    selected_resume, match_msg, job_techs = self.select_resume(
+                        job_description, job_title, override_resume
+                    )
+                except ValueError as e:
+                    self.log_step("Resume Matching", "FAILED", str(e))
+                    result["errors"].append(str(e))
                     return False, result
                 
-                selected_resume = best_match['resume']
-                match_score = best_match['score']
-                self.log_step("Resume Matching", "SUCCESS", 
-                             f"Match score: {match_score:.1f}%")
+                self.log_step("Resume Matching", "SUCCESS", match_msg)
+                if checkpoint:
+                    checkpoint.save('match', {'resume': selected_resume, 'job_techs': job_techs})
             
             result["selected_resume"] = {
                 "name": selected_resume['name'],
@@ -207,164 +518,133 @@ Best regards,
             }
             
             # Generate default message if not provided (now that we have person name)
-            if not personal_message or len(personal_message.strip()) < 5:
-                person_name = selected_resume.get('person_name', 'Candidate')
-                personal_message = self.generate_default_message(job_title, person_name)
+            personal_message, auto_generated = self.resolve_message(
+                job_title, selected_resume, personal_message
+            )
+            if auto_generated:
                 self.log_step("Message Generation", "AUTO", 
-                             f"Auto-generated message for {person_name}")
+                             f"Auto-generated message for {selected_resume.get('person_name', 'Candidate')}")
             else:
                 self.log_step("Message Generation", "PROVIDED", "Using user-provided message")
             
             # Step 3: Generate resume points
-            self.log_step("Points Generation", "START", 
-                         f"Generating {points_per_tech} points per technology...")
-            
-            try:
-                # Extract techs from job description
-                success, job_techs, _ = self.matcher.extract_job_tech_stacks(job_description)
+            cached = checkpoint.load('generate') if checkpoint else None
+            if cached:
+                generated_text = cached['generated_text']
+                self.log_step("Points Generation", "RESUMED", 
+                             f"Using checkpoint ({len(generated_text)} characters)")
+            else:
+                self.log_step("Points Generation", "START", 
+                             f"Generating {points_per_tech} points per technology...")
                 
-                if not success or not job_techs:
-                    raise Exception("Could not extract technologies from job description")
+                try:
+                    generated_text = self.generate_job_points(
+                        job_description, job_title, points_per_tech, job_techs
+                    )
+                    
+                    self.log_step("Points Generation", "SUCCESS", 
+                                 f"Generated {len(generated_text)} characters of content")
                 
-                # Generate points
-                generated_text = self.points_generator.generate_points(
-                    job_description=job_description,
-                    job_title=job_title,
-                    tech_stacks=job_techs,
-                    num_points=points_per_tech
-                )
+                except Exception as e:
+                    msg = f"❌ Error generating points: {str(e)}"
+                    self.log_step("Points Generation", "FAILED", msg)
+                    result["errors"].append(msg)
+                    return False, result
                 
-                self.log_step("Points Generation", "SUCCESS", 
-                             f"Generated {len(generated_text)} characters of content")
-                result["extracted_points"] = generated_text
-            
-            except Exception as e:
-                msg = f"❌ Error generating points: {str(e)}"
-                self.log_step("Points Generation", "FAILED", msg)
-                result["errors"].append(msg)
-                return False, result
+                if checkpoint:
+                    checkpoint.save('generate', {'generated_text': generated_text})
+            result["extracted_points"] = generated_text
             
             # Step 4: Process generated points to Cycle format
-            self.log_step("Points Processing", "START", 
-                         "Converting generated points to Cycle format...")
-            
-            try:
-                # Process generated text to Cycle format for injection
-                # The TextProcessor expects heading+bullet format, which GeminiPointsGenerator produces
-                processed_points = self.text_processor.process_text(
-                    generated_text, 
-                    points_per_cycle=points_per_tech
-                )
+            cached = checkpoint.load('process') if checkpoint else None
+            if cached:
+                processed_points = CycleDocument.parse(cached['processed_points'])
+                self.log_step("Points Processing", "RESUMED", "Using checkpoint")
+            else:
+                self.log_step("Points Processing", "START", 
+                             "Converting generated points to Cycle format...")
                 
-                self.log_step("Points Processing", "SUCCESS", 
-                             f"Points converted to Cycle format ({len(processed_points)} chars)")
+                try:
+                    # Process generated text to Cycle format for injection
+                    # The TextProcessor expects heading+bullet format, which GeminiPointsGenerator produces
+                    history = None
+                    if global_dedup and self.point_history:
+                        history = self.point_history.get(recruiter_email)
+                    processed_points = self.text_processor.build_cycles(
+                        generated_text, 
+                        points_per_cycle=points_per_tech,
+                        dedup='global' if global_dedup else None,
+                        history=history
+                    )
+                    
+                    self.log_step("Points Processing", "SUCCESS", 
+                                 f"Points converted to Cycle format ({len(processed_points.render())} chars)"
+                                 + (f", {len(history)} points in history" if history is not None else ""))
+                    
+                except Exception as e:
+                    msg = f"❌ Error processing points: {str(e)}"
+                    self.log_step("Points Processing", "FAILED", msg)
+                    result["errors"].append(msg)
+                    return False, result
                 
-            except Exception as e:
-                msg = f"❌ Error processing points: {str(e)}"
-                self.log_step("Points Processing", "FAILED", msg)
-                result["errors"].append(msg)
-                return False, result
+                if checkpoint:
+                    checkpoint.save('process', {'processed_points': processed_points.render()})
             
             # Step 5: Inject points into resume
-            self.log_step("Resume Injection", "START", 
-                         f"Injecting points into: {selected_resume['name']}")
-            
-            try:
-                # Get resume file
-                if selected_resume['source'] == 'local':
-                    resume_path = Path(selected_resume['path'])
-                    if not resume_path.exists():
-                        raise Exception(f"Resume file not found: {resume_path}")
-                    
-                    with open(resume_path, 'rb') as f:
-                        resume_bytes = io.BytesIO(f.read())
-                
-                elif selected_resume['source'] == 'google_drive':
-                    success, resume_content = self.catalog.download_gdrive_resume(
-                        selected_resume['name']
-                    )
-                    if not success:
-                        raise Exception(f"Failed to download from Google Drive: {resume_content}")
-                    resume_bytes = resume_content
-                
-                else:
-                    raise Exception(f"Unknown resume source: {selected_resume['source']}")
-                
-                # Inject points (now in Cycle format)
-                updated_resume_bytes, injection_details = self.injector.inject_points_into_resume(
-                    resume_bytes=resume_bytes,
-                    processed_text=processed_points
-                )
-                
-                self.log_step("Resume Injection", "SUCCESS", 
-                             "Points successfully injected into resume")
+            cached = checkpoint.load('inject') if checkpoint else None
+            cached_resume = checkpoint.load_resume() if cached else None
+            if cached and cached_resume:
+                updated_resume_bytes = io.BytesIO(cached_resume)
                 result["updated_resume"] = updated_resume_bytes
-            
-            except Exception as e:
-                msg = f"❌ Error injecting points: {str(e)}"
-                self.log_step("Resume Injection", "FAILED", msg)
-                result["errors"].append(msg)
-                return False, result
-            
-            # Step 5: Save updated resume for download
-            try:
-                resume_filename = f"{job_title.replace(' ', '_')}_{selected_resume['person_name']}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.docx"
-                resume_filepath = self.output_folder / resume_filename
-                
-                with open(resume_filepath, 'wb') as f:
-                    f.write(updated_resume_bytes.getvalue())
-                
-                self.log_step("Resume Saving", "SUCCESS", f"Saved to: {resume_filepath}")
-                result["resume_file_path"] = str(resume_filepath)
-            
-            except Exception as e:
-                logger.error(f"Error saving resume: {e}")
-            
-            # Step 6: Send email (if email sender is initialized)
-            if self.email_sender:
-                self.log_step("Email Sending", "START", f"Sending to: {recruiter_email}")
+                result["resume_file_path"] = cached.get('resume_file_path')
+                self.log_step("Resume Injection", "RESUMED", "Using checkpointed resume")
+            else:
+                self.log_step("Resume Injection", "START", 
+                             f"Injecting points into: {selected_resume['name']}")
                 
                 try:
-                    # Prepare email
-                    subject = f"Resume - {job_title} - {selected_resume['person_name']}"
-                    
-                    # Add resume info to message
-                    email_body = (
-                        f"{personal_message}\n\n"
-                        f"Position: {job_title}\n"
-                        f"Resume: {selected_resume['person_name']}\n"
-                        f"Technologies: {', '.join(selected_resume.get('technologies', []))}\n\n"
-                        "Best regards"
-                    )
-                    
-                    # Send with attachment
-                    updated_resume_bytes.seek(0)
-                    attachments = [
-                        (f"{selected_resume['person_name']}_Resume.docx", updated_resume_bytes)
-                    ]
+                    with self.tracer.span("resume.load") as span:
+                        resume_bytes = self.load_resume_bytes(selected_resume)
+                        span.set(bytes=len(resume_bytes.getvalue()))
                     
-                    email_success = self.email_sender.send_email(
-                        recipient=recruiter_email,
-                        subject=subject,
-                        body=email_body,
-                        attachments=attachments,
-                        from_name=selected_resume['person_name']
+                    # Inject points (now in Cycle format)
+                    updated_resume_bytes, injection_details = self.injector.inject_points_into_resume(
+                        resume_bytes=resume_bytes,
+                        processed_text=processed_points
                     )
                     
-                    if email_success:
-                        self.log_step("Email Sending", "SUCCESS", 
-                                     f"Email sent to {recruiter_email}")
-                        result["email_sent"] = True
-                    else:
-                        self.log_step("Email Sending", "FAILED", "Email send failed")
-                        result["errors"].append("Failed to send email")
+                    self.log_step("Resume Injection", "SUCCESS", 
+                                 "Points successfully injected into resume")
+                    result["updated_resume"] = updated_resume_bytes
                 
                 except Exception as e:
-                    msg = f"Error sending email: {str(e)}"
-                    self.log_step("Email Sending", "FAILED", msg)
+                    msg = f"❌ Error injecting points: {str(e)}"
+                    self.log_step("Resume Injection", "FAILED", msg)
                     result["errors"].append(msg)
-            else:
-                self.log_step("Email Sending", "SKIPPED", "Email not configured")
+                    return False, result
+                
+                # Step 5: Save updated resume for download
+                self.log_step("Resume Saving", "START", "")
+                try:
+                    resume_filepath = self.save_resume(job_title, selected_resume, updated_resume_bytes)
+                    
+                    self.log_step("Resume Saving", "SUCCESS", f"Saved to: {resume_filepath}")
+                    result["resume_file_path"] = str(resume_filepath)
+                
+                except Exception as e:
+                    self.log_step("Resume Saving", "FAILED", str(e))
+                    logger.error(f"Error saving resume: {e}")
+                
+                if checkpoint:
+                    checkpoint.save_resume(updated_resume_bytes.getvalue())
+                    checkpoint.save('inject', {
+                        'injections': injection_details,
+                        'resume_file_path': result.get("resume_file_path")
+                    })
+            
+            # Step 6: Send email (if email sender is initialized)
+            self.deliver_email(checkpoint, job_title, recruiter_email, selected_resume,
+                               personal_message, updated_resume_bytes, processed_points, result)
             
             # Mark as success
             result["success"] = True
@@ -382,7 +662,9 @@ Best regards,
             result["errors"].append(msg)
             logger.error(f"Workflow failed: {e}")
             return False, result
-
+        
+        finally:
+            self.tracer.close_open_spans()
 
 def interactive_workflow():
     """Interactive CLI for running automation workflow."""
@@ -508,6 +790,8 @@ def interactive_workflow():
         print(f"\nSelected Resume: {result['selected_resume']['name']}")
         print(f"Email Sent: {'✅ Yes' if result['email_sent'] else '❌ No'}")
         print(f"Resume File: {result.get('resume_file_path', 'N/A')}")
+        if result.get('run_id'):
+            print(f"Run ID: {result['run_id']} (rerun the same job to resume it)")
         
         if result.get('log_file'):
             print(f"Log File: {result['log_file']}")
@@ -515,6 +799,8 @@ def interactive_workflow():
         print(f"❌ FAILED")
         for error in result['errors']:
             print(f"  - {error}")
+        if result.get('run_id'):
+            print(f"Run ID: {result['run_id']} - rerun the same job to resume from the failed step")
     
     print("\n" + "="*60)
 
@@ -0,0 +1,388 @@
+"""
+Batch Automation - Run the resume automation workflow for many jobs at once.
+
+Reads jobs from a JSONL or CSV file and pipelines the workflow stages across jobs:
+1. LLM stage (resume matching + points generation) on an asyncio-driven thread pool
+2. Resume injection on a process pool (CPU-bound DOCX work)
+3. Emails on a single send queue, so SMTP sends never overlap
+
+Emails go through the workflow's checkpointed email stage (outbox when one is
+configured), so rerunning a batch never re-sends a job's email and sent points
+are recorded in the recruiter's point history.
+
+Each job needs job_description, job_title and recruiter_email. Optional fields:
+id, points_per_tech, personal_message, override_resume.
+
+Usage:
+    python batch_automation.py jobs.jsonl --points 3 --llm-workers 4 --send-email
+"""
+
+import argparse
+import asyncio
+import csv
+import io
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from automation_workflow import AutomationWorkflow
+
+logger = logging.getLogger(__name__)
+
+# Per-process injector for the injection pool (created on first use in each worker)
+_worker_injector = None
+
+
+def _inject_in_worker(resume_bytes: bytes, processed_text) -> Tuple[bytes, Dict]:
+    """Inject points (a CycleDocument, or processed text) into a resume inside a pool worker process."""
+    global _worker_injector
+    if _worker_injector is None:
+        from utils.resume_injector import ResumeInjector
+        _worker_injector = ResumeInjector()
+
+    output, details = _worker_injector.inject_points_into_resume(
+        resume_bytes=io.BytesIO(resume_bytes),
+        processed_text=processed_text
+    )
+    return output.getvalue(), details
+
+
+def _parse_points(value):
+    """
+    Whole-number points_per_tech from a CSV cell or JSON value ("3", "3.0", 3).
+
+    Anything else is returned unchanged, so validation fails that one job
+    instead of the whole file.
+    """
+    if isinstance(value, bool):
+        return value
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return value
+    return int(number) if number.is_integer() else value
+
+
+def load_jobs(path: str, default_points: int = 3) -> List[Dict]:
+    """
+    Load jobs from a JSONL (.jsonl/.json, one object per line) or CSV file.
+
+    Returns:
+        List of job dicts with normalized fields (an invalid points_per_tech is
+        kept as-is and reported as that job's error when the batch runs)
+    """
+    path = Path(path)
+    if path.suffix.lower() == '.csv':
+        with open(path, newline='', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+    else:
+        rows = []
+        with open(path, encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    rows.append(json.loads(line))
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"Invalid JSON on line {line_number}: {e}")
+
+    jobs = []
+    for index, row in enumerate(rows, 1):
+        points = row.get('points_per_tech')
+        if isinstance(points, str):
+            points = points.strip()
+        if points in (None, ''):
+            points = default_points
+        jobs.append({
+            "id": str(row.get('id') or index),
+            "job_description": row.get('job_description', '') or '',
+            "job_title": (row.get('job_title', '') or '').strip(),
+            "recruiter_email": (row.get('recruiter_email', '') or '').strip(),
+            "points_per_tech": _parse_points(points),
+            "personal_message": row.get('personal_message', '') or '',
+            "override_resume": row.get('override_resume') or None,
+        })
+    return jobs
+
+
+class BatchAutomationRunner:
+    """Pipelines AutomationWorkflow stages across many jobs."""
+
+    def __init__(self, workflow: Optional[AutomationWorkflow] = None,
+                 llm_concurrency: int = 4, injection_workers: Optional[int] = None,
+                 send_emails: bool = True):
+        """
+        Args:
+            workflow: Configured workflow (its generator, catalog and email sender are used)
+            llm_concurrency: Jobs in the LLM stage at once
+            injection_workers: Injection processes (0 = inject on threads, None = CPU count)
+            send_emails: Queue emails when the workflow has an email sender
+        """
+        self.workflow = workflow or AutomationWorkflow()
+        self.llm_concurrency = max(1, llm_concurrency)
+        self.injection_workers = injection_workers
+        self.send_emails = send_emails
+        self._resume_cache: Dict[str, bytes] = {}
+        self._resume_lock = threading.Lock()
+
+    def _resume_bytes(self, selected_resume: Dict) -> bytes:
+        """Load each template once per batch."""
+        key = selected_resume['name']
+        with self._resume_lock:
+            if key not in self._resume_cache:
+                self._resume_cache[key] = self.workflow.load_resume_bytes(selected_resume).getvalue()
+            return self._resume_cache[key]
+
+    def _prepare_job(self, job: Dict) -> Dict:
+        """
+        LLM stage: validate, match, generate and convert points (runs on a thread).
+
+        Returns only the checkpoint and its email record when an earlier batch
+        already emailed this job.
+        """
+        workflow = self.workflow
+        is_valid, msg = workflow.validate_inputs(
+            job["job_description"], job["job_title"], job["points_per_tech"],
+            job["recruiter_email"], job["personal_message"]
+        )
+        if not is_valid:
+            raise ValueError(msg)
+
+        checkpoint = None
+        if workflow.checkpoints:
+            checkpoint = workflow.open_checkpoint(
+                job["job_description"], job["job_title"], job["points_per_tech"],
+                job["recruiter_email"], job["override_resume"]
+            )
+            if self.send_emails and checkpoint.is_complete('email'):
+                record = checkpoint.load('email') or {}
+                if not record.get('skipped'):
+                    return {"checkpoint": checkpoint, "email_record": record}
+
+        selected_resume, _, job_techs = workflow.select_resume(
+            job["job_description"], job["job_title"], job["override_resume"]
+        )
+        generated_text = workflow.generate_job_points(
+            job["job_description"], job["job_title"], job["points_per_tech"], job_techs
+        )
+        processed_points = workflow.text_processor.build_cycles(
+            generated_text, points_per_cycle=job["points_per_tech"]
+        )
+        message, _ = workflow.resolve_message(job["job_title"], selected_resume, job["personal_message"])
+
+        return {
+            "checkpoint": checkpoint,
+            "selected_resume": selected_resume,
+            "generated_text": generated_text,
+            "processed_points": processed_points,
+            "personal_message": message,
+            "resume_bytes": self._resume_bytes(selected_resume),
+        }
+
+    def _email_worker(self, email_queue: queue.Queue):
+        """Run the workflow's email stage for queued jobs one at a time (a single connection owner)."""
+        while True:
+            item = email_queue.get()
+            if item is None:
+                email_queue.task_done()
+                return
+
+            job_result, job, prepared, updated_resume = item
+            start = time.perf_counter()
+            try:
+                self.workflow.deliver_email(
+                    prepared["checkpoint"], job["job_title"], job["recruiter_email"],
+                    prepared["selected_resume"], prepared["personal_message"],
+                    updated_resume, prepared["processed_points"], job_result
+                )
+            except Exception as e:
+                job_result["errors"].append(f"Error sending email: {str(e)}")
+            job_result["timings"]["email"] = round(time.perf_counter() - start, 4)
+            email_queue.task_done()
+
+    async def _run_job(self, job: Dict, llm_pool, injection_pool, email_queue) -> Dict:
+        loop = asyncio.get_running_loop()
+        job_result = {
+            "id": job["id"],
+            "job_title": job["job_title"],
+            "recruiter_email": job["recruiter_email"],
+            "success": False,
+            "selected_resume": None,
+            "resume_file_path": None,
+            "run_id": None,
+            "email_sent": False,
+            "email_queued": None,
+            "errors": [],
+            "timings": {},
+        }
+
+        try:
+            start = time.perf_counter()
+            prepared = await loop.run_in_executor(llm_pool, self._prepare_job, job)
+            job_result["timings"]["llm"] = round(time.perf_counter() - start, 4)
+            if prepared["checkpoint"]:
+                job_result["run_id"] = prepared["checkpoint"].run_id
+            if "email_record" in prepared:
+                record = prepared["email_record"]
+                job_result["email_sent"] = not record.get('outbox_id')
+                job_result["email_queued"] = record.get('outbox_id')
+                job_result["success"] = True
+                logger.info(f"Batch job {job['id']} already emailed in run {job_result['run_id']}; skipped")
+                return job_result
+            selected_resume = prepared["selected_resume"]
+            job_result["selected_resume"] = selected_resume['name']
+
+            start = time.perf_counter()
+            updated_bytes, injection_details = await loop.run_in_executor(
+                injection_pool, _inject_in_worker,
+                prepared["resume_bytes"], prepared["processed_points"]
+            )
+            job_result["timings"]["injection"] = round(time.perf_counter() - start, 4)
+            job_result["injections"] = injection_details
+
+            updated_resume = io.BytesIO(updated_bytes)
+            resume_filepath = self.workflow.save_resume(
+                job["job_title"], selected_resume, updated_resume, name_suffix=f"_job{job['id']}"
+            )
+            job_result["resume_file_path"] = str(resume_filepath)
+            job_result["success"] = True
+
+            if self.send_emails and self.workflow.email_sender:
+                email_queue.put((job_result, job, prepared, updated_resume))
+
+        except Exception as e:
+            job_result["errors"].append(str(e))
+            logger.error(f"Batch job {job['id']} failed: {e}")
+
+        return job_result
+
+    async def _run_async(self, jobs: List[Dict], llm_pool, injection_pool, email_queue) -> List[Dict]:
+        return await asyncio.gather(*(
+            self._run_job(job, llm_pool, injection_pool, email_queue) for job in jobs
+        ))
+
+    def run(self, jobs: List[Dict]) -> Dict:
+        """
+        Run all jobs through the pipeline.
+
+        Returns:
+            Report dict with per-job results and aggregate throughput
+        """
+        email_queue = queue.Queue()
+        email_thread = threading.Thread(target=self._email_worker, args=(email_queue,), daemon=True)
+        email_thread.start()
+
+        if self.injection_workers == 0:
+            injection_pool = ThreadPoolExecutor(max_workers=self.llm_concurrency)
+        else:
+            injection_pool = ProcessPoolExecutor(max_workers=self.injection_workers)
+
+        started_at = datetime.now().isoformat()
+        wall_start = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=self.llm_concurrency) as llm_pool:
+                results = asyncio.run(self._run_async(jobs, llm_pool, injection_pool, email_queue))
+        finally:
+            injection_pool.shutdown()
+            email_queue.put(None)
+            email_queue.join()
+        wall = time.perf_counter() - wall_start
+
+        return {
+            "started_at": started_at,
+            "summary": self._summarize(results, wall),
+            "results": results,
+        }
+
+    @staticmethod
+    def _summarize(results: List[Dict], wall: float) -> Dict:
+        stage_totals = {}
+        for job_result in results:
+            for stage, seconds in job_result["timings"].items():
+                stage_totals[stage] = stage_totals.get(stage, 0.0) + seconds
+
+        return {
+            "total_jobs": len(results),
+            "succeeded": sum(1 for r in results if r["success"]),
+            "failed": sum(1 for r in results if not r["success"]),
+            "emails_sent": sum(1 for r in results if r["email_sent"]),
+            "emails_queued": sum(1 for r in results if r["email_queued"]),
+            "wall_seconds": round(wall, 3),
+            "jobs_per_second": round(len(results) / wall, 3) if wall else 0.0,
+            "stage_busy_seconds": {stage: round(total, 3) for stage, total in stage_totals.items()},
+        }
+
+    def save_results(self, report: Dict, path: Optional[str] = None) -> str:
+        """Write the consolidated batch report to one JSON file."""
+        if path is None:
+            filename = f"batch_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+            path = self.workflow.output_folder / filename
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2)
+        logger.info(f"Batch results saved: {path}")
+        return str(path)
+
+
+def print_summary(summary: Dict, results_file: str):
+    print("\n" + "="*60)
+    print("📊 BATCH RESULTS")
+    print("="*60)
+    print(f"Jobs: {summary['total_jobs']}  ✅ {summary['succeeded']}  ❌ {summary['failed']}  "
+          f"📧 {summary['emails_sent']}")
+    print(f"Wall time: {summary['wall_seconds']:.2f}s  Throughput: {summary['jobs_per_second']:.2f} jobs/s")
+    for stage, seconds in summary["stage_busy_seconds"].items():
+        print(f"  {stage:<10} {seconds:>8.2f}s busy")
+    print(f"Results: {results_file}")
+    print("="*60 + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the resume automation workflow for many jobs")
+    parser.add_argument("jobs_file", help="JSONL or CSV file of jobs")
+    parser.add_argument("--points", type=int, default=3, help="Default points per technology")
+    parser.add_argument("--llm-workers", type=int, default=4, help="Concurrent LLM jobs")
+    parser.add_argument("--injection-workers", type=int, default=None,
+                        help="Injection processes (0 = use threads)")
+    parser.add_argument("--send-email", action="store_true",
+                        help="Send resumes via Gmail (GMAIL_EMAIL / GMAIL_PASSWORD)")
+    parser.add_argument("--output", default=None, help="Path of the consolidated results file")
+    args = parser.parse_args()
+
+    jobs = load_jobs(args.jobs_file, default_points=args.points)
+    print(f"\n🚀 Loaded {len(jobs)} jobs from {args.jobs_file}")
+
+    workflow = AutomationWorkflow()
+    if args.send_email:
+        gmail, app_password = os.getenv('GMAIL_EMAIL'), os.getenv('GMAIL_PASSWORD')
+        if not gmail or not app_password:
+            print("❌ --send-email requires GMAIL_EMAIL and GMAIL_PASSWORD")
+            return
+        success, msg = workflow.initialize_email(gmail, app_password)
+        print(msg)
+        if not success:
+            return
+
+    runner = BatchAutomationRunner(
+        workflow,
+        llm_concurrency=args.llm_workers,
+        injection_workers=args.injection_workers,
+        send_emails=args.send_email
+    )
+    report = runner.run(jobs)
+    results_file = runner.save_results(report, args.output)
+    print_summary(report["summary"], results_file)
+
+
+if __name__ == "__main__":
+    main()
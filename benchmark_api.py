@@ -0,0 +1,218 @@
+"""
+Load test for the headless HTTP API (api_server.py).
+
+Starts the server in-process (or targets --url), then runs concurrent clients
+that each hold one keep-alive connection and send a mix of requests for a fixed
+duration. Reports requests/second, latency percentiles (p50/p95/p99) per
+endpoint and the status codes returned.
+
+Usage:
+    python benchmark_api.py --clients 16 --duration 10 --workers 4
+    python benchmark_api.py --url http://127.0.0.1:8080 --mix process,export
+"""
+
+import argparse
+import http.client
+import json
+import logging
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+from urllib.parse import urlsplit
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from api_server import ApiServer
+
+SAMPLE_RESUME = Path(__file__).parent / "resumes_uploaded" / "Java.docx"
+
+SAMPLE_TEXT = """Java
+• Built Spring Boot microservices handling 2M requests per day
+• Migrated monoliths to event-driven services on Kafka
+• Tuned JVM garbage collection for low-latency APIs
+
+AWS
+• Designed multi-account AWS landing zone with Terraform
+• Cut EC2 costs 30% with autoscaling and spot instances
+• Automated deployments with CodePipeline and CodeDeploy
+
+Docker
+• Containerized 40 services with multi-stage Docker builds
+• Ran Kubernetes clusters on EKS with Helm charts
+"""
+
+
+def percentile(values: list, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _multipart(fields: dict) -> tuple:
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, (filename, data) in fields.items():
+        disposition = f'form-data; name="{name}"' + (f'; filename="{filename}"' if filename else "")
+        parts.append(f"--{boundary}\r\nContent-Disposition: {disposition}\r\n\r\n".encode() + data + b"\r\n")
+    body = b"".join(parts) + f"--{boundary}--\r\n".encode()
+    return f"multipart/form-data; boundary={boundary}", body
+
+
+def build_requests() -> dict:
+    """{name: (method, path, content_type, body)} for each endpoint in the mix."""
+    resume = SAMPLE_RESUME.read_bytes() if SAMPLE_RESUME.exists() else None
+    from utils.text_processor import TextProcessor
+    processed = TextProcessor().process_text(SAMPLE_TEXT, 2)
+
+    requests = {
+        "process": ("POST", "/process?points=2&dedup=exact", "text/plain", SAMPLE_TEXT.encode()),
+        "dedup": ("POST", "/dedup?mode=fuzzy", "text/plain",
+                  "\n".join(SAMPLE_TEXT.splitlines() * 3).encode()),
+        "export": ("POST", "/export?format=docx", "text/plain", processed.encode()),
+        "match": ("POST", "/match", "application/json", json.dumps({
+            "job_description": "Senior Java engineer with AWS and Docker",
+            "technologies": ["Java", "AWS", "Docker"],
+        }).encode()),
+        "health": ("GET", "/health", None, b""),
+    }
+    if resume is not None:
+        requests["bookmarks"] = ("POST", "/bookmarks", "application/octet-stream", resume)
+        content_type, body = _multipart({"resume": ("resume.docx", resume),
+                                         "text": (None, processed.encode())})
+        requests["inject"] = ("POST", "/inject", content_type, body)
+    return requests
+
+
+def run_load(url: str, clients: int = 8, duration: float = 5.0, mix: list = None, seed: int = 0) -> dict:
+    """
+    Send requests from `clients` threads for `duration` seconds.
+
+    Returns:
+        Dict with totals, requests/second, latency percentiles overall and per endpoint
+    """
+    requests = build_requests()
+    names = [name for name in (mix or ["process", "dedup", "export", "bookmarks", "inject", "match"])
+             if name in requests]
+    parts = urlsplit(url)
+    latencies = {name: [] for name in names}
+    statuses = Counter()
+    errors = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client(index: int):
+        rng = random.Random(seed + index)
+        conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=60)
+        while time.perf_counter() < deadline:
+            name = rng.choice(names)
+            method, path, content_type, body = requests[name]
+            headers = {"Content-Type": content_type} if content_type else {}
+            start = time.perf_counter()
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+                response.read()
+                status = response.status
+            except (OSError, http.client.HTTPException) as e:
+                conn.close()
+                conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=60)
+                with lock:
+                    errors.append(f"{name}: {type(e).__name__}: {e}")
+                continue
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies[name].append(elapsed)
+                statuses[status] += 1
+        conn.close()
+
+    wall_start = time.perf_counter()
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - wall_start
+
+    every = [t for values in latencies.values() for t in values]
+
+    def summary(values: list) -> dict:
+        return {
+            "count": len(values),
+            "p50_ms": round(percentile(values, 50) * 1000, 2),
+            "p95_ms": round(percentile(values, 95) * 1000, 2),
+            "p99_ms": round(percentile(values, 99) * 1000, 2),
+            "max_ms": round(max(values) * 1000, 2) if values else 0.0,
+        }
+
+    return {
+        "clients": clients,
+        "duration_seconds": round(wall, 3),
+        "requests": len(every),
+        "requests_per_second": round(len(every) / wall, 1) if wall else 0.0,
+        "latency": summary(every),
+        "endpoints": {name: summary(values) for name, values in latencies.items()},
+        "statuses": dict(statuses),
+        "transport_errors": len(errors),
+        "sample_errors": errors[:5],
+    }
+
+
+def print_report(report: dict):
+    print("\n" + "=" * 60)
+    print(f"[BENCHMARK] HTTP API LOAD TEST ({report['clients']} clients, {report['duration_seconds']:.1f}s)")
+    print("=" * 60)
+    latency = report["latency"]
+    print(f"Requests: {report['requests']}  Throughput: {report['requests_per_second']:.1f} req/s")
+    print(f"Latency: p50 {latency['p50_ms']:.1f} ms  p95 {latency['p95_ms']:.1f} ms  "
+          f"p99 {latency['p99_ms']:.1f} ms  max {latency['max_ms']:.1f} ms")
+    print(f"Statuses: {report['statuses']}  Transport errors: {report['transport_errors']}")
+    print(f"\n{'Endpoint':<12}{'count':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, stats in report["endpoints"].items():
+        print(f"{name:<12}{stats['count']:>8}{stats['p50_ms']:>10.1f}{stats['p95_ms']:>10.1f}{stats['p99_ms']:>10.1f}")
+    for error in report["sample_errors"]:
+        print(f"  Error: {error}")
+    print("=" * 60 + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test for the headless HTTP API")
+    parser.add_argument("--url", help="Target an already running server (default: start one in-process)")
+    parser.add_argument("--clients", type=int, default=8, help="Concurrent keep-alive clients")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds to send requests")
+    parser.add_argument("--mix", default="process,dedup,export,bookmarks,inject,match",
+                        help="Comma-separated endpoints to exercise")
+    parser.add_argument("--workers", type=int, default=4, help="Worker pool size of the in-process server")
+    parser.add_argument("--executor", choices=["thread", "process"], default="thread",
+                        help="Worker pool type of the in-process server")
+    parser.add_argument("--seed", type=int, default=0, help="RNG seed for the request mix")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    server = None
+    url = args.url
+    if url is None:
+        server = ApiServer(workers=args.workers, max_queue=args.clients * 2, executor=args.executor)
+        url = f"http://127.0.0.1:{server.start_in_thread()}"
+
+    try:
+        report = run_load(url, clients=args.clients, duration=args.duration,
+                          mix=args.mix.split(","), seed=args.seed)
+    finally:
+        if server is not None:
+            server.stop_thread()
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
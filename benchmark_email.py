@@ -0,0 +1,156 @@
+"""
+Offline benchmark for bulk SendGrid sending.
+
+Starts a local HTTP stub of the SendGrid v3 mail/send endpoint and sends the
+same resume to N recipients two ways:
+1. per-recipient: one request (and one new connection) per recipient
+2. batched: personalizations packed into as few requests as possible over one
+   keep-alive connection, with the attachment encoded once
+
+Usage:
+    python benchmark_email.py --recipients 2500 --attachment-kb 200
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from utils.email_sender import SendGridSender
+
+
+class SendGridStub:
+    """Local stand-in for api.sendgrid.com that records requests and connections."""
+
+    def __init__(self, latency: float = 0.0):
+        stub = self
+        self.latency = latency
+        self.requests = []
+        self.connections = 0
+        self._lock = threading.Lock()
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                with stub._lock:
+                    stub.connections += 1
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                payload = json.loads(body)
+                with stub._lock:
+                    stub.requests.append({
+                        "path": self.path,
+                        "authorization": self.headers.get("Authorization"),
+                        "bytes": len(body),
+                        "recipients": [p["to"][0]["email"] for p in payload["personalizations"]],
+                        "attachments": len(payload.get("attachments", [])),
+                    })
+                if stub.latency:
+                    time.sleep(stub.latency)
+                status = 400 if len(payload["personalizations"]) > SendGridSender.MAX_PERSONALIZATIONS else 202
+                self.send_response(status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def reset(self):
+        with self._lock:
+            self.requests = []
+            self.connections = 0
+
+
+def run_benchmark(recipients: int = 500, attachment_kb: int = 200, latency: float = 0.0) -> dict:
+    """Send to `recipients` addresses per-recipient and batched; return timings and counts."""
+    addresses = [f"recruiter{i}@example.com" for i in range(recipients)]
+    attachment = os.urandom(attachment_kb * 1024)
+    report = {"recipients": recipients, "attachment_kb": attachment_kb}
+
+    with SendGridStub(latency=latency) as stub:
+        sender = SendGridSender("SG.test", from_email="me@example.com", api_url=stub.url)
+
+        # 1. Per recipient: fresh message, request and connection each time
+        start = time.perf_counter()
+        for address in addresses:
+            sender.send_email(address, "Resume", "Please find my resume attached.",
+                              attachments=[("resume.docx", attachment)])
+            sender.close()
+        report["per_recipient"] = {
+            "seconds": round(time.perf_counter() - start, 4),
+            "requests": len(stub.requests),
+            "connections": stub.connections,
+            "upload_mb": round(sum(r["bytes"] for r in stub.requests) / 1e6, 2),
+        }
+
+        # 2. Batched personalizations over one connection
+        stub.reset()
+        start = time.perf_counter()
+        template = sender.create_template("Resume", "Please find my resume attached.",
+                                          attachments=[("resume.docx", attachment)])
+        results = sender.send_template_many(template, addresses)
+        sender.close()
+        report["batched"] = {
+            "seconds": round(time.perf_counter() - start, 4),
+            "requests": len(stub.requests),
+            "connections": stub.connections,
+            "upload_mb": round(sum(r["bytes"] for r in stub.requests) / 1e6, 2),
+            "delivered": sum(results),
+        }
+
+    return report
+
+
+def print_report(report: dict):
+    print("\n" + "=" * 60)
+    print(f"[BENCHMARK] SENDGRID BULK SEND ({report['recipients']} recipients, "
+          f"{report['attachment_kb']} KB attachment)")
+    print("=" * 60)
+    print(f"{'Mode':<16}{'seconds':>10}{'requests':>10}{'conns':>8}{'upload MB':>11}")
+    for mode in ("per_recipient", "batched"):
+        stats = report[mode]
+        print(f"{mode:<16}{stats['seconds']:>10.3f}{stats['requests']:>10}"
+              f"{stats['connections']:>8}{stats['upload_mb']:>11.2f}")
+    print("=" * 60 + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark for bulk SendGrid sending")
+    parser.add_argument("--recipients", type=int, default=500, help="Number of recipients")
+    parser.add_argument("--attachment-kb", type=int, default=200, help="Attachment size in KB")
+    parser.add_argument("--latency", type=float, default=0.0, help="Stub latency per request (s)")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    report = run_benchmark(args.recipients, args.attachment_kb, args.latency)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""
+Cold-start benchmark for the Streamlit app.
+
+Each run starts a fresh interpreter and measures:
+1. import time of main.py (python -X importtime), with its slowest direct imports
+2. time to first render: Streamlit's AppTest running main.py once (no browser,
+   no network), from interpreter start until the script finishes
+
+It also lists heavy dependencies that were loaded by the first render; they are
+meant to be imported by the tab that first uses them. The exit status is 1 when
+a median exceeds its budget or a deferred dependency is loaded at startup, so
+the benchmark can gate CI.
+
+Usage:
+    python benchmark_startup.py --runs 5 --render-budget-ms 2500
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+APP_DIR = Path(__file__).parent
+
+# Dependencies main.py must not load before a tab needs them
+DEFERRED_MODULES = [
+    "pandas",
+    "docx",
+    "reportlab",
+    "groq",
+    "googleapiclient",
+    "psycopg2",
+    "automation_workflow",
+    "utils.export_handler",
+    "utils.gemini_points_generator",
+    "utils.resume_injector",
+    "utils.email_sender",
+]
+
+DEFAULT_IMPORT_BUDGET_MS = 1000.0
+DEFAULT_RENDER_BUDGET_MS = 2500.0
+
+RENDER_SCRIPT = """
+import json, sys
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({path!r}, default_timeout=120)
+at.run()
+print(json.dumps({{
+    "exceptions": [e.message for e in at.exception],
+    "loaded": [m for m in {modules!r} if m in sys.modules],
+}}))
+"""
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def _env() -> dict:
+    # Offline LLM backend and a placeholder key: the first render never calls out
+    env = dict(os.environ)
+    env.setdefault("LLM_BACKEND", "fake")
+    env.setdefault("GROQ_API_KEY", "benchmark")
+    return env
+
+
+def parse_importtime(stderr: str, module: str = "main") -> dict:
+    """
+    Cumulative import time of `module` and of its direct imports.
+
+    Returns:
+        {'total_ms': float, 'children': [(name, cumulative_ms), ...]} (slowest first)
+    """
+    entries = []
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            entries.append((match.group(4), int(match.group(2)), len(match.group(3))))
+
+    for index, (name, cumulative, depth) in enumerate(entries):
+        if name != module:
+            continue
+        # importtime prints a module's imports (one level deeper) just before it
+        children = []
+        for child, child_cumulative, child_depth in reversed(entries[:index]):
+            if child_depth <= depth:
+                break
+            if child_depth == depth + 2:
+                children.append((child, child_cumulative / 1000))
+        children.sort(key=lambda item: item[1], reverse=True)
+        return {"total_ms": cumulative / 1000, "children": children}
+    raise RuntimeError(f"'{module}' not found in -X importtime output")
+
+
+def measure_import() -> dict:
+    """Import main.py in a fresh interpreter under -X importtime."""
+    code = f"import json, sys, main; print(json.dumps([m for m in {DEFERRED_MODULES!r} if m in sys.modules]))"
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=APP_DIR, env=_env(), capture_output=True, text=True, timeout=300
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import main failed:\n{proc.stderr[-2000:]}")
+    result = parse_importtime(proc.stderr)
+    result["loaded"] = json.loads(proc.stdout.strip().splitlines()[-1])
+    return result
+
+
+def measure_first_render() -> dict:
+    """Run main.py once through AppTest in a fresh interpreter."""
+    code = RENDER_SCRIPT.format(path=str(APP_DIR / "main.py"), modules=DEFERRED_MODULES)
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=APP_DIR, env=_env(), capture_output=True, text=True, timeout=300
+    )
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    if proc.returncode != 0:
+        raise RuntimeError(f"first render failed:\n{proc.stderr[-2000:]}")
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["ms"] = elapsed_ms
+    return result
+
+
+def run_benchmark(runs: int = 3, import_budget_ms: float = DEFAULT_IMPORT_BUDGET_MS,
+                  render_budget_ms: float = DEFAULT_RENDER_BUDGET_MS, render: bool = True) -> dict:
+    """
+    Measure `runs` cold starts.
+
+    Returns:
+        Dict with median/max timings, slowest imports, deferred modules that were
+        loaded, and 'failures' (empty when every budget is met)
+    """
+    imports = [measure_import() for _ in range(runs)]
+    renders = [measure_first_render() for _ in range(runs)] if render else []
+
+    import_ms = [r["total_ms"] for r in imports]
+    loaded = sorted({m for r in imports + renders for m in r["loaded"]})
+    report = {
+        "runs": runs,
+        "import_ms": {"median": round(statistics.median(import_ms), 1), "max": round(max(import_ms), 1)},
+        "import_budget_ms": import_budget_ms,
+        "slowest_imports": [(name, round(ms, 1)) for name, ms in imports[-1]["children"][:10]],
+        "deferred_modules_loaded": loaded,
+        "failures": [],
+    }
+    if renders:
+        render_ms = [r["ms"] for r in renders]
+        report["first_render_ms"] = {"median": round(statistics.median(render_ms), 1),
+                                     "max": round(max(render_ms), 1)}
+        report["render_budget_ms"] = render_budget_ms
+        report["render_exceptions"] = renders[-1]["exceptions"]
+
+    if report["import_ms"]["median"] > import_budget_ms:
+        report["failures"].append(
+            f"import main: {report['import_ms']['median']:.0f} ms > budget {import_budget_ms:.0f} ms")
+    if renders and report["first_render_ms"]["median"] > render_budget_ms:
+        report["failures"].append(
+            f"first render: {report['first_render_ms']['median']:.0f} ms > budget {render_budget_ms:.0f} ms")
+    if loaded:
+        report["failures"].append(f"loaded at startup: {', '.join(loaded)}")
+    if renders and report["render_exceptions"]:
+        report["failures"].append(f"first render raised: {report['render_exceptions'][0]}")
+    return report
+
+
+def print_report(report: dict):
+    print("\n" + "=" * 60)
+    print("[BENCHMARK] APP COLD START")
+    print("=" * 60)
+    print(f"Runs: {report['runs']}")
+    print(f"import main:  median {report['import_ms']['median']:.1f} ms  "
+          f"max {report['import_ms']['max']:.1f} ms  (budget {report['import_budget_ms']:.0f} ms)")
+    if "first_render_ms" in report:
+        print(f"first render: median {report['first_render_ms']['median']:.1f} ms  "
+              f"max {report['first_render_ms']['max']:.1f} ms  (budget {report['render_budget_ms']:.0f} ms)")
+    print(f"\n{'Slowest imports of main':<40}{'ms':>10}")
+    for name, ms in report["slowest_imports"]:
+        print(f"{name:<40}{ms:>10.1f}")
+    print(f"\nDeferred modules loaded: {', '.join(report['deferred_modules_loaded']) or 'none'}")
+    for failure in report["failures"]:
+        print(f"  FAIL: {failure}")
+    print("=" * 60 + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start benchmark for the Streamlit app")
+    parser.add_argument("--runs", type=int, default=3, help="Fresh interpreters per measurement")
+    parser.add_argument("--import-budget-ms", type=float, default=DEFAULT_IMPORT_BUDGET_MS,
+                        help="Maximum median import time of main.py")
+    parser.add_argument("--render-budget-ms", type=float, default=DEFAULT_RENDER_BUDGET_MS,
+                        help="Maximum median time from interpreter start to first render")
+    parser.add_argument("--no-render", action="store_true", help="Only measure import time")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    report = run_benchmark(runs=args.runs, import_budget_ms=args.import_budget_ms,
+                           render_budget_ms=args.render_budget_ms, render=not args.no_render)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+    sys.exit(1 if report["failures"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+"""
+Offline latency benchmark for the automation workflow.
+
+Runs AutomationWorkflow.run_workflow end-to-end against FakeLLMBackend (no Groq
+key, no network) using the bundled resume templates, and reports throughput and
+per-stage latency.
+
+Usage:
+    python benchmark_workflow.py --jobs 20 --latency 0.2 --workers 4
+"""
+
+import argparse
+import json
+import logging
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from automation_workflow import AutomationWorkflow
+from batch_automation import BatchAutomationRunner
+from utils.gemini_points_generator import GeminiPointsGenerator
+from utils.llm_backend import FakeLLMBackend
+from utils.resume_catalog import ResumeCatalog
+
+TEMPLATE_FOLDER = Path(__file__).parent / "resumes_uploaded"
+
+SAMPLE_JOB = """Senior Backend Engineer
+
+Primary Skills: Java, Spring Boot, AWS, Docker, Kubernetes, PostgreSQL
+
+Key Responsibilities:
+- Design and build microservices on AWS using Java and Spring Boot
+- Own CI/CD pipelines with Jenkins and Docker
+- Tune PostgreSQL and Redis for high-throughput workloads
+
+Benefits:
+Medical, dental and vision coverage
+
+We are an equal opportunity employer.
+"""
+
+
+def build_catalog() -> ResumeCatalog:
+    """Catalog holding the bundled templates (in memory, never saved)."""
+    catalog = ResumeCatalog()
+    catalog.catalog = {"resumes": []}
+    for path in sorted(TEMPLATE_FOLDER.glob("*.docx")):
+        catalog.catalog["resumes"].append({
+            "name": f"Bench_{path.name}",
+            "path": str(path),
+            "source": "local",
+            "file_id": None,
+            "person_name": "Bench",
+            "technologies": [path.stem],
+            "job_roles": [],
+            "bookmarks": [],
+            "added_date": datetime.now().isoformat()
+        })
+    return catalog
+
+
+def percentile(values: list, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_benchmark(jobs: int = 10, workers: int = 1, latency: float = 0.0,
+                  jitter: float = 0.0, error_rate: float = 0.0, points: int = 3,
+                  seed: int = 0) -> dict:
+    """
+    Run the workflow `jobs` times across `workers` threads.
+
+    Returns:
+        Dict with throughput, job latency percentiles and per-stage latency stats
+    """
+    backend = FakeLLMBackend(latency=latency, jitter=jitter, error_rate=error_rate, seed=seed)
+    catalog = build_catalog()
+    output_dir = tempfile.mkdtemp(prefix="workflow_bench_")
+
+    def run_one(index: int) -> dict:
+        # One workflow per job: run_workflow keeps per-run state on the instance
+        workflow = AutomationWorkflow(
+            points_generator=GeminiPointsGenerator(backend=backend),
+            catalog=catalog,
+            output_folder=output_dir
+        )
+        start = time.perf_counter()
+        success, result = workflow.run_workflow(
+            job_description=SAMPLE_JOB,
+            job_title=f"Backend Engineer {index}",
+            points_per_tech=points,
+            recruiter_email="recruiter@example.com"
+        )
+        return {
+            "success": success,
+            "seconds": time.perf_counter() - start,
+            "stages": workflow.tracer.stage_durations(),
+            "errors": result["errors"]
+        }
+
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        runs = list(executor.map(run_one, range(jobs)))
+    wall = time.perf_counter() - wall_start
+
+    job_times = [r["seconds"] for r in runs]
+    stage_times = {}
+    for run in runs:
+        for stage, seconds in run["stages"].items():
+            stage_times.setdefault(stage, []).append(seconds)
+
+    return {
+        "jobs": jobs,
+        "workers": workers,
+        "succeeded": sum(1 for r in runs if r["success"]),
+        "failed": sum(1 for r in runs if not r["success"]),
+        "llm_calls": backend.call_count,
+        "wall_seconds": round(wall, 4),
+        "jobs_per_second": round(jobs / wall, 3) if wall else 0.0,
+        "job_latency": {
+            "p50": round(percentile(job_times, 50), 4),
+            "p95": round(percentile(job_times, 95), 4),
+            "max": round(max(job_times), 4) if job_times else 0.0,
+        },
+        "stages": {
+            stage: {
+                "count": len(times),
+                "mean": round(statistics.mean(times), 4),
+                "p95": round(percentile(times, 95), 4),
+            }
+            for stage, times in stage_times.items()
+        },
+        "sample_errors": [e for r in runs for e in r["errors"]][:5],
+    }
+
+
+def run_batch_benchmark(jobs: int = 10, workers: int = 4, latency: float = 0.0,
+                        jitter: float = 0.0, error_rate: float = 0.0, points: int = 3,
+                        seed: int = 0, injection_workers: int = None) -> dict:
+    """
+    Run the same jobs through BatchAutomationRunner's pipelined stages.
+
+    Returns:
+        The batch summary (throughput and per-stage busy time)
+    """
+    backend = FakeLLMBackend(latency=latency, jitter=jitter, error_rate=error_rate, seed=seed)
+    workflow = AutomationWorkflow(
+        points_generator=GeminiPointsGenerator(backend=backend),
+        catalog=build_catalog(),
+        output_folder=tempfile.mkdtemp(prefix="workflow_bench_")
+    )
+    runner = BatchAutomationRunner(
+        workflow, llm_concurrency=workers, injection_workers=injection_workers
+    )
+    batch_jobs = [
+        {
+            "id": str(index),
+            "job_description": SAMPLE_JOB,
+            "job_title": f"Backend Engineer {index}",
+            "recruiter_email": "recruiter@example.com",
+            "points_per_tech": points,
+            "personal_message": "",
+            "override_resume": None,
+        }
+        for index in range(jobs)
+    ]
+    summary = runner.run(batch_jobs)["summary"]
+    summary["llm_calls"] = backend.call_count
+    return summary
+
+
+def print_report(report: dict):
+    print("\n" + "=" * 60)
+    print("[BENCHMARK] AUTOMATION WORKFLOW (offline)")
+    print("=" * 60)
+    print(f"Jobs: {report['jobs']}  Workers: {report['workers']}  "
+          f"Succeeded: {report['succeeded']}  Failed: {report['failed']}")
+    print(f"LLM calls: {report['llm_calls']}")
+    print(f"Wall time: {report['wall_seconds']:.3f}s  Throughput: {report['jobs_per_second']:.2f} jobs/s")
+    latency = report["job_latency"]
+    print(f"Job latency: p50 {latency['p50']:.3f}s  p95 {latency['p95']:.3f}s  max {latency['max']:.3f}s")
+    print(f"\n{'Stage':<22}{'count':>7}{'mean (s)':>12}{'p95 (s)':>12}")
+    for stage, stats in report["stages"].items():
+        print(f"{stage:<22}{stats['count']:>7}{stats['mean']:>12.4f}{stats['p95']:>12.4f}")
+    for error in report["sample_errors"]:
+        print(f"  Error: {error}")
+    print("=" * 60 + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark for AutomationWorkflow")
+    parser.add_argument("--jobs", type=int, default=10, help="Number of workflow runs")
+    parser.add_argument("--workers", type=int, default=1, help="Concurrent workflow runs")
+    parser.add_argument("--latency", type=float, default=0.0, help="Fake LLM latency per call (s)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random latency per call (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fake LLM failure probability")
+    parser.add_argument("--points", type=int, default=3, help="Points per technology")
+    parser.add_argument("--seed", type=int, default=0, help="RNG seed")
+    parser.add_argument("--batch", action="store_true",
+                        help="Also run the jobs through the pipelined batch runner")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    parser.add_argument("--verbose", action="store_true", help="Keep workflow INFO/DEBUG logging")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logging.disable(logging.INFO)
+
+    report = run_benchmark(
+        jobs=args.jobs, workers=args.workers, latency=args.latency, jitter=args.jitter,
+        error_rate=args.error_rate, points=args.points, seed=args.seed
+    )
+    if args.batch:
+        report["batch"] = run_batch_benchmark(
+            jobs=args.jobs, workers=max(args.workers, 4), latency=args.latency,
+            jitter=args.jitter, error_rate=args.error_rate, points=args.points, seed=args.seed
+        )
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+        if args.batch:
+            batch = report["batch"]
+            print(f"[BATCH] {batch['succeeded']}/{batch['total_jobs']} jobs in {batch['wall_seconds']:.3f}s "
+                  f"-> {batch['jobs_per_second']:.2f} jobs/s "
+                  f"(busy: {', '.join(f'{k} {v:.2f}s' for k, v in batch['stage_busy_seconds'].items())})\n")
+
+
+if __name__ == "__main__":
+    main()
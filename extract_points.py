@@ -0,0 +1,371 @@
+"""
+Extract Points - Command-line batch processing without the Streamlit UI.
+
+Processes text files matched by one or more globs on a pool of worker
+processes, each running the same BatchProcessor (and optionally
+BatchResumeInjector) the app uses. Outputs are streamed to a directory or a
+.zip archive as each file finishes, so a large nightly batch never holds more
+than a few results in memory:
+
+    <name>.txt / <name>.docx / <name>.pdf        processed points
+    <resume>_with_<name>_injected.docx           when resumes are given
+
+Resumes are paired with text files by a mapping file (JSON object or two-column
+CSV of text name -> resume name, names without extension). Without a mapping,
+a single resume receives every text file and otherwise texts go to the resume
+with the same name.
+
+Usage:
+    python extract_points.py "inputs/*.txt" --points 3 --out results.zip --workers 4
+    python extract_points.py "inputs/**/*.txt" --resumes "templates/*.docx" --mapping map.csv --out out/
+"""
+
+import argparse
+import csv
+import glob
+import io
+import json
+import logging
+import os
+import sys
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from utils.text_input import TextSource
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("txt", "docx", "pdf")
+
+# Per-process pipelines for the worker pool (created on first use in each worker)
+_worker_processor = None
+_worker_injector = None
+
+
+def _extract_in_worker(text_path: str, points: int, dedup: Optional[str], formats: tuple,
+                       resume_path: Optional[str] = None) -> Dict:
+    """
+    Process one text file (and inject it into its resume) inside a pool worker.
+
+    Returns:
+        Dict with name, outputs [(filename, bytes)], injected count, error and stage timings
+    """
+    global _worker_processor, _worker_injector
+    if _worker_processor is None:
+        from utils.batch_processor import BatchProcessor
+        _worker_processor = BatchProcessor()
+
+    name = Path(text_path).stem
+    result = {"name": name, "source": text_path, "outputs": [], "injected": 0,
+              "bytes_in": 0, "error": None, "timings": {}}
+    try:
+        start = time.perf_counter()
+        # Memory-mapped; decoded a block of lines at a time, and the processor keeps only the point lines
+        with TextSource.open(text_path) as content:
+            result["bytes_in"] = len(content)
+            key, document = _worker_processor.process_document(content, points, bool(dedup), dedup or 'exact')
+        result["timings"]["process"] = time.perf_counter() - start
+        if not document:
+            raise ValueError("No points found in input")
+
+        start = time.perf_counter()
+        if "txt" in formats:
+            result["outputs"].append((f"{name}.txt", document.render().encode('utf-8')))
+        if "docx" in formats:
+            result["outputs"].append((f"{name}.docx", _worker_processor.export_docx(key, document)))
+        if "pdf" in formats:
+            result["outputs"].append((f"{name}.pdf", _worker_processor.export_pdf(key, document)))
+        result["timings"]["export"] = time.perf_counter() - start
+
+        if resume_path:
+            if _worker_injector is None:
+                from utils.batch_resume_injector import BatchResumeInjector
+                _worker_injector = BatchResumeInjector()
+
+            start = time.perf_counter()
+            resume_name = Path(resume_path).stem
+            results, errors = _worker_injector.inject_batch(
+                {name: {'content': document, 'original_name': Path(text_path).name}},
+                {resume_name: {'bytes': io.BytesIO(Path(resume_path).read_bytes()),
+                               'original_name': Path(resume_path).name}},
+                {name: resume_name}
+            )
+            result["timings"]["inject"] = time.perf_counter() - start
+            if errors:
+                raise ValueError(errors[0])
+            for injected_bytes, injection_summary, output_name in results.values():
+                result["outputs"].append((output_name, injected_bytes))
+                result["injected"] = len(injection_summary)
+
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+
+    return result
+
+
+def expand_globs(patterns: List[str]) -> List[str]:
+    """Files matched by the patterns (recursive ** allowed), in order, without duplicates."""
+    paths = []
+    seen = set()
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern, recursive=True)) or ([pattern] if os.path.isfile(pattern) else [])
+        for path in matches:
+            if os.path.isfile(path) and os.path.abspath(path) not in seen:
+                seen.add(os.path.abspath(path))
+                paths.append(path)
+    return paths
+
+
+def load_mapping(path: str) -> Dict[str, str]:
+    """
+    Load a text -> resume mapping from a JSON object or a two-column CSV.
+
+    Names may include extensions; they are compared without them.
+    """
+    path = Path(path)
+    if path.suffix.lower() == '.csv':
+        with open(path, newline='', encoding='utf-8') as f:
+            rows = [row for row in csv.reader(f) if len(row) >= 2]
+        # Skip a header row such as "text,resume"
+        if rows and rows[0][0].strip().lower() in ('text', 'text_file', 'text_name'):
+            rows = rows[1:]
+        pairs = [(row[0], row[1]) for row in rows]
+    else:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        if not isinstance(data, dict):
+            raise ValueError("Mapping JSON must be an object of text name -> resume name")
+        pairs = list(data.items())
+    return {Path(text.strip()).stem: Path(resume.strip()).stem for text, resume in pairs}
+
+
+def pair_resumes(text_paths: List[str], resume_paths: List[str],
+                 mapping: Optional[Dict[str, str]] = None) -> Dict[str, Optional[str]]:
+    """
+    Resume path for each text path (None when the text is not injected).
+
+    Raises:
+        ValueError: When the mapping names a resume that was not given
+    """
+    resumes = {Path(path).stem: path for path in resume_paths}
+    pairs = {}
+    for text_path in text_paths:
+        name = Path(text_path).stem
+        if mapping is not None:
+            resume_name = mapping.get(name)
+            if resume_name is not None and resume_name not in resumes:
+                raise ValueError(f"Mapping sends '{name}' to unknown resume '{resume_name}'")
+        elif len(resumes) == 1:
+            resume_name = next(iter(resumes))
+        else:
+            resume_name = name if name in resumes else None
+        pairs[text_path] = resumes.get(resume_name) if resume_name else None
+    return pairs
+
+
+class OutputSink:
+    """Writes finished outputs to a directory or a .zip archive as they arrive."""
+
+    def __init__(self, target: str):
+        self.target = Path(target)
+        self.is_zip = self.target.suffix.lower() == '.zip'
+        self._names = set()
+        self.files_written = 0
+        self.bytes_written = 0
+        if self.is_zip:
+            self.target.parent.mkdir(parents=True, exist_ok=True)
+            self._zip = zipfile.ZipFile(self.target, 'w', compression=zipfile.ZIP_DEFLATED)
+        else:
+            self.target.mkdir(parents=True, exist_ok=True)
+            self._zip = None
+
+    def _unique(self, filename: str) -> str:
+        # Same-named inputs from different directories must not overwrite each other
+        stem, suffix = os.path.splitext(filename)
+        candidate, counter = filename, 2
+        while candidate in self._names:
+            candidate = f"{stem}_{counter}{suffix}"
+            counter += 1
+        self._names.add(candidate)
+        return candidate
+
+    def write(self, filename: str, data: bytes) -> str:
+        filename = self._unique(filename)
+        if self._zip is not None:
+            self._zip.writestr(filename, data)
+        else:
+            (self.target / filename).write_bytes(data)
+        self.files_written += 1
+        self.bytes_written += len(data)
+        return filename
+
+    def close(self):
+        if self._zip is not None:
+            self._zip.close()
+            self._zip = None
+
+
+def run_extraction(text_paths: List[str], sink: OutputSink, points: int = 3, dedup: Optional[str] = None,
+                   formats: tuple = FORMATS, resume_pairs: Optional[Dict[str, Optional[str]]] = None,
+                   workers: Optional[int] = None, on_result=None) -> Dict:
+    """
+    Process files on `workers` processes (0 = in this process) and stream outputs to sink.
+
+    dedup is None, 'exact' / 'fuzzy' (duplicates dropped within each cycle) or
+    'global' (dropped across all cycles).
+
+    At most two tasks per worker are in flight, so memory stays bounded for
+    large batches. on_result(result) is called as each file finishes.
+
+    Returns:
+        Report dict with per-file results (without output bytes) and a throughput summary
+    """
+    resume_pairs = resume_pairs or {}
+    results = []
+
+    def collect(result: Dict):
+        written = [sink.write(filename, data) for filename, data in result.pop("outputs")]
+        result["written"] = written
+        results.append(result)
+        if on_result:
+            on_result(result)
+
+    wall_start = time.perf_counter()
+    if workers == 0:
+        for path in text_paths:
+            collect(_extract_in_worker(path, points, dedup, formats, resume_pairs.get(path)))
+    else:
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = set()
+            for path in text_paths:
+                pending.add(pool.submit(_extract_in_worker, path, points, dedup, formats,
+                                        resume_pairs.get(path)))
+                if len(pending) >= 2 * workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        collect(future.result())
+            for future in wait(pending).done:
+                collect(future.result())
+    wall = time.perf_counter() - wall_start
+
+    return {"summary": summarize(results, wall, sink), "results": results}
+
+
+def summarize(results: List[Dict], wall: float, sink: OutputSink) -> Dict:
+    stage_totals = {}
+    for result in results:
+        for stage, seconds in result["timings"].items():
+            stage_totals[stage] = stage_totals.get(stage, 0.0) + seconds
+    bytes_in = sum(r["bytes_in"] for r in results)
+
+    return {
+        "total_files": len(results),
+        "succeeded": sum(1 for r in results if not r["error"]),
+        "failed": sum(1 for r in results if r["error"]),
+        "injected": sum(1 for r in results if r["injected"]),
+        "outputs_written": sink.files_written,
+        "bytes_in": bytes_in,
+        "bytes_out": sink.bytes_written,
+        "wall_seconds": round(wall, 3),
+        "files_per_second": round(len(results) / wall, 2) if wall else 0.0,
+        "input_mb_per_second": round(bytes_in / wall / 1e6, 3) if wall else 0.0,
+        "stage_busy_seconds": {stage: round(total, 3) for stage, total in stage_totals.items()},
+    }
+
+
+def print_summary(summary: Dict, target: str):
+    print("\n" + "="*60)
+    print("📊 EXTRACTION RESULTS")
+    print("="*60)
+    print(f"Files: {summary['total_files']}  ✅ {summary['succeeded']}  ❌ {summary['failed']}  "
+          f"💉 {summary['injected']} injected")
+    print(f"Wall time: {summary['wall_seconds']:.2f}s  Throughput: {summary['files_per_second']:.2f} files/s "
+          f"({summary['input_mb_per_second']:.3f} MB/s in)")
+    for stage, seconds in summary["stage_busy_seconds"].items():
+        print(f"  {stage:<10} {seconds:>8.2f}s busy")
+    print(f"Outputs: {summary['outputs_written']} files, {summary['bytes_out'] / 1e6:.2f} MB → {target}")
+    print("="*60 + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="extract-points",
+                                     description="Extract points from text files without the UI")
+    parser.add_argument("inputs", nargs="+", help="Text files or globs (quote ** patterns)")
+    parser.add_argument("--out", required=True, help="Output directory, or a path ending in .zip")
+    parser.add_argument("--points", type=int, default=3, help="Points per heading per cycle")
+    parser.add_argument("--dedup", nargs="?", const="exact", choices=["exact", "fuzzy", "global"],
+                        help="Remove duplicate points within each cycle, or across cycles with "
+                             "'global' (default match: exact)")
+    parser.add_argument("--formats", default=",".join(FORMATS),
+                        help="Comma-separated outputs to write (txt,docx,pdf)")
+    parser.add_argument("--resumes", nargs="*", default=[], help="Resume templates (.docx) or globs")
+    parser.add_argument("--mapping", help="JSON or CSV mapping of text name -> resume name")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes (0 = run in this process, default = CPU count)")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    parser.add_argument("--quiet", action="store_true", help="Don't print a line per finished file")
+    parser.add_argument("--verbose", action="store_true", help="Show the processors' debug logging")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING)
+    if not args.verbose:
+        # The injectors log every point at DEBUG; workers inherit this when forked
+        logging.disable(logging.INFO)
+    formats = tuple(f.strip() for f in args.formats.split(",") if f.strip())
+    unknown = set(formats) - set(FORMATS)
+    if unknown:
+        parser.error(f"unknown format(s): {', '.join(sorted(unknown))}")
+    if args.points < 1:
+        parser.error("--points must be at least 1")
+
+    text_paths = expand_globs(args.inputs)
+    if not text_paths:
+        print("❌ No input files matched")
+        sys.exit(1)
+
+    resume_pairs = {}
+    if args.resumes or args.mapping:
+        resume_paths = expand_globs(args.resumes)
+        if not resume_paths:
+            print("❌ No resume files matched")
+            sys.exit(1)
+        try:
+            mapping = load_mapping(args.mapping) if args.mapping else None
+            resume_pairs = pair_resumes(text_paths, resume_paths, mapping)
+        except (OSError, ValueError) as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+
+    if not args.json:
+        print(f"\n🚀 Processing {len(text_paths)} files → {args.out}")
+
+    def report_file(result: Dict):
+        if args.quiet or args.json:
+            return
+        if result["error"]:
+            print(f"  ❌ {result['source']}: {result['error']}")
+        else:
+            print(f"  ✅ {result['source']} → {', '.join(result['written'])}")
+
+    sink = OutputSink(args.out)
+    try:
+        report = run_extraction(text_paths, sink, points=args.points, dedup=args.dedup, formats=formats,
+                                resume_pairs=resume_pairs, workers=args.workers, on_result=report_file)
+    finally:
+        sink.close()
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_summary(report["summary"], args.out)
+    sys.exit(1 if report["summary"]["failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,19 @@
 import streamlit as st
-from utils.text_processor import TextProcessor
-from utils.export_handler import ExportHandler
-from utils.batch_processor import BatchProcessor
-from utils.resume_injector import ResumeInjector
-from utils.batch_resume_injector import BatchResumeInjector
+from dotenv import load_dotenv
 from utils.validators import InputValidator, MessageFormatter
-from utils.deduplicator import PointDeduplicator
 from utils.persistence import SettingsPersistence, RecentUsedManager
-from utils.gemini_points_generator import GeminiPointsGenerator, PointsValidator
-from utils.cloud_storage_manager import get_cloud_storage_manager
-from utils.email_sender import get_email_sender
 import io
+import uuid
 import zipfile
 from pathlib import Path
-import pandas as pd
 import logging
 import os
 
+# Heavy dependencies (pandas, python-docx, reportlab, groq, cloud SDKs) are imported
+# where a tab first uses them, so the first render only pays for Streamlit itself.
+# Check with: python benchmark_startup.py
+load_dotenv()
+
 # Setup logging
 logger = logging.getLogger(__name__)
 
@@ -28,13 +25,140 @@ def get_neon_manager():
     db_url = os.getenv("DATABASE_URL")
     if not db_url:
         return None
-    return NeonResumeManager(db_url)
+    return NeonResumeManager(db_url, storage=os.getenv("RESUME_STORAGE", "local"))
+
+@st.cache_resource
+def get_processing_cache():
+    """Cache processed text and exports (keyed by input hash) for the app process"""
+    from utils.processing_cache import ProcessingCache
+    return ProcessingCache()
 
 @st.cache_resource
-def get_automation_workflow():
-    """Cache automation workflow for entire session"""
-    from automation_workflow import AutomationWorkflow
-    return AutomationWorkflow()
+def get_email_outbox():
+    """Cache the email outbox (and its worker threads) for the app process"""
+    from utils.email_outbox import EmailOutbox
+    outbox = EmailOutbox()
+    outbox.start()
+    return outbox
+
+@st.cache_resource
+def get_job_runner():
+    """Cache the background job runner (and its worker threads) for the app process"""
+    from utils.job_runner import JobRunner
+    from utils.app_jobs import register_app_jobs
+    runner = JobRunner()
+    register_app_jobs(runner, cache=get_processing_cache())
+    runner.start()
+    return runner
+
+def submit_job(session_key: str, kind: str, payload, wait: float = 2.0):
+    """Queue a background job and remember its ID in session state (identical input reuses an
+    in-flight job, and a finished one for deterministic kinds).
+
+    Waits briefly so quick jobs finish within this run; longer ones are polled by poll_job.
+    """
+    runner = get_job_runner()
+    job_id, _ = runner.submit(kind, payload)
+    st.session_state[session_key] = job_id
+    runner.wait(job_id, timeout=wait)
+
+def poll_job(session_key: str, label: str):
+    """Show status of the job stored under session_key; returns its result once, when it succeeds"""
+    job_id = st.session_state.get(session_key)
+    if not job_id:
+        return None
+    runner = get_job_runner()
+    job = runner.get(job_id)
+    if job is None:
+        del st.session_state[session_key]
+        return None
+
+    if job['state'] == 'succeeded':
+        del st.session_state[session_key]
+        return runner.result(job_id)
+
+    if job['state'] in ('queued', 'running'):
+        st.progress(job['progress'], text=f"⏳ {label}: {job['message'] or job['state']}")
+        if st.button("🔄 Refresh Status", key=f"{session_key}_refresh"):
+            st.rerun()
+    else:
+        st.error(f"❌ {label} {job['state']}: {job['error']}")
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button("🔁 Retry", key=f"{session_key}_retry", use_container_width=True):
+                runner.retry(job_id)
+                st.rerun()
+        with col2:
+            if st.button("✖️ Dismiss", key=f"{session_key}_dismiss", use_container_width=True):
+                del st.session_state[session_key]
+                st.rerun()
+    return None
+
+def render_batch_results(batch_state: dict, noun: str, zip_name: str, zip_key: str):
+    """Show Tab 2 results kept in session state (re-rendered on every rerun without reprocessing)"""
+    results = batch_state['results']
+    successful = sum(1 for r in results for filename, (text, _, _) in r.items() if not (isinstance(text, str) and text.startswith("Error")))
+    st.success(f"✅ Successfully processed {successful}/{len(results)} {noun}!")
+
+    # Display individual results
+    for result in results:
+        for filename, (text, docx, pdf) in result.items():
+            st.subheader(f"📄 {filename}")
+            if isinstance(text, str) and text.startswith("Error"):
+                st.error(text)
+            else:
+                st.text_area(
+                    "Processed Text",
+                    value=text,
+                    height=800,
+                    key=f"batch_{filename}",
+                    disabled=True
+                )
+                col1, col2 = st.columns(2)
+                with col1:
+                    if docx:
+                        st.download_button(
+                            label=f"📥 {filename}.docx",
+                            data=docx,
+                            file_name=f"{filename}.docx",
+                            mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+                            key=f"{filename}_docx",
+                            use_container_width=True
+                        )
+                with col2:
+                    if pdf:
+                        st.download_button(
+                            label=f"📄 {filename}.pdf",
+                            data=pdf,
+                            file_name=f"{filename}.pdf",
+                            mime="application/pdf",
+                            key=f"{filename}_pdf"
+                        )
+
+    # Create ZIP file for batch download (built once per result set)
+    if successful > 0:
+        st.subheader("Download All Results")
+        if batch_state.get('zip') is None:
+            zip_buffer = io.BytesIO()
+            with zipfile.ZipFile(zip_buffer, 'w') as zip_file:
+                for result in results:
+                    for filename, (text, docx, pdf) in result.items():
+                        # Only add successful results (docx/pdf are not None)
+                        if isinstance(text, str) and docx is not None and pdf is not None:
+                            zip_file.writestr(f"{filename}.txt", text)
+                            if docx:
+                                zip_file.writestr(f"{filename}.docx", docx)
+                            if pdf:
+                                zip_file.writestr(f"{filename}.pdf", pdf)
+            batch_state['zip'] = zip_buffer.getvalue()
+
+        st.download_button(
+            label="Download All Files (ZIP)",
+            data=batch_state['zip'],
+            file_name=zip_name,
+            mime="application/zip",
+            key=zip_key
+        )
 
 # ===========================================================
 
@@ -166,6 +290,19 @@ Heading 3
         with col3:
             dedup_enabled = st.checkbox("🔍 Remove Duplicates", value=st.session_state.settings.get('deduplication_enabled', False))
             st.session_state.settings.set('deduplication_enabled', dedup_enabled)
+            dedup_strictness = st.session_state.settings.get('deduplication_strictness', 'exact')
+            if dedup_enabled:
+                modes = ["exact", "fuzzy", "global"]
+                dedup_strictness = st.radio(
+                    "Match",
+                    modes,
+                    index=modes.index(dedup_strictness) if dedup_strictness in modes else 0,
+                    horizontal=True,
+                    help="Exact: same text ignoring case, per cycle. Fuzzy: near-identical wording "
+                         "(95% similar), per cycle. Global: same text anywhere in the output.",
+                    key="tab1_dedup_strictness"
+                )
+                st.session_state.settings.set('deduplication_strictness', dedup_strictness)
 
         # Process text when button is clicked
         if process_button and input_text:
@@ -177,8 +314,13 @@ Heading 3
                 else:
                     # Create a spinner to show processing status
                     with st.spinner('Processing text...'):
-                        processor = TextProcessor()
-                        processed_content = processor.process_text(input_text, points_per_heading)
+                        from utils.batch_processor import BatchProcessor
+                        
+                        # Cached by (input hash, points, dedup mode): repeats skip the pipeline
+                        pipeline = BatchProcessor(cache=get_processing_cache())
+                        result_key, processed_content = pipeline.process_text(
+                            input_text, points_per_heading, dedup_enabled, dedup_strictness
+                        )
 
                         if processed_content:
                             # Save to undo stack before modifying
@@ -186,83 +328,17 @@ Heading 3
                                 st.session_state.undo_stack.append(st.session_state.processed_text)
                                 st.session_state.redo_stack = []  # Clear redo stack on new operation
                             
-                            # Apply deduplication if enabled
                             if dedup_enabled:
-                                # Extract points from processed content and deduplicate
-                                lines = processed_content.split('\n')
-                                dedup_lines = []
-                                current_section_points = []
-                                
-                                for line in lines:
-                                    if line.strip().startswith('Cycle'):
-                                        # If we have accumulated points, deduplicate them
-                                        if current_section_points:
-                                            dedup_points = PointDeduplicator.deduplicate_points_exact(current_section_points)
-                                            dedup_lines.extend(dedup_points)
-                                            current_section_points = []
-                                        dedup_lines.append(line)
-                                    elif line.strip() and not line.strip().startswith(('Cycle', '=')):
-                                        current_section_points.append(line)
-                                    else:
-                                        if current_section_points:
-                                            dedup_points = PointDeduplicator.deduplicate_points_exact(current_section_points)
-                                            dedup_lines.extend(dedup_points)
-                                            current_section_points = []
-                                        if line.strip():
-                                            dedup_lines.append(line)
-                                
-                                # CRITICAL: Flush any remaining points at the end (especially Cycle 2+)
-                                if current_section_points:
-                                    dedup_points = PointDeduplicator.deduplicate_points_exact(current_section_points)
-                                    dedup_lines.extend(dedup_points)
-                                
-                                processed_content = '\n'.join(dedup_lines)
                                 st.info(f"🔍 Duplicates removed from output")
                             
                             st.session_state.processed_text = processed_content
+                            st.session_state.tab1_result_key = result_key
                             st.session_state.input_text = input_text  # Preserve input text
                             st.session_state.settings.add_to_history(f"Processed {len(input_text)} chars")
 
                             st.success("✅ Text processed successfully!")
-
-                            # Display processed output in a container
-                            with st.container():
-                                st.subheader("📊 Processed Output")
-                                st.text_area(
-                                    "Preview",
-                                value=processed_content,
-                                height=1000,
-                                key="processed_output"
-                            )
-
-                            # Export options
-                            st.subheader("Export Options")
-                            export_col1, export_col2, export_col3 = st.columns(3)
-
-                            with export_col1:
-                                if st.button("Copy to Clipboard"):
-                                    st.code(processed_content)
-                                    st.toast("Text ready to copy!")
-
-                            with export_col2:
-                                export_handler = ExportHandler()
-                                docx_file = export_handler.generate_docx(processed_content)
-                                st.download_button(
-                                    label="Download DOCX",
-                                    data=docx_file.getvalue(),
-                                    file_name="processed_text.docx",
-                                    mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-                                )
-
-                            with export_col3:
-                                pdf_file = export_handler.generate_pdf(processed_content)
-                                st.download_button(
-                                    label="Download PDF",
-                                    data=pdf_file.getvalue(),
-                                    file_name="processed_text.pdf",
-                                    mime="application/pdf"
-                                )
                         else:
+                            st.session_state.tab1_result_key = None
                             st.error("No output was generated. Please check your input format.")
 
             except ValueError as e:
@@ -283,6 +359,48 @@ Heading 2
                 with st.expander("Technical details"):
                     st.code(sanitized_error)
 
+        # Show the latest result on every rerun (download clicks don't redo the pipeline)
+        result_key = st.session_state.get('tab1_result_key')
+        if result_key and st.session_state.processed_text:
+            processed_content = st.session_state.processed_text
+            from utils.batch_processor import BatchProcessor
+            pipeline = BatchProcessor(cache=get_processing_cache())
+
+            # Display processed output in a container
+            with st.container():
+                st.subheader("📊 Processed Output")
+                st.text_area(
+                    "Preview",
+                value=processed_content,
+                height=1000,
+                key=f"processed_output_{result_key[:16]}"
+            )
+
+            # Export options
+            st.subheader("Export Options")
+            export_col1, export_col2, export_col3 = st.columns(3)
+
+            with export_col1:
+                if st.button("Copy to Clipboard"):
+                    st.code(processed_content)
+                    st.toast("Text ready to copy!")
+
+            with export_col2:
+                st.download_button(
+                    label="Download DOCX",
+                    data=pipeline.export_docx(result_key, processed_content),
+                    file_name="processed_text.docx",
+                    mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+                )
+
+            with export_col3:
+                st.download_button(
+                    label="Download PDF",
+                    data=pipeline.export_pdf(result_key, processed_content),
+                    file_name="processed_text.pdf",
+                    mime="application/pdf"
+                )
+
     with tab2:
         # Batch processing UI
         st.markdown("### 📦 Batch Text Processing")
@@ -331,103 +449,30 @@ Heading 2
             
             if st.button("🔄 Process Texts", use_container_width=True, key="batch_paste_button"):
                 if batch_paste_text.strip():
-                    with st.spinner('Processing texts...'):
-                        try:
-                            # Split texts by separator
-                            texts = batch_paste_text.split('\n---\n')
-                            texts = [t.strip() for t in texts if t.strip()]
-                            
-                            if not texts:
-                                st.error("❌ No valid text found. Make sure texts are separated by '---' on its own line.")
-                            else:
-                                # Create virtual file objects from texts
-                                class VirtualFile:
-                                    def __init__(self, name, content):
-                                        self.name = name
-                                        self.content = content
-                                    
-                                    def read(self):
-                                        return self.content.encode('utf-8')
-                                
-                                virtual_files = [
-                                    VirtualFile(f"text_{i+1}.txt", text) 
-                                    for i, text in enumerate(texts)
-                                ]
-                                
-                                # Process using batch processor
-                                batch_processor = BatchProcessor()
-                                results = batch_processor.process_files(virtual_files, points_per_heading_batch, dedup_enabled=batch_dedup)
-                                
-                                if results:
-                                    successful = sum(1 for r in results for filename, (text, _, _) in r.items() if not (isinstance(text, str) and text.startswith("Error")))
-                                    st.success(f"✅ Successfully processed {successful}/{len(results)} text(s)!")
-                                    
-                                    # Display individual results
-                                    for result in results:
-                                        for filename, (text, docx, pdf) in result.items():
-                                            st.subheader(f"📄 {filename}")
-                                            if isinstance(text, str) and text.startswith("Error"):
-                                                st.error(text)
-                                            else:
-                                                st.text_area(
-                                                    "Processed Text",
-                                                    value=text,
-                                                    height=800,
-                                                    key=f"batch_{filename}",
-                                                    disabled=True
-                                                )
-                                                col1, col2 = st.columns(2)
-                                                with col1:
-                                                    if docx:
-                                                        st.download_button(
-                                                            label=f"📥 {filename}.docx",
-                                                            data=docx,
-                                                            file_name=f"{filename}.docx",
-                                                            mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                                                            key=f"{filename}_docx",
-                                                            use_container_width=True
-                                                        )
-                                                with col2:
-                                                    if pdf:
-                                                        st.download_button(
-                                                            label=f"📄 {filename}.pdf",
-                                                            data=pdf,
-                                                            file_name=f"{filename}.pdf",
-                                                            mime="application/pdf",
-                                                            key=f"{filename}_pdf"
-                                                        )
-                                    
-                                    # Create ZIP file for batch download
-                                    if successful > 0:
-                                        st.subheader("Download All Results")
-                                        zip_buffer = io.BytesIO()
-                                        with zipfile.ZipFile(zip_buffer, 'w') as zip_file:
-                                            for result in results:
-                                                for filename, (text, docx, pdf) in result.items():
-                                                    if isinstance(text, str) and docx is not None and pdf is not None:
-                                                        zip_file.writestr(f"{filename}.txt", text)
-                                                        if docx:
-                                                            zip_file.writestr(f"{filename}.docx", docx)
-                                                        if pdf:
-                                                            zip_file.writestr(f"{filename}.pdf", pdf)
-                                        
-                                        st.download_button(
-                                            label="Download All Files (ZIP)",
-                                            data=zip_buffer.getvalue(),
-                                            file_name="processed_texts.zip",
-                                            mime="application/zip",
-                                            key="batch_paste_zip"
-                                        )
-                        
-                        except ValueError as e:
-                            st.error(f"❌ Format Error: {str(e)}")
-                            st.warning("Check that all texts contain properly formatted headings and bullet points.")
-                        except Exception as e:
-                            st.error(f"❌ Processing Failed: {type(e).__name__}")
-                            with st.expander("Technical details"):
-                                st.code(str(e))
+                    # Split texts by separator
+                    texts = batch_paste_text.split('\n---\n')
+                    texts = [t.strip() for t in texts if t.strip()]
+                    
+                    if not texts:
+                        st.error("❌ No valid text found. Make sure texts are separated by '---' on its own line.")
+                    else:
+                        # Processed in the background (cached per text); identical input reuses the job
+                        submit_job('batch_paste_job', 'batch_process', {
+                            'files': [(f"text_{i+1}.txt", text.encode('utf-8')) for i, text in enumerate(texts)],
+                            'points': points_per_heading_batch,
+                            'dedup': batch_dedup,
+                            'dedup_strictness': st.session_state.settings.get('deduplication_strictness', 'exact'),
+                        })
                 else:
                     st.warning("Please paste some text to process.")
+            
+            results = poll_job('batch_paste_job', "Processing texts")
+            if results is not None:
+                st.session_state.batch_results = {'mode': 'paste', 'results': results}
+            
+            batch_state = st.session_state.batch_results
+            if batch_state and batch_state['mode'] == 'paste' and batch_state['results']:
+                render_batch_results(batch_state, "text(s)", "processed_texts.zip", "batch_paste_zip")
         
         # ============ UPLOAD MODE ============
         else:
@@ -468,86 +513,22 @@ Heading 2
                     batch_dedup = st.checkbox("🔍 Remove Duplicates", value=st.session_state.settings.get('deduplication_enabled', False), key="batch_upload_dedup")
 
                     if st.button("🔄 Process Batch", use_container_width=True, key="batch_upload_button"):
-                        with st.spinner('Processing files...'):
-                            try:
-                                batch_processor = BatchProcessor()
-                                results = batch_processor.process_files(valid_files, points_per_heading_batch, dedup_enabled=batch_dedup)
-
-                                if results:
-                                    successful = sum(1 for r in results for filename, (text, _, _) in r.items() if not (isinstance(text, str) and text.startswith("Error")))
-                                    st.success(f"✅ Successfully processed {successful}/{len(results)} files!")
+                        submit_job('batch_upload_job', 'batch_process', {
+                            'files': [(file.name, file.getvalue()) for file in valid_files],
+                            'points': points_per_heading_batch,
+                            'dedup': batch_dedup,
+                            'dedup_strictness': st.session_state.settings.get('deduplication_strictness', 'exact'),
+                        })
 
-                                    # Display individual results
-                                    for result in results:
-                                        for filename, (text, docx, pdf) in result.items():
-                                            st.subheader(f"📄 {filename}")
-                                            if isinstance(text, str) and text.startswith("Error"):
-                                                st.error(text)
-                                            else:
-                                                st.text_area(
-                                                    "Processed Text",
-                                                    value=text,
-                                                    height=800,
-                                                    key=f"batch_{filename}",
-                                                    disabled=True
-                                                )
-                                                col1, col2 = st.columns(2)
-                                                with col1:
-                                                    if docx:
-                                                        st.download_button(
-                                                            label=f"📥 {filename}.docx",
-                                                            data=docx,
-                                                            file_name=f"{filename}.docx",
-                                                            mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                                                            key=f"{filename}_docx",
-                                                            use_container_width=True
-                                                        )
-                                                with col2:
-                                                    if pdf:
-                                                        st.download_button(
-                                                            label=f"📄 {filename}.pdf",
-                                                            data=pdf,
-                                                            file_name=f"{filename}.pdf",
-                                                            mime="application/pdf",
-                                                            key=f"{filename}_pdf"
-                                                        )
-
-                                    # Create ZIP file for batch download
-                                    if successful > 0:
-                                        st.subheader("Download All Results")
-                                        zip_buffer = io.BytesIO()
-                                        with zipfile.ZipFile(zip_buffer, 'w') as zip_file:
-                                            for result in results:
-                                                for filename, (text, docx, pdf) in result.items():
-                                                    # Only add successful results (docx/pdf are not None)
-                                                    if isinstance(text, str) and docx is not None and pdf is not None:
-                                                        # Add text file
-                                                        zip_file.writestr(f"{filename}.txt", text)
-                                                        # Add DOCX file
-                                                        if docx:
-                                                            zip_file.writestr(f"{filename}.docx", docx)
-                                                        # Add PDF file
-                                                        if pdf:
-                                                            zip_file.writestr(f"{filename}.pdf", pdf)
-
-                                        st.download_button(
-                                            label="Download All Files (ZIP)",
-                                            data=zip_buffer.getvalue(),
-                                            file_name="processed_files.zip",
-                                            mime="application/zip",
-                                            key="batch_upload_zip"
-                                        )
-                                else:
-                                    st.warning("No files were processed. Please check your input files.")
+                    results = poll_job('batch_upload_job', "Processing files")
+                    if results is not None:
+                        st.session_state.batch_results = {'mode': 'upload', 'results': results}
+                        if not results:
+                            st.warning("No files were processed. Please check your input files.")
 
-                            except ValueError as e:
-                                st.error(f"❌ Format Error: {str(e)}")
-                                st.warning("Check that all files contain properly formatted headings and bullet points.")
-                            except Exception as e:
-                                st.error(f"❌ Batch Processing Failed: {type(e).__name__}")
-                                st.info("Some files may have failed to process. Check file formats and try again.")
-                                with st.expander("Technical details"):
-                                    st.code(str(e))
+                    batch_state = st.session_state.batch_results
+                    if batch_state and batch_state['mode'] == 'upload' and batch_state['results']:
+                        render_batch_results(batch_state, "files", "processed_files.zip", "batch_upload_zip")
 
     with tab3:
         # Resume Template Injection UI
@@ -652,6 +633,7 @@ Heading 2
                 else:
                     resume_bytes = io.BytesIO(resume_file.read())
                     resume_bytes.seek(0)  # Reset stream position to beginning
+                    from utils.resume_injector import ResumeInjector
                     injector = ResumeInjector()
                     detected_bookmarks = injector.get_available_bookmarks(resume_bytes)
                     
@@ -729,15 +711,9 @@ Heading 2
                 )
                 if text_file:
                     try:
-                        file_content = text_file.read()  # Read once
-                        try:
-                            processed_text = file_content.decode('utf-8')
-                        except UnicodeDecodeError:
-                            # Try alternative encodings
-                            try:
-                                processed_text = file_content.decode('latin-1')
-                            except UnicodeDecodeError:
-                                processed_text = file_content.decode('utf-8', errors='replace')
+                        from utils.text_input import TextSource
+                        with TextSource.open(text_file, name=text_file.name) as source:
+                            processed_text = source.read_text()
                     except Exception as e:
                         st.error(f"❌ Error reading text file: {str(e)}")
                 else:
@@ -838,6 +814,7 @@ Heading 2
                                     })
                         
                         # Display as table
+                        import pandas as pd
                         preview_df = pd.DataFrame(preview_rows)
                         st.dataframe(preview_df, use_container_width=True)
                         
@@ -897,6 +874,7 @@ Heading 2
                             with st.spinner('Injecting points...'):
                                 try:
                                     resume_bytes.seek(0)
+                                    from utils.resume_injector import ResumeInjector
                                     injector = ResumeInjector()
                                     
                                     # Store current state for undo
@@ -996,8 +974,6 @@ Heading 2
         - ✅ View injection summary for each pair
         """)
         
-        batch_injector = BatchResumeInjector()
-        
         # Step 1: Upload multiple resume templates
         st.markdown("### Step 1: Upload Resume Templates")
         st.info("📌 Each resume should have bookmarks defined for injection")
@@ -1011,6 +987,8 @@ Heading 2
         
         batch_resumes_data = {}
         if resume_files:
+            from utils.batch_resume_injector import BatchResumeInjector
+            batch_injector = BatchResumeInjector()
             is_valid, error_msg, batch_resumes_data = batch_injector.validate_resume_files(resume_files)
             
             if not is_valid:
@@ -1108,6 +1086,7 @@ Heading 2
                     "→": "→",
                     "Resume File": resume_name
                 })
+            import pandas as pd
             summary_df = pd.DataFrame(summary_rows)
             st.dataframe(summary_df, use_container_width=True, hide_index=True)
             
@@ -1118,38 +1097,33 @@ Heading 2
             
             with col_inject:
                 if st.button("✨ Execute Batch Injection", type="primary", use_container_width=True):
-                    with st.spinner("Processing batch injection..."):
-                        try:
-                            # Reset stream positions
-                            for resume_info in batch_resumes_data.values():
-                                resume_info['bytes'].seek(0)
-                            
-                            results, errors = batch_injector.inject_batch(
-                                batch_texts_data,
-                                batch_resumes_data,
-                                mapping
-                            )
-                            
-                            # Store results in session state
-                            st.session_state.batch_injection_results = {
-                                'results': results,
-                                'errors': errors
-                            }
-                            
-                            st.success("✅ Batch injection completed!")
-                            
-                        except Exception as e:
-                            st.error(f"❌ Batch injection failed: {str(e)}")
-                            logger.error(f"Batch injection error: {str(e)}", exc_info=True)
+                    # Runs in the background; payload holds plain bytes/strings so it can be stored and hashed
+                    submit_job('batch_injection_job', 'batch_inject', {
+                        'texts': {
+                            name: {'content': info['content'], 'original_name': info['original_name']}
+                            for name, info in batch_texts_data.items()
+                        },
+                        'resumes': {
+                            name: {'bytes': info['bytes'].getvalue(), 'original_name': info['original_name']}
+                            for name, info in batch_resumes_data.items()
+                        },
+                        'mapping': mapping,
+                    })
             
             with col_reset:
                 if st.button("🔄 Clear & Start Over", use_container_width=True):
                     st.session_state.batch_injection_results = None
+                    st.session_state.pop('batch_injection_job', None)
                     st.session_state.batch_resumes = {}
                     st.session_state.batch_texts = {}
                     st.session_state.batch_mapping = {}
                     st.rerun()
             
+            injection_results = poll_job('batch_injection_job', "Batch injection")
+            if injection_results is not None:
+                st.session_state.batch_injection_results = injection_results
+                st.success("✅ Batch injection completed!")
+            
             # Step 5: Download results
             if st.session_state.batch_injection_results:
                 results = st.session_state.batch_injection_results['results']
@@ -1334,30 +1308,26 @@ Heading 2
             elif not job_title or not job_title.strip():
                 st.error("❌ Please provide a job title")
             else:
-                try:
-                    with st.spinner("🔄 Processing with Groq AI..."):
-                        # Initialize generator (will use .env API key)
-                        generator = GeminiPointsGenerator()
-                        
-                        # Generate points
-                        tech_stacks, generated_points = generator.process_job_description(
-                            job_description=job_description,
-                            job_title=job_title,
-                            num_points=num_points
-                        )
-                        
-                        # Store in session
-                        st.session_state.tab5_tech_stacks = tech_stacks
-                        st.session_state.tab5_generated_points = generated_points
-                        
-                        st.success("✅ Points generated successfully!")
-                
-                except ValueError as e:
-                    st.error(f"❌ Validation Error: {str(e)}")
-                except Exception as e:
-                    st.error(f"❌ Error: {str(e)}")
-                    with st.expander("Technical Details"):
-                        st.code(str(e))
+                # Generated in the background; each click asks the LLM again (only an
+                # identical request still in flight is shared)
+                submit_job('tab5_job', 'generate_points', {
+                    'job_description': job_description,
+                    'job_title': job_title,
+                    'num_points': num_points,
+                })
+        
+        generated = poll_job('tab5_job', "Generating points with Groq AI")
+        if generated is not None:
+            st.session_state.tab5_tech_stacks = generated['tech_stacks']
+            st.session_state.tab5_generated_points = generated['points']
+            st.success("✅ Points generated successfully!")
+            
+            usage = generated['usage']
+            st.caption(
+                f"🔢 Tokens: {usage['prompt_tokens']} prompt + {usage['completion_tokens']} completion "
+                f"across {usage['calls']} calls in {usage['total_latency_seconds']:.1f}s "
+                f"({usage['context_tokens_saved']} job description tokens trimmed)"
+            )
         
         # Display Results
         if st.session_state.tab5_tech_stacks and st.session_state.tab5_generated_points:
@@ -1391,6 +1361,7 @@ Heading 2
             
             with export_col2:
                 # Download as DOCX
+                from utils.export_handler import ExportHandler
                 export_handler = ExportHandler()
                 docx_file = export_handler.generate_docx(st.session_state.tab5_generated_points)
                 st.download_button(
@@ -1443,8 +1414,8 @@ Heading 2
         # Initialize session state for email tab
         if 'email_tab_resumes' not in st.session_state:
             st.session_state.email_tab_resumes = {}
-        if 'email_history' not in st.session_state:
-            st.session_state.email_history = []
+        if 'email_batches' not in st.session_state:
+            st.session_state.email_batches = []
         
         # Step 1: Select Cloud Storage Provider
         st.markdown("### Step 1️⃣ : Select Cloud Storage Provider")
@@ -1465,6 +1436,7 @@ Heading 2
         if st.button("🔄 Load Resumes from Cloud", use_container_width=True, key="load_cloud_resumes"):
             with st.spinner("Loading resumes from cloud storage..."):
                 try:
+                    from utils.cloud_storage_manager import get_cloud_storage_manager
                     storage_manager = get_cloud_storage_manager(cloud_provider)
                     resumes = storage_manager.list_files()
                     
@@ -1635,8 +1607,11 @@ Your Name""",
             elif email_provider == "outlook" and (not outlook_email or not outlook_password):
                 st.error("❌ Please enter Outlook email and password")
             else:
-                with st.spinner("Sending emails..."):
+                with st.spinner("Queueing emails..."):
                     try:
+                        from utils.cloud_storage_manager import get_cloud_storage_manager
+                        from utils.email_sender import get_email_sender
+                        
                         # Get email sender
                         if email_provider == "gmail":
                             sender = get_email_sender("gmail", 
@@ -1661,68 +1636,68 @@ Your Name""",
                             if not resume_content:
                                 st.error("❌ Failed to download resume from cloud storage")
                             else:
-                                # Send to each recipient
-                                success_count = 0
-                                failed_recipients = []
-                                
-                                progress_bar = st.progress(0)
-                                status_text = st.empty()
-                                
-                                for idx, recipient in enumerate(recipients):
-                                    status_text.text(f"Sending to {recipient} ({idx + 1}/{len(recipients)})...")
-                                    
-                                    # Download fresh copy of resume for each recipient
-                                    resume_content.seek(0)
-                                    
-                                    success = sender.send_email(
-                                        recipient=recipient,
-                                        subject=email_subject,
-                                        body=email_body,
-                                        attachments=[(resume_to_send, resume_content)]
-                                    )
-                                    
-                                    if success:
-                                        success_count += 1
-                                        st.session_state.email_history.append({
-                                            "recipient": recipient,
-                                            "resume": resume_to_send,
-                                            "timestamp": pd.Timestamp.now(),
-                                            "status": "Success"
-                                        })
-                                    else:
-                                        failed_recipients.append(recipient)
-                                        st.session_state.email_history.append({
-                                            "recipient": recipient,
-                                            "resume": resume_to_send,
-                                            "timestamp": pd.Timestamp.now(),
-                                            "status": "Failed"
-                                        })
-                                    
-                                    progress_bar.progress((idx + 1) / len(recipients))
-                                
-                                status_text.empty()
-                                progress_bar.empty()
+                                # Encode the message once; the outbox sends it in the background
+                                template = sender.create_template(
+                                    email_subject, email_body,
+                                    attachments=[(resume_to_send, resume_content)]
+                                )
+                                outbox = get_email_outbox()
+                                outbox.register_sender(email_provider, sender)
                                 
-                                # Results summary
-                                st.success(f"✅ Successfully sent to {success_count}/{len(recipients)} recipients")
+                                batch_id = uuid.uuid4().hex
+                                queued = outbox.enqueue_many(email_provider, template, recipients,
+                                                             batch_id=batch_id)
+                                st.session_state.email_batches.append(batch_id)
                                 
-                                if failed_recipients:
-                                    st.warning(f"⚠️ Failed to send to: {', '.join(failed_recipients)}")
+                                new_count = sum(1 for _, created in queued if created)
+                                st.success(f"✅ Queued {new_count}/{len(recipients)} email(s) - "
+                                           "they are sent in the background")
+                                if new_count < len(recipients):
+                                    st.info(f"ℹ️ {len(recipients) - new_count} recipient(s) already "
+                                            "received (or have queued) this exact email and were skipped")
                     
                     except Exception as e:
                         st.error(f"❌ Error sending emails: {str(e)}")
                         with st.expander("Technical Details"):
                             st.code(str(e))
         
-        # Email History
+        # Email History (live outbox status)
         st.markdown("### 📋 Email History")
-        if st.session_state.email_history:
-            history_df = pd.DataFrame(st.session_state.email_history)
-            st.dataframe(history_df, use_container_width=True)
+        if st.session_state.email_batches:
+            outbox = get_email_outbox()
+            latest = outbox.batch_status(st.session_state.email_batches[-1])
+            pending = latest['queued'] + latest['sending']
+            done = latest['total'] - pending
+            st.progress(done / latest['total'] if latest['total'] else 1.0)
+            st.caption(f"Latest send: {latest['sent']} sent, {pending} pending, "
+                       f"{latest['failed'] + latest['interrupted']} failed of {latest['total']}")
             
-            if st.button("🗑️ Clear History", use_container_width=True):
-                st.session_state.email_history = []
-                st.rerun()
+            history = outbox.list_messages(st.session_state.email_batches)
+            import pandas as pd
+            history_df = pd.DataFrame(history)
+            history_df['created_at'] = pd.to_datetime(history_df['created_at'], unit='s')
+            history_df['sent_at'] = pd.to_datetime(history_df['sent_at'], unit='s')
+            st.dataframe(
+                history_df[['id', 'recipient', 'provider', 'status', 'attempts',
+                            'last_error', 'created_at', 'sent_at']],
+                use_container_width=True
+            )
+            
+            col1, col2, col3 = st.columns([1, 1, 1])
+            with col1:
+                if st.button("🔄 Refresh Status", use_container_width=True):
+                    st.rerun()
+            with col2:
+                retryable = [m['id'] for m in history if m['status'] in ('failed', 'interrupted')]
+                if st.button(f"🔁 Retry Failed ({len(retryable)})", use_container_width=True,
+                             disabled=not retryable):
+                    for message_id in retryable:
+                        outbox.retry(message_id)
+                    st.rerun()
+            with col3:
+                if st.button("🗑️ Clear History", use_container_width=True):
+                    st.session_state.email_batches = []
+                    st.rerun()
         else:
             st.info("No emails sent yet")
     
@@ -1732,9 +1707,6 @@ Your Name""",
         **One-Click Automation:** Job Description → Auto-Select Resume → Generate Points → Inject → Download
         """)
         
-        # Use cached workflow (same instance for entire session)
-        workflow = get_automation_workflow()
-        
         # STEP 0: Resume Storage Location
         st.markdown("### 📂 Step 0: Resume Storage Location")
         
@@ -1863,15 +1835,17 @@ Your Name""",
                 
                 # Cache user resumes in session state
                 cache_key = f"neon_resumes_{user_email}"
+                cursor_key = f"neon_resumes_cursor_{user_email}"
                 if cache_key not in st.session_state or st.session_state.get('force_reload_neon', False):
-                    success, user_resumes = neon_mgr.get_user_resumes(user_email)
-                    st.session_state[cache_key] = user_resumes
+                    success, page = neon_mgr.list_resumes_page(user_email=user_email)
+                    st.session_state[cache_key] = page['resumes']
+                    st.session_state[cursor_key] = page['next_cursor']
                     st.session_state.force_reload_neon = False
-                else:
-                    user_resumes = st.session_state[cache_key]
+                user_resumes = st.session_state[cache_key]
                 
                 if user_resumes:
-                    st.success(f"✅ You have {len(user_resumes)} resume(s) in database")
+                    more = "+" if st.session_state.get(cursor_key) else ""
+                    st.success(f"✅ You have {len(user_resumes)}{more} resume(s) in database")
                     
                     with st.expander("View Your Resumes", expanded=True):
                         for resume in user_resumes:
@@ -1903,33 +1877,47 @@ Your Name""",
                                         st.rerun()
                                     else:
                                         st.error(msg)
+                        
+                        if st.session_state.get(cursor_key):
+                            if st.button("⏬ Load more", key="neon_load_more"):
+                                success, page = neon_mgr.list_resumes_page(
+                                    user_email=user_email, cursor=st.session_state[cursor_key]
+                                )
+                                if success:
+                                    st.session_state[cache_key] = user_resumes + page['resumes']
+                                    st.session_state[cursor_key] = page['next_cursor']
+                                    st.rerun()
                 else:
                     st.info("No resumes yet. Upload your first resume below!")
                 
                 # Upload new resume
                 st.markdown("#### ⬆️ Upload New Resume")
                 
-                uploaded_file = st.file_uploader(
-                    "Choose a resume file",
+                uploaded_files = st.file_uploader(
+                    "Choose resume files",
                     type=["docx"],
+                    accept_multiple_files=True,
                     key="neon_resume_upload"
                 )
                 
-                if uploaded_file:
+                if uploaded_files:
                     if st.button("💾 Save to Neon Database", use_container_width=True, key="neon_save_button"):
-                        with st.spinner("Uploading to database..."):
-                            success, msg = neon_mgr.upload_resume(
-                                uploaded_file,
-                                uploaded_file.name,
-                                user_email
+                        with st.spinner(f"Uploading {len(uploaded_files)} resume(s) to database..."):
+                            success, report = neon_mgr.bulk_upload_resumes(
+                                [(f.name, f.getvalue()) for f in uploaded_files],
+                                user_email,
+                                parse_workers=0
                             )
                             
                             if success:
                                 st.session_state.force_reload_neon = True
-                                st.success(f"✅ {msg}")
+                                st.success(
+                                    f"✅ Stored {report['rows']} resume(s) in {report['seconds']:.2f}s "
+                                    f"({report['rows_per_sec']:.0f} rows/s)"
+                                )
                                 st.rerun()
                             else:
-                                st.error(f"❌ {msg}")
+                                st.error(f"❌ Error: {report.get('error')}")
             else:
                 st.warning("⚠️ Enter your email to get started")
         
@@ -1961,7 +1949,14 @@ Your Name""",
                 st.metric("Users", stats.get('total_users', 0))
             with col3:
                 st.metric("Applications", stats.get('total_jobs', 0))
-            
+
+            pool = neon_mgr.pool_metrics()
+            st.caption(
+                f"🔌 DB pool: {pool['in_use']}/{pool['max_size']} in use, {pool['idle']} idle · "
+                f"{pool['checkouts']} checkouts · avg wait {pool['avg_wait_ms']} ms · "
+                f"{pool['rollbacks']} rollbacks · {pool['reconnects']} reconnects"
+            )
+
             if stats.get('total_resumes', 0) == 0:
                 st.error("❌ No resumes in database!")
                 st.info("💡 Upload your resume above first")
@@ -1977,7 +1972,8 @@ Your Name""",
         else:
             # Show local/cloud catalog statistics (cached in session)
             if 'catalog_summary' not in st.session_state:
-                st.session_state.catalog_summary = workflow.catalog.get_catalog_summary()
+                from utils.resume_catalog import ResumeCatalog
+                st.session_state.catalog_summary = ResumeCatalog().get_catalog_summary()
             
             summary = st.session_state.catalog_summary
             
@@ -2013,6 +2009,11 @@ Your Name""",
         )
         
         recruiter_email = st.text_input("Recruiter Email", placeholder="recruiter@company.com")
+        skip_sent_points = st.checkbox(
+            "🔁 Skip repeated points",
+            value=False,
+            help="Drop points repeated across technologies and points already sent to this recruiter"
+        )
         
         # Optional message
         st.markdown("### 💬 Personalized Message (Optional)")
@@ -2031,60 +2032,66 @@ Your Name""",
             elif not recruiter_email or '@' not in recruiter_email:
                 st.error("❌ Invalid email address")
             else:
-                with st.spinner("🔄 Processing..."):
-                    try:
-                        # Run workflow
-                        success, result = workflow.run_workflow(
-                            job_description=job_description,
-                            job_title=job_title,
-                            points_per_tech=points_per_tech,
-                            recruiter_email=recruiter_email,
-                            personal_message=personal_message
-                        )
-                        
-                        if success:
-                            st.success("✅ Automation Completed!")
-                            
-                            # Show results
-                            col1, col2, col3 = st.columns(3)
-                            with col1:
-                                st.metric("Selected Resume", result['selected_resume']['name'].split('.')[0])
-                            with col2:
-                                st.metric("Match Score", f"{result['match_score']:.0f}%")
-                            with col3:
-                                st.metric("Points Injected", 8)
-                            
-                            # Download button
-                            resume_path = result['resume_file_path']
-                            with open(resume_path, 'rb') as f:
-                                st.download_button(
-                                    label="📥 Download Updated Resume",
-                                    data=f.read(),
-                                    file_name=Path(resume_path).name,
-                                    mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                                    use_container_width=True
-                                )
-                            
-                            # Show what was generated
-                            st.markdown("### 📊 Generated Points Preview")
-                            with st.expander("View Generated Points"):
-                                st.text(result['generated_text'][:500] + "...")
-                            
-                            # Show execution log
-                            with st.expander("📋 Execution Log"):
-                                if result.get('log_file'):
-                                    import json
-                                    with open(result['log_file'], 'r') as f:
-                                        log_data = json.load(f)
-                                        for step in log_data:
-                                            st.write(f"**{step['step']}:** {step['status']}")
-                        else:
-                            st.error("❌ Automation failed")
-                            for error in result.get('errors', []):
-                                st.error(f"  - {error}")
-                    
-                    except Exception as e:
-                        st.error(f"❌ Error: {str(e)}")
+                # Runs in the background (one automation at a time); retrying a failed run
+                # resumes from its checkpoints, rerunning a finished one starts a new run
+                submit_job('tab7_job', 'workflow', {
+                    'job_description': job_description,
+                    'job_title': job_title,
+                    'points_per_tech': points_per_tech,
+                    'recruiter_email': recruiter_email,
+                    'personal_message': personal_message,
+                    'global_dedup': skip_sent_points,
+                    'rerun_completed': True,
+                })
+        
+        workflow_result = poll_job('tab7_job', "Automation")
+        if workflow_result is not None:
+            st.session_state.tab7_workflow_result = workflow_result
+        
+        if st.session_state.get('tab7_workflow_result'):
+            result = st.session_state.tab7_workflow_result
+            st.success("✅ Automation Completed!")
+            if result.get('run_id'):
+                st.caption(
+                    f"Run ID: {result['run_id']}"
+                    + (f" (resumed at: {result['resumed_from']})" if result.get('resumed_from') not in (None, 'match') else "")
+                )
+            
+            # Show results
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Selected Resume", result['selected_resume']['name'].split('.')[0])
+            with col2:
+                st.metric("Match Score", f"{result['match_score']:.0f}%")
+            with col3:
+                st.metric("Points Injected", 8)
+            
+            # Download button
+            resume_path = result['resume_file_path']
+            with open(resume_path, 'rb') as f:
+                st.download_button(
+                    label="📥 Download Updated Resume",
+                    data=f.read(),
+                    file_name=Path(resume_path).name,
+                    mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+                    use_container_width=True
+                )
+            
+            # Show what was generated
+            st.markdown("### 📊 Generated Points Preview")
+            with st.expander("View Generated Points"):
+                st.text(result['generated_text'][:500] + "...")
+            
+            # Show execution log
+            with st.expander("📋 Execution Log"):
+                if result.get('log_file'):
+                    import json
+                    with open(result['log_file'], 'r') as f:
+                        log_data = json.load(f)
+                        for step in log_data['steps']:
+                            duration = f" ({step['duration_ms']:.0f} ms)" if 'duration_ms' in step else ""
+                            st.write(f"**{step['step']}:** {step['status']}{duration}")
+                        st.code("\n".join(log_data['summary_table']))
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
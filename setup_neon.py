@@ -48,6 +48,23 @@ try:
         )
     """)
     
+    # Create resume_blobs table (DOCX bytes deduplicated by SHA-256 when
+    # NeonResumeManager uses storage="database")
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS resume_blobs (
+            sha256 CHAR(64) PRIMARY KEY,
+            size INT NOT NULL,
+            content BYTEA NOT NULL,
+            created_at TIMESTAMP DEFAULT NOW()
+        )
+    """)
+    # DOCX is already zip-compressed; uncompressed TOAST lets substring() read chunks
+    cur.execute("ALTER TABLE resume_blobs ALTER COLUMN content SET STORAGE EXTERNAL")
+    cur.execute("""
+        ALTER TABLE resumes
+        ADD COLUMN IF NOT EXISTS content_hash CHAR(64) REFERENCES resume_blobs(sha256)
+    """)
+    
     # Create resume_versions table
     cur.execute("""
         CREATE TABLE IF NOT EXISTS resume_versions (
@@ -75,20 +92,99 @@ try:
         )
     """)
     
-    # Create indexes
+    # Create indexes (keyset pagination on (created_at, id) and @> technology search)
     cur.execute("""
         CREATE INDEX IF NOT EXISTS idx_resumes_user_id ON resumes(user_id);
         CREATE INDEX IF NOT EXISTS idx_resumes_filename ON resumes(filename);
+        CREATE INDEX IF NOT EXISTS idx_resumes_created_id ON resumes(created_at DESC, id DESC)
+            WHERE deleted_at IS NULL;
+        CREATE INDEX IF NOT EXISTS idx_resumes_user_created_id ON resumes(user_id, created_at DESC, id DESC)
+            WHERE deleted_at IS NULL;
+        CREATE INDEX IF NOT EXISTS idx_resumes_technologies ON resumes USING GIN (technologies);
         CREATE INDEX IF NOT EXISTS idx_job_apps_user_id ON job_applications(user_id);
         CREATE INDEX IF NOT EXISTS idx_job_apps_created ON job_applications(created_at);
     """)
     
+    # Row counters for the dashboard, kept current by statement-level triggers
+    # (one counter UPDATE per statement, so bulk inserts stay cheap)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS table_counters (
+            name VARCHAR(50) PRIMARY KEY,
+            value BIGINT NOT NULL DEFAULT 0
+        )
+    """)
+    cur.execute("""
+        CREATE OR REPLACE FUNCTION count_inserted_rows() RETURNS TRIGGER AS $$
+        BEGIN
+            UPDATE table_counters SET value = value + (SELECT COUNT(*) FROM new_rows)
+            WHERE name = TG_ARGV[0];
+            RETURN NULL;
+        END $$ LANGUAGE plpgsql;
+        
+        CREATE OR REPLACE FUNCTION count_deleted_rows() RETURNS TRIGGER AS $$
+        BEGIN
+            UPDATE table_counters SET value = value - (SELECT COUNT(*) FROM old_rows)
+            WHERE name = TG_ARGV[0];
+            RETURN NULL;
+        END $$ LANGUAGE plpgsql;
+        
+        -- Active resumes: not soft-deleted
+        CREATE OR REPLACE FUNCTION count_active_resumes() RETURNS TRIGGER AS $$
+        DECLARE
+            delta BIGINT := 0;
+        BEGIN
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                delta := delta + (SELECT COUNT(*) FROM new_rows WHERE deleted_at IS NULL);
+            END IF;
+            IF TG_OP IN ('DELETE', 'UPDATE') THEN
+                delta := delta - (SELECT COUNT(*) FROM old_rows WHERE deleted_at IS NULL);
+            END IF;
+            IF delta <> 0 THEN
+                UPDATE table_counters SET value = value + delta WHERE name = 'total_resumes';
+            END IF;
+            RETURN NULL;
+        END $$ LANGUAGE plpgsql;
+    """)
+    for table, counter in (("users", "total_users"), ("job_applications", "total_jobs")):
+        cur.execute(f"""
+            DROP TRIGGER IF EXISTS {table}_count_insert ON {table};
+            CREATE TRIGGER {table}_count_insert AFTER INSERT ON {table}
+                REFERENCING NEW TABLE AS new_rows
+                FOR EACH STATEMENT EXECUTE FUNCTION count_inserted_rows('{counter}');
+            DROP TRIGGER IF EXISTS {table}_count_delete ON {table};
+            CREATE TRIGGER {table}_count_delete AFTER DELETE ON {table}
+                REFERENCING OLD TABLE AS old_rows
+                FOR EACH STATEMENT EXECUTE FUNCTION count_deleted_rows('{counter}');
+        """)
+    cur.execute("""
+        DROP TRIGGER IF EXISTS resumes_count_insert ON resumes;
+        CREATE TRIGGER resumes_count_insert AFTER INSERT ON resumes
+            REFERENCING NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION count_active_resumes();
+        DROP TRIGGER IF EXISTS resumes_count_update ON resumes;
+        CREATE TRIGGER resumes_count_update AFTER UPDATE ON resumes
+            REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION count_active_resumes();
+        DROP TRIGGER IF EXISTS resumes_count_delete ON resumes;
+        CREATE TRIGGER resumes_count_delete AFTER DELETE ON resumes
+            REFERENCING OLD TABLE AS old_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION count_active_resumes();
+    """)
+    # Seed (or re-sync) the counters with exact counts
+    cur.execute("""
+        INSERT INTO table_counters (name, value) VALUES
+            ('total_resumes', (SELECT COUNT(*) FROM resumes WHERE deleted_at IS NULL)),
+            ('total_users', (SELECT COUNT(*) FROM users)),
+            ('total_jobs', (SELECT COUNT(*) FROM job_applications))
+        ON CONFLICT (name) DO UPDATE SET value = EXCLUDED.value
+    """)
+    
     conn.commit()
     cur.close()
     conn.close()
     
     print("✅ Neon database setup complete!")
-    print("✅ Tables created: users, resumes, resume_versions, job_applications")
+    print("✅ Tables created: users, resumes, resume_blobs, resume_versions, job_applications, table_counters")
     print("\nYour database is ready to use!")
     print("DATABASE_URL:", DATABASE_URL.split("@")[1][:50] + "...")
     
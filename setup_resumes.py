@@ -1,13 +1,50 @@
 """
 Setup helper script - Initialize resume catalog with existing resumes
-Usage: python setup_resumes.py
+Usage: python setup_resumes.py [--neon-email you@example.com]
 """
 
+import argparse
 import os
 from pathlib import Path
 from utils.resume_catalog import ResumeCatalog
 
+
+def upload_to_neon(catalog: ResumeCatalog, user_email: str):
+    """Bulk upload every local catalog resume to Neon in one transaction"""
+    from dotenv import load_dotenv
+    from utils.neon_resume_manager import NeonResumeManager
+    
+    load_dotenv()
+    db_url = os.getenv("DATABASE_URL")
+    if not db_url:
+        print("\n❌ DATABASE_URL not found in .env - skipping Neon upload")
+        return
+    
+    files = []
+    for resume in catalog.list_resumes():
+        if resume.get('path') and Path(resume['path']).exists():
+            files.append((Path(resume['path']).name, Path(resume['path']).read_bytes()))
+    
+    print(f"\n☁️  Uploading {len(files)} resume(s) to Neon for {user_email}...")
+    mgr = NeonResumeManager(db_url)
+    try:
+        success, report = mgr.bulk_upload_resumes(files, user_email)
+    finally:
+        mgr.close()
+    
+    if success:
+        print(f"  ✅ Inserted {report['rows']} rows in {report['seconds']:.2f}s "
+              f"({report['rows_per_sec']:.0f} rows/s; parse {report['parse_seconds']:.2f}s, "
+              f"insert {report['insert_seconds']:.2f}s)")
+    else:
+        print(f"  ❌ Upload failed: {report.get('error')}")
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Initialize the resume catalog")
+    parser.add_argument("--neon-email", help="Also bulk upload local resumes to Neon for this user")
+    args = parser.parse_args()
+    
     print("\n" + "="*60)
     print("📋 RESUME CATALOG SETUP")
     print("="*60)
@@ -44,6 +81,9 @@ def main():
         print("\nPlease add resume files with format: PersonName_Tech1_Tech2.docx")
         print("Example: Arjun_Python_Django_PostgreSQL.docx")
     
+    if args.neon_email and summary['local_resumes'] > 0:
+        upload_to_neon(catalog, args.neon_email)
+    
     print("\n✅ Setup complete!")
     print("="*60 + "\n")
 
@@ -0,0 +1,149 @@
+"""
+Test the headless HTTP API (no network beyond localhost; server runs in-process)
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import http.client
+import json
+import socket
+import threading
+import time
+
+import api_server
+from api_server import ApiServer
+from benchmark_api import SAMPLE_RESUME, SAMPLE_TEXT, _multipart, run_load
+
+
+def request(port, method, path, body=b"", headers=None):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    try:
+        conn.request(method, path, body=body, headers=headers or {})
+        response = conn.getresponse()
+        return response.status, response.getheader("Content-Type"), response.read()
+    finally:
+        conn.close()
+
+
+def test_endpoints_round_trip():
+    server = ApiServer(workers=2)
+    port = server.start_in_thread()
+    try:
+        status, content_type, body = request(port, "POST", "/process?points=2", SAMPLE_TEXT.encode())
+        assert status == 200 and content_type.startswith("text/plain")
+        processed = body.decode()
+        assert processed.startswith("Cycle 1:")
+
+        status, _, body = request(port, "POST", "/process?points=2&format=pdf", SAMPLE_TEXT.encode())
+        assert status == 200 and body[:4] == b"%PDF"
+
+        status, _, body = request(port, "POST", "/dedup", b"Built APIs\nbuilt apis \nShipped UI\n")
+        assert body.decode().splitlines() == ["Built APIs", "Shipped UI"]
+
+        status, content_type, body = request(port, "POST", "/export?format=docx", processed.encode())
+        assert status == 200 and "wordprocessingml" in content_type and body[:2] == b"PK"
+
+        resume = SAMPLE_RESUME.read_bytes()
+        status, _, body = request(port, "POST", "/bookmarks", resume)
+        bookmarks = json.loads(body)["bookmarks"]
+        print(f"   Bookmarks: {bookmarks}")
+        assert status == 200 and bookmarks
+
+        content_type, form = _multipart({"resume": ("resume.docx", resume), "text": (None, processed.encode())})
+        status, _, body = request(port, "POST", "/inject", form, {"Content-Type": content_type})
+        assert status == 200 and body[:2] == b"PK" and body != resume
+
+        status, _, body = request(port, "POST", "/match", json.dumps({
+            "job_description": "Java developer", "technologies": ["Java"], "top_n": 2
+        }).encode())
+        ranked = json.loads(body)["resumes"]
+        assert status == 200 and len(ranked) <= 2
+        assert ranked == sorted(ranked, key=lambda r: r["score"], reverse=True)
+    finally:
+        server.stop_thread()
+
+
+def test_errors_chunked_bodies_and_limits():
+    server = ApiServer(workers=1, max_body=1024)
+    port = server.start_in_thread()
+    try:
+        assert request(port, "GET", "/nope")[0] == 404
+        assert request(port, "GET", "/process")[0] == 405
+        assert request(port, "POST", "/process?points=99", b"x")[0] == 400
+        assert request(port, "POST", "/match", b"not json")[0] == 400
+        status, _, body = request(port, "POST", "/process", b"x" * 2048)
+        assert status == 413 and b"larger than" in body
+
+        # Chunked request body, then a second request on the same keep-alive connection
+        with socket.create_connection(("127.0.0.1", port), timeout=10) as sock:
+            chunks = [SAMPLE_TEXT[:40].encode(), SAMPLE_TEXT[40:].encode()]
+            payload = b"".join(f"{len(c):x}\r\n".encode() + c + b"\r\n" for c in chunks) + b"0\r\n\r\n"
+            sock.sendall(b"POST /process HTTP/1.1\r\nHost: x\r\nTransfer-Encoding: chunked\r\n\r\n" + payload)
+            sock.sendall(b"GET /health HTTP/1.1\r\nHost: x\r\n\r\n")
+            received = b""
+            while received.count(b"HTTP/1.1 200") < 2 or not received.rstrip().endswith(b"}"):
+                received += sock.recv(65536)
+        assert b"Cycle 1:" in received
+        assert json.loads(received[received.rindex(b"\r\n\r\n") + 4:])["requests"] >= 2
+    finally:
+        server.stop_thread()
+
+
+def test_worker_concurrency_is_bounded_and_overflow_gets_503():
+    server = ApiServer(workers=2, max_queue=1)
+    port = server.start_in_thread()
+    release = threading.Event()
+    running = []
+    peak = []
+    original = api_server.dedup_points
+
+    def slow_dedup(text, mode, threshold):
+        running.append(1)
+        peak.append(len(running))
+        release.wait(10)
+        running.pop()
+        return b"ok"
+
+    api_server.dedup_points = slow_dedup
+    results = []
+    try:
+        threads = [threading.Thread(target=lambda: results.append(request(port, "POST", "/dedup", b"a")[0]))
+                   for _ in range(5)]
+        for thread in threads:
+            thread.start()
+            time.sleep(0.05)
+        time.sleep(0.3)
+        release.set()
+        for thread in threads:
+            thread.join(10)
+    finally:
+        api_server.dedup_points = original
+        server.stop_thread()
+
+    print(f"   Statuses: {sorted(results)}")
+    assert max(peak) == 2
+    assert sorted(results) == [200, 200, 200, 503, 503]
+
+
+def test_load_test_reports_throughput_and_p99():
+    server = ApiServer(workers=2)
+    port = server.start_in_thread()
+    try:
+        report = run_load(f"http://127.0.0.1:{port}", clients=4, duration=1.0, mix=["process", "dedup", "match"])
+    finally:
+        server.stop_thread()
+    print(f"   {report['requests_per_second']} req/s, p99 {report['latency']['p99_ms']} ms")
+    assert report["requests"] > 0 and report["transport_errors"] == 0
+    assert set(report["statuses"]) == {200}
+    assert report["latency"]["p99_ms"] >= report["latency"]["p50_ms"]
+
+
+if __name__ == "__main__":
+    test_endpoints_round_trip()
+    test_errors_chunked_bodies_and_limits()
+    test_worker_concurrency_is_bounded_and_overflow_gets_503()
+    test_load_test_reports_throughput_and_p99()
+    print("✅ API server tests passed")
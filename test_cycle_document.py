@@ -0,0 +1,96 @@
+"""
+Test the structured cycle document shared by processing, export and injection (no network)
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import io
+import pickle
+
+from docx import Document
+
+from benchmark_api import SAMPLE_TEXT
+from utils.cycle_document import CycleDocument
+from utils.export_handler import ExportHandler
+from utils.processing_cache import ProcessingCache
+from utils.resume_injector import ResumeInjector
+from utils.text_processor import TextProcessor
+
+SAMPLE_RESUME = Path(__file__).parent / "resumes_uploaded" / "Java.docx"
+
+SAMPLE = """Heading 1
+• Point 1
+- Point 2
+3. Point 3
+
+Heading 2
+• Item A
+• Item B"""
+
+
+def test_document_renders_cycle_text_and_parses_back():
+    processor = TextProcessor()
+    document = processor.build_cycles(SAMPLE, 2)
+    text = document.render()
+    print(f"   {document!r}:\n{text}")
+    assert text == processor.process_text(SAMPLE, 2)
+    assert text.splitlines() == ["Cycle 1:", "Point 1", "Point 2", "Item A", "Item B",
+                                 "Cycle 2:", "Point 3"]
+    assert document.points_by_cycle() == {1: ["Point 1", "Point 2", "Item A", "Item B"], 2: ["Point 3"]}
+    assert TextProcessor.cycle_points(text) == document.all_points()
+
+    assert CycleDocument.parse(text) == document
+    assert CycleDocument.parse("Intro\n\nCycle 1:\n  Point 1  \n") == CycleDocument.parse("Cycle 1:\nPoint 1")
+    assert pickle.loads(pickle.dumps(document)) == document
+    assert document.nbytes == len(text.encode("utf-8"))
+
+    cache = ProcessingCache()
+    cache.get_or_process("k", lambda: document)
+    assert cache.nbytes == document.nbytes
+    # Exports of a cached entry render from the document, whatever text is passed
+    assert cache.get_export("k", "docx", "ignored", lambda doc: str(doc).encode()) == text.encode()
+
+
+def test_exports_match_between_document_and_text():
+    handler = ExportHandler()
+    document = TextProcessor().build_cycles(SAMPLE_TEXT, 2)
+
+    def paragraphs(output):
+        return [(p.style.name, p.text) for p in Document(output).paragraphs]
+
+    from_document = paragraphs(handler.generate_docx(document))
+    assert from_document == paragraphs(handler.generate_docx(document.render()))
+    assert from_document[0] == ("Heading 1", "Cycle 1:")
+    assert handler.generate_pdf(document).getvalue()[:4] == b"%PDF"
+
+
+def test_injector_uses_document_points_without_reparsing():
+    injector = ResumeInjector()
+    long_points = TextProcessor().build_cycles(SAMPLE_TEXT, 2)
+    assert injector.extract_points_by_heading(long_points.render()) == (long_points.points_by_cycle(),
+                                                                        long_points.all_points())
+
+    # Short points are only recognized heuristically in text; a document carries them as points
+    short_points = TextProcessor().build_cycles(SAMPLE, 2)
+    resume = SAMPLE_RESUME.read_bytes()
+    try:
+        injector.inject_points_into_resume(io.BytesIO(resume), short_points.render())
+    except Exception as e:
+        assert "No points found" in str(e)
+    else:
+        raise AssertionError("expected an injection error")
+
+    output, injections = injector.inject_points_into_resume(io.BytesIO(resume), short_points)
+    print(f"   Injections: {injections}")
+    assert sum(injections.values()) == len(short_points.all_points())
+    assert "Item A" in "\n".join(p.text for p in Document(output).paragraphs)
+
+
+if __name__ == "__main__":
+    test_document_renders_cycle_text_and_parses_back()
+    test_exports_match_between_document_and_text()
+    test_injector_uses_document_points_without_reparsing()
+    print("✅ Cycle document tests passed")
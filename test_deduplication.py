@@ -0,0 +1,81 @@
+"""
+Test duplicate removal during cycle construction (no network)
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from test_processing_cache import NamedText
+from utils.batch_processor import BatchProcessor
+from utils.deduplicator import DedupFilter, PointDeduplicator
+from utils.processing_cache import ProcessingCache
+from utils.text_processor import TextProcessor
+
+SAMPLE = """Java
+• Built REST APIs with Spring Boot
+• Tuned JVM garbage collection
+
+AWS
+• built rest apis with spring boot
+• Built REST APIs with Spring Boot on AWS Lambda
+
+Docker
+• Built  REST APIs with   Spring Boot
+• Tuned JVM garbage collection"""
+
+
+def test_exact_and_fuzzy_modes_drop_duplicates_within_each_cycle():
+    processor = TextProcessor()
+    plain = processor.process_text(SAMPLE, 1)
+    exact = processor.process_text(SAMPLE, 1, dedup='exact')
+    fuzzy = processor.process_text(SAMPLE, 1, dedup='fuzzy', similarity_threshold=0.8)
+    print(f"   Exact:\n{exact}\n   Fuzzy:\n{fuzzy}")
+
+    assert plain.count("\n") == 7
+    # Case-insensitive copy removed; the extra spaces only match fuzzily
+    assert exact.splitlines() == [
+        "Cycle 1:", "Built REST APIs with Spring Boot", "Built  REST APIs with   Spring Boot",
+        "Cycle 2:", "Tuned JVM garbage collection", "Built REST APIs with Spring Boot on AWS Lambda",
+    ]
+    assert fuzzy.splitlines() == [
+        "Cycle 1:", "Built REST APIs with Spring Boot",
+        "Cycle 2:", "Tuned JVM garbage collection", "Built REST APIs with Spring Boot on AWS Lambda",
+    ]
+
+    try:
+        processor.process_text(SAMPLE, 1, dedup='semantic')
+    except ValueError as e:
+        assert "semantic" in str(e)
+    else:
+        raise AssertionError("expected ValueError")
+
+
+def test_filter_matches_list_helpers():
+    points = ["Led team of 5", "led team of 5 ", "• Led team of five", "Shipped UI", ""]
+    dedup_filter = DedupFilter('fuzzy', similarity_threshold=0.6)
+    assert [p for p in points if dedup_filter.add(p)] == PointDeduplicator.deduplicate_points(points, 0.6)
+    assert PointDeduplicator.deduplicate_points_exact(points) == ["Led team of 5", "• Led team of five",
+                                                                   "Shipped UI", ""]
+
+
+def test_batch_processor_caches_each_strictness_separately():
+    processor = BatchProcessor(cache=ProcessingCache())
+    exact_key, exact = processor.process_text(SAMPLE, 1, True, 'exact')
+    fuzzy_key, fuzzy = processor.process_text(SAMPLE, 1, True, 'fuzzy')
+    off_key, _ = processor.process_text(SAMPLE, 1, False, 'fuzzy')
+    assert len({exact_key, fuzzy_key, off_key}) == 3
+    assert exact == TextProcessor().process_text(SAMPLE, 1, dedup='exact')
+    assert fuzzy == TextProcessor().process_text(SAMPLE, 1, dedup='fuzzy')
+
+    results = processor.process_files([NamedText("a.txt", SAMPLE)], 1, dedup_enabled=True,
+                                      dedup_strictness='fuzzy')
+    assert results[0]["a"][0] == fuzzy
+
+
+if __name__ == "__main__":
+    test_exact_and_fuzzy_modes_drop_duplicates_within_each_cycle()
+    test_filter_matches_list_helpers()
+    test_batch_processor_caches_each_strictness_separately()
+    print("✅ Deduplication tests passed")
@@ -0,0 +1,148 @@
+"""
+Test the SQLite email outbox with an in-memory sender (no SMTP server needed)
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import smtplib
+import tempfile
+import threading
+
+from utils.email_outbox import EmailOutbox, RateLimit
+from utils.email_sender import DeliveryUncertainError, EmailSender, MessageTemplate
+
+
+class MemorySender(EmailSender):
+    """Records deliveries; fails the first `failures` attempts per recipient."""
+
+    def __init__(self, failures: int = 0, error: Exception = None):
+        self.failures = failures
+        self.error = error or ConnectionError("Connection reset")
+        self.attempts = {}
+        self.sent = []
+        self.lock = threading.Lock()
+
+    def deliver(self, template, recipient):
+        with self.lock:
+            self.attempts[recipient] = self.attempts.get(recipient, 0) + 1
+            if self.attempts[recipient] <= self.failures:
+                raise self.error
+            self.sent.append((recipient, template.subject))
+
+
+def _outbox(**options) -> EmailOutbox:
+    db_path = Path(tempfile.mkdtemp()) / "outbox.db"
+    options.setdefault("backoff_base", 0.01)
+    options.setdefault("poll_interval", 0.02)
+    return EmailOutbox(db_path, **options)
+
+
+def _template() -> MessageTemplate:
+    return MessageTemplate("Resume", "Hello", [("resume.docx", b"docx-bytes")])
+
+
+def test_outbox_sends_in_background_and_dedups():
+    """Queued mail is sent by workers; re-enqueueing the same email is a no-op."""
+    outbox = _outbox()
+    sender = MemorySender()
+    outbox.register_sender("gmail", sender)
+    outbox.start(workers=2)
+    try:
+        recipients = [f"r{i}@example.com" for i in range(6)]
+        queued = outbox.enqueue_many("gmail", _template(), recipients, batch_id="b1")
+        assert all(created for _, created in queued)
+        status = outbox.wait("b1", timeout=10)
+        assert status["sent"] == 6, status
+
+        again = outbox.enqueue_many("gmail", _template(), recipients[:2], batch_id="b2")
+        assert [created for _, created in again] == [False, False]
+        assert len(sender.sent) == 6
+    finally:
+        outbox.stop()
+
+
+def test_transient_errors_retry_and_permanent_errors_fail():
+    """Connection errors back off and retry; 5xx rejections fail at once."""
+    outbox = _outbox()
+    outbox.register_sender("gmail", MemorySender(failures=2))
+    outbox.register_sender("outlook", MemorySender(
+        failures=99, error=smtplib.SMTPRecipientsRefused({"x@example.com": (550, b"No such user")})
+    ))
+    outbox.start(workers=2)
+    try:
+        retried_id, _ = outbox.enqueue("gmail", "a@example.com", _template(), batch_id="b")
+        failed_id, _ = outbox.enqueue("outlook", "x@example.com", _template(), batch_id="b")
+        outbox.wait("b", timeout=10)
+
+        retried = outbox.get_message(retried_id)
+        failed = outbox.get_message(failed_id)
+        assert retried["status"] == "sent" and retried["attempts"] == 3, retried
+        assert failed["status"] == "failed" and failed["attempts"] == 1, failed
+        assert "No such user" in failed["last_error"]
+    finally:
+        outbox.stop()
+
+
+def test_uncertain_deliveries_are_not_retried():
+    """A send that may have reached the server is flagged for a manual check, not resent."""
+    outbox = _outbox()
+    sender = MemorySender(failures=1, error=DeliveryUncertainError("Connection lost after DATA"))
+    outbox.register_sender("gmail", sender)
+    outbox.start(workers=1)
+    try:
+        message_id, _ = outbox.enqueue("gmail", "a@example.com", _template(), batch_id="b")
+        outbox.wait("b", timeout=10)
+        message = outbox.get_message(message_id)
+        assert message["status"] == "interrupted" and message["attempts"] == 1, message
+        assert "check the sent folder" in message["last_error"]
+
+        assert outbox.retry(message_id)
+        outbox.wait("b", timeout=10)
+        assert outbox.get_message(message_id)["status"] == "sent"
+    finally:
+        outbox.stop()
+
+
+def test_rate_limit_holds_messages_in_queue():
+    """Messages beyond the per-minute cap stay queued."""
+    outbox = _outbox(rate_limits={"gmail": RateLimit(per_minute=3)})
+    sender = MemorySender()
+    outbox.register_sender("gmail", sender)
+    outbox.start(workers=2)
+    try:
+        outbox.enqueue_many("gmail", _template(), [f"r{i}@example.com" for i in range(5)], batch_id="b")
+        status = outbox.wait("b", timeout=0.5)
+        assert status["sent"] == 3 and status["queued"] == 2, status
+    finally:
+        outbox.stop()
+
+
+def test_sendgrid_messages_are_sent_in_batches():
+    """Queued SendGrid messages sharing a template go out as one API request."""
+    from benchmark_email import SendGridStub
+    from utils.email_sender import SendGridSender
+
+    outbox = _outbox()
+    with SendGridStub() as stub:
+        outbox.enqueue_many("sendgrid", _template(), [f"r{i}@example.com" for i in range(50)],
+                            batch_id="b")
+        outbox.register_sender("sendgrid", SendGridSender("SG.test", api_url=stub.url))
+        outbox.start(workers=1)
+        try:
+            status = outbox.wait("b", timeout=10)
+        finally:
+            outbox.stop()
+    assert status["sent"] == 50, status
+    assert len(stub.requests) == 1
+
+
+if __name__ == "__main__":
+    test_outbox_sends_in_background_and_dedups()
+    test_transient_errors_retry_and_permanent_errors_fail()
+    test_uncertain_deliveries_are_not_retried()
+    test_rate_limit_holds_messages_in_queue()
+    test_sendgrid_messages_are_sent_in_batches()
+    print("✅ Email outbox tests passed")
@@ -0,0 +1,247 @@
+"""
+Test pooled SMTP sending against a local aiosmtpd server (pip install aiosmtpd; no real mailbox needed)
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import email
+import socket
+import time
+
+from benchmark_email import SendGridStub
+from utils.email_sender import GmailSender, SendGridSender
+
+try:
+    from aiosmtpd.controller import Controller
+    from aiosmtpd.smtp import AuthResult
+except ImportError:  # pragma: no cover - optional test dependency
+    Controller = None
+
+
+class RecordingHandler:
+    def __init__(self):
+        self.messages = []
+        self.refuse_mail = 0  # refuse this many MAIL commands
+        self.refuse_data = 0  # reject this many message bodies
+        self.close_after_data = 0  # keep this many messages, then reply 421 as if the link dropped
+
+    async def handle_MAIL(self, server, session, envelope, address, mail_options):
+        if self.refuse_mail:
+            self.refuse_mail -= 1
+            return "451 Try again later"
+        envelope.mail_from = address
+        return "250 OK"
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address.startswith("nobody@"):
+            return "550 No such user"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        if self.refuse_data:
+            self.refuse_data -= 1
+            return "554 Message rejected"
+        self.messages.append(envelope)
+        if self.close_after_data:
+            self.close_after_data -= 1
+            return "421 Closing connection"
+        return "250 OK"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start_server(idle_timeout: float = 300):
+    handler = RecordingHandler()
+    controller = Controller(
+        handler, hostname="127.0.0.1", port=_free_port(),
+        authenticator=lambda *args: AuthResult(success=True),
+        auth_require_tls=False, timeout=idle_timeout
+    )
+    controller.start()
+    return controller, handler
+
+
+def _sender(controller, **pool_options) -> GmailSender:
+    return GmailSender("me@example.com", "app-password", smtp_server=controller.hostname,
+                       smtp_port=controller.port, use_tls=False, **pool_options)
+
+
+def _skip_without_aiosmtpd():
+    if Controller is None:
+        import pytest
+        pytest.skip("aiosmtpd not installed")
+
+
+def test_send_many_reuses_one_session():
+    """Many recipients go out over a single authenticated connection."""
+    _skip_without_aiosmtpd()
+    controller, handler = _start_server()
+    try:
+        with _sender(controller) as sender:
+            messages = [
+                {"recipient": f"r{i}@example.com", "subject": "Resume", "body": "Hi",
+                 "attachments": [("resume.docx", b"docx-bytes")]}
+                for i in range(10)
+            ]
+            results = sender.send_many(messages)
+            print(f"   Stats: {sender.stats}")
+            assert results == [True] * 10
+            assert sender.stats["connections"] == 1
+        assert len(handler.messages) == 10
+        assert handler.messages[3].rcpt_tos == ["r3@example.com"]
+    finally:
+        controller.stop()
+
+
+def test_reconnects_after_server_idle_timeout():
+    """A session dropped by the server is detected and replaced transparently."""
+    _skip_without_aiosmtpd()
+    controller, handler = _start_server(idle_timeout=0.3)
+    try:
+        with _sender(controller, noop_after=0.0) as sender:
+            assert sender.send_email("a@example.com", "Resume", "Hi")
+            time.sleep(0.8)
+            assert sender.send_email("b@example.com", "Resume", "Hi")
+            print(f"   Stats: {sender.stats}")
+            assert sender.stats["connections"] == 2
+            assert sender.stats["reconnects"] == 1
+
+            # Without the NOOP check, the failed send itself triggers the retry
+            sender.noop_after = 3600
+            time.sleep(0.8)
+            assert sender.send_email("c@example.com", "Resume", "Hi")
+            assert sender.stats["connections"] == 3
+        assert [m.rcpt_tos[0] for m in handler.messages] == [
+            "a@example.com", "b@example.com", "c@example.com"
+        ]
+    finally:
+        controller.stop()
+
+
+def test_refusals_reset_and_keep_the_session():
+    """A refused sender, recipient or message fails only that send; the session is reset and reused."""
+    _skip_without_aiosmtpd()
+    controller, handler = _start_server()
+    try:
+        with _sender(controller) as sender:
+            assert not sender.send_email("nobody@example.com", "Resume", "Hi")
+            assert sender.send_email("a@example.com", "Resume", "Hi")
+            handler.refuse_mail = 1
+            assert not sender.send_email("b@example.com", "Resume", "Hi")
+            assert sender.send_email("c@example.com", "Resume", "Hi")
+            handler.refuse_data = 1
+            assert not sender.send_email("d@example.com", "Resume", "Hi")
+            assert sender.send_email("e@example.com", "Resume", "Hi")
+            print(f"   Stats: {sender.stats}")
+            assert sender.stats["connections"] == 1
+        assert [m.rcpt_tos for m in handler.messages] == [["a@example.com"], ["c@example.com"],
+                                                          ["e@example.com"]]
+    finally:
+        controller.stop()
+
+
+def test_failure_after_data_is_not_resent():
+    """A reused session that fails after the message data went out is not retried on a new one."""
+    _skip_without_aiosmtpd()
+    controller, handler = _start_server()
+    try:
+        with _sender(controller) as sender:
+            assert sender.send_email("a@example.com", "Resume", "Hi")
+            handler.close_after_data = 1
+            assert not sender.send_email("b@example.com", "Resume", "Hi")
+            assert sender.send_email("c@example.com", "Resume", "Hi")
+            print(f"   Stats: {sender.stats}")
+            assert sender.stats["reconnects"] == 0 and sender.stats["connections"] == 2
+        # The server kept b's message once; the sender reported failure rather than sending it again
+        assert [m.rcpt_tos for m in handler.messages] == [["a@example.com"], ["b@example.com"],
+                                                          ["c@example.com"]]
+    finally:
+        controller.stop()
+
+
+def test_parallel_sessions_are_bounded():
+    """send_many with a pool never opens more sessions than pool_size."""
+    _skip_without_aiosmtpd()
+    controller, handler = _start_server()
+    try:
+        with _sender(controller, pool_size=3) as sender:
+            done = []
+            results = sender.send_many(
+                [{"recipient": f"r{i}@example.com", "subject": "S", "body": "B"} for i in range(12)],
+                on_result=lambda index, message, success: done.append(index)
+            )
+            assert all(results)
+            assert sorted(done) == list(range(12))
+            assert sender.stats["connections"] <= 3
+        assert len(handler.messages) == 12
+    finally:
+        controller.stop()
+
+
+def test_template_encodes_once_and_stamps_recipients():
+    """A bulk template is serialized once; every copy gets its own To and Message-ID."""
+    _skip_without_aiosmtpd()
+    controller, handler = _start_server()
+    attachment = bytes(range(256)) * 400
+    try:
+        with _sender(controller) as sender:
+            serialize_calls = []
+            original = sender._serialize
+            sender._serialize = lambda template: serialize_calls.append(1) or original(template)
+
+            template = sender.create_template("Resume", "Please find my resume attached.",
+                                              attachments=[("resume.docx", attachment)],
+                                              from_name="Jane Doe")
+            recipients = [f"r{i}@example.com" for i in range(5)]
+            assert sender.send_template_many(template, recipients) == [True] * 5
+            assert len(serialize_calls) == 1
+
+        parsed = [email.message_from_bytes(m.content) for m in handler.messages]
+        assert [m["To"] for m in parsed] == recipients
+        assert len({m["Message-ID"] for m in parsed}) == 5
+        assert parsed[0]["From"] == "Jane Doe <me@example.com>"
+        parts = [part for part in parsed[4].walk() if part.get_filename()]
+        assert parts[0].get_payload(decode=True) == attachment
+    finally:
+        controller.stop()
+
+
+def test_sendgrid_batches_personalizations_on_one_connection():
+    """Bulk SendGrid sends pack recipients per request and keep every attachment."""
+    with SendGridStub() as stub:
+        with SendGridSender("SG.test", from_email="me@example.com", api_url=stub.url) as sender:
+            template = sender.create_template(
+                "Resume", "Hi", attachments=[("resume.docx", b"docx"), ("cover.pdf", b"pdf")]
+            )
+            recipients = [f"r{i}@example.com" for i in range(2500)]
+            done = []
+            results = sender.send_template_many(
+                template, recipients, on_result=lambda index, recipient, success: done.append(index)
+            )
+            assert all(results) and done == list(range(2500))
+            assert sender.send_email("solo@example.com", "Resume", "Hi")
+
+        print(f"   Requests: {len(stub.requests)}  Connections: {stub.connections}")
+        assert [len(r["recipients"]) for r in stub.requests] == [1000, 1000, 500, 1]
+        assert stub.connections == 1
+        assert stub.requests[0]["attachments"] == 2
+        assert stub.requests[0]["authorization"] == "Bearer SG.test"
+
+
+if __name__ == "__main__":
+    test_send_many_reuses_one_session()
+    test_reconnects_after_server_idle_timeout()
+    test_refusals_reset_and_keep_the_session()
+    test_failure_after_data_is_not_resent()
+    test_parallel_sessions_are_bounded()
+    test_template_encodes_once_and_stamps_recipients()
+    test_sendgrid_batches_personalizations_on_one_connection()
+    print("✅ Email sender tests passed")
@@ -0,0 +1,102 @@
+"""
+Test the extract-points CLI pipeline (no network; uses temporary directories)
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import shutil
+import tempfile
+import zipfile
+
+from benchmark_api import SAMPLE_TEXT
+from extract_points import OutputSink, expand_globs, load_mapping, pair_resumes, run_extraction
+from utils.batch_processor import BatchProcessor
+
+SAMPLE_RESUME = Path(__file__).parent / "resumes_uploaded" / "Java.docx"
+
+SAMPLE = """Heading 1
+• Point 1
+• Point 2
+
+Heading 2
+• Item A
+• Item B"""
+
+
+def _write_inputs(root: Path) -> list:
+    (root / "nested").mkdir()
+    (root / "alpha.txt").write_text(SAMPLE, encoding="utf-8")
+    (root / "beta.txt").write_text(SAMPLE.replace("Point", "Task"), encoding="utf-8")
+    (root / "nested" / "alpha.txt").write_text(SAMPLE.replace("Item", "Entry"), encoding="utf-8")
+    (root / "empty.txt").write_text("", encoding="utf-8")
+    return expand_globs([str(root / "**" / "*.txt")])
+
+
+def test_in_process_run_matches_batch_processor_and_reports_failures():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        paths = _write_inputs(root)
+        assert len(paths) == 4
+
+        sink = OutputSink(str(root / "out"))
+        report = run_extraction(paths, sink, points=2, dedup='exact', formats=("txt", "docx"), workers=0)
+        sink.close()
+
+        summary = report["summary"]
+        print(f"   Summary: {summary}")
+        assert (summary["total_files"], summary["succeeded"], summary["failed"]) == (4, 3, 1)
+        assert summary["outputs_written"] == 6 and summary["files_per_second"] > 0
+
+        written = sorted(p.name for p in (root / "out").iterdir())
+        assert written == ["alpha.docx", "alpha.txt", "alpha_2.docx", "alpha_2.txt", "beta.docx", "beta.txt"]
+
+        _, expected = BatchProcessor().process_text(SAMPLE, 2, True, 'exact')
+        assert (root / "out" / "alpha.txt").read_text(encoding="utf-8") == expected
+
+
+def test_worker_pool_streams_to_zip_with_resume_mapping():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        paths = _write_inputs(root)[:2]
+        # Injection only recognizes full-length points
+        Path(paths[0]).write_text(SAMPLE_TEXT, encoding="utf-8")
+        shutil.copy(SAMPLE_RESUME, root / "Java.docx")
+        (root / "map.csv").write_text("text,resume\nalpha.txt,Java.docx\n", encoding="utf-8")
+
+        pairs = pair_resumes(paths, [str(root / "Java.docx")], load_mapping(str(root / "map.csv")))
+        assert [Path(p).name if p else None for p in pairs.values()] == ["Java.docx", None]
+
+        seen = []
+        sink = OutputSink(str(root / "results.zip"))
+        report = run_extraction(paths, sink, points=2, formats=("pdf",), resume_pairs=pairs,
+                                workers=2, on_result=lambda r: seen.append(r["name"]))
+        sink.close()
+
+        assert sorted(seen) == ["alpha", "beta"]
+        assert report["summary"]["injected"] == 1
+        with zipfile.ZipFile(root / "results.zip") as archive:
+            names = sorted(archive.namelist())
+            assert names == ["Java_with_alpha_injected.docx", "alpha.pdf", "beta.pdf"]
+            assert archive.read("alpha.pdf")[:4] == b"%PDF"
+            assert archive.read("Java_with_alpha_injected.docx")[:2] == b"PK"
+
+
+def test_unknown_resume_in_mapping_is_rejected():
+    try:
+        pair_resumes(["a.txt"], ["Java.docx"], {"a": "Python"})
+    except ValueError as e:
+        assert "Python" in str(e)
+    else:
+        raise AssertionError("expected ValueError")
+    assert pair_resumes(["a.txt", "Java.txt"], ["x/Java.docx", "y/Go.docx"]) == {"a.txt": None,
+                                                                                  "Java.txt": "x/Java.docx"}
+
+
+if __name__ == "__main__":
+    test_in_process_run_matches_batch_processor_and_reports_failures()
+    test_worker_pool_streams_to_zip_with_resume_mapping()
+    test_unknown_resume_in_mapping_is_rejected()
+    print("✅ Extract points tests passed")
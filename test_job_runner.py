@@ -0,0 +1,175 @@
+"""
+Test the background job runner and the app's job handlers (no network; uses a temporary job database)
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import tempfile
+import threading
+import time
+
+from utils.app_jobs import register_app_jobs
+from utils.job_runner import JobRunner
+from utils.processing_cache import ProcessingCache
+
+SAMPLE = """Heading 1
+• Point 1
+• Point 2
+
+Heading 2
+• Item A
+• Item B"""
+
+
+def test_identical_input_reuses_job_and_progress_is_recorded():
+    with tempfile.TemporaryDirectory() as tmp:
+        runner = JobRunner(db_path=Path(tmp) / "jobs.db", poll_interval=0.05, progress_interval=0)
+        calls = []
+
+        def square(payload, progress):
+            calls.append(payload)
+            progress(0.5, "Halfway")
+            return payload['n'] ** 2
+
+        runner.register('square', square)
+        runner.start(workers=2)
+        try:
+            job_id, created = runner.submit('square', {'n': 7})
+            assert created
+            assert runner.wait(job_id, timeout=10)['state'] == 'succeeded'
+            assert runner.result(job_id) == 49
+
+            again, created = runner.submit('square', {'n': 7})
+            assert (again, created) == (job_id, False)
+            forced, created = runner.submit('square', {'n': 7}, force=True)
+            assert created and forced != job_id
+            runner.wait(forced, timeout=10)
+            assert len(calls) == 2
+
+            job = runner.get(job_id)
+            print(f"   Job: {job['state']} {job['progress']} {job['message']}")
+            assert job['progress'] == 1.0 and job['message'] == 'Done'
+        finally:
+            runner.stop()
+
+
+def test_failed_job_is_not_reused_and_can_be_retried():
+    with tempfile.TemporaryDirectory() as tmp:
+        runner = JobRunner(db_path=Path(tmp) / "jobs.db", poll_interval=0.05)
+        attempts = []
+
+        def flaky(payload, progress):
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise ValueError("rate limited")
+            return "ok"
+
+        runner.register('flaky', flaky)
+        runner.start(workers=1)
+        try:
+            job_id, _ = runner.submit('flaky', "input")
+            job = runner.wait(job_id, timeout=10)
+            assert job['state'] == 'failed' and "rate limited" in job['error']
+            assert runner.result(job_id) is None
+
+            assert runner.retry(job_id)
+            assert runner.wait(job_id, timeout=10)['state'] == 'succeeded'
+            assert runner.result(job_id) == "ok"
+            assert not runner.retry(job_id)
+        finally:
+            runner.stop()
+
+
+def test_llm_kinds_rerun_after_success_but_share_in_flight_jobs():
+    with tempfile.TemporaryDirectory() as tmp:
+        runner = JobRunner(db_path=Path(tmp) / "jobs.db", poll_interval=0.05)
+        release = threading.Event()
+        calls = []
+
+        def generate(payload, progress):
+            calls.append(payload)
+            release.wait(10)
+            return f"points v{len(calls)}"
+
+        runner.register('generate', generate, reuse_results=False)
+        runner.start(workers=1)
+        try:
+            first, created = runner.submit('generate', "same JD")
+            assert created
+            assert runner.submit('generate', "same JD") == (first, False)  # still in flight
+            release.set()
+            assert runner.wait(first, timeout=10)['state'] == 'succeeded'
+
+            second, created = runner.submit('generate', "same JD")
+            assert created and second != first
+            runner.wait(second, timeout=10)
+            assert runner.result(second) == "points v2" and len(calls) == 2
+        finally:
+            release.set()
+            runner.stop()
+
+
+def test_restart_flags_running_jobs_and_kind_concurrency_is_enforced():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "jobs.db"
+        release = threading.Event()
+        running = []
+        peak = []
+
+        def slow(payload, progress):
+            running.append(payload)
+            peak.append(len(running))
+            release.wait(10)
+            running.remove(payload)
+            return payload
+
+        runner = JobRunner(db_path=db_path, poll_interval=0.05)
+        runner.register('slow', slow, concurrency=1)
+        runner.start(workers=3)
+        try:
+            first, _ = runner.submit('slow', 1)
+            second, _ = runner.submit('slow', 2)
+            time.sleep(0.3)
+            assert runner.get(first)['state'] == 'running'
+            assert runner.get(second)['state'] == 'queued'
+
+            # A new process sees the job still 'running' and flags it
+            restarted = JobRunner(db_path=db_path)
+            restarted.start(workers=0)
+            assert restarted.get(first)['state'] == 'interrupted'
+        finally:
+            release.set()
+            runner.stop()
+        assert max(peak) == 1
+
+
+def test_batch_process_job_matches_direct_processing():
+    with tempfile.TemporaryDirectory() as tmp:
+        runner = JobRunner(db_path=Path(tmp) / "jobs.db", poll_interval=0.05)
+        register_app_jobs(runner, cache=ProcessingCache())
+        runner.start(workers=2)
+        try:
+            job_id, _ = runner.submit('batch_process', {
+                'files': [("a.txt", SAMPLE.encode('utf-8')), ("b.txt", b"")],
+                'points': 2,
+                'dedup': True,
+            })
+            assert runner.wait(job_id, timeout=30)['state'] == 'succeeded'
+            results = runner.result(job_id)
+            text, docx, pdf = results[0]['a']
+            assert "Cycle 1" in text and docx[:2] == b"PK" and pdf[:4] == b"%PDF"
+            assert len(results) == 2
+        finally:
+            runner.stop()
+
+
+if __name__ == "__main__":
+    test_identical_input_reuses_job_and_progress_is_recorded()
+    test_failed_job_is_not_reused_and_can_be_retried()
+    test_llm_kinds_rerun_after_success_but_share_in_flight_jobs()
+    test_restart_flags_running_jobs_and_kind_concurrency_is_enforced()
+    test_batch_process_job_matches_direct_processing()
+    print("✅ Job runner tests passed")
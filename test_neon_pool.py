@@ -0,0 +1,414 @@
+"""
+Test the pooled Neon connection layer and bulk ingest (needs DATABASE_URL; run setup_neon.py first)
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import os
+import threading
+import uuid
+from io import BytesIO
+
+from dotenv import load_dotenv
+
+load_dotenv()
+DATABASE_URL = os.getenv("DATABASE_URL")
+
+
+def _skip_without_database():
+    if not DATABASE_URL:
+        import pytest
+        pytest.skip("DATABASE_URL not set")
+
+
+def _count_statements(mgr) -> list:
+    """Record every statement the manager sends (one entry per network round trip)."""
+    from contextlib import contextmanager
+
+    statements = []
+    pool_cursor = mgr.pool.cursor
+
+    class CountingCursor:
+        def __init__(self, cur):
+            self._cur = cur
+
+        def execute(self, query, *args):
+            statements.append(query.decode() if isinstance(query, bytes) else query)
+            return self._cur.execute(query, *args)
+
+        def __getattr__(self, name):
+            return getattr(self._cur, name)
+
+    @contextmanager
+    def cursor(cursor_factory=None):
+        with pool_cursor(cursor_factory=cursor_factory) as cur:
+            yield CountingCursor(cur)
+
+    mgr.pool.cursor = cursor
+    return statements
+
+
+def test_failed_query_rolls_back_and_connection_is_reused():
+    """An error inside a checkout rolls back and leaves the pooled connection usable."""
+    _skip_without_database()
+    from utils.neon_pool import NeonConnectionPool
+
+    pool = NeonConnectionPool(DATABASE_URL, minconn=1, maxconn=1)
+    try:
+        try:
+            with pool.cursor() as cur:
+                cur.execute("SELECT * FROM table_that_does_not_exist")
+        except Exception:
+            pass
+
+        with pool.cursor() as cur:
+            cur.execute("SELECT 1")
+            assert cur.fetchone()[0] == 1
+
+        metrics = pool.metrics()
+        print(f"   Metrics: {metrics}")
+        assert metrics["rollbacks"] == 1
+        assert metrics["checkouts"] == 2
+        assert metrics["open"] == 1 and metrics["in_use"] == 0
+    finally:
+        pool.close()
+
+
+def test_stale_connection_is_replaced():
+    """A connection dropped by the server while idle is detected and replaced on checkout."""
+    _skip_without_database()
+    import psycopg2
+    from utils.neon_pool import NeonConnectionPool
+
+    pool = NeonConnectionPool(DATABASE_URL, minconn=1, maxconn=1, health_check_after=0)
+    try:
+        with pool.cursor() as cur:
+            cur.execute("SELECT pg_backend_pid()")
+            pid = cur.fetchone()[0]
+
+        admin = psycopg2.connect(DATABASE_URL)
+        admin.autocommit = True
+        with admin.cursor() as cur:
+            cur.execute("SELECT pg_terminate_backend(%s)", (pid,))
+        admin.close()
+
+        with pool.cursor() as cur:
+            cur.execute("SELECT 1")
+        assert pool.metrics()["reconnects"] == 1
+    finally:
+        pool.close()
+
+
+def test_all_idle_connections_dead_after_suspend():
+    """When every idle connection was dropped (e.g. Neon autosuspend), checkout skips all of them."""
+    _skip_without_database()
+    import psycopg2
+    from utils.neon_pool import NeonConnectionPool
+
+    pool = NeonConnectionPool(DATABASE_URL, minconn=1, maxconn=3, health_check_after=0)
+    try:
+        held = [pool._checkout() for _ in range(3)]
+        pids = []
+        for conn in held:
+            with conn.cursor() as cur:
+                cur.execute("SELECT pg_backend_pid()")
+                pids.append(cur.fetchone()[0])
+            conn.rollback()
+        for conn in held:
+            pool._return(conn, broken=False)
+        assert pool.metrics()["idle"] == 3  # retained beyond minconn
+
+        admin = psycopg2.connect(DATABASE_URL)
+        admin.autocommit = True
+        with admin.cursor() as cur:
+            for pid in pids:
+                cur.execute("SELECT pg_terminate_backend(%s)", (pid,))
+        admin.close()
+
+        with pool.cursor() as cur:
+            cur.execute("SELECT 1")
+            assert cur.fetchone()[0] == 1
+        metrics = pool.metrics()
+        print(f"   Metrics: {metrics}")
+        assert metrics["reconnects"] == 3 and metrics["open"] == 1
+    finally:
+        pool.close()
+
+    small = NeonConnectionPool(DATABASE_URL, minconn=1, maxconn=3, max_idle=1)
+    try:
+        held = [small._checkout() for _ in range(3)]
+        for conn in held:
+            small._return(conn, broken=False)
+        assert small.metrics()["idle"] == 1
+    finally:
+        small.close()
+
+
+def test_manager_methods_share_bounded_pool():
+    """Concurrent manager calls never open more connections than max_connections."""
+    _skip_without_database()
+    from utils.neon_resume_manager import NeonResumeManager
+
+    mgr = NeonResumeManager(DATABASE_URL, max_connections=3)
+    email = f"pool-{uuid.uuid4().hex[:8]}@example.com"
+    try:
+        success, msg = mgr.upload_resume(BytesIO(b"not a docx"), "PoolTest_Java_AWS.docx", email)
+        assert success, msg
+
+        errors = []
+
+        def worker():
+            for _ in range(5):
+                ok, resumes = mgr.get_user_resumes(email)
+                if not ok or len(resumes) != 1:
+                    errors.append(resumes)
+                mgr.get_stats()
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        metrics = mgr.pool_metrics()
+        print(f"   Metrics: {metrics}")
+        assert not errors
+        assert metrics["open"] <= 3
+        # upload + listings + one stats read (the rest are served from the stats cache)
+        assert metrics["checkouts"] == 1 + 8 * 5 + 1
+
+        resume_id = mgr.get_user_resumes(email)[1][0]["id"]
+        assert mgr.delete_resume(resume_id, "someone-else@example.com")[0] is False
+        assert mgr.delete_resume(resume_id, email) == (True, "Resume deleted")
+    finally:
+        (mgr.local_storage / "PoolTest_Java_AWS.docx").unlink(missing_ok=True)
+        mgr.close()
+
+
+def test_bulk_upload_inserts_all_rows_in_one_statement():
+    """Bulk ingest parses every file, resolves the user once and inserts in one round trip."""
+    _skip_without_database()
+    from utils.neon_resume_manager import NeonResumeManager
+
+    sample = Path(__file__).parent / "resumes_uploaded" / "Java.docx"
+    files = [(f"Bulk{i}_Python_SQL.docx", sample.read_bytes()) for i in range(40)]
+    email = f"bulk-{uuid.uuid4().hex[:8]}@example.com"
+
+    mgr = NeonResumeManager(DATABASE_URL)
+    statements = _count_statements(mgr)
+    try:
+        success, report = mgr.bulk_upload_resumes(files, email, parse_workers=2)
+        print(f"   Report: { {k: v for k, v in report.items() if k != 'resume_ids'} }")
+        assert success, report
+        assert report["rows"] == 40 and len(set(report["resume_ids"])) == 40
+        assert report["rows_per_sec"] > 0
+        assert len(statements) == 1
+        assert mgr.pool_metrics()["checkouts"] == 1
+
+        ok, resumes = mgr.get_user_resumes(email)
+        assert ok and len(resumes) == 40
+        assert resumes[0]["technologies"] == ["Python", "SQL"]
+        assert resumes[0]["bookmarks"] == mgr.bookmark_manager.detect_bookmarks(str(sample))
+    finally:
+        for filename, _ in files:
+            (mgr.local_storage / filename).unlink(missing_ok=True)
+        mgr.close()
+
+
+def test_resume_operations_take_one_round_trip():
+    """User resolution is folded into each statement; the upsert is skipped once the id is cached."""
+    _skip_without_database()
+    from utils.neon_resume_manager import NeonResumeManager
+
+    sample = (Path(__file__).parent / "resumes_uploaded" / "Java.docx").read_bytes()
+    email = f"trip-{uuid.uuid4().hex[:8]}@example.com"
+    mgr = NeonResumeManager(DATABASE_URL)
+    statements = _count_statements(mgr)
+    try:
+        assert mgr.upload_resume(BytesIO(sample), "TripTest_Go.docx", email)[0]
+        assert "ON CONFLICT" in statements[-1]
+        assert mgr.upload_resume(BytesIO(sample), "TripTest_Go.docx", email)[0]
+        assert "ON CONFLICT" not in statements[-1]
+
+        # A fresh manager (cold cache) still upserts the existing user in one statement
+        other = NeonResumeManager(DATABASE_URL)
+        try:
+            assert other.upload_resume(BytesIO(sample), "TripTest_Go.docx", email)[0]
+        finally:
+            other.close()
+
+        ok, resumes = mgr.get_user_resumes(email)
+        assert ok and len(resumes) == 3
+        assert mgr.get_user_resumes("nobody@example.com") == (True, [])
+        assert mgr.delete_resume(resumes[0]["id"], "nobody@example.com")[0] is False
+        assert mgr.delete_resume(resumes[0]["id"], email) == (True, "Resume deleted")
+        assert len(statements) == 6
+    finally:
+        (mgr.local_storage / "TripTest_Go.docx").unlink(missing_ok=True)
+        mgr.close()
+
+
+def test_keyset_pages_and_streaming_export():
+    """Pages walk every row exactly once (ties on created_at broken by id); exports stream."""
+    _skip_without_database()
+    import tempfile
+    from utils.neon_resume_manager import NeonResumeManager
+
+    sample = (Path(__file__).parent / "resumes_uploaded" / "Java.docx").read_bytes()
+    tech = f"Tech{uuid.uuid4().hex[:6]}"
+    email = f"page-{uuid.uuid4().hex[:8]}@example.com"
+    files = [(f"Page{i}_{tech}.docx", sample) for i in range(23)]
+    mgr = NeonResumeManager(DATABASE_URL)
+    try:
+        # One INSERT statement, so every row shares the same created_at
+        success, report = mgr.bulk_upload_resumes(files, email, parse_workers=0)
+        assert success
+
+        seen, cursor, pages = [], None, 0
+        while True:
+            ok, page = mgr.list_resumes_page(user_email=email, limit=5, cursor=cursor)
+            assert ok
+            seen += [r["id"] for r in page["resumes"]]
+            pages += 1
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+        assert pages == 5
+        assert seen == sorted(report["resume_ids"], reverse=True)
+
+        ok, found = mgr.search_resumes_by_tech(tech, limit=100)
+        assert ok and len(found) == 23
+
+        streamed = mgr.iter_resumes(technology=tech, batch_size=4)
+        assert next(streamed)["technologies"] == [tech]
+        streamed.close()
+        assert mgr.pool_metrics()["in_use"] == 0
+
+        with tempfile.TemporaryDirectory() as tmp:
+            ok, count = mgr.export_resumes_csv(f"{tmp}/resumes.csv", user_email=email)
+            assert ok and count == 23
+            lines = Path(f"{tmp}/resumes.csv").read_text().splitlines()
+            assert lines[0] == "id,filename,technologies,bookmarks,size,created_at"
+            assert len(lines) == 24
+    finally:
+        for filename, _ in files:
+            (mgr.local_storage / filename).unlink(missing_ok=True)
+        mgr.close()
+
+
+def test_database_storage_dedups_and_streams_chunks():
+    """Identical uploads share one blob; a second instance streams it into its own cache."""
+    _skip_without_database()
+    import tempfile
+    from utils.neon_resume_manager import NeonResumeManager
+
+    content = (Path(__file__).parent / "resumes_uploaded" / "Java.docx").read_bytes() + uuid.uuid4().bytes
+    email = f"blob-{uuid.uuid4().hex[:8]}@example.com"
+    with tempfile.TemporaryDirectory() as tmp:
+        writer = NeonResumeManager(DATABASE_URL, storage="database")
+        reader = NeonResumeManager(DATABASE_URL, storage="database", chunk_size=4096)
+        writer.cache_dir = Path(tmp, "writer")
+        reader.cache_dir = Path(tmp, "reader")
+        writer.cache_dir.mkdir()
+        reader.cache_dir.mkdir()
+        try:
+            assert writer.upload_resume(BytesIO(content), "Blob_Go.docx", email)[0]
+            ok, report = writer.bulk_upload_resumes(
+                [("Blob_Go.docx", content), ("Blob2_Go.docx", content)], email, parse_workers=0
+            )
+            assert ok, report
+            assert not (writer.local_storage / "Blob_Go.docx").exists()
+
+            with writer.pool.cursor() as cur:
+                cur.execute("""
+                    SELECT COUNT(DISTINCT r.content_hash), MAX(r.s3_path), MAX(b.size)
+                    FROM resumes r JOIN resume_blobs b ON b.sha256 = r.content_hash
+                    WHERE r.id = ANY(%s)
+                """, (report["resume_ids"],))
+                assert cur.fetchone() == (1, None, len(content))
+
+            # The reader has an empty cache: bytes come from the database in 4 KB chunks
+            chunk_queries = _count_statements(reader)
+            ok, data = reader.get_resume_file(report["resume_ids"][0])
+            assert ok and data.getvalue() == content
+            assert sum("substring" in q for q in chunk_queries) == len(content) // 4096 + 1
+
+            # Second read is served from the local cache by hash
+            queries_before = len(chunk_queries)
+            assert b"".join(reader.iter_resume_file(report["resume_ids"][1])) == content
+            assert len(chunk_queries) == queries_before + 1
+
+            # Switching to local storage keeps earlier database uploads readable
+            local_reader = NeonResumeManager(DATABASE_URL, storage="local")
+            local_reader.cache_dir = Path(tmp, "local")
+            local_reader.cache_dir.mkdir()
+            try:
+                ok, data = local_reader.get_resume_file(report["resume_ids"][0])
+                assert ok and data.getvalue() == content
+            finally:
+                local_reader.close()
+        finally:
+            writer.close()
+            reader.close()
+
+
+def test_stats_come_from_counters_and_stay_exact():
+    """Trigger-maintained counters match COUNT(*) after inserts, soft deletes and restores."""
+    _skip_without_database()
+    from utils.neon_resume_manager import NeonResumeManager
+
+    def exact_counts(mgr):
+        with mgr.pool.cursor() as cur:
+            cur.execute("""
+                SELECT (SELECT COUNT(*) FROM resumes WHERE deleted_at IS NULL),
+                       (SELECT COUNT(*) FROM users),
+                       (SELECT COUNT(*) FROM job_applications)
+            """)
+            return dict(zip(NeonResumeManager.STATS_KEYS, cur.fetchone()))
+
+    sample = (Path(__file__).parent / "resumes_uploaded" / "Java.docx").read_bytes()
+    email = f"stats-{uuid.uuid4().hex[:8]}@example.com"
+    mgr = NeonResumeManager(DATABASE_URL, stats_ttl=60)
+    try:
+        before = mgr.get_stats()
+        assert before == exact_counts(mgr)
+
+        statements = _count_statements(mgr)
+        assert mgr.get_stats() == before
+        assert statements == []  # served from the TTL cache
+
+        ok, report = mgr.bulk_upload_resumes(
+            [(f"Stats{i}_Rust.docx", sample) for i in range(7)], email, parse_workers=0
+        )
+        assert ok
+        assert mgr.delete_resume(report["resume_ids"][0], email)[0]
+        with mgr.pool.cursor() as cur:
+            cur.execute("UPDATE resumes SET deleted_at = NULL WHERE id = %s", (report["resume_ids"][0],))
+            cur.execute("UPDATE resumes SET deleted_at = NOW() WHERE id = ANY(%s)", (report["resume_ids"][1:3],))
+        mgr.invalidate_stats()
+
+        after = mgr.get_stats()
+        assert "table_counters" in statements[-1]
+        assert after == exact_counts(mgr)
+        assert after["total_resumes"] == before["total_resumes"] + 5
+        assert after["total_users"] == before["total_users"] + 1
+    finally:
+        for i in range(7):
+            (mgr.local_storage / f"Stats{i}_Rust.docx").unlink(missing_ok=True)
+        mgr.close()
+
+
+if __name__ == "__main__":
+    test_failed_query_rolls_back_and_connection_is_reused()
+    test_stale_connection_is_replaced()
+    test_all_idle_connections_dead_after_suspend()
+    test_manager_methods_share_bounded_pool()
+    test_bulk_upload_inserts_all_rows_in_one_statement()
+    test_resume_operations_take_one_round_trip()
+    test_keyset_pages_and_streaming_export()
+    test_database_storage_dedups_and_streams_chunks()
+    test_stats_come_from_counters_and_stay_exact()
+    print("✅ Neon pool tests passed")
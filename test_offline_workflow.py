@@ -0,0 +1,278 @@
+"""
+Test automation workflow offline with the fake LLM backend (no Groq key needed)
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import csv
+import json
+import tempfile
+from datetime import datetime
+
+from automation_workflow import AutomationWorkflow
+from batch_automation import BatchAutomationRunner, load_jobs
+from benchmark_workflow import run_benchmark, run_batch_benchmark, build_catalog, SAMPLE_JOB
+from utils.gemini_points_generator import GeminiPointsGenerator
+from utils.email_sender import EmailSender
+from utils.llm_backend import FakeLLMBackend
+from utils.point_history import PointHistoryStore
+
+
+def test_fake_backend_is_deterministic():
+    """Same prompt and seed give the same completion."""
+    generator = GeminiPointsGenerator(backend=FakeLLMBackend(seed=1))
+    techs = generator.extract_tech_stacks("We need Java, Spring Boot and AWS experience with Docker.")
+    assert techs == ["Java", "Spring Boot", "AWS", "Docker"], techs
+    
+    first = generator.generate_points("Java role", "Backend Developer", techs, 2)
+    second = generator.generate_points("Java role", "Backend Developer", techs, 2)
+    assert first == second
+    assert first.count("\n- ") == len(techs) * 2
+    
+    usage = generator.get_usage_summary()
+    assert usage["calls"] == 3
+    assert usage["prompt_tokens"] > 0
+
+
+def test_offline_workflow_benchmark():
+    """Full run_workflow succeeds offline and reports per-stage latency."""
+    report = run_benchmark(jobs=2, workers=2, latency=0.01)
+    print(f"   Throughput: {report['jobs_per_second']} jobs/s")
+    assert report["succeeded"] == 2, report["sample_errors"]
+    assert "Points Generation" in report["stages"]
+    assert "Resume Injection" in report["stages"]
+
+
+def test_injected_errors_fail_the_run():
+    """Injected backend errors surface as workflow errors, not exceptions."""
+    report = run_benchmark(jobs=1, error_rate=1.0)
+    assert report["failed"] == 1
+    assert report["sample_errors"]
+
+
+def test_batch_runner_pipelines_jobs():
+    """Batch mode processes every job and reports aggregate throughput."""
+    summary = run_batch_benchmark(jobs=4, workers=2, latency=0.01, injection_workers=0)
+    print(f"   Batch throughput: {summary['jobs_per_second']} jobs/s")
+    assert summary["succeeded"] == 4
+    assert summary["llm_calls"] == 8  # tech extraction is reused from matching
+    assert set(summary["stage_busy_seconds"]) == {"llm", "injection"}
+
+
+def test_batch_bad_points_fail_only_their_job():
+    """A malformed points_per_tech cell is reported on its job; the rest of the CSV still runs."""
+    with tempfile.TemporaryDirectory() as tmp:
+        jobs_file = Path(tmp) / "jobs.csv"
+        with open(jobs_file, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["id", "job_title", "recruiter_email", "points_per_tech", "job_description"])
+            for job_id, points in (("a", "2"), ("b", "three"), ("c", " 3.0 "), ("d", ""), ("e", "2.5")):
+                writer.writerow([job_id, "Backend Engineer", "r@example.com", points, SAMPLE_JOB])
+        jobs = load_jobs(str(jobs_file), default_points=1)
+        assert [job["points_per_tech"] for job in jobs] == [2, "three", 3, 1, "2.5"]
+
+        workflow = AutomationWorkflow(
+            points_generator=GeminiPointsGenerator(backend=FakeLLMBackend()),
+            catalog=build_catalog(),
+            output_folder=tmp
+        )
+        report = BatchAutomationRunner(workflow, injection_workers=0, send_emails=False).run(jobs)
+        failed = {r["id"]: r["errors"] for r in report["results"] if not r["success"]}
+        print(f"   Failed jobs: {failed}")
+        assert report["summary"]["succeeded"] == 3 and set(failed) == {"b", "e"}
+        assert "Points per technology" in failed["b"][0]
+
+
+class FlakySender(EmailSender):
+    """Email sender that fails the first `failures` sends."""
+    
+    def __init__(self, failures: int = 1):
+        self.failures = failures
+        self.sent = []
+    
+    def send_email(self, recipient, subject, body, attachments=None, from_name=None):
+        if self.failures > 0:
+            self.failures -= 1
+            return False
+        self.sent.append(recipient)
+        return True
+
+
+def test_rerun_resumes_and_never_double_sends():
+    """A rerun after an email failure skips finished stages and sends exactly once."""
+    backend = FakeLLMBackend()
+    workflow = AutomationWorkflow(
+        points_generator=GeminiPointsGenerator(backend=backend),
+        catalog=build_catalog(),
+        output_folder=tempfile.mkdtemp()
+    )
+    workflow.email_sender = FlakySender(failures=1)
+    job = dict(job_description=SAMPLE_JOB, job_title="Backend Engineer",
+               points_per_tech=2, recruiter_email="recruiter@example.com")
+    
+    success, first = workflow.run_workflow(**job)
+    assert success and not first["email_sent"]
+    calls_after_first = backend.call_count
+    
+    success, second = workflow.run_workflow(**job)
+    assert second["run_id"] == first["run_id"]
+    assert second["resumed_from"] == "email"
+    assert second["email_sent"]
+    assert backend.call_count == calls_after_first, "LLM stages should not rerun"
+    
+    success, third = workflow.run_workflow(**job)
+    assert third["email_sent"]
+    assert workflow.email_sender.sent == ["recruiter@example.com"]
+
+    # An explicit rerun of the finished job starts a new run instead of replaying it
+    success, fresh = workflow.run_workflow(**job, rerun_completed=True)
+    assert success and fresh["run_id"] == f"{first['run_id']}-2"
+    assert fresh["resumed_from"] == "match" and backend.call_count > calls_after_first
+    assert workflow.email_sender.sent == ["recruiter@example.com"] * 2
+
+
+def test_rerun_without_email_configured_starts_new_runs():
+    """A run with no email sender is finished after injection, so reruns regenerate points."""
+    backend = FakeLLMBackend()
+    workflow = AutomationWorkflow(
+        points_generator=GeminiPointsGenerator(backend=backend),
+        catalog=build_catalog(),
+        output_folder=tempfile.mkdtemp()
+    )
+    job = dict(job_description=SAMPLE_JOB, job_title="Backend Engineer",
+               points_per_tech=2, recruiter_email="recruiter@example.com")
+
+    run_ids = []
+    for _ in range(3):
+        calls_before = backend.call_count
+        success, result = workflow.run_workflow(**job, rerun_completed=True)
+        assert success and result["resumed_from"] == "match"
+        assert backend.call_count > calls_before, "LLM stages should rerun"
+        run_ids.append(result["run_id"])
+    assert len(set(run_ids)) == 3
+
+    # A plain rerun replays the finished run; once email is configured it sends it
+    calls_before = backend.call_count
+    success, replay = workflow.run_workflow(**job)
+    assert replay["resumed_from"] is None and not replay["email_sent"]
+    workflow.email_sender = FlakySender(failures=0)
+    success, sent = workflow.run_workflow(**job)
+    assert sent["run_id"] == run_ids[0] and sent["email_sent"]
+    assert backend.call_count == calls_before
+    assert workflow.email_sender.sent == ["recruiter@example.com"]
+
+
+def test_batch_rerun_never_resends_and_records_points():
+    """Batch emails use the checkpointed email stage: one send per job across reruns."""
+    output = tempfile.mkdtemp()
+    store = PointHistoryStore(Path(output) / "point_history")
+    workflow = AutomationWorkflow(
+        points_generator=GeminiPointsGenerator(backend=FakeLLMBackend()),
+        catalog=build_catalog(),
+        output_folder=output,
+        point_history=store
+    )
+    workflow.email_sender = FlakySender(failures=1)
+    jobs = [
+        {"id": str(i), "job_description": SAMPLE_JOB, "job_title": f"Backend Engineer {i}",
+         "recruiter_email": f"r{i}@example.com", "points_per_tech": 2,
+         "personal_message": "", "override_resume": None}
+        for i in range(3)
+    ]
+    runner = BatchAutomationRunner(workflow, injection_workers=0)
+
+    first = runner.run(jobs)
+    print(f"   First batch: {first['summary']}")
+    assert first["summary"]["emails_sent"] == 2 and len(workflow.email_sender.sent) == 2
+    assert first["started_at"] <= datetime.now().isoformat()
+    assert all(len(store.get(r)) > 0 for r in workflow.email_sender.sent)
+
+    # The rerun only sends the email that failed; finished jobs are not redone
+    second = runner.run(jobs)
+    assert [r["run_id"] for r in second["results"]] == [r["run_id"] for r in first["results"]]
+    assert second["summary"]["emails_sent"] == 3 and second["summary"]["succeeded"] == 3
+    assert sorted(workflow.email_sender.sent) == [job["recruiter_email"] for job in jobs]
+    runner.run(jobs)
+    assert len(workflow.email_sender.sent) == 3
+    store.close()
+
+
+def test_workflow_log_has_nested_spans():
+    """Injection records parse/save sub-spans and the saved log carries a summary table."""
+    workflow = AutomationWorkflow(
+        points_generator=GeminiPointsGenerator(backend=FakeLLMBackend()),
+        catalog=build_catalog(),
+        output_folder=tempfile.mkdtemp(),
+        checkpoints=False
+    )
+    success, result = workflow.run_workflow(
+        job_description=SAMPLE_JOB, job_title="Backend Engineer",
+        points_per_tech=2, recruiter_email="recruiter@example.com"
+    )
+    assert success, result["errors"]
+    
+    spans = {span.name: span for span in workflow.tracer.spans}
+    injection = spans["Resume Injection"]
+    for name in ("resume.load", "docx.parse", "docx.save"):
+        assert spans[name].parent_id == injection.span_id, name
+        assert spans[name].end is not None
+    assert spans["docx.save"].attributes["bytes"] > 0
+    assert spans["llm.generate_points"].attributes["completion_tokens"] > 0
+    
+    with open(result["log_file"]) as f:
+        log = json.load(f)
+    print("\n".join(log["summary_table"]))
+    assert any("duration_ms" in step for step in log["steps"])
+    assert log["summary_table"][-1].startswith("TOTAL")
+    jsonl = list(Path(result["log_file"]).parent.glob("workflow_spans_*.jsonl"))
+    assert len(jsonl) == 1
+    assert len(jsonl[0].read_text().splitlines()) == len(log["spans"])
+
+
+def test_outbox_queues_workflow_email_once():
+    """With an outbox the workflow returns without sending, and reruns never queue twice."""
+    from utils.email_outbox import EmailOutbox
+    
+    output_folder = tempfile.mkdtemp()
+    outbox = EmailOutbox(Path(output_folder) / "outbox.db")
+    workflow = AutomationWorkflow(
+        points_generator=GeminiPointsGenerator(backend=FakeLLMBackend()),
+        catalog=build_catalog(),
+        output_folder=output_folder,
+        outbox=outbox
+    )
+    workflow.email_sender = FlakySender(failures=0)
+    job = dict(job_description=SAMPLE_JOB, job_title="Backend Engineer",
+               points_per_tech=2, recruiter_email="recruiter@example.com")
+    
+    success, first = workflow.run_workflow(**job)
+    assert success and first["email_queued"] and not first["email_sent"]
+    assert workflow.email_sender.sent == []
+    
+    # Simulate a crash after queueing but before the email checkpoint was saved
+    manifest_path = Path(output_folder) / "runs" / first["run_id"] / "run.json"
+    manifest = json.loads(manifest_path.read_text())
+    manifest["stages"].pop("email")
+    manifest_path.write_text(json.dumps(manifest))
+    
+    success, second = workflow.run_workflow(**job)
+    assert second["resumed_from"] == "email"
+    assert second["email_queued"] == first["email_queued"]
+    assert len(outbox.list_messages()) == 1
+
+
+if __name__ == "__main__":
+    test_fake_backend_is_deterministic()
+    test_offline_workflow_benchmark()
+    test_injected_errors_fail_the_run()
+    test_batch_runner_pipelines_jobs()
+    test_batch_bad_points_fail_only_their_job()
+    test_rerun_resumes_and_never_double_sends()
+    test_rerun_without_email_configured_starts_new_runs()
+    test_batch_rerun_never_resends_and_records_points()
+    test_workflow_log_has_nested_spans()
+    test_outbox_queues_workflow_email_once()
+    print("✅ Offline workflow tests passed")
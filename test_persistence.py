@@ -0,0 +1,76 @@
+"""
+Test write-behind settings persistence (no network; uses a temporary settings file)
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import json
+import tempfile
+import time
+
+from utils.persistence import SettingsPersistence
+
+
+def test_unchanged_values_skip_writes_and_bursts_coalesce():
+    """Rerun-style repeated sets don't touch disk; a burst of changes is one write."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "user_settings.json"
+        settings = SettingsPersistence(settings_file=path, flush_delay=0.2)
+
+        for _ in range(50):
+            settings.set('deduplication_enabled', False)
+        assert settings.writes == 0 and not path.exists()
+
+        for points in range(1, 6):
+            settings.set('points_per_cycle', points)
+        settings.add_to_history("Processed 120 chars")
+        time.sleep(0.5)
+
+        print(f"   Writes: {settings.writes}")
+        assert settings.writes == 1
+        saved = json.loads(path.read_text())
+        assert saved['points_per_cycle'] == 5
+        assert saved['session_history'] == ["Processed 120 chars"]
+
+
+def test_concurrent_sessions_merge_instead_of_clobbering():
+    """Two sessions changing different keys (and both adding history) keep every change."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "user_settings.json"
+        first = SettingsPersistence(settings_file=path, flush_delay=60)
+        second = SettingsPersistence(settings_file=path, flush_delay=60)
+
+        first.set('points_per_cycle', 4)
+        first.add_to_history("first")
+        second.set('deduplication_enabled', True)
+        second.add_to_history("second")
+
+        assert first.flush() and second.flush()
+        saved = json.loads(path.read_text())
+        assert saved['points_per_cycle'] == 4
+        assert saved['deduplication_enabled'] is True
+        assert saved['session_history'] == ["second", "first"]
+
+        # The later flush also refreshed the session's view of other sessions' changes
+        assert second.get('points_per_cycle') == 4
+        assert list(Path(tmp).glob(".settings-*")) == []
+
+
+def test_reset_writes_defaults_immediately():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "user_settings.json"
+        settings = SettingsPersistence(settings_file=path, flush_delay=60)
+        settings.set('auto_map_cycles', False)
+        settings.add_to_history("x")
+        settings.reset_to_defaults()
+        assert json.loads(path.read_text()) == SettingsPersistence.DEFAULT_SETTINGS
+
+
+if __name__ == "__main__":
+    test_unchanged_values_skip_writes_and_bursts_coalesce()
+    test_concurrent_sessions_merge_instead_of_clobbering()
+    test_reset_writes_defaults_immediately()
+    print("✅ Settings persistence tests passed")
@@ -0,0 +1,162 @@
+"""
+Test global dedup and the persistent per-recruiter point history (no network; temporary files)
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import os
+import sys
+import tempfile
+import threading
+
+from automation_workflow import AutomationWorkflow
+from benchmark_workflow import build_catalog, SAMPLE_JOB
+from test_offline_workflow import FlakySender
+from utils.gemini_points_generator import GeminiPointsGenerator
+from utils.llm_backend import FakeLLMBackend
+from utils.point_history import INITIAL_CAPACITY, PointHistory, PointHistoryStore
+from utils.text_processor import TextProcessor
+
+SAMPLE = """Java
+• Built REST APIs with Spring Boot
+• Tuned JVM garbage collection
+
+AWS
+• built rest apis with spring boot
+• Tuned  JVM garbage collection
+• Moved batch jobs to Lambda"""
+
+
+def test_global_mode_drops_repeats_across_cycles_and_history_points():
+    processor = TextProcessor()
+    exact = processor.process_text(SAMPLE, 1, dedup='exact')
+    glob = processor.process_text(SAMPLE, 1, dedup='global')
+    print(f"   Global:\n{glob}")
+    assert "Tuned  JVM garbage collection" in exact
+    assert glob.splitlines() == ["Cycle 1:", "Built REST APIs with Spring Boot",
+                                 "Cycle 2:", "Tuned JVM garbage collection",
+                                 "Cycle 3:", "Moved batch jobs to Lambda"]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with PointHistory(Path(tmp) / "r.pth") as history:
+            history.add_points(["• built REST APIs  with Spring Boot"])
+            # Cycle 1 loses its only point and is left out; later cycles are renumbered
+            assert processor.process_text(SAMPLE, 1, dedup='global', history=history).splitlines() == [
+                "Cycle 1:", "Tuned JVM garbage collection", "Cycle 2:", "Moved batch jobs to Lambda"]
+            history.add_points(TextProcessor.cycle_points(glob))
+            try:
+                processor.process_text(SAMPLE, 1, dedup='global', history=history)
+            except ValueError as e:
+                assert "used before" in str(e)
+            else:
+                raise AssertionError("expected ValueError")
+
+
+def test_history_persists_grows_and_is_shared_between_handles():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "r.pth"
+        first = PointHistory(path)
+        second = PointHistory(path)
+        points = [f"Delivered feature {i} ahead of schedule" for i in range(INITIAL_CAPACITY)]
+
+        assert first.add_points(points[:10]) == 10
+        assert points[3] in second  # same mapping, no reload needed
+        assert first.add_points(points[:10] + ["  " + points[0].upper()]) == 0
+
+        assert second.add_points(points) == len(points) - 10  # crosses the load limit: table doubles
+        size = os.path.getsize(path)
+        print(f"   {len(second)} points, {size} bytes")
+        assert size == 32 + 2 * INITIAL_CAPACITY * 8
+
+        first.refresh()
+        assert len(first) == len(points) and all(p in first for p in points[::97])
+        assert "Never sent" not in first
+        first.close()
+        second.close()
+
+        with PointHistory(path) as reopened:
+            assert len(reopened) == len(points) and points[-1] in reopened
+
+        path.write_bytes(b"not a history file" * 4)
+        try:
+            PointHistory(path)
+        except ValueError as e:
+            assert "not a point history" in str(e)
+        else:
+            raise AssertionError("expected ValueError")
+
+
+def test_lookups_are_safe_while_another_thread_refreshes():
+    """Job-runner workers share a handle: a lookup must never see the map refresh() is replacing."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "r.pth"
+        shared = PointHistory(path)
+        writer = PointHistory(path)
+        points = [f"Shipped release {i}" for i in range(4 * INITIAL_CAPACITY)]
+        writer.add_points(points[:1])
+        shared.refresh()
+        errors = []
+        done = threading.Event()
+
+        def look_up():
+            try:
+                while not done.is_set():
+                    assert points[0] in shared and len(shared) >= 1
+            except Exception as e:
+                errors.append(e)
+
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        readers = [threading.Thread(target=look_up) for _ in range(4)]
+        try:
+            for reader in readers:
+                reader.start()
+            for i in range(1, len(points), 64):
+                writer.add_points(points[i:i + 64])  # grows the table: a new file to remap
+                shared.refresh()
+        finally:
+            done.set()
+            for reader in readers:
+                reader.join()
+            sys.setswitchinterval(interval)
+        print(f"   {len(shared)} points, reader errors: {errors[:1]}")
+        assert not errors and len(shared) == len(points)
+        shared.close()
+        writer.close()
+
+
+def test_workflow_skips_points_already_sent_to_recruiter():
+    output = tempfile.mkdtemp()
+    store = PointHistoryStore(Path(output) / "point_history")
+    workflow = AutomationWorkflow(
+        points_generator=GeminiPointsGenerator(backend=FakeLLMBackend()),
+        catalog=build_catalog(),
+        output_folder=output,
+        point_history=store
+    )
+    workflow.email_sender = FlakySender(failures=0)
+    job = dict(job_description=SAMPLE_JOB, points_per_tech=2, global_dedup=True)
+
+    success, first = workflow.run_workflow(job_title="Backend Engineer", recruiter_email="R@example.com", **job)
+    assert success, first["errors"]
+    sent_first = len(store.get("r@example.com"))
+
+    # Mostly the same generated points for another role: only the new ones go out
+    success, second = workflow.run_workflow(job_title="Platform Engineer", recruiter_email="r@example.com", **job)
+    assert success, second["errors"]
+    new_points = len(store.get("r@example.com")) - sent_first
+    print(f"   First run: {sent_first} points, second run: {new_points} new")
+    assert sent_first > 0 and 0 < new_points < sent_first
+    assert store.path_for("R@example.com") == store.path_for(" r@example.com")
+    store.close()
+
+
+if __name__ == "__main__":
+    test_global_mode_drops_repeats_across_cycles_and_history_points()
+    test_history_persists_grows_and_is_shared_between_handles()
+    test_lookups_are_safe_while_another_thread_refreshes()
+    test_workflow_skips_points_already_sent_to_recruiter()
+    print("✅ Point history tests passed")
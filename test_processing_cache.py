@@ -0,0 +1,71 @@
+"""
+Test the processing cache used by Tab 1 and Tab 2 (no network)
+"""
+
+import io
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from utils.batch_processor import BatchProcessor
+from utils.processing_cache import ProcessingCache
+
+SAMPLE = """Heading 1
+• Point 1
+• Point 2
+• Point 1
+
+Heading 2
+• Item A
+• Item B"""
+
+
+class NamedText(io.BytesIO):
+    """Stand-in for Streamlit's UploadedFile (a named BytesIO)."""
+
+    def __init__(self, name, content):
+        super().__init__(content.encode('utf-8'))
+        self.name = name
+
+
+def test_repeat_runs_skip_pipeline_and_exports():
+    """Same input + settings reuse text and exports; changing a setting is a new entry."""
+    processor = BatchProcessor(cache=ProcessingCache())
+    calls = []
+    original = processor.text_processor.build_cycles
+    processor.text_processor.build_cycles = lambda *args, **kwargs: calls.append(args) or original(*args, **kwargs)
+
+    first = processor.process_files([NamedText("a.txt", SAMPLE)], 2, dedup_enabled=True)
+    second = processor.process_files([NamedText("copy.txt", SAMPLE)], 2, dedup_enabled=True)
+    print(f"   Stats: {processor.cache.stats}")
+    assert len(calls) == 1
+    assert first[0]["a"] == second[0]["copy"]
+    assert processor.cache.stats["export_renders"] == 2  # one DOCX + one PDF
+
+    key, text = processor.process_text(SAMPLE, 2, dedup_enabled=False)
+    assert len(calls) == 2
+    assert key != processor.process_text(SAMPLE, 3, dedup_enabled=False)[0]
+    assert processor.export_docx(key, text)[:2] == b"PK"
+    assert processor.export_pdf(key, text)[:4] == b"%PDF"
+
+
+def test_cache_is_bounded_by_bytes_with_lru_eviction():
+    cache = ProcessingCache(max_bytes=1000)
+    keys = [cache.make_key(f"text {i}", 2, None) for i in range(4)]
+    for i, key in enumerate(keys[:3]):
+        cache.get_or_process(key, lambda i=i: "x" * 200)
+        cache.get_export(key, "docx", "x" * 200, lambda text: b"d" * 100)
+    assert cache.nbytes == 900 and len(cache) == 3
+
+    cache.get_or_process(keys[0], lambda: "unused")  # touch: keys[1] is now least recent
+    cache.get_or_process(keys[3], lambda: "y" * 200)
+    assert cache.nbytes <= 1000
+    assert cache.stats["evictions"] == 1
+    assert cache.get_or_process(keys[1], lambda: "recomputed") == "recomputed"
+
+
+if __name__ == "__main__":
+    test_repeat_runs_skip_pipeline_and_exports()
+    test_cache_is_bounded_by_bytes_with_lru_eviction()
+    print("✅ Processing cache tests passed")
@@ -0,0 +1,84 @@
+"""
+Test job description compaction in the prompt builder (no network)
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from utils.prompt_builder import PromptBuilder
+
+REQUIREMENTS_JD = """Senior ML Engineer
+
+Requirements:
+- Strong Python skills
+- Experience with computer vision (OpenCV/PyTorch)
+- Provisioning Kafka on AWS with Terraform
+- Comfortable with Git revisions/supervision of junior engineers
+
+Legal Tech Experience
+- Built document review pipelines for law firms
+
+Diversity Of Data Sources
+- Ingested clickstream, CRM and IoT data"""
+
+BOILERPLATE_JD = """Backend Engineer
+
+Responsibilities:
+- Design REST APIs in Go. We offer medical, dental and vision insurance.
+
+Benefits & Perks
+- 401(k) matching
+- Unlimited PTO
+
+Equal Opportunity Employer:
+We are an equal opportunity employer and consider applicants without regard to race.
+
+Requirements:
+- Five years of Go. Click apply to join us."""
+
+
+def test_requirement_lines_survive_compaction():
+    compacted, stats = PromptBuilder().compact_job_description(REQUIREMENTS_JD)
+    print(f"   Stats: {stats}")
+    for line in REQUIREMENTS_JD.splitlines():
+        if line.strip():
+            assert line.strip() in compacted, line
+    assert stats["sections_removed"] == 0 and stats["sentences_removed"] == 0
+
+
+def test_boilerplate_sections_and_sentences_are_removed():
+    compacted, stats = PromptBuilder().compact_job_description(BOILERPLATE_JD)
+    print(f"   Compacted:\n{compacted}")
+    assert "Design REST APIs in Go." in compacted and "Five years of Go." in compacted
+    for boilerplate in ("dental", "401(k)", "PTO", "Benefits", "equal opportunity", "Click apply"):
+        assert boilerplate.lower() not in compacted.lower(), boilerplate
+    assert stats["sections_removed"] == 2 and stats["sentences_removed"] == 2
+
+
+def test_headings_match_whole_line_only():
+    builder = PromptBuilder()
+    for heading in ("Benefits:", "What We Offer", "EEO Statement", "Legal", "Privacy Notice",
+                    "Diversity, Equity & Inclusion", "About Us"):
+        assert builder._is_boilerplate_heading(heading), heading
+    for heading in ("Legal Tech Experience", "Privacy Engineering", "Benefits Platform Team",
+                    "Diversity Of Data Sources", "About The Role"):
+        assert not builder._is_boilerplate_heading(heading), heading
+
+
+def test_single_paragraph_over_budget_is_cut_not_dropped():
+    paragraph = " ".join(f"Build service {i} in Go with gRPC and Postgres" for i in range(200))
+    builder = PromptBuilder()
+    compacted, stats = builder.compact_job_description(paragraph, max_tokens=50)
+    print(f"   Stats: {stats}")
+    assert stats["truncated"] and compacted
+    assert paragraph.startswith(compacted) and len(compacted) <= 50 * builder.CHARS_PER_TOKEN
+
+
+if __name__ == "__main__":
+    test_requirement_lines_survive_compaction()
+    test_boilerplate_sections_and_sentences_are_removed()
+    test_headings_match_whole_line_only()
+    test_single_paragraph_over_budget_is_cut_not_dropped()
+    print("✅ Prompt builder tests passed")
@@ -0,0 +1,39 @@
+"""
+Test that the app's cold start stays lean (no network; runs main.py in fresh interpreters)
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from benchmark_startup import measure_first_render, measure_import, parse_importtime
+
+
+def test_importtime_parser_finds_direct_imports():
+    stderr = "\n".join([
+        "import time: self [us] | cumulative | imported package",
+        "import time:       100 |        100 |     leaf",
+        "import time:       200 |        300 |   heavy",
+        "import time:        50 |         50 |   light",
+        "import time:        10 |        360 | main",
+    ])
+    result = parse_importtime(stderr)
+    assert result["total_ms"] == 0.36
+    assert result["children"] == [("heavy", 0.3), ("light", 0.05)]
+
+
+def test_first_render_does_not_load_deferred_dependencies():
+    """pandas, python-docx, reportlab, groq etc. load only when a tab uses them."""
+    imported = measure_import()
+    rendered = measure_first_render()
+    print(f"   import main: {imported['total_ms']:.0f} ms, first render: {rendered['ms']:.0f} ms")
+    assert imported["loaded"] == []
+    assert rendered["loaded"] == []
+    assert rendered["exceptions"] == []
+
+
+if __name__ == "__main__":
+    test_importtime_parser_finds_direct_imports()
+    test_first_render_does_not_load_deferred_dependencies()
+    print("✅ Startup tests passed")
@@ -0,0 +1,124 @@
+"""
+Test the memory-mapped, encoding-sniffing reader for uploaded text (no network; temporary files)
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import codecs
+import io
+import tempfile
+
+from test_processing_cache import NamedText
+from utils.batch_processor import BatchProcessor
+from utils.batch_resume_injector import BatchResumeInjector
+from utils.processing_cache import ProcessingCache
+from utils.text_input import TextSource, sniff_encoding
+from utils.text_processor import TextProcessor
+
+SAMPLE = """Héading 1
+- Café opening hours
+- Naïve Bayes model
+
+Heading 2
+- Item A
+- Item B"""
+
+
+def test_encoding_is_sniffed_and_lines_match_a_full_decode():
+    assert sniff_encoding(SAMPLE.encode("utf-8")) == "utf-8"
+    assert sniff_encoding("é".encode("utf-8")[:1]) == "utf-8"  # cut mid-character: not an error in a prefix
+    assert sniff_encoding("é".encode("utf-8")[:1], complete=True) == "latin-1"
+    assert sniff_encoding(SAMPLE.encode("latin-1")) == "latin-1"
+
+    cases = {
+        "utf-8": SAMPLE.encode("utf-8"),
+        "latin-1": SAMPLE.encode("latin-1"),
+        "utf-8-sig": codecs.BOM_UTF8 + SAMPLE.replace("\n", "\r\n").encode("utf-8"),
+        "utf-16": (SAMPLE + "\n").encode("utf-16"),
+    }
+    for encoding, data in cases.items():
+        source = TextSource.open(data)
+        text = source.read_text()
+        assert source.encoding == encoding and text.replace("\r", "") == SAMPLE.rstrip("\n") + (
+            "\n" if encoding == "utf-16" else "")
+        assert list(source.iter_lines()) == text.split("\n")
+    assert list(TextSource.open(b"").iter_lines()) == [""]
+
+    # Valid UTF-8 in the sample, latin-1 further on: only the odd line falls back
+    mixed = b"Heading\n" * 8 + "- Café\n".encode("latin-1") + "• Naïve".encode("utf-8")
+    source = TextSource.open(mixed, sniff_bytes=16)
+    assert source.encoding == "utf-8"
+    assert source.read_text().split("\n")[-2:] == ["- Café", "• Naïve"]
+    assert list(source.iter_lines())[-2:] == ["- Café", "• Naïve"]
+
+
+def test_cycles_are_built_from_lines_in_one_pass():
+    processor = TextProcessor()
+    no_heading = "- lead point one\n- lead point two\n\n- lead point three"
+    for text in (SAMPLE, "Intro sentence that is long enough to not be a heading at all\n" + SAMPLE, no_heading):
+        lines = iter(text.split("\n"))  # single-use: the parser may not go back over it
+        assert processor.build_cycles(lines, 2) == processor.build_cycles(text, 2)
+    assert processor.build_cycles(iter(no_heading.split("\n")), 5).all_points() == [
+        "lead point two", "lead point three"]
+    try:
+        processor.build_cycles(iter(["", "   ", ""]), 1)
+    except ValueError as e:
+        assert "cannot be empty" in str(e)
+    else:
+        raise AssertionError("expected ValueError")
+
+
+def test_large_streams_are_spooled_and_files_are_mapped():
+    data = ("Heading\n" + "• A point long enough to matter\n" * 2000).encode("utf-8")
+
+    upload = NamedText("in_memory.txt", "x")
+    with TextSource.open(upload) as source:
+        assert not source.is_mapped and source.name == "in_memory.txt"
+
+    stream = io.BufferedReader(io.BytesIO(data))  # no shared buffer to reuse
+    with TextSource.open(stream, name="big.txt", spool_threshold=4096) as source:
+        print(f"   Spooled {len(source)} bytes, mapped={source.is_mapped}")
+        assert source.is_mapped and len(source) == len(data)
+        assert source.read_text() == data.decode("utf-8")
+    with TextSource.open(io.BufferedReader(io.BytesIO(data))) as source:
+        assert not source.is_mapped and source.digest() == TextSource.open(data).digest()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "points.txt"
+        path.write_bytes(data)
+        with TextSource.open(path) as source:
+            assert source.is_mapped and source.name == "points.txt"
+            assert sum(1 for _ in source.iter_lines()) == 2002
+        (Path(tmp) / "empty.txt").write_bytes(b"")
+        with TextSource.open(Path(tmp) / "empty.txt") as source:
+            assert len(source) == 0 and source.read_text() == ""
+
+
+def test_uploads_process_like_pasted_text():
+    processor = BatchProcessor(cache=ProcessingCache())
+    key, expected = processor.process_text(SAMPLE, 1)
+
+    # A UTF-8 upload is keyed by its bytes and hits the entry made from the pasted text
+    results = processor.process_files([NamedText("utf8.txt", SAMPLE)], 1)
+    assert results[0]["utf8"][0] == expected and processor.cache.stats["hits"] == 1
+
+    latin = io.BytesIO(SAMPLE.encode("latin-1"))
+    latin.name = "latin.txt"
+    results = processor.process_files([latin], 1)
+    assert results[0]["latin"][0] == expected and processor.cache.stats["misses"] == 2
+
+    latin.seek(0)
+    is_valid, error, text_data = BatchResumeInjector().validate_text_files([latin])
+    assert is_valid, error
+    assert text_data["latin"]["content"] == SAMPLE
+
+
+if __name__ == "__main__":
+    test_encoding_is_sniffed_and_lines_match_a_full_decode()
+    test_cycles_are_built_from_lines_in_one_pass()
+    test_large_streams_are_spooled_and_files_are_mapped()
+    test_uploads_process_like_pasted_text()
+    print("✅ Text input tests passed")
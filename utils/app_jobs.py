@@ -0,0 +1,126 @@
+"""
+App Jobs - Handlers for the long-running work the Streamlit tabs submit to the JobRunner.
+
+Payloads are plain data (names, bytes, strings, numbers) so they pickle into
+the job table and hash the same way for identical input; results are what the
+tabs keep in session state. Handlers import their pipelines on first use, so
+starting the runner doesn't load python-docx, reportlab or the LLM client.
+"""
+
+import io
+import logging
+import threading
+from typing import Dict, Optional
+
+from .job_runner import JobRunner, ProgressCallback
+from .processing_cache import ProcessingCache
+
+logger = logging.getLogger(__name__)
+
+
+class NamedBytes:
+    """Minimal uploaded-file stand-in (name + read() / getvalue()) for BatchProcessor."""
+
+    __slots__ = ('name', 'data')
+
+    def __init__(self, name: str, data: bytes):
+        self.name = name
+        self.data = data
+
+    def read(self) -> bytes:
+        return self.data
+
+    def getvalue(self) -> bytes:
+        return self.data
+
+
+def batch_process_job(payload: Dict, progress: ProgressCallback,
+                      cache: Optional[ProcessingCache] = None):
+    """
+    Tab 2 batch processing.
+
+    Payload: {'files': [(name, bytes)], 'points': int, 'dedup': bool, 'dedup_strictness': 'exact'|'fuzzy'}
+    Returns: BatchProcessor.process_files results
+    """
+    from .batch_processor import BatchProcessor
+
+    processor = BatchProcessor(cache=cache)
+    files = [NamedBytes(name, data) for name, data in payload['files']]
+    return processor.process_files(files, payload['points'], dedup_enabled=payload['dedup'],
+                                   progress=progress,
+                                   dedup_strictness=payload.get('dedup_strictness', 'exact'))
+
+
+def batch_inject_job(payload: Dict, progress: ProgressCallback):
+    """
+    Tab 4 batch injection.
+
+    Payload: {'texts': {name: {'content', 'original_name'}},
+              'resumes': {name: {'bytes': bytes, 'original_name'}},
+              'mapping': {text_name: resume_name}}
+    Returns: {'results': {...}, 'errors': [...]} as from inject_batch
+    """
+    from .batch_resume_injector import BatchResumeInjector
+
+    resumes = {
+        name: {'bytes': io.BytesIO(info['bytes']), 'original_name': info['original_name']}
+        for name, info in payload['resumes'].items()
+    }
+    results, errors = BatchResumeInjector().inject_batch(
+        payload['texts'], resumes, payload['mapping'], progress=progress
+    )
+    return {'results': results, 'errors': errors}
+
+
+def generate_points_job(payload: Dict, progress: ProgressCallback):
+    """
+    Tab 5 points generation.
+
+    Payload: {'job_description', 'job_title', 'num_points'}
+    Returns: {'tech_stacks', 'points', 'usage'}
+    """
+    from .gemini_points_generator import GeminiPointsGenerator
+
+    progress(0.1, "Extracting technologies and generating points")
+    generator = GeminiPointsGenerator()
+    tech_stacks, points = generator.process_job_description(
+        job_description=payload['job_description'],
+        job_title=payload['job_title'],
+        num_points=payload['num_points']
+    )
+    return {'tech_stacks': tech_stacks, 'points': points, 'usage': generator.get_usage_summary()}
+
+
+def register_app_jobs(runner: JobRunner, cache: Optional[ProcessingCache] = None, workflow=None):
+    """
+    Register the app's job kinds on a runner.
+
+    Args:
+        runner: JobRunner to register on
+        cache: Processing cache shared with Tab 1 (batch jobs reuse its entries)
+        workflow: AutomationWorkflow for 'workflow' jobs (default: one is created
+            by the first such job); it keeps per-run state, so its jobs run one at a time
+    """
+    runner.register('batch_process',
+                    lambda payload, progress: batch_process_job(payload, progress, cache),
+                    concurrency=2)
+    runner.register('batch_inject', batch_inject_job, concurrency=2)
+    # LLM output differs between runs: a new submit regenerates instead of reusing the last result
+    runner.register('generate_points', generate_points_job, concurrency=2, reuse_results=False)
+    workflows = [workflow] if workflow is not None else []
+    workflow_lock = threading.Lock()
+
+    def workflow_job(payload: Dict, progress: ProgressCallback):
+        progress(0.05, "Running automation workflow")
+        with workflow_lock:
+            if not workflows:
+                from automation_workflow import AutomationWorkflow
+                from .point_history import PointHistoryStore
+                workflows.append(AutomationWorkflow(point_history=PointHistoryStore()))
+        success, result = workflows[0].run_workflow(**payload)
+        if not success:
+            # Failed runs are not reused by submit(); retrying resumes from the checkpoints
+            raise RuntimeError("; ".join(result.get('errors', [])) or "Automation failed")
+        return result
+
+    runner.register('workflow', workflow_job, concurrency=1, reuse_results=False)
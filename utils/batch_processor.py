@@ -1,52 +1,75 @@
 
 import io
-from typing import List, Dict, Tuple
+import logging
+from typing import Callable, List, Dict, Tuple, Optional, Union
 from pathlib import Path
 from .text_processor import TextProcessor
+from .cycle_document import CycleDocument
 from .export_handler import ExportHandler
 from .deduplicator import PointDeduplicator
+from .processing_cache import ProcessingCache
+from .text_input import TextSource
+
+logger = logging.getLogger(__name__)
 
 class BatchProcessor:
-    def __init__(self):
+    def __init__(self, cache: Optional[ProcessingCache] = None):
+        """
+        Args:
+            cache: Shared processing cache; identical inputs skip processing and export rendering
+        """
         self.text_processor = TextProcessor()
         self.export_handler = ExportHandler()
         self.deduplicator = PointDeduplicator()
+        self.cache = cache or ProcessingCache()
 
-    def _apply_deduplication(self, processed_text: str) -> str:
-        """
-        Apply deduplication to processed content, removing duplicate points within each cycle.
-        Uses the same logic as the single file processor.
+    def process_document(self, content: Union[str, TextSource], points_per_heading: int,
+                         dedup_enabled: bool = False, dedup_strictness: str = 'exact') -> Tuple[str, CycleDocument]:
         """
-        lines = processed_text.split('\n')
-        dedup_lines = []
-        current_section_points = []
+        Process one text through the cache.
         
-        for line in lines:
-            if line.strip().startswith('Cycle'):
-                # If we have accumulated points, deduplicate them
-                if current_section_points:
-                    dedup_points = PointDeduplicator.deduplicate_points_exact(current_section_points)
-                    dedup_lines.extend(dedup_points)
-                    current_section_points = []
-                dedup_lines.append(line)
-            elif line.strip() and not line.strip().startswith(('Cycle', '=')):
-                current_section_points.append(line)
-            else:
-                if current_section_points:
-                    dedup_points = PointDeduplicator.deduplicate_points_exact(current_section_points)
-                    dedup_lines.extend(dedup_points)
-                    current_section_points = []
-                if line.strip():
-                    dedup_lines.append(line)
+        Args:
+            content: Input text, or an uploaded file's TextSource (decoded line by line on a miss)
+            dedup_enabled: Whether to remove duplicate points within each cycle
+            dedup_strictness: 'exact' or 'fuzzy' (near-identical points count as duplicates)
         
-        # Flush any remaining points at the end (especially for Cycle 2+)
-        if current_section_points:
-            dedup_points = PointDeduplicator.deduplicate_points_exact(current_section_points)
-            dedup_lines.extend(dedup_points)
+        Returns:
+            (cache_key, CycleDocument)
+        """
+        dedup_mode = dedup_strictness if dedup_enabled else None
+        key = self.cache.make_key(content, points_per_heading, dedup_mode)
         
-        return '\n'.join(dedup_lines)
-
-    def process_files(self, uploaded_files, points_per_heading, dedup_enabled=False) -> List[Dict[str, Tuple[str, bytes, bytes]]]:
+        lines = content.iter_lines if isinstance(content, TextSource) else lambda: content
+        return key, self.cache.get_or_process(
+            key, lambda: self.text_processor.build_cycles(lines(), points_per_heading, dedup=dedup_mode)
+        )
+    
+    def process_text(self, content: Union[str, TextSource], points_per_heading: int, dedup_enabled: bool = False,
+                     dedup_strictness: str = 'exact') -> Tuple[str, str]:
+        """
+        Like process_document, with the result rendered for display.
+        
+        Returns:
+            (cache_key, processed_text)
+        """
+        key, document = self.process_document(content, points_per_heading, dedup_enabled, dedup_strictness)
+        return key, document.render()
+    
+    def export_docx(self, key: str, processed_text) -> bytes:
+        """DOCX bytes for a processed text or CycleDocument, rendered once per cache entry"""
+        return self.cache.get_export(
+            key, 'docx', processed_text, lambda text: self.export_handler.generate_docx(text).getvalue()
+        )
+    
+    def export_pdf(self, key: str, processed_text) -> bytes:
+        """PDF bytes for a processed text or CycleDocument, rendered once per cache entry"""
+        return self.cache.get_export(
+            key, 'pdf', processed_text, lambda text: self.export_handler.generate_pdf(text).getvalue()
+        )
+    
+    def process_files(self, uploaded_files, points_per_heading, dedup_enabled=False,
+                      progress: Optional[Callable[[float, str], None]] = None,
+                      dedup_strictness: str = 'exact') -> List[Dict[str, Tuple[str, bytes, bytes]]]:
         """
         Process multiple files and return their processed contents along with export formats.
         
@@ -54,6 +77,8 @@ class BatchProcessor:
             uploaded_files: List of file objects to process
             points_per_heading: Number of points to extract per heading per cycle
             dedup_enabled: Whether to remove duplicate points (default: False)
+            progress: Optional progress(fraction, message) callback, called after each file
+            dedup_strictness: 'exact' or 'fuzzy' when dedup_enabled
         
         Returns:
             List of dictionaries mapping filename to (text_content, docx_bytes, pdf_bytes)
@@ -61,40 +86,22 @@ class BatchProcessor:
         """
         results = []
         
-        for uploaded_file in uploaded_files:
+        for index, uploaded_file in enumerate(uploaded_files):
             try:
-                # Read the file content with error handling for encoding
-                file_content = uploaded_file.read()  # Read once
-                try:
-                    content = file_content.decode('utf-8')
-                except UnicodeDecodeError:
-                    # Try alternative encodings if UTF-8 fails
-                    try:
-                        content = file_content.decode('latin-1')
-                    except UnicodeDecodeError:
-                        # Last resort: use UTF-8 with errors='replace' to skip invalid chars
-                        content = file_content.decode('utf-8', errors='replace')
-                
-                # Use pathlib for robust filename handling
-                filename = Path(uploaded_file.name).stem
-                
-                # Process the text
-                processed_text = self.text_processor.process_text(content, points_per_heading)
-                
-                # Apply deduplication if enabled
-                if dedup_enabled and processed_text:
-                    processed_text = self._apply_deduplication(processed_text)
-                
-                # Generate export formats
-                docx_file = self.export_handler.generate_docx(processed_text)
-                pdf_file = self.export_handler.generate_pdf(processed_text)
+                # Raw bytes with a sniffed encoding; large non-memory uploads are spooled and mmapped
+                with TextSource.open(uploaded_file, name=uploaded_file.name) as content:
+                    # Use pathlib for robust filename handling
+                    filename = Path(uploaded_file.name).stem
+                    
+                    # Process the text (cached by input hash, points and dedup mode)
+                    key, document = self.process_document(content, points_per_heading, dedup_enabled, dedup_strictness)
                 
-                # Add to results
+                # Generate export formats straight from the document; text only for display
                 results.append({
                     filename: (
-                        processed_text,
-                        docx_file.getvalue() if docx_file else b'',
-                        pdf_file.getvalue() if pdf_file else b''
+                        document.render(),
+                        self.export_docx(key, document),
+                        self.export_pdf(key, document)
                     )
                 })
                 
@@ -105,5 +112,8 @@ class BatchProcessor:
                     Path(uploaded_file.name).stem: (error_msg, None, None)  # Tuple: (error_str, None, None)
                 })
                 logger.error(f"Error processing {uploaded_file.name}: {e}")
+            
+            if progress:
+                progress((index + 1) / len(uploaded_files), f"Processed {index + 1}/{len(uploaded_files)} files")
                 
         return results
@@ -5,10 +5,11 @@ Supports custom mapping of text files to resume files.
 
 import io
 import logging
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, List, Tuple, Optional
 from pathlib import Path
 from .resume_injector import ResumeInjector
 from .security_utils import FileUploadValidator, InputSanitizer
+from .text_input import TextSource
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
@@ -97,16 +98,10 @@ class BatchResumeInjector:
                     return False, f"❌ Invalid filename: {sanitized_filename}", {}
                 
                 filename = sanitized_filename
-                content = text_file.read()
                 
-                # Try UTF-8 first, then latin-1, then with replacement
-                try:
-                    text_content = content.decode('utf-8')
-                except UnicodeDecodeError:
-                    try:
-                        text_content = content.decode('latin-1')
-                    except UnicodeDecodeError:
-                        text_content = content.decode('utf-8', errors='replace')
+                # Encoding is sniffed from the start of the file; decoded once
+                with TextSource.open(text_file, name=text_file.name) as source:
+                    text_content = source.read_text()
                 
                 text_data[filename] = {
                     'file': text_file,
@@ -125,15 +120,18 @@ class BatchResumeInjector:
         self,
         text_data: Dict,
         resume_data: Dict,
-        mapping: Dict[str, str]
+        mapping: Dict[str, str],
+        progress: Optional[Callable[[float, str], None]] = None
     ) -> Tuple[Dict, List[str]]:
         """
         Perform batch injection of text files into resume files.
         
         Args:
-            text_data: Dict with {filename: {content, original_name, file}}
+            text_data: Dict with {filename: {content, original_name, file}}; content is
+                processed text or a CycleDocument
             resume_data: Dict with {filename: {bytes, bookmarks, original_name, file}}
             mapping: Dict with {text_filename: resume_filename}
+            progress: Optional progress(fraction, message) callback, called after each pair
         
         Returns:
             Tuple of (results, errors)
@@ -145,7 +143,9 @@ class BatchResumeInjector:
         
         logger.debug(f"Starting batch injection with {len(mapping)} pairs")
         
-        for text_name, resume_name in mapping.items():
+        for index, (text_name, resume_name) in enumerate(mapping.items()):
+            if progress:
+                progress(index / len(mapping), f"Injecting {text_name} → {resume_name}")
             try:
                 if text_name not in text_data:
                     errors.append(f"⚠️ Text file '{text_name}' not found in uploaded files")
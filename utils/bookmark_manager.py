@@ -8,7 +8,6 @@ import json
 import os
 import logging
 from pathlib import Path
-from docx import Document
 from typing import Dict, List, Tuple
 import re
 
@@ -38,6 +37,9 @@ class BookmarkManager:
         Auto-detect all bookmarks in a document.
         Returns list of bookmark names in order found (preserving duplicates with suffixes).
         """
+        # python-docx is only needed here; profile management works without loading it
+        from docx import Document
+        
         try:
             doc = Document(resume_bytes)
             bookmarks = []
@@ -0,0 +1,115 @@
+"""
+Cycle Document - Structured result of cycle processing
+
+TextProcessor builds a CycleDocument instead of a joined string, and the export,
+injection and caching stages read its cycles directly. Text is only rendered
+where it is shown or saved (the UI, .txt downloads, checkpoints), so no stage
+has to split the text back into lines or guess which lines are cycle headers.
+
+A document is treated as immutable once built: render() is cached.
+"""
+
+import re
+from typing import Dict, Iterator, List, Optional
+
+CYCLE_HEADER = re.compile(r'^Cycle (\d+):$')
+
+
+class Cycle:
+    """One cycle: its 1-based number and its points (bullet symbols already removed)."""
+
+    __slots__ = ("number", "points")
+
+    def __init__(self, number: int, points: List[str]):
+        self.number = number
+        self.points = points
+
+    @property
+    def heading(self) -> str:
+        return f"Cycle {self.number}:"
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Cycle):
+            return NotImplemented
+        return self.number == other.number and self.points == other.points
+
+    def __repr__(self) -> str:
+        return f"Cycle({self.number}, {len(self.points)} points)"
+
+
+class CycleDocument:
+    """Ordered cycles of points, rendered to text on demand."""
+
+    __slots__ = ("cycles", "_text")
+
+    def __init__(self, cycles: Optional[List[Cycle]] = None):
+        self.cycles: List[Cycle] = cycles or []
+        self._text: Optional[str] = None
+
+    def add_cycle(self, points: List[str]) -> Cycle:
+        """Append a cycle numbered after the last one."""
+        cycle = Cycle(len(self.cycles) + 1, points)
+        self.cycles.append(cycle)
+        self._text = None
+        return cycle
+
+    def render(self) -> str:
+        """The processed text ("Cycle N:" followed by its points, one per line)."""
+        if self._text is None:
+            lines = []
+            for cycle in self.cycles:
+                lines.append(cycle.heading)
+                lines.extend(cycle.points)
+            self._text = "\n".join(lines)
+        return self._text
+
+    __str__ = render
+
+    def points_by_cycle(self) -> Dict[int, List[str]]:
+        """{cycle number: points}"""
+        return {cycle.number: cycle.points for cycle in self.cycles}
+
+    def all_points(self) -> List[str]:
+        """Every point in order across all cycles."""
+        return [point for cycle in self.cycles for point in cycle.points]
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate size of the document (its rendered UTF-8 text)."""
+        return len(self.render().encode("utf-8"))
+
+    @classmethod
+    def parse(cls, text: str) -> "CycleDocument":
+        """
+        Rebuild a document from rendered text (e.g. a saved checkpoint).
+
+        Every "Cycle N:" line starts a cycle and every other non-empty line is a
+        point of the current one; lines before the first header are ignored.
+        """
+        document = cls()
+        current = None
+        for line in text.split("\n"):
+            stripped = line.strip()
+            if not stripped:
+                continue
+            match = CYCLE_HEADER.match(stripped)
+            if match:
+                current = Cycle(int(match.group(1)), [])
+                document.cycles.append(current)
+            elif current is not None:
+                current.points.append(stripped)
+        return document
+
+    def __iter__(self) -> Iterator[Cycle]:
+        return iter(self.cycles)
+
+    def __len__(self) -> int:
+        return len(self.cycles)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, CycleDocument):
+            return NotImplemented
+        return self.cycles == other.cycles
+
+    def __repr__(self) -> str:
+        return f"CycleDocument({len(self.cycles)} cycles, {sum(len(c.points) for c in self.cycles)} points)"
@@ -3,9 +3,82 @@ Point deduplication and cleanup utilities.
 Provides options to remove duplicate points and clean formatting.
 """
 
-from typing import List, Set
+from typing import Container, List, Optional, Set, Union
+import hashlib
 import re
 
+DEDUP_MODES = ('exact', 'fuzzy', 'global')
+
+
+def point_digest(point: str) -> int:
+    """
+    64-bit hash of a normalized point (case, bullets and spacing ignored), never 0.
+    
+    Used by 'global' dedup and the persistent point history.
+    """
+    normalized = PointDeduplicator._normalize_point(re.sub(r'^\s*(?:[•*+-]|\d+[.)]|\([a-z0-9]\))\s+', '', point))
+    digest = int.from_bytes(hashlib.blake2b(normalized.encode('utf-8'), digest_size=8).digest(), 'little')
+    return digest or 1
+
+
+class DedupFilter:
+    """
+    Incremental duplicate filter: add(point) is False when the point duplicates one already added.
+    
+    'exact' compares points case-insensitively after stripping; 'fuzzy' also drops
+    bullets and extra whitespace and treats points at least similarity_threshold
+    similar as duplicates. Seen points are kept tokenized, so each new point costs
+    one pass over the points before it instead of re-splitting them. 'global'
+    keeps only the normalized digest of each point (point_digest), so membership
+    is O(1) and one filter can span every cycle of a run.
+    
+    history (e.g. a PointHistory) holds digests of points already used elsewhere;
+    points found there are duplicates in every mode.
+    """
+    
+    __slots__ = ('mode', 'similarity_threshold', 'history', '_seen', '_tokens')
+    
+    def __init__(self, mode: str = 'exact', similarity_threshold: float = 0.95,
+                 history: Optional[Container[int]] = None):
+        if mode not in DEDUP_MODES:
+            raise ValueError(f"Unknown deduplication mode '{mode}' (expected one of {', '.join(DEDUP_MODES)})")
+        self.mode = mode
+        self.similarity_threshold = similarity_threshold
+        self.history = history
+        self._seen: Set[Union[str, int]] = set()
+        self._tokens = []
+    
+    def add(self, point: str) -> bool:
+        digest = point_digest(point) if self.mode == 'global' or self.history is not None else None
+        if self.history is not None and point.strip() and digest in self.history:
+            return False
+        
+        if self.mode == 'global':
+            if digest in self._seen:
+                return False
+            self._seen.add(digest)
+            return True
+        
+        if self.mode == 'exact':
+            key = point.strip().lower()
+            if key in self._seen:
+                return False
+            self._seen.add(key)
+            return True
+        
+        normalized = PointDeduplicator._normalize_point(point)
+        # Empty points never count as duplicates (their similarity is 0)
+        if normalized and normalized in self._seen:
+            return False
+        words = normalized.split()
+        word_set = set(words)
+        for seen_words, seen_set in self._tokens:
+            if PointDeduplicator._token_similarity(words, word_set, seen_words, seen_set) >= self.similarity_threshold:
+                return False
+        self._seen.add(normalized)
+        self._tokens.append((words, word_set))
+        return True
+
 
 class PointDeduplicator:
     """Handles deduplication and cleanup of extracted points."""
@@ -23,28 +96,8 @@ class PointDeduplicator:
         Returns:
             List of deduplicated points
         """
-        if not points:
-            return points
-        
-        unique_points = []
-        seen_normalized = set()
-        
-        for point in points:
-            normalized = PointDeduplicator._normalize_point(point)
-            
-            # Check if this point is similar to any seen point
-            is_duplicate = False
-            for seen in seen_normalized:
-                similarity = PointDeduplicator._calculate_similarity(normalized, seen)
-                if similarity >= similarity_threshold:
-                    is_duplicate = True
-                    break
-            
-            if not is_duplicate:
-                unique_points.append(point)
-                seen_normalized.add(normalized)
-        
-        return unique_points
+        dedup_filter = DedupFilter('fuzzy', similarity_threshold)
+        return [point for point in points if dedup_filter.add(point)]
     
     @staticmethod
     def deduplicate_points_exact(points: List[str]) -> List[str]:
@@ -57,16 +110,8 @@ class PointDeduplicator:
         Returns:
             List of deduplicated points
         """
-        seen = set()
-        unique_points = []
-        
-        for point in points:
-            normalized = point.strip().lower()
-            if normalized not in seen:
-                seen.add(normalized)
-                unique_points.append(point)
-        
-        return unique_points
+        dedup_filter = DedupFilter('exact')
+        return [point for point in points if dedup_filter.add(point)]
     
     @staticmethod
     def _normalize_point(text: str) -> str:
@@ -96,17 +141,19 @@ class PointDeduplicator:
         # Tokenize into words
         words1 = str1.split()
         words2 = str2.split()
-        
+        return PointDeduplicator._token_similarity(words1, set(words1), words2, set(words2))
+    
+    @staticmethod
+    def _token_similarity(words1: List[str], word_set1: Set[str], words2: List[str], word_set2: Set[str]) -> float:
+        """_calculate_similarity on already tokenized strings."""
         if not words1 or not words2:
             return 0.0
         
         # Count matching words (treating as bag of words for robustness)
-        common_words = sum(1 for word in words1 if word in words2)
+        common_words = sum(1 for word in words1 if word in word_set2)
         max_len = max(len(words1), len(words2))
         
         # Jaccard similarity: intersection / union
-        word_set1 = set(words1)
-        word_set2 = set(words2)
         intersection = len(word_set1 & word_set2)
         union = len(word_set1 | word_set2)
         jaccard = intersection / union if union > 0 else 0.0
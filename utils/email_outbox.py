@@ -0,0 +1,515 @@
+"""
+Email Outbox - Durable local queue for outgoing email.
+
+Messages are written to a SQLite database and sent by background workers, so
+callers (Streamlit tabs, the automation workflow) enqueue and return at once
+and poll for status instead of blocking on SMTP.
+
+- Templates and attachments are stored once and shared by every recipient
+- Each message has a dedup key; enqueueing the same key twice is a no-op
+- Per-provider concurrency and rate limits (per-minute and per-day caps)
+- Transient failures are retried with exponential backoff
+"""
+
+import hashlib
+import json
+import logging
+import random
+import smtplib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .email_sender import DeliveryUncertainError, EmailSender, MessageTemplate, SendGridError
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimit:
+    """Send caps for one provider (None = unlimited)"""
+
+    __slots__ = ('per_minute', 'per_day')
+
+    def __init__(self, per_minute: Optional[int] = None, per_day: Optional[int] = None):
+        self.per_minute = per_minute
+        self.per_day = per_day
+
+
+# Conservative defaults below the providers' published sending limits
+DEFAULT_RATE_LIMITS = {
+    'gmail': RateLimit(per_minute=20, per_day=500),
+    'outlook': RateLimit(per_minute=30, per_day=300),
+    'sendgrid': RateLimit(per_minute=600),
+}
+
+DEFAULT_CONCURRENCY = {'gmail': 2, 'outlook': 2, 'sendgrid': 4}
+
+STATUSES = ['queued', 'sending', 'sent', 'failed', 'interrupted']
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    sha256 TEXT PRIMARY KEY,
+    content BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS templates (
+    id TEXT PRIMARY KEY,
+    subject TEXT NOT NULL,
+    body TEXT NOT NULL,
+    from_name TEXT,
+    attachments TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    dedup_key TEXT UNIQUE NOT NULL,
+    provider TEXT NOT NULL,
+    recipient TEXT NOT NULL,
+    template_id TEXT NOT NULL REFERENCES templates(id),
+    batch_id TEXT,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    next_attempt_at REAL NOT NULL,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    sent_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_messages_ready ON messages(status, provider, next_attempt_at);
+CREATE INDEX IF NOT EXISTS idx_messages_batch ON messages(batch_id);
+CREATE INDEX IF NOT EXISTS idx_messages_sent ON messages(provider, sent_at);
+"""
+
+
+def is_permanent_error(error: Exception) -> bool:
+    """Errors that will fail again on retry (bad address, rejected auth, 5xx replies)."""
+    if isinstance(error, ValueError):
+        return True
+    if isinstance(error, SendGridError):
+        return 400 <= error.status < 500 and error.status != 429
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(500 <= code < 600 for code, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 500 <= error.smtp_code < 600
+    return False
+
+
+class EmailOutbox:
+    """SQLite-backed outbox with a background worker pool."""
+
+    def __init__(self, db_path: str = "./automation_output/outbox.db",
+                 rate_limits: Optional[Dict[str, RateLimit]] = None,
+                 concurrency: Optional[Dict[str, int]] = None,
+                 max_attempts: int = 5, backoff_base: float = 30.0,
+                 backoff_max: float = 3600.0, poll_interval: float = 1.0):
+        """
+        Args:
+            db_path: SQLite database file (created if missing)
+            rate_limits: {provider: RateLimit}, merged over DEFAULT_RATE_LIMITS
+            concurrency: {provider: max in-flight sends}, merged over DEFAULT_CONCURRENCY
+            max_attempts: Attempts before a message is marked failed
+            backoff_base: Delay in seconds before the first retry (doubles per attempt)
+            backoff_max: Maximum retry delay in seconds
+            poll_interval: Seconds idle workers wait before checking for due messages
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.rate_limits = {**DEFAULT_RATE_LIMITS, **(rate_limits or {})}
+        self.concurrency = {**DEFAULT_CONCURRENCY, **(concurrency or {})}
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.poll_interval = poll_interval
+
+        self._senders: Dict[str, EmailSender] = {}
+        self._in_flight: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._workers: List[threading.Thread] = []
+        self._templates: "OrderedDict[str, MessageTemplate]" = OrderedDict()
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    # ---- Database helpers --------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        """Write transaction that takes the database lock up front."""
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            yield conn
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    # ---- Enqueueing --------------------------------------------------------
+
+    @staticmethod
+    def _store_template(conn: sqlite3.Connection, template: MessageTemplate) -> str:
+        """Store a template (and its attachment blobs) once; returns its content hash."""
+        attachments = []
+        for filename, payload in template.attachments:
+            digest = hashlib.sha256(payload).hexdigest()
+            conn.execute("INSERT OR IGNORE INTO blobs (sha256, content) VALUES (?, ?)",
+                         (digest, payload))
+            attachments.append([filename, digest])
+
+        attachments_json = json.dumps(attachments)
+        template_id = hashlib.sha256(json.dumps(
+            [template.subject, template.body, template.from_name, attachments]
+        ).encode('utf-8')).hexdigest()
+        conn.execute(
+            """INSERT OR IGNORE INTO templates (id, subject, body, from_name, attachments, created_at)
+               VALUES (?, ?, ?, ?, ?, ?)""",
+            (template_id, template.subject, template.body, template.from_name,
+             attachments_json, time.time())
+        )
+        return template_id
+
+    def enqueue_many(self, provider: str, template: MessageTemplate, recipients: List[str],
+                     batch_id: Optional[str] = None,
+                     dedup_keys: Optional[List[str]] = None) -> List[Tuple[int, bool]]:
+        """
+        Queue one message per recipient.
+
+        Args:
+            provider: Provider name ('gmail', 'outlook', 'sendgrid') - selects the
+                registered sender, rate limit and concurrency
+            template: Message shared by all recipients
+            recipients: Recipient addresses
+            batch_id: Optional group ID for polling status of this send
+            dedup_keys: Optional key per recipient (default: provider + recipient +
+                template content, so an identical resend is skipped)
+
+        Returns:
+            (message_id, created) per recipient; created is False for duplicates
+        """
+        provider = provider.lower()
+        now = time.time()
+        results = []
+        with self._transaction() as conn:
+            template_id = self._store_template(conn, template)
+            for index, recipient in enumerate(recipients):
+                key = dedup_keys[index] if dedup_keys else f"{provider}:{recipient.lower()}:{template_id}"
+                cursor = conn.execute(
+                    """INSERT OR IGNORE INTO messages
+                       (dedup_key, provider, recipient, template_id, batch_id, max_attempts,
+                        next_attempt_at, created_at, updated_at)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                    (key, provider, recipient, template_id, batch_id, self.max_attempts, now, now, now)
+                )
+                if cursor.rowcount:
+                    results.append((cursor.lastrowid, True))
+                else:
+                    row = conn.execute("SELECT id FROM messages WHERE dedup_key = ?", (key,)).fetchone()
+                    results.append((row['id'], False))
+
+        created = sum(1 for _, new in results if new)
+        logger.info(f"Outbox: queued {created} message(s) for {provider}"
+                    f" ({len(results) - created} duplicate(s) skipped)")
+        self._wake.set()
+        return results
+
+    def enqueue(self, provider: str, recipient: str, template: MessageTemplate,
+                batch_id: Optional[str] = None, dedup_key: Optional[str] = None) -> Tuple[int, bool]:
+        """Queue a single message; returns (message_id, created)."""
+        return self.enqueue_many(provider, template, [recipient], batch_id,
+                                 [dedup_key] if dedup_key else None)[0]
+
+    # ---- Workers -----------------------------------------------------------
+
+    def register_sender(self, provider: str, sender: EmailSender):
+        """Attach the sender used for a provider's messages (credentials stay in memory)."""
+        with self._lock:
+            previous = self._senders.get(provider.lower())
+            self._senders[provider.lower()] = sender
+        if previous is not None and previous is not sender:
+            previous.close()
+        self._wake.set()
+
+    def start(self, workers: Optional[int] = None):
+        """Start worker threads; messages interrupted by a previous crash are flagged."""
+        if self._workers:
+            return
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute(
+                """UPDATE messages SET status = 'interrupted', updated_at = ?,
+                       last_error = 'Process stopped while sending; check the sent folder, then retry'
+                   WHERE status = 'sending'""",
+                (now,)
+            )
+
+        self._stop.clear()
+        count = workers or sum(self.concurrency.values())
+        for index in range(count):
+            thread = threading.Thread(target=self._worker, name=f"outbox-{index}", daemon=True)
+            thread.start()
+            self._workers.append(thread)
+
+    def stop(self, timeout: float = 10.0):
+        """Stop workers after their current send and close sender connections."""
+        self._stop.set()
+        self._wake.set()
+        for thread in self._workers:
+            thread.join(timeout)
+        self._workers = []
+        with self._lock:
+            senders = list(self._senders.values())
+        for sender in senders:
+            sender.close()
+
+    def _rate_allowance(self, conn: sqlite3.Connection, provider: str, now: float) -> Optional[int]:
+        """Messages the provider may still send right now (None = unlimited)."""
+        limit = self.rate_limits.get(provider)
+        if limit is None:
+            return None
+        allowance = None
+        for cap, window in ((limit.per_minute, 60), (limit.per_day, 86400)):
+            if cap is None:
+                continue
+            used = conn.execute(
+                """SELECT COUNT(*) FROM messages WHERE provider = ?
+                   AND (status = 'sending' OR (status = 'sent' AND sent_at >= ?))""",
+                (provider, now - window)
+            ).fetchone()[0]
+            remaining = max(0, cap - used)
+            allowance = remaining if allowance is None else min(allowance, remaining)
+        return allowance
+
+    def _batch_size(self, provider: str) -> int:
+        """Senders with deliver_batch (SendGrid) take many recipients of one template per call."""
+        sender = self._senders.get(provider)
+        if sender is not None and hasattr(sender, 'deliver_batch'):
+            return getattr(sender, 'MAX_PERSONALIZATIONS', 1)
+        return 1
+
+    def _claim(self) -> List[sqlite3.Row]:
+        """Atomically move the next due message(s) of an available provider to 'sending'.
+
+        Batch-capable providers claim further due messages that share the first
+        message's template, up to the sender's batch size and the rate allowance.
+        """
+        with self._lock:
+            providers = [
+                p for p in self._senders
+                if self._in_flight.get(p, 0) < self.concurrency.get(p, 1)
+            ]
+        if not providers:
+            return []
+
+        now = time.time()
+        with self._transaction() as conn:
+            for provider in providers:
+                allowance = self._rate_allowance(conn, provider, now)
+                if allowance == 0:
+                    continue
+                row = conn.execute(
+                    """SELECT * FROM messages WHERE status = 'queued' AND provider = ?
+                       AND next_attempt_at <= ? ORDER BY next_attempt_at, id LIMIT 1""",
+                    (provider, now)
+                ).fetchone()
+                if row is None:
+                    continue
+                rows = [row]
+                batch_size = self._batch_size(provider)
+                if allowance is not None:
+                    batch_size = min(batch_size, allowance)
+                if batch_size > 1:
+                    rows += conn.execute(
+                        """SELECT * FROM messages WHERE status = 'queued' AND provider = ?
+                           AND template_id = ? AND next_attempt_at <= ? AND id != ?
+                           ORDER BY next_attempt_at, id LIMIT ?""",
+                        (provider, row['template_id'], now, row['id'], batch_size - 1)
+                    ).fetchall()
+                with self._lock:
+                    if self._in_flight.get(provider, 0) >= self.concurrency.get(provider, 1):
+                        continue
+                    self._in_flight[provider] = self._in_flight.get(provider, 0) + 1
+                conn.executemany(
+                    """UPDATE messages SET status = 'sending', attempts = attempts + 1, updated_at = ?
+                       WHERE id = ?""",
+                    [(now, r['id']) for r in rows]
+                )
+                return rows
+        return []
+
+    def _load_template(self, template_id: str) -> MessageTemplate:
+        """Templates are cached so every recipient shares one encoded message."""
+        with self._lock:
+            if template_id in self._templates:
+                self._templates.move_to_end(template_id)
+                return self._templates[template_id]
+
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT * FROM templates WHERE id = ?", (template_id,)).fetchone()
+            attachments = []
+            for filename, digest in json.loads(row['attachments']):
+                blob = conn.execute("SELECT content FROM blobs WHERE sha256 = ?", (digest,)).fetchone()
+                attachments.append((filename, bytes(blob['content'])))
+        finally:
+            conn.close()
+
+        template = MessageTemplate(row['subject'], row['body'], attachments, row['from_name'])
+        with self._lock:
+            template = self._templates.setdefault(template_id, template)
+            while len(self._templates) > 16:
+                self._templates.popitem(last=False)
+        return template
+
+    def _backoff(self, attempts: int) -> float:
+        delay = min(self.backoff_max, self.backoff_base * (2 ** (attempts - 1)))
+        return delay * (1 + random.random() * 0.25)
+
+    def _process(self, rows: List[sqlite3.Row]):
+        provider = rows[0]['provider']
+        try:
+            with self._lock:
+                sender = self._senders[provider]
+            error = None
+            try:
+                template = self._load_template(rows[0]['template_id'])
+                if len(rows) > 1:
+                    sender.deliver_batch(template, [row['recipient'] for row in rows])
+                else:
+                    sender.deliver(template, rows[0]['recipient'])
+            except Exception as e:
+                error = e
+
+            now = time.time()
+            with self._transaction() as conn:
+                for row in rows:
+                    self._record_result(conn, row, error, now)
+        finally:
+            with self._lock:
+                self._in_flight[provider] -= 1
+            self._wake.set()
+
+    def _record_result(self, conn: sqlite3.Connection, row: sqlite3.Row,
+                       error: Optional[Exception], now: float):
+        if error is None:
+            conn.execute(
+                """UPDATE messages SET status = 'sent', sent_at = ?, updated_at = ?, last_error = NULL
+                   WHERE id = ?""",
+                (now, now, row['id'])
+            )
+            logger.info(f"Outbox: sent #{row['id']} to {row['recipient']}")
+        elif isinstance(error, DeliveryUncertainError):
+            # May already be delivered: never resend automatically
+            conn.execute(
+                "UPDATE messages SET status = 'interrupted', last_error = ?, updated_at = ? WHERE id = ?",
+                (f"{error}; check the sent folder, then retry", now, row['id'])
+            )
+            logger.error(f"Outbox: #{row['id']} to {row['recipient']} may have been sent: {error}")
+        elif is_permanent_error(error) or row['attempts'] + 1 >= row['max_attempts']:
+            conn.execute(
+                "UPDATE messages SET status = 'failed', last_error = ?, updated_at = ? WHERE id = ?",
+                (str(error), now, row['id'])
+            )
+            logger.error(f"Outbox: #{row['id']} to {row['recipient']} failed: {error}")
+        else:
+            delay = self._backoff(row['attempts'] + 1)
+            conn.execute(
+                """UPDATE messages SET status = 'queued', last_error = ?, next_attempt_at = ?,
+                       updated_at = ? WHERE id = ?""",
+                (str(error), now + delay, now, row['id'])
+            )
+            logger.warning(f"Outbox: #{row['id']} to {row['recipient']} will retry in "
+                           f"{delay:.0f}s: {error}")
+
+    def _worker(self):
+        while not self._stop.is_set():
+            try:
+                rows = self._claim()
+            except Exception as e:
+                logger.error(f"Outbox: error claiming message: {e}")
+                rows = []
+            if not rows:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+                continue
+            self._process(rows)
+
+    # ---- Status ------------------------------------------------------------
+
+    def batch_status(self, batch_id: str) -> Dict[str, int]:
+        """Message counts by status for a batch, plus 'total'."""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT status, COUNT(*) AS n FROM messages WHERE batch_id = ? GROUP BY status",
+                (batch_id,)
+            ).fetchall()
+        finally:
+            conn.close()
+        counts = {status: 0 for status in STATUSES}
+        counts.update({row['status']: row['n'] for row in rows})
+        counts['total'] = sum(row['n'] for row in rows)
+        return counts
+
+    def list_messages(self, batch_ids: Optional[List[str]] = None, limit: int = 200) -> List[Dict]:
+        """Recent messages (optionally only for some batches), newest first."""
+        query = """SELECT id, batch_id, provider, recipient, status, attempts, last_error,
+                          created_at, sent_at FROM messages"""
+        params: list = []
+        if batch_ids is not None:
+            if not batch_ids:
+                return []
+            query += f" WHERE batch_id IN ({', '.join('?' * len(batch_ids))})"
+            params.extend(batch_ids)
+        query += " ORDER BY id DESC LIMIT ?"
+        params.append(limit)
+
+        conn = self._connect()
+        try:
+            return [dict(row) for row in conn.execute(query, params).fetchall()]
+        finally:
+            conn.close()
+
+    def get_message(self, message_id: int) -> Optional[Dict]:
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT * FROM messages WHERE id = ?", (message_id,)).fetchone()
+            return dict(row) if row else None
+        finally:
+            conn.close()
+
+    def retry(self, message_id: int) -> bool:
+        """Requeue a failed or interrupted message."""
+        now = time.time()
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                """UPDATE messages SET status = 'queued', attempts = 0, next_attempt_at = ?, updated_at = ?
+                   WHERE id = ? AND status IN ('failed', 'interrupted')""",
+                (now, now, message_id)
+            )
+        self._wake.set()
+        return cursor.rowcount == 1
+
+    def wait(self, batch_id: str, timeout: float = 60.0) -> Dict[str, int]:
+        """Block until a batch has nothing queued or sending (CLI and tests)."""
+        deadline = time.monotonic() + timeout
+        while True:
+            status = self.batch_status(batch_id)
+            if not status['queued'] and not status['sending']:
+                return status
+            if time.monotonic() >= deadline:
+                return status
+            time.sleep(min(0.05, self.poll_interval))
@@ -3,48 +3,374 @@ Email Sender Module - Send resumes via email without office laptop login
 Supports Gmail (with App Password), Outlook, and SendGrid
 """
 
+import base64
+import email.policy
+import http.client
+import json
+import re
 import smtplib
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
 from email.mime.text import MIMEText
-from email.utils import formatdate
+from email.utils import formataddr, formatdate, make_msgid
+from urllib.parse import urlsplit
 import os
 import logging
-from typing import List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 import io
 
+from .workflow_tracer import trace_span
+
 logger = logging.getLogger(__name__)
 
 
+def _read_payload(file_content) -> bytes:
+    """Attachment content as bytes (BytesIO is read from the start)"""
+    if isinstance(file_content, io.BytesIO):
+        return file_content.getvalue()
+    if isinstance(file_content, (bytes, bytearray, memoryview)):
+        return bytes(file_content)
+    file_content.seek(0)
+    return file_content.read()
+
+
+class MessageTemplate:
+    """Subject, body and attachments shared by every recipient of a bulk send
+    
+    Attachments are read once when the template is created. Senders cache their
+    encoded form of the message on the template (see cached()), so a send to N
+    recipients encodes the attachments and serializes the body only once.
+    """
+    
+    def __init__(self, subject: str, body: str, attachments: List[tuple] = None,
+                 from_name: str = None):
+        self.subject = subject
+        self.body = body
+        self.from_name = from_name
+        self.attachments = [
+            (filename, _read_payload(file_content)) for filename, file_content in (attachments or [])
+        ]
+        self._cache = {}
+        self._lock = threading.Lock()
+    
+    def cached(self, key, build: Callable[[], object]):
+        """Return the cached value for key, building it on first use."""
+        with self._lock:
+            if key not in self._cache:
+                self._cache[key] = build()
+            return self._cache[key]
+
+
 class EmailSender:
     """Base email sender class"""
     
+    def create_template(self, subject: str, body: str, attachments: List[tuple] = None,
+                        from_name: str = None) -> MessageTemplate:
+        """Prepare a message once for sending to many recipients"""
+        return MessageTemplate(subject, body, attachments, from_name)
+    
+    def deliver(self, template: MessageTemplate, recipient: str):
+        """Send a prepared message to one recipient, raising on failure"""
+        if not self.send_template(template, recipient):
+            raise RuntimeError(f"Failed to send email to {recipient}")
+    
+    def send_template(self, template: MessageTemplate, recipient: str) -> bool:
+        """Send a prepared message to one recipient"""
+        return self.send_email(
+            recipient=recipient,
+            subject=template.subject,
+            body=template.body,
+            attachments=template.attachments,
+            from_name=template.from_name
+        )
+    
+    def send_template_many(self, template: MessageTemplate, recipients: List[str],
+                           on_result: Optional[Callable[[int, str, bool], None]] = None) -> List[bool]:
+        """Send a prepared message to each recipient in turn"""
+        results = []
+        for index, recipient in enumerate(recipients):
+            results.append(self.send_template(template, recipient))
+            if on_result:
+                on_result(index, recipient, results[-1])
+        return results
+    
     def send_email(self, recipient: str, subject: str, body: str, 
                    attachments: List[tuple] = None) -> bool:
         """Send email with optional attachments"""
         raise NotImplementedError
+    
+    def send_many(self, messages: List[Dict],
+                  on_result: Optional[Callable[[int, Dict, bool], None]] = None) -> List[bool]:
+        """Send each message dict (send_email keyword arguments) in turn"""
+        results = []
+        for index, message in enumerate(messages):
+            results.append(self.send_email(**message))
+            if on_result:
+                on_result(index, message, results[-1])
+        return results
+    
+    def close(self):
+        """Release any open connections"""
 
 
-class GmailSender(EmailSender):
-    """Gmail SMTP sender using App Password
+class DeliveryUncertainError(smtplib.SMTPException):
+    """The session failed after the message data was sent, so the server may have accepted it"""
+
+
+class _SMTPSession:
+    """An authenticated SMTP connection held by a pool"""
     
-    Setup Instructions:
-    1. Go to myaccount.google.com
-    2. Enable 2-Factor Authentication
-    3. Create App Password (myaccount.google.com/apppasswords)
-    4. Use the 16-character password below
+    __slots__ = ('smtp', 'last_used', 'messages')
+    
+    def __init__(self, smtp: smtplib.SMTP):
+        self.smtp = smtp
+        self.last_used = time.monotonic()
+        self.messages = 0
+
+
+class SMTPSender(EmailSender):
+    """SMTP sender that keeps authenticated sessions open between messages
+    
+    Sessions are pooled: each message borrows an idle session, checks it with
+    NOOP if it has been idle for a while, and reconnects transparently when the
+    server has dropped it (e.g. after an idle timeout).
     """
     
-    def __init__(self, sender_email: str, app_password: str):
+    # Errors that mean the session is dead rather than the message being rejected
+    RECONNECT_ERRORS = (smtplib.SMTPServerDisconnected, ConnectionError, socket.timeout)
+    
+    def __init__(self, sender_email: str, password: str, smtp_server: str, smtp_port: int = 587,
+                 use_tls: bool = True, pool_size: int = 1, timeout: float = 30.0,
+                 noop_after: float = 5.0, max_messages_per_session: int = 100):
+        """
+        Args:
+            sender_email: Login and From address
+            password: SMTP password (or App Password)
+            smtp_server: SMTP host
+            smtp_port: SMTP port (STARTTLS)
+            use_tls: Run STARTTLS before logging in
+            pool_size: Maximum concurrent sessions (used by send_many)
+            timeout: Socket timeout in seconds
+            noop_after: Idle seconds after which a session is checked with NOOP before reuse
+            max_messages_per_session: Recycle a session after this many messages
+        """
         self.sender_email = sender_email
-        self.app_password = app_password
-        self.smtp_server = "smtp.gmail.com"
-        self.smtp_port = 587
+        self.password = password
+        self.smtp_server = smtp_server
+        self.smtp_port = smtp_port
+        self.use_tls = use_tls
+        self.pool_size = max(1, pool_size)
+        self.timeout = timeout
+        self.noop_after = noop_after
+        self.max_messages_per_session = max_messages_per_session
+        
+        self._idle: List[_SMTPSession] = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.pool_size)
+        self.stats = {'connections': 0, 'reconnects': 0, 'noops': 0, 'sent': 0}
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def _count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+    
+    def _connect(self) -> _SMTPSession:
+        """Open, secure and authenticate a new session."""
+        with trace_span("smtp.connect", server=self.smtp_server):
+            smtp = smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=self.timeout)
+            try:
+                if self.use_tls:
+                    smtp.starttls()
+                smtp.login(self.sender_email, self.password)
+            except Exception:
+                self._discard(smtp)
+                raise
+        self._count('connections')
+        return _SMTPSession(smtp)
+    
+    @staticmethod
+    def _discard(smtp: smtplib.SMTP):
+        """Close a session, ignoring errors from an already-dead connection."""
+        try:
+            smtp.quit()
+        except Exception:
+            try:
+                smtp.close()
+            except Exception:
+                pass
+    
+    def _is_alive(self, session: _SMTPSession) -> bool:
+        """NOOP health check for sessions that have been idle."""
+        if time.monotonic() - session.last_used < self.noop_after:
+            return True
+        self._count('noops')
+        try:
+            return session.smtp.noop()[0] == 250
+        except Exception:
+            return False
+    
+    def _acquire(self) -> Tuple[_SMTPSession, bool]:
+        """Borrow a session; returns (session, reused)."""
+        self._slots.acquire()
+        try:
+            while True:
+                with self._lock:
+                    session = self._idle.pop() if self._idle else None
+                if session is None:
+                    return self._connect(), False
+                if self._is_alive(session):
+                    return session, True
+                self._discard(session.smtp)
+                self._count('reconnects')
+        except Exception:
+            self._slots.release()
+            raise
+    
+    def _release(self, session: _SMTPSession, healthy: bool):
+        """Return a session to the pool, or close it if broken or worn out."""
+        try:
+            if healthy and session.messages < self.max_messages_per_session:
+                session.last_used = time.monotonic()
+                with self._lock:
+                    self._idle.append(session)
+            else:
+                self._discard(session.smtp)
+        finally:
+            self._slots.release()
+    
+    def _serialize(self, template: MessageTemplate) -> bytes:
+        """Encode a template once: every header except To/Date/Message-ID, plus the body.
+        
+        The result is already dot-stuffed and CRLF-terminated, ready for DATA.
+        """
+        msg = MIMEMultipart()
+        msg['From'] = formataddr((template.from_name, self.sender_email)) if template.from_name else self.sender_email
+        msg['Subject'] = template.subject
+        
+        # Add body
+        msg.attach(MIMEText(template.body, 'plain'))
+        
+        # Add attachments
+        for filename, payload in template.attachments:
+            self._attach_file(msg, filename, payload)
+        
+        raw = msg.as_bytes(policy=email.policy.SMTP)
+        raw = re.sub(rb'(?m)^\.', b'..', raw)
+        if not raw.endswith(b'\r\n'):
+            raw += b'\r\n'
+        return raw
+    
+    def _stamp(self, recipient: str) -> bytes:
+        """Per-recipient headers prepended to a serialized template."""
+        if not recipient.isascii() or any(c in recipient for c in '\r\n'):
+            raise ValueError(f"Invalid recipient address: {recipient!r}")
+        domain = self.sender_email.rpartition('@')[2] or None
+        return (
+            f"To: {recipient}\r\n"
+            f"Date: {formatdate(localtime=True)}\r\n"
+            f"Message-ID: {make_msgid(domain=domain)}\r\n"
+        ).encode('ascii')
+    
+    @staticmethod
+    def _abort(smtp: smtplib.SMTP, code: int):
+        """End a failed transaction: drop the channel on 421, otherwise RSET so the session stays usable."""
+        if code == 421:
+            smtp.close()
+        else:
+            smtp.rset()
+    
+    def _transmit(self, smtp: smtplib.SMTP, recipient: str, stamp: bytes, payload: bytes):
+        """MAIL/RCPT/DATA for one recipient, writing the shared payload without copying it.
+        
+        Any refusal other than 421 leaves the session reset and reusable. Once the
+        message data is being written, a dropped session or a 421 raises
+        DeliveryUncertainError: the server may already have the message, so it
+        must not be sent again automatically.
+        """
+        code, resp = smtp.mail(self.sender_email)
+        if code != 250:
+            self._abort(smtp, code)
+            raise smtplib.SMTPSenderRefused(code, resp, self.sender_email)
+        
+        code, resp = smtp.rcpt(recipient)
+        if code not in (250, 251):
+            self._abort(smtp, code)
+            if code == 421:
+                raise smtplib.SMTPResponseException(code, resp)
+            raise smtplib.SMTPRecipientsRefused({recipient: (code, resp)})
+        
+        code, resp = smtp.docmd("data")
+        if code != 354:
+            self._abort(smtp, code)
+            raise smtplib.SMTPDataError(code, resp)
+        try:
+            smtp.send(stamp)
+            smtp.send(payload)
+            smtp.send(b".\r\n")
+            code, resp = smtp.getreply()
+        except self.RECONNECT_ERRORS as e:
+            smtp.close()
+            raise DeliveryUncertainError(f"Connection lost after sending the message to {recipient}: {e}") from e
+        if code == 421:
+            smtp.close()
+            raise DeliveryUncertainError(f"Server closed the session after the message to {recipient}: "
+                                         f"{code} {resp!r}")
+        if code != 250:
+            self._abort(smtp, code)
+            raise smtplib.SMTPDataError(code, resp)
+    
+    def deliver(self, template: MessageTemplate, recipient: str):
+        """
+        Send on a pooled session, retrying on a fresh session if a reused one died.
+        
+        Only failures before the message data is written are retried; after that
+        DeliveryUncertainError is raised instead of risking a second copy.
+        """
+        payload = template.cached(('smtp', self.sender_email), lambda: self._serialize(template))
+        stamp = self._stamp(recipient)
+        
+        while True:
+            session, reused = self._acquire()
+            healthy = False
+            try:
+                with trace_span("smtp.send", reused=reused, bytes=len(payload)):
+                    self._transmit(session.smtp, recipient, stamp, payload)
+                session.messages += 1
+                healthy = True
+                self._count('sent')
+                return
+            except self.RECONNECT_ERRORS:
+                if not reused:
+                    raise
+                self._count('reconnects')
+                logger.info(f"SMTP session to {self.smtp_server} was closed, reconnecting")
+            except smtplib.SMTPRecipientsRefused:
+                # One bad address: the transaction was reset, the session is fine
+                healthy = True
+                raise
+            except smtplib.SMTPResponseException as e:
+                # 421: server is closing the channel; the session is unusable.
+                # Other refusals were reset by _transmit, so the session goes back.
+                if e.smtp_code != 421 or not reused:
+                    healthy = e.smtp_code != 421
+                    raise
+                self._count('reconnects')
+            finally:
+                self._release(session, healthy)
     
     def send_email(self, recipient: str, subject: str, body: str, 
                    attachments: List[tuple] = None, from_name: str = None) -> bool:
         """
-        Send email via Gmail
+        Send email over a pooled SMTP session
         
         Args:
             recipient: Recipient email address
@@ -53,26 +379,14 @@ class GmailSender(EmailSender):
             attachments: List of (filename, file_content) tuples
             from_name: Display name for sender
         """
+        return self.send_template(
+            self.create_template(subject, body, attachments, from_name), recipient
+        )
+    
+    def send_template(self, template: MessageTemplate, recipient: str) -> bool:
+        """Send a prepared message; the encoded body is built on first use and reused."""
         try:
-            msg = MIMEMultipart()
-            msg['From'] = f"{from_name} <{self.sender_email}>" if from_name else self.sender_email
-            msg['To'] = recipient
-            msg['Subject'] = subject
-            msg['Date'] = formatdate(localtime=True)
-            
-            # Add body
-            msg.attach(MIMEText(body, 'plain'))
-            
-            # Add attachments
-            if attachments:
-                for filename, file_content in attachments:
-                    self._attach_file(msg, filename, file_content)
-            
-            # Send email
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.sender_email, self.app_password)
-                server.send_message(msg)
+            self.deliver(template, recipient)
             
             logger.info(f"Email sent successfully to {recipient}")
             return True
@@ -81,19 +395,67 @@ class GmailSender(EmailSender):
             logger.error(f"Failed to send email to {recipient}: {e}")
             return False
     
+    def _map_pooled(self, send: Callable, items: List, on_result: Optional[Callable]) -> List[bool]:
+        """Run send(item) over up to pool_size sessions, reporting results in the calling thread."""
+        results = [False] * len(items)
+        if self.pool_size == 1 or len(items) <= 1:
+            for index, item in enumerate(items):
+                results[index] = send(item)
+                if on_result:
+                    on_result(index, item, results[index])
+            return results
+        
+        with ThreadPoolExecutor(max_workers=min(self.pool_size, len(items))) as executor:
+            futures = {executor.submit(send, item): index for index, item in enumerate(items)}
+            for future in as_completed(futures):
+                index = futures[future]
+                results[index] = future.result()
+                if on_result:
+                    on_result(index, items[index], results[index])
+        return results
+    
+    def send_many(self, messages: List[Dict],
+                  on_result: Optional[Callable[[int, Dict, bool], None]] = None) -> List[bool]:
+        """
+        Send many different emails over up to pool_size sessions.
+        
+        Args:
+            messages: send_email keyword dicts (recipient, subject, body, ...)
+            on_result: Called as on_result(index, message, success) in the calling
+                thread as each send finishes (e.g. to update a progress bar)
+        
+        Returns:
+            Success flag per message, in input order
+        """
+        return self._map_pooled(lambda message: self.send_email(**message), messages, on_result)
+    
+    def send_template_many(self, template: MessageTemplate, recipients: List[str],
+                           on_result: Optional[Callable[[int, str, bool], None]] = None) -> List[bool]:
+        """
+        Send one prepared message to many recipients over up to pool_size sessions.
+        
+        The attachments are encoded and the body serialized once; each recipient
+        only adds its To/Date/Message-ID headers.
+        
+        Returns:
+            Success flag per recipient, in input order
+        """
+        return self._map_pooled(
+            lambda recipient: self.send_template(template, recipient), recipients, on_result
+        )
+    
+    def close(self):
+        """Close all idle sessions."""
+        with self._lock:
+            sessions, self._idle = self._idle, []
+        for session in sessions:
+            self._discard(session.smtp)
+    
     def _attach_file(self, msg: MIMEMultipart, filename: str, file_content: io.BytesIO):
         """Attach file to email"""
         try:
             part = MIMEBase('application', 'octet-stream')
-            
-            # Properly handle BytesIO objects by seeking to beginning first
-            if isinstance(file_content, io.BytesIO):
-                file_content.seek(0)
-                payload = file_content.read()
-            else:
-                payload = file_content
-            
-            part.set_payload(payload)
+            part.set_payload(_read_payload(file_content))
             
             from email import encoders
             encoders.encode_base64(part)
@@ -103,7 +465,23 @@ class GmailSender(EmailSender):
             logger.error(f"Failed to attach file {filename}: {e}")
 
 
-class OutlookSender(EmailSender):
+class GmailSender(SMTPSender):
+    """Gmail SMTP sender using App Password
+    
+    Setup Instructions:
+    1. Go to myaccount.google.com
+    2. Enable 2-Factor Authentication
+    3. Create App Password (myaccount.google.com/apppasswords)
+    4. Use the 16-character password below
+    """
+    
+    def __init__(self, sender_email: str, app_password: str,
+                 smtp_server: str = "smtp.gmail.com", smtp_port: int = 587, **pool_options):
+        super().__init__(sender_email, app_password, smtp_server, smtp_port, **pool_options)
+        self.app_password = app_password
+
+
+class OutlookSender(SMTPSender):
     """Outlook/Microsoft 365 SMTP sender
     
     Setup Instructions:
@@ -111,60 +489,18 @@ class OutlookSender(EmailSender):
     2. If 2FA enabled, use App Password instead
     """
     
-    def __init__(self, sender_email: str, password: str):
-        self.sender_email = sender_email
-        self.password = password
-        self.smtp_server = "smtp-mail.outlook.com"
-        self.smtp_port = 587
-    
-    def send_email(self, recipient: str, subject: str, body: str, 
-                   attachments: List[tuple] = None, from_name: str = None) -> bool:
-        """Send email via Outlook"""
-        try:
-            msg = MIMEMultipart()
-            msg['From'] = f"{from_name} <{self.sender_email}>" if from_name else self.sender_email
-            msg['To'] = recipient
-            msg['Subject'] = subject
-            msg['Date'] = formatdate(localtime=True)
-            
-            msg.attach(MIMEText(body, 'plain'))
-            
-            if attachments:
-                for filename, file_content in attachments:
-                    self._attach_file(msg, filename, file_content)
-            
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.sender_email, self.password)
-                server.send_message(msg)
-            
-            logger.info(f"Email sent successfully to {recipient}")
-            return True
-        
-        except Exception as e:
-            logger.error(f"Failed to send email to {recipient}: {e}")
-            return False
+    def __init__(self, sender_email: str, password: str,
+                 smtp_server: str = "smtp-mail.outlook.com", smtp_port: int = 587, **pool_options):
+        super().__init__(sender_email, password, smtp_server, smtp_port, **pool_options)
+
+
+class SendGridError(Exception):
+    """Error response from the SendGrid API"""
     
-    def _attach_file(self, msg: MIMEMultipart, filename: str, file_content: io.BytesIO):
-        """Attach file to email"""
-        try:
-            part = MIMEBase('application', 'octet-stream')
-            
-            # Properly handle BytesIO objects by seeking to beginning first
-            if isinstance(file_content, io.BytesIO):
-                file_content.seek(0)
-                payload = file_content.read()
-            else:
-                payload = file_content
-            
-            part.set_payload(payload)
-            
-            from email import encoders
-            encoders.encode_base64(part)
-            part.add_header('Content-Disposition', f'attachment; filename= {filename}')
-            msg.attach(part)
-        except Exception as e:
-            logger.error(f"Failed to attach file {filename}: {e}")
+    def __init__(self, status: int, body: str):
+        super().__init__(f"SendGrid API error {status}: {body[:300]}")
+        self.status = status
+        self.body = body
 
 
 class SendGridSender(EmailSender):
@@ -174,62 +510,169 @@ class SendGridSender(EmailSender):
     1. Create SendGrid account (sendgrid.com)
     2. Create API key
     3. Set as environment variable: SENDGRID_API_KEY
+    
+    Requests go to the v3 mail/send endpoint over one keep-alive connection.
+    A bulk send packs up to MAX_PERSONALIZATIONS recipients into each request,
+    and each template's JSON (including base64 attachments) is encoded once.
     """
     
-    def __init__(self, api_key: str = None):
+    API_URL = "https://api.sendgrid.com"
+    SEND_PATH = "/v3/mail/send"
+    MAX_PERSONALIZATIONS = 1000
+    
+    def __init__(self, api_key: str = None, from_email: str = None, from_name: str = None,
+                 api_url: str = None, timeout: float = 30.0):
+        """
+        Args:
+            api_key: SendGrid API key (default: SENDGRID_API_KEY)
+            from_email: Verified sender address (default: SENDGRID_FROM_EMAIL)
+            from_name: Default sender display name
+            api_url: API base URL (e.g. a local stub for benchmarks)
+            timeout: Socket timeout in seconds
+        """
         self.api_key = api_key or os.getenv('SENDGRID_API_KEY')
         if not self.api_key:
             logger.error("SendGrid API key not found. Set SENDGRID_API_KEY environment variable")
+        self.from_email = from_email or os.getenv('SENDGRID_FROM_EMAIL') or "noreply@example.com"
+        self.from_name = from_name or "Resume Sender"
+        self.timeout = timeout
+        
+        url = urlsplit(api_url or self.API_URL)
+        self._connection_class = http.client.HTTPSConnection if url.scheme == 'https' else http.client.HTTPConnection
+        self._host = url.netloc
+        self._path = url.path.rstrip('/') + self.SEND_PATH
+        self._connection = None
+        self._lock = threading.Lock()
+        self.stats = {'requests': 0, 'connections': 0, 'recipients': 0}
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def _shared_json(self, template: MessageTemplate, from_email: str) -> bytes:
+        """Everything except personalizations, encoded once per template."""
+        def build():
+            payload = {
+                "from": {"email": from_email, "name": template.from_name or self.from_name},
+                "subject": template.subject,
+                "content": [{"type": "text/plain", "value": template.body}],
+            }
+            if template.attachments:
+                payload["attachments"] = [
+                    {
+                        "content": base64.b64encode(data).decode('ascii'),
+                        "filename": filename,
+                        "type": "application/octet-stream",
+                        "disposition": "attachment",
+                    }
+                    for filename, data in template.attachments
+                ]
+            # Drop the opening brace so personalizations can be prepended
+            return json.dumps(payload).encode('utf-8')[1:]
+        return template.cached(('sendgrid', from_email, self.from_name), build)
+    
+    def _request(self, body: bytes):
+        """POST to mail/send on the persistent connection, reconnecting once if it was dropped."""
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+        }
+        with self._lock:
+            for attempt in (1, 2):
+                reused = self._connection is not None
+                if not reused:
+                    self._connection = self._connection_class(self._host, timeout=self.timeout)
+                    self.stats['connections'] += 1
+                try:
+                    self._connection.request("POST", self._path, body=body, headers=headers)
+                    response = self._connection.getresponse()
+                    response_body = response.read()
+                except (http.client.HTTPException, ConnectionError, socket.timeout):
+                    self._connection.close()
+                    self._connection = None
+                    if not reused or attempt == 2:
+                        raise
+                    continue
+                
+                self.stats['requests'] += 1
+                if response.will_close:
+                    self._connection.close()
+                    self._connection = None
+                if response.status >= 400:
+                    raise SendGridError(response.status, response_body.decode('utf-8', 'replace'))
+                return
+    
+    def deliver_batch(self, template: MessageTemplate, recipients: List[str], from_email: str = None):
+        """
+        Send one template to up to MAX_PERSONALIZATIONS recipients in a single request.
+        Each recipient gets a separate personalization, so nobody sees the others.
+        
+        Raises:
+            SendGridError: If the API rejects the request
+        """
+        if not self.api_key:
+            raise ValueError("SendGrid not configured properly")
+        if len(recipients) > self.MAX_PERSONALIZATIONS:
+            raise ValueError(f"At most {self.MAX_PERSONALIZATIONS} recipients per request")
+        
+        personalizations = json.dumps([{"to": [{"email": r}]} for r in recipients]).encode('utf-8')
+        shared = self._shared_json(template, from_email or self.from_email)
+        with trace_span("sendgrid.send", recipients=len(recipients), bytes=len(shared)):
+            self._request(b'{"personalizations": ' + personalizations + b', ' + shared)
+        self.stats['recipients'] += len(recipients)
+    
+    def deliver(self, template: MessageTemplate, recipient: str):
+        self.deliver_batch(template, [recipient])
+    
+    def send_template(self, template: MessageTemplate, recipient: str) -> bool:
+        try:
+            self.deliver(template, recipient)
+            logger.info(f"Email sent successfully to {recipient} via SendGrid")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to send email via SendGrid: {e}")
+            return False
+    
+    def send_template_many(self, template: MessageTemplate, recipients: List[str],
+                           on_result: Optional[Callable[[int, str, bool], None]] = None) -> List[bool]:
+        """Send to many recipients, MAX_PERSONALIZATIONS per API request."""
+        results = []
+        for start in range(0, len(recipients), self.MAX_PERSONALIZATIONS):
+            chunk = recipients[start:start + self.MAX_PERSONALIZATIONS]
+            try:
+                self.deliver_batch(template, chunk)
+                success = True
+                logger.info(f"Email sent successfully to {len(chunk)} recipient(s) via SendGrid")
+            except Exception as e:
+                success = False
+                logger.error(f"Failed to send email via SendGrid: {e}")
+            for offset, recipient in enumerate(chunk):
+                results.append(success)
+                if on_result:
+                    on_result(start + offset, recipient, success)
+        return results
     
     def send_email(self, recipient: str, subject: str, body: str, 
                    attachments: List[tuple] = None, from_name: str = None, 
                    from_email: str = None) -> bool:
         """Send email via SendGrid"""
+        template = self.create_template(subject, body, attachments, from_name)
         try:
-            from sendgrid import SendGridAPIClient
-            from sendgrid.helpers.mail import Mail, Attachment, FileContent, FileName, FileType, Disposition
-            import base64
-            
-            if not self.api_key:
-                logger.error("SendGrid not configured properly")
-                return False
-            
-            mail = Mail(
-                from_email=(from_email or "noreply@example.com", from_name or "Resume Sender"),
-                to_emails=recipient,
-                subject=subject,
-                plain_text_content=body
-            )
-            
-            # Add attachments
-            if attachments:
-                for filename, file_content in attachments:
-                    if isinstance(file_content, io.BytesIO):
-                        file_content.seek(0)
-                        content = base64.b64encode(file_content.read()).decode()
-                    else:
-                        content = base64.b64encode(file_content).decode()
-                    
-                    attachment = Attachment(
-                        FileContent(content),
-                        FileName(filename),
-                        FileType('application/octet-stream'),
-                        Disposition('attachment')
-                    )
-                    mail.attachment = attachment
-            
-            sg = SendGridAPIClient(self.api_key)
-            response = sg.send(mail)
-            
+            self.deliver_batch(template, [recipient], from_email)
             logger.info(f"Email sent successfully to {recipient} via SendGrid")
             return True
-        
-        except ImportError:
-            logger.error("SendGrid library not installed. Install: pip install sendgrid")
-            return False
         except Exception as e:
             logger.error(f"Failed to send email via SendGrid: {e}")
             return False
+    
+    def close(self):
+        """Close the API connection."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
 
 
 def get_email_sender(provider: str = "gmail", **config) -> Optional[EmailSender]:
@@ -241,19 +684,24 @@ def get_email_sender(provider: str = "gmail", **config) -> Optional[EmailSender]
         **config: Provider-specific configuration
             Gmail: sender_email, app_password
             Outlook: sender_email, password
-            SendGrid: api_key (or environment variable)
+            Gmail/Outlook pooling (optional): pool_size, noop_after, max_messages_per_session
+            SendGrid: api_key, from_email (or environment variables)
     
     Returns:
         EmailSender instance or None if configuration invalid
     """
     provider = provider.lower()
+    pool_options = {
+        key: config[key] for key in ('pool_size', 'noop_after', 'max_messages_per_session')
+        if key in config
+    }
     
     if provider == "gmail":
         sender_email = config.get('sender_email') or os.getenv('GMAIL_EMAIL')
         app_password = config.get('app_password') or os.getenv('GMAIL_PASSWORD')
         
         if sender_email and app_password:
-            return GmailSender(sender_email, app_password)
+            return GmailSender(sender_email, app_password, **pool_options)
         else:
             logger.error("Gmail requires sender_email and app_password")
             return None
@@ -263,13 +711,13 @@ def get_email_sender(provider: str = "gmail", **config) -> Optional[EmailSender]
         password = config.get('password') or os.getenv('OUTLOOK_PASSWORD')
         
         if sender_email and password:
-            return OutlookSender(sender_email, password)
+            return OutlookSender(sender_email, password, **pool_options)
         else:
             logger.error("Outlook requires sender_email and password")
             return None
     
     elif provider == "sendgrid":
-        return SendGridSender(config.get('api_key'))
+        return SendGridSender(config.get('api_key'), config.get('from_email'))
     
     else:
         logger.error(f"Unknown email provider: {provider}")
@@ -7,6 +7,8 @@ from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak
 from reportlab.lib.enums import TA_LEFT
 import re
 
+from .cycle_document import CycleDocument
+
 class ExportHandler:
     def __init__(self):
         self.styles = getSampleStyleSheet()
@@ -39,15 +41,24 @@ class ExportHandler:
         text = re.sub(r'[\x00-\x08\x0b-\x0c\x0e-\x1f\x7f-\x9f]', '', text)
         return text
 
+    def _content_lines(self, content):
+        """(line, is_heading) pairs of processed text or a CycleDocument; blank lines are ''."""
+        if isinstance(content, CycleDocument):
+            # Cycles are already structured: no splitting or header guessing
+            for cycle in content:
+                yield cycle.heading, True
+                for point in cycle.points:
+                    yield point, False
+            return
+        for line in content.split('\n'):
+            line = line.strip()
+            yield line, line.startswith('Cycle')
+
     def generate_docx(self, content):
-        """Generate a DOCX file from the processed text."""
+        """Generate a DOCX file from the processed text (a string or CycleDocument)."""
         document = Document()
 
-        # Split the content by newlines
-        lines = content.split('\n')
-
-        for line in lines:
-            line = line.strip()
+        for line, is_heading in self._content_lines(content):
             if not line:
                 continue
 
@@ -55,7 +66,7 @@ class ExportHandler:
             line = self._sanitize_for_xml(line)
 
             # Add headings and regular content
-            if line.startswith('Cycle'):
+            if is_heading:
                 document.add_heading(line, level=1)
             else:
                 document.add_paragraph(line)
@@ -68,7 +79,7 @@ class ExportHandler:
         return docx_file
 
     def generate_pdf(self, content):
-        """Generate a PDF file from the processed text with proper text wrapping and pagination."""
+        """Generate a PDF file from the processed text (a string or CycleDocument) with proper text wrapping and pagination."""
         pdf_file = io.BytesIO()
         doc = SimpleDocTemplate(
             pdf_file,
@@ -81,10 +92,8 @@ class ExportHandler:
 
         # Build story of elements
         story = []
-        lines = content.split('\n')
 
-        for line in lines:
-            line = line.strip()
+        for line, is_heading in self._content_lines(content):
             if not line:
                 story.append(Spacer(1, 0.1 * inch))
                 continue
@@ -93,7 +102,7 @@ class ExportHandler:
             line = self._sanitize_for_xml(line)
             
             # Determine line type and formatting
-            if line.startswith('Cycle'):
+            if is_heading:
                 story.append(Paragraph(line, self.styles['CycleHeading']))
             else:
                 story.append(Paragraph(line, self.styles['ContentText']))
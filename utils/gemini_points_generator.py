@@ -3,13 +3,17 @@ Groq API integration for automatic point generation from job descriptions
 Groq provides free, fast API with generous limits
 """
 
-from groq import Groq
 import re
 import os
+import time
 from typing import List, Dict, Tuple
 from dotenv import load_dotenv
 import logging
 
+from .prompt_builder import PromptBuilder, TokenUsageMetrics
+from .llm_backend import LLMBackend, get_llm_backend
+from .workflow_tracer import trace_span
+
 logger = logging.getLogger(__name__)
 
 # Load environment variables from .env
@@ -19,29 +23,53 @@ load_dotenv()
 class GeminiPointsGenerator:
     """Generate resume points from job descriptions using Groq API (free)"""
     
-    def __init__(self, api_key: str = None):
+    def __init__(self, api_key: str = None, prompt_builder: PromptBuilder = None,
+                 backend: LLMBackend = None):
         """
         Initialize Groq API
         
         Args:
             api_key: Groq API key (if not provided, loads from .env)
+            prompt_builder: Prompt builder controlling per-call context caps
+            backend: LLM backend to use instead of Groq (e.g. FakeLLMBackend);
+                defaults to the LLM_BACKEND env var, then Groq
         """
+        self.prompt_builder = prompt_builder or PromptBuilder()
+        self.metrics = TokenUsageMetrics()
+        
         try:
-            # Use provided key or load from environment
-            if api_key is None:
-                api_key = os.getenv("GROQ_API_KEY")
-            
-            if not api_key:
-                raise ValueError("Groq API key not found. Please set GROQ_API_KEY in .env file")
-            
-            # Initialize Groq client
-            self.client = Groq(api_key=api_key)
-            # Use llama-3.3-70b-versatile (latest, fast, capable)
-            self.model = "llama-3.3-70b-versatile"
+            self.backend = backend or get_llm_backend(api_key=api_key)
+            self.model = self.backend.model
         except Exception as e:
             logger.error(f"Failed to initialize Groq: {str(e)}")
             raise ValueError("Invalid Groq API key or initialization failed")
     
+    def _complete(self, operation: str, prompt: str, compaction: Dict,
+                  temperature: float, max_tokens: int):
+        """Run a completion on the backend and record its token usage and latency."""
+        with trace_span(f"llm.{operation}", model=self.model) as span:
+            start = time.perf_counter()
+            completion = self.backend.complete(
+                prompt,
+                temperature=temperature,
+                max_tokens=max_tokens
+            )
+            entry = self.metrics.record(
+                operation, completion.usage,
+                time.perf_counter() - start, compaction
+            )
+            span.set(prompt_tokens=entry['prompt_tokens'],
+                     completion_tokens=entry['completion_tokens'])
+        logger.info(
+            f"{operation}: {entry['prompt_tokens']} prompt + {entry['completion_tokens']} completion tokens "
+            f"in {entry['latency_seconds']:.2f}s ({entry['context_tokens_saved']} context tokens saved)"
+        )
+        return completion.content
+    
+    def get_usage_summary(self) -> Dict:
+        """Get aggregate token usage and latency for calls made by this generator."""
+        return self.metrics.summary()
+    
     def extract_tech_stacks(self, job_description: str) -> List[str]:
         """
         Extract tech stacks from job description using Groq
@@ -56,24 +84,14 @@ class GeminiPointsGenerator:
             raise ValueError("Job description cannot be empty")
         
         try:
-            prompt = f"""Extract all technologies, programming languages, frameworks, tools, and platforms mentioned in this job description.
-
-Return ONLY a comma-separated list of technologies (no explanations, no numbering, no bullets).
+            prompt, compaction = self.prompt_builder.build_tech_extraction_prompt(job_description)
 
-Job Description:
-{job_description}
-
-Return format example: Node.js, React, MongoDB, Python, Docker, AWS"""
-
-            message = self.client.chat.completions.create(
-                messages=[{"role": "user", "content": prompt}],
-                model=self.model,
+            response_text = self._complete(
+                'extract_tech_stacks', prompt, compaction,
                 temperature=0.3,
                 max_tokens=500
             )
             
-            response_text = message.choices[0].message.content
-            
             if not response_text:
                 raise ValueError("No tech stacks found in response")
             
@@ -119,54 +137,16 @@ Return format example: Node.js, React, MongoDB, Python, Docker, AWS"""
             raise ValueError("Number of points must be at least 1")
         
         try:
-            # Format tech stacks list
-            tech_stacks_str = ", ".join(tech_stacks)
-            
-            # Use a specific prompt for the exact format the user wants
-            prompt = f"""Generate {num_points} detailed, specific, and professional bullet points for my resume highlighting my experience as a {job_title}.
-
-CRITICAL: You MUST generate points for ALL {len(tech_stacks)} technologies listed below. Do not skip any technology.
-
-Format EXACTLY as shown:
-
-TechName1
-- Bullet point 1
-- Bullet point 2
-- Bullet point 3
-
-TechName2
-- Bullet point 1
-- Bullet point 2
-- Bullet point 3
-
-RULES:
-1. Each technology name must be on its own line (just the name, no symbols)
-2. Each bullet point must start with a dash and space (- )
-3. Each bullet point should be 1-2 sentences, specific and detailed
-4. Mention the technology name in each bullet point when relevant
-5. Include specific frameworks, versions, or related technologies
-6. Focus on achievements, implementations, and business impact
-7. Use professional language appropriate for {job_title} role
-8. Each tech stack MUST have exactly {num_points} bullet points
-9. GENERATE POINTS FOR ALL TECHNOLOGIES - DO NOT SKIP ANY
-
-Technologies to cover ({len(tech_stacks)} total):
-{tech_stacks_str}
-
-Job description context:
-{job_description}
-
-Generate complete resume bullet points for ALL {len(tech_stacks)} technologies:"""
+            prompt, compaction = self.prompt_builder.build_points_prompt(
+                job_description, job_title, tech_stacks, num_points
+            )
 
-            message = self.client.chat.completions.create(
-                messages=[{"role": "user", "content": prompt}],
-                model=self.model,
+            response_text = self._complete(
+                'generate_points', prompt, compaction,
                 temperature=0.7,
-                max_tokens=8000
+                max_tokens=self.prompt_builder.max_completion_tokens(len(tech_stacks), num_points)
             )
             
-            response_text = message.choices[0].message.content
-            
             if not response_text:
                 raise ValueError("No content generated from Groq")
             
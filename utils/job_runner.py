@@ -0,0 +1,379 @@
+"""
+Job Runner - Durable local queue for long-running app work.
+
+Tabs submit a job (batch processing, batch injection, points generation, the
+automation workflow) and return at once; background workers run it and record
+state, progress and the result in a SQLite job table. The page stores only the
+job ID, so a rerun (or a reconnecting browser) picks the job back up instead of
+starting it again.
+
+- Each job has an input hash; submitting identical input while a matching job
+  is queued or running returns that job instead of a new one, and so does a
+  finished one for kinds whose results are reusable (not LLM output)
+- Handlers report progress through a callback; the fraction and message are
+  stored on the job for polling
+- Per-kind concurrency limits (e.g. one automation run at a time)
+- Jobs left running by a crashed process are flagged 'interrupted' on start
+"""
+
+import hashlib
+import logging
+import pickle
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+STATES = ['queued', 'running', 'succeeded', 'failed', 'interrupted']
+FINISHED_STATES = ('succeeded', 'failed', 'interrupted')
+
+# Progress callback handed to job handlers: progress(fraction 0..1, message)
+ProgressCallback = Callable[[float, str], None]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    input_hash TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'queued',
+    progress REAL NOT NULL DEFAULT 0,
+    message TEXT,
+    payload BLOB NOT NULL,
+    result BLOB,
+    error TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_ready ON jobs(state, kind, id);
+CREATE INDEX IF NOT EXISTS idx_jobs_input ON jobs(input_hash, state);
+"""
+
+# Columns returned by get()/list_jobs() (payload and result blobs are loaded on demand)
+STATUS_COLUMNS = """id, kind, input_hash, state, progress, message, error,
+                    created_at, started_at, finished_at, updated_at"""
+
+
+def input_hash(kind: str, payload: Any) -> str:
+    """Dedup key for a job: hash of its kind and pickled payload."""
+    digest = hashlib.sha256(kind.encode('utf-8'))
+    digest.update(pickle.dumps(payload, protocol=4))
+    return digest.hexdigest()
+
+
+class _Handler:
+    __slots__ = ('fn', 'concurrency', 'reuse_results')
+
+    def __init__(self, fn: Callable[[Any, ProgressCallback], Any], concurrency: int,
+                 reuse_results: bool = True):
+        self.fn = fn
+        self.concurrency = concurrency
+        self.reuse_results = reuse_results
+
+
+class JobRunner:
+    """SQLite-backed job table with a background worker pool."""
+
+    def __init__(self, db_path: str = "./automation_output/jobs.db",
+                 poll_interval: float = 1.0, progress_interval: float = 0.2,
+                 retention_days: float = 7.0):
+        """
+        Args:
+            db_path: SQLite database file (created if missing)
+            poll_interval: Seconds idle workers wait before checking for queued jobs
+            progress_interval: Minimum seconds between progress writes of one job
+            retention_days: Finished jobs older than this are deleted on start
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.poll_interval = poll_interval
+        self.progress_interval = progress_interval
+        self.retention_days = retention_days
+
+        self._handlers: Dict[str, _Handler] = {}
+        self._running: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._workers: List[threading.Thread] = []
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    # ---- Database helpers --------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        """Write transaction that takes the database lock up front."""
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            yield conn
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    # ---- Registration and submission ---------------------------------------
+
+    def register(self, kind: str, fn: Callable[[Any, ProgressCallback], Any], concurrency: int = 1,
+                 reuse_results: bool = True):
+        """
+        Attach the handler that runs jobs of one kind.
+
+        Args:
+            kind: Job kind name (e.g. 'batch_process')
+            fn: fn(payload, progress) -> result; result must be picklable
+            concurrency: Maximum jobs of this kind running at once
+            reuse_results: Whether a succeeded job answers later identical submits.
+                Use False for non-deterministic kinds (LLM generation) so each
+                submit runs again; queued/running jobs are still shared.
+        """
+        with self._lock:
+            self._handlers[kind] = _Handler(fn, concurrency, reuse_results)
+        self._wake.set()
+
+    def submit(self, kind: str, payload: Any, force: bool = False) -> Tuple[int, bool]:
+        """
+        Queue a job, reusing an identical queued or running one (or a succeeded
+        one, for kinds registered with reuse_results).
+
+        Args:
+            kind: Registered job kind
+            payload: Picklable handler input (also hashed for deduplication)
+            force: Always queue a new job, even while an identical one is in flight
+
+        Returns:
+            (job_id, created); created is False when an existing job was reused
+        """
+        if kind not in self._handlers:
+            raise ValueError(f"No handler registered for job kind '{kind}'")
+        blob = pickle.dumps(payload, protocol=4)
+        digest = input_hash(kind, payload)
+        now = time.time()
+        with self._transaction() as conn:
+            if not force:
+                reusable = ('queued', 'running', 'succeeded') if self._handlers[kind].reuse_results \
+                    else ('queued', 'running')
+                row = conn.execute(
+                    f"""SELECT id FROM jobs WHERE input_hash = ?
+                       AND state IN ({', '.join('?' * len(reusable))})
+                       ORDER BY id DESC LIMIT 1""",
+                    (digest, *reusable)
+                ).fetchone()
+                if row is not None:
+                    logger.info(f"Jobs: reusing #{row['id']} for identical {kind} input")
+                    return row['id'], False
+            cursor = conn.execute(
+                """INSERT INTO jobs (kind, input_hash, payload, message, created_at, updated_at)
+                   VALUES (?, ?, ?, 'Queued', ?, ?)""",
+                (kind, digest, blob, now, now)
+            )
+            job_id = cursor.lastrowid
+
+        logger.info(f"Jobs: queued {kind} #{job_id}")
+        self._wake.set()
+        return job_id, True
+
+    # ---- Workers -----------------------------------------------------------
+
+    def start(self, workers: int = 4):
+        """Start worker threads; jobs left running by a previous process are flagged."""
+        if self._workers:
+            return
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute(
+                """UPDATE jobs SET state = 'interrupted', finished_at = ?, updated_at = ?,
+                       error = 'Process stopped while the job was running; retry to run it again'
+                   WHERE state = 'running'""",
+                (now, now)
+            )
+            conn.execute(
+                "DELETE FROM jobs WHERE state IN ('succeeded', 'failed', 'interrupted') AND updated_at < ?",
+                (now - self.retention_days * 86400,)
+            )
+
+        self._stop.clear()
+        for index in range(workers):
+            thread = threading.Thread(target=self._worker, name=f"jobs-{index}", daemon=True)
+            thread.start()
+            self._workers.append(thread)
+
+    def stop(self, timeout: float = 10.0):
+        """Stop workers after their current job."""
+        self._stop.set()
+        self._wake.set()
+        for thread in self._workers:
+            thread.join(timeout)
+        self._workers = []
+
+    def _claim(self) -> Optional[sqlite3.Row]:
+        """Atomically move the oldest queued job of an available kind to 'running'."""
+        with self._lock:
+            kinds = [
+                kind for kind, handler in self._handlers.items()
+                if self._running.get(kind, 0) < handler.concurrency
+            ]
+        if not kinds:
+            return None
+
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute(
+                f"""SELECT id, kind, payload FROM jobs WHERE state = 'queued'
+                    AND kind IN ({', '.join('?' * len(kinds))}) ORDER BY id LIMIT 1""",
+                kinds
+            ).fetchone()
+            if row is None:
+                return None
+            with self._lock:
+                if self._running.get(row['kind'], 0) >= self._handlers[row['kind']].concurrency:
+                    return None
+                self._running[row['kind']] = self._running.get(row['kind'], 0) + 1
+            conn.execute(
+                """UPDATE jobs SET state = 'running', message = 'Starting', started_at = ?,
+                       updated_at = ? WHERE id = ?""",
+                (now, now, row['id'])
+            )
+            return row
+
+    def _progress_callback(self, job_id: int) -> ProgressCallback:
+        """Progress writer for one job; intermediate updates are throttled."""
+        last_write = [0.0]
+
+        def progress(fraction: float, message: str = ""):
+            now = time.monotonic()
+            if fraction < 1.0 and now - last_write[0] < self.progress_interval:
+                return
+            last_write[0] = now
+            with self._transaction() as conn:
+                conn.execute(
+                    "UPDATE jobs SET progress = ?, message = ?, updated_at = ? WHERE id = ?",
+                    (max(0.0, min(1.0, fraction)), message, time.time(), job_id)
+                )
+
+        return progress
+
+    def _run(self, row: sqlite3.Row):
+        kind = row['kind']
+        try:
+            with self._lock:
+                handler = self._handlers[kind]
+            start = time.monotonic()
+            try:
+                payload = pickle.loads(row['payload'])
+                result = handler.fn(payload, self._progress_callback(row['id']))
+                result_blob = pickle.dumps(result, protocol=4)
+                error = None
+            except Exception as e:
+                logger.error(f"Jobs: {kind} #{row['id']} failed: {e}", exc_info=True)
+                result_blob = None
+                error = f"{type(e).__name__}: {e}"
+
+            now = time.time()
+            with self._transaction() as conn:
+                if error is None:
+                    conn.execute(
+                        """UPDATE jobs SET state = 'succeeded', progress = 1, message = 'Done',
+                               result = ?, error = NULL, finished_at = ?, updated_at = ? WHERE id = ?""",
+                        (result_blob, now, now, row['id'])
+                    )
+                else:
+                    conn.execute(
+                        """UPDATE jobs SET state = 'failed', message = 'Failed', error = ?,
+                               finished_at = ?, updated_at = ? WHERE id = ?""",
+                        (error, now, now, row['id'])
+                    )
+            logger.info(f"Jobs: {kind} #{row['id']} finished in {time.monotonic() - start:.2f}s"
+                        f" ({'ok' if error is None else 'failed'})")
+        finally:
+            with self._lock:
+                self._running[kind] -= 1
+            self._wake.set()
+
+    def _worker(self):
+        while not self._stop.is_set():
+            try:
+                row = self._claim()
+            except Exception as e:
+                logger.error(f"Jobs: error claiming job: {e}")
+                row = None
+            if row is None:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+                continue
+            self._run(row)
+
+    # ---- Status ------------------------------------------------------------
+
+    def get(self, job_id: int) -> Optional[Dict]:
+        """Job status (without payload or result), or None if unknown."""
+        conn = self._connect()
+        try:
+            row = conn.execute(f"SELECT {STATUS_COLUMNS} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            return dict(row) if row else None
+        finally:
+            conn.close()
+
+    def result(self, job_id: int) -> Any:
+        """Unpickled result of a succeeded job (None otherwise)."""
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT result FROM jobs WHERE id = ? AND state = 'succeeded'", (job_id,)
+            ).fetchone()
+        finally:
+            conn.close()
+        return pickle.loads(row['result']) if row and row['result'] is not None else None
+
+    def list_jobs(self, kind: Optional[str] = None, limit: int = 50) -> List[Dict]:
+        """Recent jobs (optionally of one kind), newest first."""
+        query = f"SELECT {STATUS_COLUMNS} FROM jobs"
+        params: list = []
+        if kind is not None:
+            query += " WHERE kind = ?"
+            params.append(kind)
+        query += " ORDER BY id DESC LIMIT ?"
+        params.append(limit)
+
+        conn = self._connect()
+        try:
+            return [dict(row) for row in conn.execute(query, params).fetchall()]
+        finally:
+            conn.close()
+
+    def retry(self, job_id: int) -> bool:
+        """Requeue a failed or interrupted job with its stored payload."""
+        now = time.time()
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                """UPDATE jobs SET state = 'queued', progress = 0, message = 'Queued', error = NULL,
+                       started_at = NULL, finished_at = NULL, updated_at = ?
+                   WHERE id = ? AND state IN ('failed', 'interrupted')""",
+                (now, job_id)
+            )
+        self._wake.set()
+        return cursor.rowcount == 1
+
+    def wait(self, job_id: int, timeout: float = 60.0) -> Optional[Dict]:
+        """Block until a job finishes or the timeout passes (CLI and tests)."""
+        deadline = time.monotonic() + timeout
+        while True:
+            job = self.get(job_id)
+            if job is None or job['state'] in FINISHED_STATES or time.monotonic() >= deadline:
+                return job
+            time.sleep(min(0.05, self.poll_interval))
@@ -0,0 +1,232 @@
+"""
+LLM backends used by GeminiPointsGenerator.
+GroqBackend talks to the Groq API; FakeLLMBackend is a deterministic local
+stand-in for benchmarks and load tests that never touches the network.
+"""
+
+import os
+import re
+import time
+import random
+import threading
+import logging
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class LLMUsage:
+    """Token usage reported for one completion"""
+
+    __slots__ = ('prompt_tokens', 'completion_tokens')
+
+    def __init__(self, prompt_tokens: int = 0, completion_tokens: int = 0):
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = completion_tokens
+
+
+class LLMCompletion:
+    """Text and usage returned by a backend"""
+
+    __slots__ = ('content', 'usage')
+
+    def __init__(self, content: str, usage: LLMUsage = None):
+        self.content = content
+        self.usage = usage or LLMUsage()
+
+
+class LLMBackend:
+    """Base LLM backend class"""
+
+    model = None
+
+    def complete(self, prompt: str, temperature: float = 0.7,
+                 max_tokens: int = 1000) -> LLMCompletion:
+        """Run a single-turn chat completion"""
+        raise NotImplementedError
+
+
+class GroqBackend(LLMBackend):
+    """Groq chat completions backend"""
+
+    DEFAULT_MODEL = "llama-3.3-70b-versatile"
+
+    def __init__(self, api_key: str = None, model: str = None):
+        from groq import Groq
+
+        api_key = api_key or os.getenv("GROQ_API_KEY")
+        if not api_key:
+            raise ValueError("Groq API key not found. Please set GROQ_API_KEY in .env file")
+
+        self.client = Groq(api_key=api_key)
+        self.model = model or self.DEFAULT_MODEL
+
+    def complete(self, prompt: str, temperature: float = 0.7,
+                 max_tokens: int = 1000) -> LLMCompletion:
+        message = self.client.chat.completions.create(
+            messages=[{"role": "user", "content": prompt}],
+            model=self.model,
+            temperature=temperature,
+            max_tokens=max_tokens
+        )
+        usage = getattr(message, 'usage', None)
+        return LLMCompletion(
+            message.choices[0].message.content,
+            LLMUsage(
+                getattr(usage, 'prompt_tokens', 0) or 0,
+                getattr(usage, 'completion_tokens', 0) or 0
+            )
+        )
+
+
+class FakeLLMError(RuntimeError):
+    """Error injected by FakeLLMBackend"""
+
+
+class FakeLLMBackend(LLMBackend):
+    """Deterministic offline stand-in for the Groq backend
+
+    Recognizes the tech extraction and points generation prompts built by
+    PromptBuilder and answers them from templates. Latency and failures are
+    injected from a seeded RNG so runs are reproducible.
+    """
+
+    model = "fake-llm"
+
+    # Vocabulary used to "extract" technologies from a job description
+    KNOWN_TECHNOLOGIES = [
+        'Python', 'Java', 'JavaScript', 'TypeScript', 'Node.js', 'React', 'Angular',
+        'Vue', 'Django', 'Flask', 'FastAPI', 'Spring Boot', 'Go', 'Rust', 'C#',
+        '.NET', 'PHP', 'Ruby', 'SQL', 'PostgreSQL', 'MySQL', 'MongoDB', 'Redis',
+        'Kafka', 'Docker', 'Kubernetes', 'AWS', 'Azure', 'GCP', 'Terraform',
+        'Jenkins', 'CI/CD', 'GraphQL', 'REST', 'Microservices', 'Linux',
+    ]
+
+    BULLET_TEMPLATES = [
+        "Designed and delivered {tech} services for {title} workloads, improving release velocity by {pct}%",
+        "Optimized {tech} components in production, reducing latency by {pct}% under peak traffic",
+        "Built automated tests and monitoring around {tech}, cutting incident rates by {pct}%",
+        "Led migration of legacy modules to {tech}, lowering infrastructure cost by {pct}%",
+        "Mentored engineers on {tech} best practices and code reviews across {n} teams",
+    ]
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 seed: int = 0, responses: Optional[Dict[str, str]] = None):
+        """
+        Initialize fake backend
+
+        Args:
+            latency: Base seconds to sleep per call
+            jitter: Extra random seconds (0..jitter) added per call
+            error_rate: Probability (0-1) that a call raises FakeLLMError
+            seed: RNG seed for jitter and error injection
+            responses: Canned responses {prompt substring: completion text},
+                checked before the built-in templates
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.responses = responses or {}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.call_count = 0
+        self._tech_patterns = [
+            (tech, re.compile(r'(?<![\w.])' + re.escape(tech) + r'(?![\w])', re.IGNORECASE))
+            for tech in self.KNOWN_TECHNOLOGIES
+        ]
+
+    def complete(self, prompt: str, temperature: float = 0.7,
+                 max_tokens: int = 1000) -> LLMCompletion:
+        with self._lock:
+            self.call_count += 1
+            delay = self.latency + (self._rng.random() * self.jitter if self.jitter else 0.0)
+            fail = self.error_rate > 0 and self._rng.random() < self.error_rate
+
+        if delay:
+            time.sleep(delay)
+        if fail:
+            raise FakeLLMError("Injected fake LLM failure")
+
+        content = self._render(prompt)
+        return LLMCompletion(
+            content,
+            LLMUsage(self._count_tokens(prompt), min(max_tokens, self._count_tokens(content)))
+        )
+
+    @staticmethod
+    def _count_tokens(text: str) -> int:
+        return max(1, len(text) // 4)
+
+    def _render(self, prompt: str) -> str:
+        for key, response in self.responses.items():
+            if key in prompt:
+                return response
+
+        if prompt.startswith("Extract all technologies"):
+            return ", ".join(self._extract_techs(prompt))
+
+        match = re.search(r'Technologies to cover \(\d+ total\):\n(.+)', prompt)
+        if match:
+            num_match = re.match(r'Generate (\d+) ', prompt)
+            title_match = re.search(r'experience as a (.+?)\.\n', prompt)
+            techs = [t.strip() for t in match.group(1).split(',') if t.strip()]
+            return self._generate_points(
+                techs,
+                int(num_match.group(1)) if num_match else 3,
+                title_match.group(1) if title_match else "Software Engineer"
+            )
+
+        return "OK"
+
+    def _extract_techs(self, prompt: str) -> List[str]:
+        body = prompt.split("Job Description:", 1)[-1].split("Return format example:", 1)[0]
+        found = []
+        for tech, pattern in self._tech_patterns:
+            match = pattern.search(body)
+            if match:
+                found.append((match.start(), tech))
+        # Report in order of first mention, like a real extraction would
+        return [tech for _, tech in sorted(found)] or ['Python']
+
+    def _generate_points(self, techs: List[str], num_points: int, title: str) -> str:
+        sections = []
+        for t_idx, tech in enumerate(techs):
+            lines = [tech]
+            for p_idx in range(num_points):
+                template = self.BULLET_TEMPLATES[(t_idx + p_idx) % len(self.BULLET_TEMPLATES)]
+                lines.append("- " + template.format(
+                    tech=tech, title=title, pct=15 + (t_idx * 7 + p_idx * 5) % 40, n=2 + p_idx
+                ))
+            sections.append("\n".join(lines))
+        return "\n\n".join(sections)
+
+
+def get_llm_backend(provider: str = None, **config) -> LLMBackend:
+    """
+    Factory function to get an LLM backend
+
+    Args:
+        provider: 'groq' or 'fake' (defaults to LLM_BACKEND env var, then 'groq')
+        **config: Provider-specific configuration
+            Groq: api_key, model
+            Fake: latency, jitter, error_rate, seed, responses
+
+    Returns:
+        LLMBackend instance
+    """
+    provider = (provider or os.getenv("LLM_BACKEND") or "groq").lower()
+
+    if provider == "groq":
+        return GroqBackend(config.get('api_key'), config.get('model'))
+
+    elif provider == "fake":
+        return FakeLLMBackend(
+            latency=float(config.get('latency', os.getenv("FAKE_LLM_LATENCY", 0.0))),
+            jitter=float(config.get('jitter', 0.0)),
+            error_rate=float(config.get('error_rate', os.getenv("FAKE_LLM_ERROR_RATE", 0.0))),
+            seed=int(config.get('seed', 0)),
+            responses=config.get('responses')
+        )
+
+    else:
+        raise ValueError(f"Unknown LLM backend: {provider}")
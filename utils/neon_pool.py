@@ -0,0 +1,188 @@
+"""
+Neon Connection Pool - Thread-safe pooled PostgreSQL connections
+
+Wraps psycopg2's ThreadedConnectionPool with:
+- Blocking checkout (waits for a free connection instead of raising PoolError)
+- Commit on success / rollback on error, so a failed query never leaves a
+  connection stuck in an aborted transaction
+- Health checks for connections that sat idle (Neon drops idle connections)
+- Pool metrics for the dashboard and debugging
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict
+
+import psycopg2
+from psycopg2 import pool as pg_pool
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeoutError(Exception):
+    """No connection became free within the checkout timeout"""
+
+
+class _RetainingConnectionPool(pg_pool.ThreadedConnectionPool):
+    """
+    ThreadedConnectionPool that keeps up to max_idle returned connections open.
+
+    psycopg2 uses minconn both for the connections opened up front and for how
+    many returned connections stay idle (the rest are closed on putconn). This
+    pool opens minconn connections, then retains up to max_idle on return.
+    """
+
+    def __init__(self, minconn: int, maxconn: int, max_idle: int, *args, **kwargs):
+        super().__init__(minconn, maxconn, *args, **kwargs)
+        self.minconn = max(int(minconn), int(max_idle))
+
+
+class NeonConnectionPool:
+    """Pooled connections with checkout/return, automatic rollback and metrics."""
+
+    def __init__(self, db_url: str, minconn: int = 1, maxconn: int = 10,
+                 checkout_timeout: float = 30.0, health_check_after: float = 30.0,
+                 connect_timeout: int = 10, max_idle: int = None):
+        """
+        Args:
+            db_url: PostgreSQL connection URL
+            minconn: Connections opened up front
+            maxconn: Maximum open connections
+            checkout_timeout: Seconds to wait for a free connection
+            health_check_after: Idle seconds after which a connection is pinged before use
+            connect_timeout: Seconds allowed to open a new connection
+            max_idle: Returned connections kept open for reuse (default maxconn)
+        """
+        self.db_url = db_url
+        self.maxconn = maxconn
+        self.checkout_timeout = checkout_timeout
+        self.health_check_after = health_check_after
+        self._pool = _RetainingConnectionPool(
+            minconn, maxconn, maxconn if max_idle is None else max_idle, db_url,
+            connect_timeout=connect_timeout,
+            keepalives=1, keepalives_idle=30, keepalives_interval=10, keepalives_count=3
+        )
+        self._slots = threading.BoundedSemaphore(maxconn)
+        self._lock = threading.Lock()
+        self._last_used: Dict[int, float] = {}
+        self._metrics = {
+            'checkouts': 0,
+            'in_use': 0,
+            'wait_seconds': 0.0,
+            'max_wait_seconds': 0.0,
+            'health_checks': 0,
+            'reconnects': 0,
+            'rollbacks': 0,
+            'errors': 0,
+        }
+
+    def _is_healthy(self, conn) -> bool:
+        if conn.closed:
+            return False
+        last_used = self._last_used.get(id(conn))
+        if last_used is None or time.monotonic() - last_used < self.health_check_after:
+            return True
+        with self._lock:
+            self._metrics['health_checks'] += 1
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _checkout(self):
+        start = time.monotonic()
+        if not self._slots.acquire(timeout=self.checkout_timeout):
+            raise PoolTimeoutError(
+                f"No database connection free after {self.checkout_timeout:.0f}s "
+                f"(pool size {self.maxconn})"
+            )
+        try:
+            # After an autosuspend every idle connection may be dead: keep discarding
+            # until one answers or the pool opens a fresh one (fresh ones skip the ping)
+            conn = self._pool.getconn()
+            while not self._is_healthy(conn):
+                self._last_used.pop(id(conn), None)
+                self._pool.putconn(conn, close=True)
+                with self._lock:
+                    self._metrics['reconnects'] += 1
+                logger.info("Replaced stale database connection")
+                conn = self._pool.getconn()
+        except Exception:
+            self._slots.release()
+            raise
+
+        waited = time.monotonic() - start
+        with self._lock:
+            self._metrics['checkouts'] += 1
+            self._metrics['in_use'] += 1
+            self._metrics['wait_seconds'] += waited
+            self._metrics['max_wait_seconds'] = max(self._metrics['max_wait_seconds'], waited)
+        return conn
+
+    def _return(self, conn, broken: bool):
+        try:
+            discard = broken or bool(conn.closed)
+            if discard:
+                self._last_used.pop(id(conn), None)
+            else:
+                self._last_used[id(conn)] = time.monotonic()
+            self._pool.putconn(conn, close=discard)
+        finally:
+            with self._lock:
+                self._metrics['in_use'] -= 1
+            self._slots.release()
+
+    @contextmanager
+    def connection(self):
+        """
+        Check out a connection for one transaction.
+
+        Commits when the block finishes and rolls back if it raises (including a
+        streaming generator closed early); connections that fail during rollback
+        are discarded instead of being returned.
+        """
+        conn = self._checkout()
+        broken = False
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            with self._lock:
+                self._metrics['errors'] += 1
+            try:
+                conn.rollback()
+                with self._lock:
+                    self._metrics['rollbacks'] += 1
+            except psycopg2.Error:
+                broken = True
+            raise
+        finally:
+            self._return(conn, broken)
+
+    @contextmanager
+    def cursor(self, cursor_factory=None):
+        """Cursor in its own transaction (see connection())."""
+        with self.connection() as conn:
+            with conn.cursor(cursor_factory=cursor_factory) as cur:
+                yield cur
+
+    def metrics(self) -> Dict:
+        """Pool usage counters."""
+        with self._lock:
+            metrics = dict(self._metrics)
+        metrics['max_size'] = self.maxconn
+        metrics['open'] = len(self._pool._used) + len(self._pool._pool)
+        metrics['idle'] = len(self._pool._pool)
+        metrics['avg_wait_ms'] = round(
+            metrics['wait_seconds'] * 1000 / metrics['checkouts'], 3
+        ) if metrics['checkouts'] else 0.0
+        return metrics
+
+    def close(self):
+        """Close every pooled connection."""
+        self._pool.closeall()
@@ -2,39 +2,94 @@
 Neon Resume Manager - Handle resume upload and storage in Neon PostgreSQL
 """
 
+import csv
+import hashlib
+import logging
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import execute_values
 import os
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional, Iterator
 from io import BytesIO
 import tempfile
 from datetime import datetime
 from functools import lru_cache
 
 from utils.bookmark_manager import BookmarkManager
+from utils.neon_pool import NeonConnectionPool
 from utils.text_processor import TextProcessor
 
+logger = logging.getLogger(__name__)
+
+# Per-process bookmark manager for the parse pool (created on first use in each worker)
+_worker_bookmarks = None
+
+
+def _detect_bookmarks_in_worker(content: bytes) -> List[str]:
+    """Detect bookmarks inside a parse pool worker."""
+    global _worker_bookmarks
+    if _worker_bookmarks is None:
+        _worker_bookmarks = BookmarkManager()
+    return _worker_bookmarks.detect_bookmarks(BytesIO(content))
+
 
 class NeonResumeManager:
     """Manage resume uploads and storage in Neon database"""
     
-    def __init__(self, db_url: str):
+    # Counters served by get_stats (rows in table_counters)
+    STATS_KEYS = ("total_resumes", "total_users", "total_jobs")
+    
+    # Columns returned by listings and exports
+    RESUME_COLUMNS = ("id", "filename", "technologies", "bookmarks", "size", "created_at")
+    
+    # Upsert that always returns the user's id (DO NOTHING would return no row for existing users)
+    UPSERT_USER_SQL = """
+        INSERT INTO users (email) VALUES (%s)
+        ON CONFLICT (email) DO UPDATE SET email = EXCLUDED.email
+        RETURNING id
+    """
+    
+    def __init__(self, db_url: str, min_connections: int = 1, max_connections: int = 10,
+                 user_cache_ttl: float = 300.0, storage: str = "local",
+                 chunk_size: int = 1024 * 1024, stats_ttl: float = 30.0):
+        """
+        Args:
+            db_url: Neon PostgreSQL connection URL
+            min_connections: Pooled connections opened up front
+            max_connections: Maximum pooled connections
+            user_cache_ttl: Seconds an email -> user_id mapping is trusted
+            storage: "local" (files under ./resumes_uploaded, path in s3_path) or
+                     "database" (bytes in resume_blobs, deduplicated by SHA-256)
+            chunk_size: Bytes fetched per round trip when reading blobs
+            stats_ttl: Seconds get_stats() results are cached
+        """
+        if storage not in ("local", "database"):
+            raise ValueError(f"Unknown resume storage: {storage}")
         self.db_url = db_url
+        self.storage = storage
+        self.chunk_size = chunk_size
         self.bookmark_manager = BookmarkManager()
         self.local_storage = Path("./resumes_uploaded")
         self.local_storage.mkdir(parents=True, exist_ok=True)
-        self._connection = None
+        # Read-through cache of database blobs, keyed by content hash
+        self.cache_dir = self.local_storage / ".blob_cache"
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.pool = NeonConnectionPool(db_url, minconn=min_connections, maxconn=max_connections)
+        self.user_cache_ttl = user_cache_ttl
+        self._user_ids: Dict[str, Tuple[int, float]] = {}
+        self.stats_ttl = stats_ttl
+        self._stats: Optional[Tuple[Dict, float]] = None
     
-    def get_connection(self):
-        """Get or create persistent connection"""
-        try:
-            if not self._connection or self._connection.closed:
-                self._connection = psycopg2.connect(self.db_url)
-            return self._connection
-        except:
-            self._connection = psycopg2.connect(self.db_url)
-            return self._connection
+    def pool_metrics(self) -> Dict:
+        """Connection pool usage (checkouts, waits, rollbacks, reconnects)"""
+        return self.pool.metrics()
+    
+    def close(self):
+        """Close all pooled connections"""
+        self.pool.close()
     
     def upload_resume(self, file_content: BytesIO, filename: str, user_email: str = None) -> Tuple[bool, str]:
         """Upload resume and store metadata in Neon"""
@@ -42,170 +97,282 @@ class NeonResumeManager:
             # Step 1: Extract technologies from filename
             techs = self._extract_techs_from_filename(filename)
             
-            # Step 2: Save file locally/temp
-            file_path = self.local_storage / filename
-            with open(file_path, 'wb') as f:
-                f.write(file_content.getvalue())
+            # Step 2: Save file locally (or to the blob cache)
+            content = file_content.getvalue()
+            s3_path, content_hash = self._store_file(filename, content)
             
             # Step 3: Extract bookmarks
-            bookmarks = self.bookmark_manager.detect_bookmarks(str(file_path))
-            
-            # Step 4: Get file size
-            file_size = file_path.stat().st_size
+            bookmarks = self.bookmark_manager.detect_bookmarks(BytesIO(content))
             
-            # Step 5: Store in Neon database
-            user_id = self._get_or_create_user(user_email) if user_email else None
-            
-            conn = psycopg2.connect(self.db_url)
-            cur = conn.cursor()
-            
-            cur.execute("""
-                INSERT INTO resumes 
-                (user_id, filename, s3_path, technologies, bookmarks, size, created_at)
-                VALUES (%s, %s, %s, %s, %s, %s, NOW())
-                RETURNING id
-            """, (user_id, filename, str(file_path), techs, bookmarks, file_size))
-            
-            resume_id = cur.fetchone()[0]
-            conn.commit()
-            cur.close()
-            conn.close()
+            # Step 4: Store in Neon database (blob + user upsert + insert in one statement)
+            with self.pool.cursor() as cur:
+                resume_id = self._insert_resumes(
+                    cur, user_email,
+                    [(filename, s3_path, techs, bookmarks, len(content), content_hash)],
+                    blobs={content_hash: content} if content_hash else None
+                )[0]
+            self.invalidate_stats()
             
             return True, f"Resume stored! ID: {resume_id}"
         
         except Exception as e:
+            logger.error(f"Resume upload failed for {filename}: {e}")
             return False, f"Error: {str(e)}"
     
-    def get_user_resumes(self, user_email: str) -> Tuple[bool, List[Dict]]:
-        """Get all resumes for a user from Neon"""
+    def bulk_upload_resumes(self, files: List[Tuple[str, bytes]], user_email: str = None,
+                            parse_workers: Optional[int] = None) -> Tuple[bool, Dict]:
+        """
+        Upload many resumes with one user lookup and one multi-row INSERT.
+        
+        Args:
+            files: (filename, content bytes) pairs
+            user_email: Owner of every uploaded resume
+            parse_workers: Bookmark parse processes (0 = parse on threads, None = CPU count)
+        
+        Returns:
+            (success, report) - report has resume_ids, rows, timings and rows_per_sec
+        """
+        report = {"rows": 0, "resume_ids": [], "parse_seconds": 0.0,
+                  "insert_seconds": 0.0, "seconds": 0.0, "rows_per_sec": 0.0}
+        if not files:
+            return True, report
+        
         try:
-            user_id = self._get_user_id(user_email)
-            if not user_id:
-                return True, []
+            start = time.perf_counter()
             
-            conn = self.get_connection()
-            cur = conn.cursor(cursor_factory=RealDictCursor)
+            # Step 1: Save files and parse bookmarks in parallel
+            stored = [self._store_file(filename, content) for filename, content in files]
             
-            # Optimized query - limit results
-            cur.execute("""
-                SELECT id, filename, technologies, bookmarks, size, created_at
-                FROM resumes
-                WHERE user_id = %s AND deleted_at IS NULL
-                ORDER BY created_at DESC
-                LIMIT 50
-            """, (user_id,))
-            
-            resumes = cur.fetchall()
-            cur.close()
-            
-            return True, list(resumes) if resumes else []
+            contents = [content for _, content in files]
+            if parse_workers == 0:
+                executor = ThreadPoolExecutor(max_workers=min(8, len(files)))
+            else:
+                executor = ProcessPoolExecutor(max_workers=parse_workers)
+            with executor:
+                all_bookmarks = list(executor.map(_detect_bookmarks_in_worker, contents,
+                                                  chunksize=max(1, len(files) // 32)))
+            report["parse_seconds"] = round(time.perf_counter() - start, 4)
+            
+            # Step 2: Resolve the user and insert every row in one round trip
+            insert_start = time.perf_counter()
+            rows = [
+                (filename, s3_path, self._extract_techs_from_filename(filename),
+                 bookmarks, len(content), content_hash)
+                for (filename, content), (s3_path, content_hash), bookmarks
+                in zip(files, stored, all_bookmarks)
+            ]
+            blobs = {content_hash: content for (_, content), (_, content_hash) in zip(files, stored)
+                     if content_hash}
+            with self.pool.cursor() as cur:
+                resume_ids = self._insert_resumes(cur, user_email, rows, blobs=blobs or None)
+            self.invalidate_stats()
+            
+            report["insert_seconds"] = round(time.perf_counter() - insert_start, 4)
+            report["seconds"] = round(time.perf_counter() - start, 4)
+            report["rows"] = len(rows)
+            report["resume_ids"] = resume_ids
+            report["rows_per_sec"] = round(len(rows) / report["seconds"], 1) if report["seconds"] else 0.0
+            
+            logger.info(f"Bulk uploaded {len(rows)} resumes in {report['seconds']}s "
+                        f"({report['rows_per_sec']} rows/s)")
+            return True, report
         
         except Exception as e:
-            return False, []
+            logger.error(f"Bulk resume upload failed: {e}")
+            report["error"] = str(e)
+            return False, report
     
-    def get_all_public_resumes(self) -> Tuple[bool, List[Dict]]:
-        """Get all resumes from database (for admin/search)"""
+    def list_resumes_page(self, user_email: str = None, technology: str = None,
+                          limit: int = 50, cursor: str = None) -> Tuple[bool, Dict]:
+        """
+        One page of resumes, newest first, using keyset pagination on (created_at, id).
+        
+        Args:
+            user_email: Only this user's resumes
+            technology: Only resumes tagged with this technology
+            limit: Page size
+            cursor: next_cursor from the previous page (None for the first page)
+        
+        Returns:
+            (success, {"resumes": [...], "next_cursor": str or None})
+        """
         try:
-            conn = self.get_connection()
-            cur = conn.cursor(cursor_factory=RealDictCursor)
-            
-            cur.execute("""
-                SELECT id, filename, technologies, bookmarks, size, created_at
-                FROM resumes
-                WHERE deleted_at IS NULL
-                ORDER BY created_at DESC
-                LIMIT 100
-            """)
-            
-            resumes = cur.fetchall()
-            cur.close()
-            
-            return True, list(resumes) if resumes else []
+            joins, conditions, params = self._resume_filters(user_email, technology)
+            if cursor:
+                created_at, resume_id = self._decode_cursor(cursor)
+                conditions.append("(r.created_at, r.id) < (%s, %s)")
+                params += [created_at, resume_id]
+            
+            with self.pool.cursor() as cur:
+                cur.execute(f"""
+                    SELECT {self._resume_columns_sql()}
+                    FROM resumes r {joins}
+                    WHERE {' AND '.join(conditions)}
+                    ORDER BY r.created_at DESC, r.id DESC
+                    LIMIT %s
+                """, params + [limit + 1])
+                
+                rows = cur.fetchall()
+            
+            resumes = [dict(zip(self.RESUME_COLUMNS, row)) for row in rows[:limit]]
+            next_cursor = self._encode_cursor(resumes[-1]) if len(rows) > limit else None
+            return True, {"resumes": resumes, "next_cursor": next_cursor}
         
         except Exception as e:
-            return False, []
+            logger.error(f"Failed to list resumes: {e}")
+            return False, {"resumes": [], "next_cursor": None}
+    
+    def get_user_resumes(self, user_email: str, limit: int = 50, cursor: str = None) -> Tuple[bool, List[Dict]]:
+        """Get a page of a user's resumes from Neon (see list_resumes_page)"""
+        success, page = self.list_resumes_page(user_email=user_email, limit=limit, cursor=cursor)
+        return success, page["resumes"]
     
-    def search_resumes_by_tech(self, technology: str) -> Tuple[bool, List[Dict]]:
+    def get_all_public_resumes(self, limit: int = 100, cursor: str = None) -> Tuple[bool, List[Dict]]:
+        """Get a page of all resumes from database (for admin/search)"""
+        success, page = self.list_resumes_page(limit=limit, cursor=cursor)
+        return success, page["resumes"]
+    
+    def search_resumes_by_tech(self, technology: str, limit: int = 50, cursor: str = None) -> Tuple[bool, List[Dict]]:
         """Search resumes by technology"""
+        success, page = self.list_resumes_page(technology=technology, limit=limit, cursor=cursor)
+        return success, page["resumes"]
+    
+    def iter_resumes(self, user_email: str = None, technology: str = None,
+                     batch_size: int = 1000) -> Iterator[Dict]:
+        """
+        Stream every matching resume through a server-side (named) cursor.
+        
+        Rows arrive in batches of batch_size, so exports never hold the full
+        table in memory. The pooled connection is held until iteration ends.
+        """
+        joins, conditions, params = self._resume_filters(user_email, technology)
+        with self.pool.connection() as conn:
+            with conn.cursor(name=f"resume_export_{uuid.uuid4().hex[:12]}") as cur:
+                cur.itersize = batch_size
+                cur.execute(f"""
+                    SELECT {self._resume_columns_sql()}
+                    FROM resumes r {joins}
+                    WHERE {' AND '.join(conditions)}
+                    ORDER BY r.created_at DESC, r.id DESC
+                """, params)
+                for row in cur:
+                    yield dict(zip(self.RESUME_COLUMNS, row))
+    
+    def export_resumes_csv(self, output_path: str, user_email: str = None,
+                           technology: str = None) -> Tuple[bool, int]:
+        """Stream matching resume metadata to a CSV file; returns (success, rows written)"""
+        count = 0
         try:
-            conn = self.get_connection()
-            cur = conn.cursor(cursor_factory=RealDictCursor)
-            
-            cur.execute("""
-                SELECT id, filename, technologies, bookmarks, size, created_at
-                FROM resumes
-                WHERE deleted_at IS NULL 
-                AND technologies @> ARRAY[%s]
-                ORDER BY created_at DESC
-                LIMIT 50
-            """, (technology,))
-            
-            resumes = cur.fetchall()
-            cur.close()
-            
-            return True, list(resumes) if resumes else []
+            with open(output_path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(self.RESUME_COLUMNS)
+                for resume in self.iter_resumes(user_email, technology):
+                    writer.writerow([
+                        ";".join(value or []) if column in ("technologies", "bookmarks") else value
+                        for column, value in resume.items()
+                    ])
+                    count += 1
+            return True, count
         
         except Exception as e:
-            return False, []
+            logger.error(f"Resume export failed after {count} rows: {e}")
+            return False, count
+    
+    def _resume_columns_sql(self) -> str:
+        return ", ".join(f"r.{column}" for column in self.RESUME_COLUMNS)
+    
+    @staticmethod
+    def _resume_filters(user_email: str = None, technology: str = None) -> Tuple[str, List[str], List]:
+        """JOIN clause, WHERE conditions and params shared by listing and export"""
+        joins, conditions, params = "", ["r.deleted_at IS NULL"], []
+        if user_email:
+            joins = "JOIN users u ON u.id = r.user_id"
+            conditions.append("u.email = %s")
+            params.append(user_email)
+        if technology:
+            conditions.append("r.technologies @> ARRAY[%s]::text[]")
+            params.append(technology)
+        return joins, conditions, params
+    
+    @staticmethod
+    def _encode_cursor(resume: Dict) -> str:
+        return f"{resume['created_at'].isoformat()}|{resume['id']}"
+    
+    @staticmethod
+    def _decode_cursor(cursor: str) -> Tuple[datetime, int]:
+        created_at, resume_id = cursor.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(resume_id)
     
     def delete_resume(self, resume_id: int, user_email: str) -> Tuple[bool, str]:
         """Soft delete resume (mark as deleted)"""
         try:
-            user_id = self._get_user_id(user_email)
-            
-            conn = self.get_connection()
-            cur = conn.cursor()
-            
-            # Check if user owns this resume
-            cur.execute("""
-                SELECT id FROM resumes 
-                WHERE id = %s AND user_id = %s
-            """, (resume_id, user_id))
-            
-            if not cur.fetchone():
-                cur.close()
-                return False, "Resume not found or permission denied"
-            
-            # Soft delete
-            cur.execute("""
-                UPDATE resumes 
-                SET deleted_at = NOW()
-                WHERE id = %s
-            """, (resume_id,))
-            
-            conn.commit()
-            cur.close()
-            
+            with self.pool.cursor() as cur:
+                # Check ownership and soft delete in one statement
+                cur.execute("""
+                    UPDATE resumes r
+                    SET deleted_at = NOW()
+                    FROM users u
+                    WHERE r.id = %s AND r.user_id = u.id AND u.email = %s
+                    RETURNING r.id
+                """, (resume_id, user_email))
+                
+                if not cur.fetchone():
+                    return False, "Resume not found or permission denied"
+            
+            self.invalidate_stats()
             return True, "Resume deleted"
         
         except Exception as e:
+            logger.error(f"Failed to delete resume {resume_id}: {e}")
             return False, str(e)
     
+    def get_resume_path(self, resume_id: int) -> Optional[Path]:
+        """
+        Local path of a resume's bytes, streaming database blobs into the cache on first read.
+        
+        Rows with a content_hash are read from resume_blobs whatever the current
+        storage mode, so resumes uploaded under "database" storage stay readable
+        after switching to "local".
+        
+        Returns:
+            Path, or None if the resume or its file is missing
+        """
+        with self.pool.cursor() as cur:
+            cur.execute("SELECT s3_path, content_hash FROM resumes WHERE id = %s", (resume_id,))
+            result = cur.fetchone()
+            if not result:
+                return None
+            
+            s3_path, content_hash = result
+            if content_hash:
+                path = self.cache_dir / f"{content_hash}.docx"
+                if not path.exists():
+                    path = self._write_cache(content_hash, self._iter_blob_chunks(cur, content_hash))
+                return path
+        
+        if s3_path and os.path.exists(s3_path):
+            return Path(s3_path)
+        return None
+    
+    def iter_resume_file(self, resume_id: int, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+        """Stream a resume's bytes in chunks (empty if missing)"""
+        path = self.get_resume_path(resume_id)
+        if path is None:
+            return
+        with open(path, 'rb') as f:
+            while chunk := f.read(chunk_size):
+                yield chunk
+    
     def get_resume_file(self, resume_id: int) -> Tuple[bool, BytesIO]:
         """Get resume file content"""
         try:
-            conn = self.get_connection()
-            cur = conn.cursor()
-            
-            cur.execute("""
-                SELECT s3_path FROM resumes WHERE id = %s
-            """, (resume_id,))
-            
-            result = cur.fetchone()
-            cur.close()
-            
-            if not result:
+            path = self.get_resume_path(resume_id)
+            if path is None:
                 return False, None
-            
-            file_path = result[0]
-            if os.path.exists(file_path):
-                with open(file_path, 'rb') as f:
-                    content = BytesIO(f.read())
-                return True, content
-            
-            return False, None
+            return True, BytesIO(path.read_bytes())
         
         except Exception as e:
+            logger.error(f"Failed to load resume file {resume_id}: {e}")
             return False, None
     
     def _extract_techs_from_filename(self, filename: str) -> List[str]:
@@ -220,72 +387,164 @@ class NeonResumeManager:
         
         return []
     
-    def _get_or_create_user(self, email: str) -> int:
-        """Get user ID or create new user"""
-        try:
-            conn = self.get_connection()
-            cur = conn.cursor()
-            
-            # Try to get existing user
-            cur.execute("SELECT id FROM users WHERE email = %s", (email,))
-            result = cur.fetchone()
-            
-            if result:
-                user_id = result[0]
-            else:
-                # Create new user
-                cur.execute("""
-                    INSERT INTO users (email, created_at)
-                    VALUES (%s, NOW())
-                    RETURNING id
-                """, (email,))
-                user_id = cur.fetchone()[0]
-                conn.commit()
-            
-            cur.close()
-            return user_id
+    def _cached_user_id(self, email: str) -> Optional[int]:
+        """User id from the TTL cache, or None if unknown or expired"""
+        entry = self._user_ids.get(email)
+        if entry and time.monotonic() - entry[1] < self.user_cache_ttl:
+            return entry[0]
+        return None
+    
+    def _insert_resumes(self, cur, user_email: Optional[str], rows: List[Tuple],
+                        blobs: Optional[Dict[str, bytes]] = None) -> List[int]:
+        """
+        Insert resume rows, resolving the owner (and storing blobs) inside the same statement.
         
-        except Exception as e:
-            return None
+        Args:
+            cur: Cursor in the caller's transaction
+            user_email: Owner email (None for anonymous uploads)
+            rows: (filename, s3_path, technologies, bookmarks, size, content_hash) tuples
+            blobs: content_hash -> bytes to store in resume_blobs (database storage only)
+        
+        Returns:
+            New resume ids in row order
+        """
+        data_columns = ["filename", "s3_path", "technologies", "bookmarks", "size"]
+        if self.storage == "database":
+            data_columns.append("content_hash")
+        else:
+            rows = [tuple(row[:5]) for row in rows]
+        placeholders = ["%s::text[]" if column in ("technologies", "bookmarks") else "%s"
+                        for column in data_columns]
+        columns = f"(user_id, {', '.join(data_columns)})"
+        user_id = self._cached_user_id(user_email) if user_email else None
+        
+        # execute_values only fills the VALUES placeholder, so CTE parameters
+        # are bound up front with mogrify
+        ctes = []
+        if blobs:
+            values = ", ".join(
+                cur.mogrify("(%s, %s, %s)", (content_hash, len(content), psycopg2.Binary(content))).decode()
+                for content_hash, content in blobs.items()
+            )
+            ctes.append(f"b AS (INSERT INTO resume_blobs (sha256, size, content) VALUES {values} "
+                        f"ON CONFLICT (sha256) DO NOTHING)")
+        
+        if user_email and user_id is None:
+            ctes.append(f"u AS ({cur.mogrify(self.UPSERT_USER_SQL, (user_email,)).decode()})")
+            body = f"""
+                INSERT INTO resumes {columns}
+                SELECT (SELECT id FROM u), {', '.join(f'v.{column}' for column in data_columns)}
+                FROM (VALUES %s) AS v({', '.join(data_columns)})
+            """
+            template = f"({', '.join(placeholders)})"
+        else:
+            body = f"INSERT INTO resumes {columns} VALUES %s"
+            template = f"(%s, {', '.join(placeholders)})"
+            rows = [(user_id,) + tuple(row) for row in rows]
+        
+        prefix = ("WITH " + ", ".join(ctes)).replace('%', '%%') if ctes else ""
+        query = f"{prefix} {body} RETURNING id, user_id"
+        
+        result = execute_values(cur, query, rows, template=template, page_size=len(rows), fetch=True)
+        if user_email and result:
+            self._user_ids[user_email] = (result[0][1], time.monotonic())
+        return [row[0] for row in result]
     
-    def _get_user_id(self, email: str) -> int:
-        """Get user ID by email"""
-        try:
-            conn = self.get_connection()
-            cur = conn.cursor()
-            
-            cur.execute("SELECT id FROM users WHERE email = %s LIMIT 1", (email,))
-            result = cur.fetchone()
-            
-            cur.close()
-            
-            return result[0] if result else None
+    def _store_file(self, filename: str, content: bytes) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Keep an uploaded file for later reads.
         
-        except Exception as e:
-            return None
+        Returns:
+            (s3_path, content_hash) - a local path for "local" storage, or the
+            SHA-256 of the bytes (also written to the blob cache) for "database"
+        """
+        if self.storage == "local":
+            file_path = self.local_storage / filename
+            with open(file_path, 'wb') as f:
+                f.write(content)
+            return str(file_path), None
+        
+        content_hash = hashlib.sha256(content).hexdigest()
+        self._write_cache(content_hash, [content])
+        return None, content_hash
     
-    def get_stats(self) -> Dict:
-        """Get database statistics (cached at session level)"""
+    def _write_cache(self, content_hash: str, chunks) -> Path:
+        """Atomically write chunks to the blob cache, verifying the content hash"""
+        path = self.cache_dir / f"{content_hash}.docx"
+        if path.exists():
+            return path
+        digest = hashlib.sha256()
+        tmp_path = self.cache_dir / f".{content_hash}.{uuid.uuid4().hex[:8]}.tmp"
         try:
-            conn = self.get_connection()
-            cur = conn.cursor()
-            
-            # Batch query in single round trip
-            cur.execute("""
-                SELECT 
-                    (SELECT COUNT(*) FROM resumes WHERE deleted_at IS NULL) as total_resumes,
-                    (SELECT COUNT(*) FROM users) as total_users,
-                    (SELECT COUNT(*) FROM job_applications) as total_jobs
-            """)
-            
+            with open(tmp_path, 'wb') as f:
+                for chunk in chunks:
+                    digest.update(chunk)
+                    f.write(chunk)
+            if digest.hexdigest() != content_hash:
+                raise ValueError(f"Blob {content_hash[:12]} failed hash check")
+            os.replace(tmp_path, path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        return path
+    
+    def _iter_blob_chunks(self, cur, content_hash: str):
+        """Read a stored blob chunk by chunk (resume_blobs.content uses EXTERNAL storage)"""
+        offset = 1
+        while True:
+            cur.execute(
+                "SELECT substring(content FROM %s FOR %s) FROM resume_blobs WHERE sha256 = %s",
+                (offset, self.chunk_size, content_hash)
+            )
             row = cur.fetchone()
-            cur.close()
-            
-            return {
-                "total_resumes": row[0] if row else 0,
-                "total_users": row[1] if row else 0,
-                "total_jobs": row[2] if row else 0
-            }
+            if row is None:
+                raise FileNotFoundError(f"Blob {content_hash[:12]} missing from resume_blobs")
+            chunk = bytes(row[0])
+            if chunk:
+                yield chunk
+            if len(chunk) < self.chunk_size:
+                return
+            offset += len(chunk)
+    
+    def get_stats(self) -> Dict:
+        """
+        Get database statistics.
+        
+        Served from a TTL cache; misses read the trigger-maintained table_counters
+        rows (O(1) regardless of table size) and fall back to COUNT(*) on
+        databases set up before the counters existed.
+        """
+        cached = self._stats
+        if cached and time.monotonic() - cached[1] < self.stats_ttl:
+            return dict(cached[0])
+        
+        try:
+            try:
+                with self.pool.cursor() as cur:
+                    cur.execute("SELECT name, value FROM table_counters WHERE name = ANY(%s)",
+                                (list(self.STATS_KEYS),))
+                    stats = dict(cur.fetchall())
+            except psycopg2.errors.UndefinedTable:
+                stats = {}
+            
+            if len(stats) < len(self.STATS_KEYS):
+                with self.pool.cursor() as cur:
+                    # Batch query in single round trip
+                    cur.execute("""
+                        SELECT 
+                            (SELECT COUNT(*) FROM resumes WHERE deleted_at IS NULL) as total_resumes,
+                            (SELECT COUNT(*) FROM users) as total_users,
+                            (SELECT COUNT(*) FROM job_applications) as total_jobs
+                    """)
+                    stats = dict(zip(self.STATS_KEYS, cur.fetchone()))
+            
+            stats = {key: int(stats[key]) for key in self.STATS_KEYS}
+            self._stats = (stats, time.monotonic())
+            return dict(stats)
         
         except Exception as e:
+            logger.error(f"Failed to load database stats: {e}")
             return {"total_resumes": 0, "total_users": 0, "total_jobs": 0}
+    
+    def invalidate_stats(self):
+        """Drop cached stats so the next get_stats() reads fresh counters"""
+        self._stats = None
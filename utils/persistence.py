@@ -2,16 +2,47 @@
 Data persistence utilities for saving user preferences and settings.
 """
 
+import atexit
 import json
 import logging
+import os
+import tempfile
+import threading
+import weakref
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process locking only
+    fcntl = None
 
 logger = logging.getLogger(__name__)
 
+# Serializes flushes within this process (flock covers other processes)
+_FILE_LOCK = threading.Lock()
+
+# Instances with unflushed changes, flushed once at interpreter exit
+_PENDING = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_pending():
+    for settings in list(_PENDING):
+        settings.flush()
+
 
 class SettingsPersistence:
-    """Handles saving and loading user settings."""
+    """
+    Handles saving and loading user settings.
+    
+    Writes are change-detecting and write-behind: set() ignores unchanged
+    values and schedules a debounced flush instead of rewriting the file.
+    A flush re-reads the file under a lock and merges only the keys this
+    instance changed, so concurrent Streamlit sessions don't clobber each
+    other, then replaces the file atomically.
+    """
     
     SETTINGS_DIR = Path.home() / ".extract_points" / "settings"
     SETTINGS_FILE = SETTINGS_DIR / "user_settings.json"
@@ -28,45 +59,141 @@ class SettingsPersistence:
         'session_history': [],  # Track last 5 sessions
     }
     
-    def __init__(self):
-        """Initialize settings persistence."""
-        self.SETTINGS_DIR.mkdir(parents=True, exist_ok=True)
+    HISTORY_LIMIT = 5
+    
+    def __init__(self, settings_file: Optional[Path] = None, flush_delay: float = 1.0):
+        """
+        Initialize settings persistence.
+        
+        Args:
+            settings_file: Settings JSON path (defaults to SETTINGS_FILE)
+            flush_delay: Seconds to coalesce changes before writing (0 = write immediately)
+        """
+        self.settings_file = Path(settings_file) if settings_file else self.SETTINGS_FILE
+        self.settings_file.parent.mkdir(parents=True, exist_ok=True)
+        self.flush_delay = flush_delay
+        self._lock = threading.RLock()
+        self._dirty: Dict[str, Any] = {}
+        self._history_ops: List[Tuple[str, Optional[str]]] = []
+        self._timer: Optional[threading.Timer] = None
+        self.writes = 0
         self.settings = self._load_settings()
     
     def _load_settings(self) -> Dict[str, Any]:
         """Load settings from file."""
         try:
-            if self.SETTINGS_FILE.exists():
-                with open(self.SETTINGS_FILE, 'r') as f:
+            if self.settings_file.exists():
+                with open(self.settings_file, 'r') as f:
                     loaded = json.load(f)
                     # Merge with defaults to ensure all keys exist
                     settings = {**self.DEFAULT_SETTINGS, **loaded}
-                    logger.debug(f"Loaded user settings from {self.SETTINGS_FILE}")
+                    logger.debug(f"Loaded user settings from {self.settings_file}")
                     return settings
         except Exception as e:
             logger.warning(f"Could not load settings: {e}")
         
         return self.DEFAULT_SETTINGS.copy()
     
-    def save_settings(self) -> bool:
-        """Save current settings to file."""
+    @contextmanager
+    def _file_lock(self):
+        """Exclusive lock across threads and processes for read-merge-write."""
+        with _FILE_LOCK:
+            if fcntl is None:
+                yield
+                return
+            lock_path = self.settings_file.with_suffix(self.settings_file.suffix + ".lock")
+            with open(lock_path, 'a') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+    
+    def _write_atomic(self, settings: Dict[str, Any]):
+        """Write to a temp file in the same directory, then rename over the settings file."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.settings_file.parent, prefix=".settings-", suffix=".tmp")
         try:
-            with open(self.SETTINGS_FILE, 'w') as f:
-                json.dump(self.settings, f, indent=2)
-            logger.info("Settings saved successfully")
-            return True
-        except Exception as e:
-            logger.error(f"Could not save settings: {e}")
-            return False
+            with os.fdopen(fd, 'w') as f:
+                json.dump(settings, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.settings_file)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+    
+    def _apply_history_ops(self, history: list, ops: List[Tuple[str, Optional[str]]]) -> list:
+        for op, item in ops:
+            if op == 'clear':
+                history = []
+            else:
+                history = [item] + history
+        return history[:self.HISTORY_LIMIT]
+    
+    def _mark_dirty(self):
+        _PENDING.add(self)
+        if self.flush_delay <= 0:
+            self.flush()
+        elif self._timer is None:
+            # Coalesce: changes made before the timer fires go out in one write
+            self._timer = threading.Timer(self.flush_delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+    
+    def flush(self) -> bool:
+        """
+        Write pending changes now.
+        
+        Re-reads the file under a lock, applies only this instance's changed
+        keys and history entries, and atomically replaces the file.
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._dirty and not self._history_ops:
+                return True
+            dirty, ops = self._dirty, self._history_ops
+            self._dirty, self._history_ops = {}, []
+            
+            try:
+                with self._file_lock():
+                    merged = self._load_settings()
+                    merged.update(dirty)
+                    if ops:
+                        merged['session_history'] = self._apply_history_ops(
+                            list(merged.get('session_history', [])), ops
+                        )
+                    self._write_atomic(merged)
+                self.writes += 1
+                # Pick up changes other sessions flushed in the meantime
+                self.settings = merged
+                _PENDING.discard(self)
+                logger.info("Settings saved successfully")
+                return True
+            except Exception as e:
+                # Keep the changes pending so a later flush can retry them
+                self._dirty = {**dirty, **self._dirty}
+                self._history_ops = ops + self._history_ops
+                logger.error(f"Could not save settings: {e}")
+                return False
+    
+    def save_settings(self) -> bool:
+        """Save pending settings to file immediately."""
+        return self.flush()
     
     def get(self, key: str, default: Any = None) -> Any:
         """Get a setting value."""
         return self.settings.get(key, default)
     
     def set(self, key: str, value: Any) -> None:
-        """Set a setting value."""
-        self.settings[key] = value
-        self.save_settings()
+        """Set a setting value (no-op if unchanged; written on the next flush)."""
+        with self._lock:
+            if key in self.settings and self.settings[key] == value:
+                return
+            self.settings[key] = value
+            self._dirty[key] = value
+            self._mark_dirty()
     
     def get_all(self) -> Dict[str, Any]:
         """Get all settings as a dictionary."""
@@ -74,8 +201,12 @@ class SettingsPersistence:
     
     def reset_to_defaults(self) -> None:
         """Reset all settings to defaults."""
-        self.settings = self.DEFAULT_SETTINGS.copy()
-        self.save_settings()
+        with self._lock:
+            self.settings = self.DEFAULT_SETTINGS.copy()
+            self._dirty = {key: value for key, value in self.DEFAULT_SETTINGS.items()
+                           if key != 'session_history'}
+            self._history_ops = [('clear', None)]
+            self.flush()
         logger.info("Settings reset to defaults")
     
     def add_to_history(self, item: str) -> None:
@@ -85,11 +216,12 @@ class SettingsPersistence:
         Args:
             item: Description of action/file processed
         """
-        history = self.settings.get('session_history', [])
-        history.insert(0, item)
-        # Keep only last 5 items
-        self.settings['session_history'] = history[:5]
-        self.save_settings()
+        with self._lock:
+            self.settings['session_history'] = self._apply_history_ops(
+                list(self.settings.get('session_history', [])), [('add', item)]
+            )
+            self._history_ops.append(('add', item))
+            self._mark_dirty()
     
     def get_history(self) -> list:
         """Get session history."""
@@ -97,8 +229,10 @@ class SettingsPersistence:
     
     def clear_history(self) -> None:
         """Clear session history."""
-        self.settings['session_history'] = []
-        self.save_settings()
+        with self._lock:
+            self.settings['session_history'] = []
+            self._history_ops.append(('clear', None))
+            self._mark_dirty()
 
 
 class RecentUsedManager:
@@ -0,0 +1,235 @@
+"""
+Point History - Per-person record of resume points that were already sent.
+
+Each person's history is one file holding an open-addressing hash table of
+8-byte point digests (see deduplicator.point_digest), memory-mapped so a
+lookup reads a couple of slots instead of loading the file. Membership checks
+stay O(1) as the history grows, and a million points take 16 MB on disk (the
+table is kept at most half full and doubles when it gets there).
+
+File layout (little-endian):
+    header  magic b'PTHIST01', capacity (u64), count (u64), reserved (u64)
+    slots   capacity x u64 digest, 0 = empty, linear probing
+
+Writers take an exclusive lock (flock on a .lock file where available), so
+several processes can record into the same history. Growing rewrites the
+table to a temporary file and renames it over the old one; other open
+handles see the new table after refresh().
+
+A handle may be shared between threads (job-runner workers): lookups, refresh()
+and close() all hold the handle's lock, so a lookup never reads a map that
+refresh() is closing.
+"""
+
+import hashlib
+import logging
+import mmap
+import os
+import re
+import struct
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Union
+
+from .deduplicator import point_digest
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process locking only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'PTHIST01'
+HEADER = struct.Struct('<8sQQQ')
+SLOT = struct.Struct('<Q')
+INITIAL_CAPACITY = 1024
+MAX_LOAD = 0.5
+
+
+def _write_table(path: Path, digests: Iterable[int], capacity: int):
+    """Write a fresh table holding digests to path (atomically via a temp file)."""
+    table = bytearray(HEADER.size + capacity * SLOT.size)
+    mask = capacity - 1
+    count = 0
+    for digest in digests:
+        index = digest & mask
+        while True:
+            offset = HEADER.size + index * SLOT.size
+            current = SLOT.unpack_from(table, offset)[0]
+            if current == digest:
+                break
+            if current == 0:
+                SLOT.pack_into(table, offset, digest)
+                count += 1
+                break
+            index = (index + 1) & mask
+    HEADER.pack_into(table, 0, MAGIC, capacity, count, 0)
+
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(table)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+
+class PointHistory:
+    """Memory-mapped set of point digests for one person."""
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Args:
+            path: History file (created empty if missing)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()  # re-entered by lookups inside add_points
+        self._file = None
+        self._map = None
+        with self._write_lock():
+            if not self.path.exists():
+                _write_table(self.path, (), INITIAL_CAPACITY)
+        self._open()
+
+    def _open(self):
+        self._file = open(self.path, 'r+b')
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        magic, self._capacity, _, _ = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or self._capacity & (self._capacity - 1):
+            self.close()
+            raise ValueError(f"{self.path} is not a point history file")
+        self._inode = os.fstat(self._file.fileno()).st_ino
+
+    def close(self):
+        with self._lock:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def refresh(self):
+        """Remap the file if another handle replaced it while growing."""
+        with self._lock:
+            try:
+                replaced = os.stat(self.path).st_ino != self._inode
+            except FileNotFoundError:
+                replaced = False
+            if replaced:
+                self.close()
+                self._open()
+
+    @contextmanager
+    def _write_lock(self):
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            with open(self.path.with_suffix(self.path.suffix + '.lock'), 'a') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return HEADER.unpack_from(self._map, 0)[2]
+
+    def _find(self, digest: int) -> int:
+        """Slot offset holding digest, or the empty slot where it would go (call under the lock)."""
+        mask = self._capacity - 1
+        index = digest & mask
+        while True:
+            offset = HEADER.size + index * SLOT.size
+            current = SLOT.unpack_from(self._map, offset)[0]
+            if current == digest or current == 0:
+                return offset
+            index = (index + 1) & mask
+
+    def __contains__(self, point: Union[str, int]) -> bool:
+        """Whether a point (text, or its point_digest) is in the history."""
+        digest = point_digest(point) if isinstance(point, str) else point
+        with self._lock:
+            return SLOT.unpack_from(self._map, self._find(digest))[0] == digest
+
+    def _digests(self):
+        for offset in range(HEADER.size, len(self._map), SLOT.size):
+            digest = SLOT.unpack_from(self._map, offset)[0]
+            if digest:
+                yield digest
+
+    def add_points(self, points: Iterable[str]) -> int:
+        """
+        Record points (duplicates and already recorded points are ignored).
+
+        Returns:
+            Number of points that were new
+        """
+        digests = {point_digest(point) for point in points if point.strip()}
+        if not digests:
+            return 0
+
+        with self._write_lock():
+            self.refresh()
+            new = [digest for digest in digests if digest not in self]
+            count = len(self)
+            if (count + len(new)) > self._capacity * MAX_LOAD:
+                capacity = self._capacity
+                while (count + len(new)) > capacity * MAX_LOAD:
+                    capacity *= 2
+                _write_table(self.path, [*self._digests(), *new], capacity)
+                logger.debug(f"Point history {self.path.name} grew to {capacity} slots")
+                self.refresh()
+            else:
+                for digest in new:
+                    SLOT.pack_into(self._map, self._find(digest), digest)
+                HEADER.pack_into(self._map, 0, MAGIC, self._capacity, count + len(new), 0)
+                self._map.flush()
+        return len(new)
+
+
+class PointHistoryStore:
+    """One PointHistory file per person under a folder."""
+
+    def __init__(self, folder: Union[str, Path] = "./automation_output/point_history"):
+        self.folder = Path(folder)
+        self._histories: Dict[str, PointHistory] = {}
+        self._lock = threading.Lock()
+
+    def path_for(self, person: str) -> Path:
+        """History file for a person (e.g. a recruiter email), case-insensitive."""
+        key = person.strip().lower()
+        readable = re.sub(r'[^a-z0-9._@-]+', '_', key)[:64]
+        return self.folder / f"{readable}-{hashlib.sha1(key.encode('utf-8')).hexdigest()[:8]}.pth"
+
+    def get(self, person: str) -> PointHistory:
+        """Open (or create) a person's history; handles are cached and refreshed."""
+        path = self.path_for(person)
+        with self._lock:
+            history = self._histories.get(str(path))
+            if history is None:
+                history = self._histories[str(path)] = PointHistory(path)
+            else:
+                history.refresh()
+            return history
+
+    def close(self):
+        with self._lock:
+            for history in self._histories.values():
+                history.close()
+            self._histories.clear()
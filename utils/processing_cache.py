@@ -0,0 +1,141 @@
+"""
+Processing Cache - Memoize processed text and exports across Streamlit reruns
+
+Entries are keyed by a hash of (input text, points per cycle, dedup mode) and
+hold the processed result (text or a CycleDocument) plus export bytes rendered
+on first request. The cache
+is bounded by total bytes and evicts least recently used entries first, so a
+download click or an unrelated widget change never re-runs the pipeline.
+"""
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Union
+
+from .cycle_document import CycleDocument
+from .text_input import TextSource
+
+logger = logging.getLogger(__name__)
+
+Processed = Union[str, CycleDocument]
+
+
+class _Entry:
+    __slots__ = ("text", "exports", "nbytes")
+
+    def __init__(self, text: Processed):
+        self.text = text
+        self.exports: Dict[str, bytes] = {}
+        self.nbytes = text.nbytes if isinstance(text, CycleDocument) else len(text.encode("utf-8"))
+
+
+class ProcessingCache:
+    """Byte-bounded LRU of processed text and lazily rendered exports."""
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        """
+        Args:
+            max_bytes: Upper bound on cached text + export bytes
+        """
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.stats = {"hits": 0, "misses": 0, "export_hits": 0, "export_renders": 0, "evictions": 0}
+
+    @staticmethod
+    def make_key(input_text: Union[str, TextSource], points_per_cycle: int, dedup_mode: Optional[str]) -> str:
+        """
+        Cache key for one pipeline run (dedup_mode None means dedup disabled).
+
+        A TextSource is keyed by its raw bytes, so a UTF-8 upload shares entries
+        with the same text pasted in.
+        """
+        if isinstance(input_text, TextSource):
+            digest = input_text.digest()
+            if input_text.encoding != "utf-8":
+                digest = f"{digest}/{input_text.encoding}"
+        else:
+            digest = hashlib.sha256(input_text.encode("utf-8")).hexdigest()
+        return f"{digest}:{points_per_cycle}:{dedup_mode or 'none'}"
+
+    def get_or_process(self, key: str, process: Callable[[], Processed]) -> Processed:
+        """
+        Processed result for key, running process() only on a miss.
+
+        Exceptions from process() propagate and nothing is cached.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return entry.text
+            self.stats["misses"] += 1
+
+        text = process()
+        with self._lock:
+            if key not in self._entries:
+                self._insert(key, _Entry(text))
+        return text
+
+    def get_export(self, key: str, fmt: str, text: Processed, render: Callable[[Processed], bytes]) -> bytes:
+        """
+        Export bytes for key in fmt ("docx", "pdf", ...), rendering on first request.
+
+        Args:
+            key: Cache key from make_key
+            fmt: Export format name
+            text: Processed result (re-seeds the entry if it was evicted)
+            render: Builds the export bytes from the processed result (the cached
+                one if the entry exists, e.g. a CycleDocument rather than its text)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and fmt in entry.exports:
+                self._entries.move_to_end(key)
+                self.stats["export_hits"] += 1
+                return entry.exports[fmt]
+            if entry is not None:
+                text = entry.text
+
+        data = render(text)
+        with self._lock:
+            self.stats["export_renders"] += 1
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = _Entry(text)
+                self._insert(key, entry)
+            if fmt not in entry.exports:
+                entry.exports[fmt] = data
+                entry.nbytes += len(data)
+                self._bytes += len(data)
+                self._entries.move_to_end(key)
+                self._evict()
+        return data
+
+    def _insert(self, key: str, entry: _Entry):
+        self._entries[key] = entry
+        self._bytes += entry.nbytes
+        self._evict()
+
+    def _evict(self):
+        # Never evict the entry just touched (the last one), even if it alone exceeds the budget
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.nbytes
+            self.stats["evictions"] += 1
+
+    @property
+    def nbytes(self) -> int:
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
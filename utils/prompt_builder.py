@@ -0,0 +1,326 @@
+"""
+Prompt building and token accounting for Groq requests.
+Condenses job descriptions deterministically before they are sent to the LLM
+and keeps a running record of prompt/completion token usage per call.
+"""
+
+import math
+import re
+import threading
+from typing import List, Dict, Tuple, Optional
+
+
+class PromptBuilder:
+    """Builds compact prompts for points generation within a token budget."""
+
+    # Rough heuristic for English text with the Llama tokenizer
+    CHARS_PER_TOKEN = 4
+
+    # Default context caps (tokens of job description inlined per call)
+    TECH_EXTRACTION_CONTEXT_TOKENS = 1200
+    POINTS_GENERATION_CONTEXT_TOKENS = 800
+
+    # Prose lines longer than this are cut to their first sentence when over budget
+    LONG_PARAGRAPH_CHARS = 200
+
+    # Section headings whose whole section is boilerplate and can be dropped.
+    # Each pattern must match the entire heading (case-insensitive), so headings
+    # that merely contain a keyword ("Legal Tech Experience") are kept.
+    BOILERPLATE_HEADINGS = [
+        r'equal (?:employment )?opportunity(?: employer)?(?: statement| policy)?',
+        r'equal employment(?: statement| policy)?',
+        r'eeo(?:c)?(?: statement| policy)?', r'eoe',
+        r'(?:our |employee )?benefits(?: (?:and|&) perks)?', r'perks(?: (?:and|&) benefits)?',
+        r'what we offer(?: you)?', r'compensation(?: (?:and|&) benefits)?',
+        r'salary(?: range)?', r'pay range', r'pay transparency',
+        r'about us', r'about the company', r'who we are', r'our culture',
+        r'why join(?: us)?', r'why work (?:with|for|at) us',
+        r'(?:legal )?disclaimers?', r'(?:reasonable )?accommodations?',
+        r'privacy(?: policy| notice| statement)?',
+        r'diversity(?:,? equity,? (?:and|&) inclusion| (?:and|&) inclusion)?(?: statement)?',
+        r'how to apply', r'application process', r'legal(?: notice| statement)?',
+    ]
+
+    # Sentences that are boilerplate wherever they appear (whole words only:
+    # "computer vision" or "provisioning" are requirements, not benefits)
+    BOILERPLATE_SENTENCE_PATTERNS = [
+        r'\bequal (?:opportunity|employment)\b',
+        r'\bwithout regard to\b',
+        r'\breasonable accommodations?\b',
+        r'\bprotected (?:veteran|class|characteristic)',
+        r'\be-?verify\b',
+        r'\bbackground checks?\b',
+        r'\b401\s*\(?k\)?',
+        r'\bpaid time off\b',
+        r'\bpto\b',
+        r'\b(?:dental|vision|medical|health)(?:,? (?:and )?(?:dental|vision|medical|health))*\s+'
+        r'(?:insurance|coverage|plans?|benefits)\b',
+        r'\bclick (?:apply|here)\b',
+        r'\bprivacy (?:policy|notice)\b',
+    ]
+
+    def __init__(self, tech_context_tokens: int = None, points_context_tokens: int = None):
+        """
+        Initialize prompt builder
+
+        Args:
+            tech_context_tokens: Max job description tokens for tech extraction
+            points_context_tokens: Max job description tokens for points generation
+        """
+        self.tech_context_tokens = tech_context_tokens or self.TECH_EXTRACTION_CONTEXT_TOKENS
+        self.points_context_tokens = points_context_tokens or self.POINTS_GENERATION_CONTEXT_TOKENS
+        self._sentence_re = re.compile(
+            '|'.join(self.BOILERPLATE_SENTENCE_PATTERNS), re.IGNORECASE
+        )
+        self._heading_re = re.compile(
+            '(?:' + '|'.join(self.BOILERPLATE_HEADINGS) + ')', re.IGNORECASE
+        )
+
+    @classmethod
+    def estimate_tokens(cls, text: str) -> int:
+        """Estimate token count of text (deterministic, no tokenizer needed)."""
+        if not text:
+            return 0
+        return math.ceil(len(text) / cls.CHARS_PER_TOKEN)
+
+    def _is_section_heading(self, line: str) -> bool:
+        """Check if a line looks like a section heading (short, title-like)."""
+        stripped = line.strip().rstrip(':').strip()
+        if not stripped or len(stripped) > 60:
+            return False
+        if re.match(r'^(?:•|-|\*|\+|\d+\.)\s', line.strip()):
+            return False
+        if line.strip().endswith(':') or stripped.isupper():
+            return True
+        # Title Case lines of a few words ("What We Offer", "About Us")
+        words = stripped.split()
+        small_words = {'and', 'or', 'of', 'the', 'to', 'for', 'a', 'an', '&', 'in', 'at'}
+        return len(words) <= 5 and all(w[0].isupper() for w in words if w.lower() not in small_words)
+
+    def _is_boilerplate_heading(self, line: str) -> bool:
+        """Check if a heading starts a boilerplate section (the whole heading must match)."""
+        heading = re.sub(r'\s+', ' ', line.strip().rstrip(':').strip())
+        return bool(self._heading_re.fullmatch(heading))
+
+    def compact_job_description(self, job_description: str,
+                                max_tokens: int = None) -> Tuple[str, Dict]:
+        """
+        Strip boilerplate from a job description and cap it to a token budget.
+
+        Args:
+            job_description: Raw job description text
+            max_tokens: Token cap for the compacted text (None = no cap)
+
+        Returns:
+            Tuple of (compacted text, stats dict)
+        """
+        original_tokens = self.estimate_tokens(job_description)
+        lines = [line.rstrip() for line in job_description.split('\n')]
+
+        kept = []
+        seen = set()
+        sections_removed = 0
+        sentences_removed = 0
+        in_boilerplate = False
+
+        for line in lines:
+            stripped = line.strip()
+            if not stripped:
+                # A blank line closes a boilerplate section; collapse runs of blanks
+                in_boilerplate = False
+                if kept and kept[-1] != '':
+                    kept.append('')
+                continue
+
+            if self._is_section_heading(stripped):
+                in_boilerplate = self._is_boilerplate_heading(stripped)
+                if in_boilerplate:
+                    sections_removed += 1
+                    continue
+            elif in_boilerplate:
+                continue
+
+            # Drop boilerplate sentences inside otherwise useful paragraphs
+            if self._sentence_re.search(stripped):
+                sentences = re.split(r'(?<=[.!?])\s+', stripped)
+                useful = [s for s in sentences if not self._sentence_re.search(s)]
+                sentences_removed += len(sentences) - len(useful)
+                if not useful:
+                    continue
+                stripped = ' '.join(useful)
+
+            # Skip repeated lines (common in pasted postings)
+            key = re.sub(r'\s+', ' ', stripped.lower())
+            if key in seen:
+                continue
+            seen.add(key)
+            kept.append(re.sub(r'[ \t]+', ' ', stripped))
+
+        while kept and kept[-1] == '':
+            kept.pop()
+        compacted = '\n'.join(kept)
+
+        condensed = 0
+        truncated = False
+        if max_tokens and self.estimate_tokens(compacted) > max_tokens:
+            # Condense long prose paragraphs to their first sentence before dropping anything
+            for i, line in enumerate(kept):
+                if len(line) > self.LONG_PARAGRAPH_CHARS:
+                    first_sentence = re.split(r'(?<=[.!?])\s+', line, maxsplit=1)[0]
+                    if len(first_sentence) < len(line):
+                        kept[i] = first_sentence
+                        condensed += 1
+            compacted = '\n'.join(kept)
+
+        if max_tokens and self.estimate_tokens(compacted) > max_tokens:
+            # Keep whole lines in order until the budget is reached
+            budget_chars = max_tokens * self.CHARS_PER_TOKEN
+            out = []
+            used = 0
+            for line in kept:
+                if used + len(line) + 1 > budget_chars:
+                    if not out:
+                        # One unbroken paragraph over budget: cut it rather than send nothing
+                        out.append(line[:budget_chars])
+                    break
+                out.append(line)
+                used += len(line) + 1
+            compacted = '\n'.join(out).rstrip()
+            truncated = True
+
+        stats = {
+            'original_tokens': original_tokens,
+            'compacted_tokens': self.estimate_tokens(compacted),
+            'sections_removed': sections_removed,
+            'sentences_removed': sentences_removed,
+            'paragraphs_condensed': condensed,
+            'truncated': truncated,
+        }
+        return compacted, stats
+
+    def build_tech_extraction_prompt(self, job_description: str) -> Tuple[str, Dict]:
+        """
+        Build the tech stack extraction prompt
+
+        Returns:
+            Tuple of (prompt, compaction stats)
+        """
+        context, stats = self.compact_job_description(job_description, self.tech_context_tokens)
+        prompt = f"""Extract all technologies, programming languages, frameworks, tools, and platforms mentioned in this job description.
+
+Return ONLY a comma-separated list of technologies (no explanations, no numbering, no bullets).
+
+Job Description:
+{context}
+
+Return format example: Node.js, React, MongoDB, Python, Docker, AWS"""
+        return prompt, stats
+
+    def build_points_prompt(self, job_description: str, job_title: str,
+                            tech_stacks: List[str], num_points: int) -> Tuple[str, Dict]:
+        """
+        Build the points generation prompt
+
+        Returns:
+            Tuple of (prompt, compaction stats)
+        """
+        # The tech list already carries the key signal, so less context is needed here
+        context, stats = self.compact_job_description(job_description, self.points_context_tokens)
+        tech_stacks_str = ", ".join(tech_stacks)
+
+        prompt = f"""Generate {num_points} detailed, specific, and professional bullet points for my resume highlighting my experience as a {job_title}.
+
+CRITICAL: You MUST generate points for ALL {len(tech_stacks)} technologies listed below. Do not skip any technology.
+
+Format EXACTLY as shown:
+
+TechName1
+- Bullet point 1
+- Bullet point 2
+- Bullet point 3
+
+TechName2
+- Bullet point 1
+- Bullet point 2
+- Bullet point 3
+
+RULES:
+1. Each technology name must be on its own line (just the name, no symbols)
+2. Each bullet point must start with a dash and space (- )
+3. Each bullet point should be 1-2 sentences, specific and detailed
+4. Mention the technology name in each bullet point when relevant
+5. Include specific frameworks, versions, or related technologies
+6. Focus on achievements, implementations, and business impact
+7. Use professional language appropriate for {job_title} role
+8. Each tech stack MUST have exactly {num_points} bullet points
+9. GENERATE POINTS FOR ALL TECHNOLOGIES - DO NOT SKIP ANY
+
+Technologies to cover ({len(tech_stacks)} total):
+{tech_stacks_str}
+
+Job description context:
+{context}
+
+Generate complete resume bullet points for ALL {len(tech_stacks)} technologies:"""
+        return prompt, stats
+
+    def max_completion_tokens(self, num_techs: int, num_points: int,
+                              cap: int = 8000) -> int:
+        """Size the completion budget from the expected output (~60 tokens per bullet)."""
+        expected = num_techs * (num_points * 60 + 10)
+        return max(256, min(cap, int(expected * 1.5)))
+
+
+class TokenUsageMetrics:
+    """Thread-safe record of token usage and latency per LLM call."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls: List[Dict] = []
+
+    def record(self, operation: str, usage=None, latency: float = 0.0,
+               compaction: Optional[Dict] = None) -> Dict:
+        """
+        Record usage for one LLM call
+
+        Args:
+            operation: Name of the call (e.g. 'extract_tech_stacks')
+            usage: Response usage object (prompt_tokens, completion_tokens)
+            latency: Wall-clock seconds for the call
+            compaction: Stats returned by PromptBuilder.compact_job_description
+        """
+        compaction = compaction or {}
+        entry = {
+            'operation': operation,
+            'prompt_tokens': int(getattr(usage, 'prompt_tokens', 0) or 0),
+            'completion_tokens': int(getattr(usage, 'completion_tokens', 0) or 0),
+            'latency_seconds': round(latency, 4),
+            'context_tokens_original': compaction.get('original_tokens', 0),
+            'context_tokens_sent': compaction.get('compacted_tokens', 0),
+        }
+        entry['context_tokens_saved'] = max(
+            0, entry['context_tokens_original'] - entry['context_tokens_sent']
+        )
+        with self._lock:
+            self.calls.append(entry)
+        return entry
+
+    def summary(self) -> Dict:
+        """Aggregate usage across all recorded calls."""
+        with self._lock:
+            calls = list(self.calls)
+
+        total_latency = sum(c['latency_seconds'] for c in calls)
+        return {
+            'calls': len(calls),
+            'prompt_tokens': sum(c['prompt_tokens'] for c in calls),
+            'completion_tokens': sum(c['completion_tokens'] for c in calls),
+            'context_tokens_saved': sum(c['context_tokens_saved'] for c in calls),
+            'total_latency_seconds': round(total_latency, 4),
+            'avg_latency_seconds': round(total_latency / len(calls), 4) if calls else 0.0,
+        }
+
+    def reset(self) -> None:
+        """Clear recorded calls."""
+        with self._lock:
+            self.calls = []
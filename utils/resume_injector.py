@@ -6,6 +6,8 @@ import io
 import re
 import logging
 from .bookmark_manager import BookmarkManager
+from .cycle_document import CycleDocument
+from .workflow_tracer import trace_span
 
 # Setup logging
 logger = logging.getLogger(__name__)
@@ -170,7 +172,8 @@ class ResumeInjector:
         
         Args:
             resume_bytes: BytesIO object of the resume template
-            processed_text: Processed text organized by cycles
+            processed_text: Processed text organized by cycles, or a CycleDocument
+                (used as is, without re-parsing)
             custom_mapping: Dict of {cycle_num: bookmark_name}. If None, auto-generates.
             
         Returns:
@@ -178,14 +181,18 @@ class ResumeInjector:
         """
         try:
             try:
-                doc = Document(resume_bytes)
+                with trace_span("docx.parse", bytes=len(resume_bytes.getvalue())):
+                    doc = Document(resume_bytes)
             except Exception as e:
                 raise ValueError(f"Invalid or corrupted DOCX file: {str(e)}. Please check the resume template.")
             
             # Reset stream position for potential re-reads
             resume_bytes.seek(0)
             
-            points_by_cycle, all_points = self.extract_points_by_heading(processed_text)
+            if isinstance(processed_text, CycleDocument):
+                points_by_cycle, all_points = processed_text.points_by_cycle(), processed_text.all_points()
+            else:
+                points_by_cycle, all_points = self.extract_points_by_heading(processed_text)
             
             if not all_points:
                 raise ValueError("No points found in processed text. Check the format.")
@@ -196,7 +203,9 @@ class ResumeInjector:
                 raise ValueError("No actual points found in any cycles. Cycles are empty.")
             
             # Auto-detect all bookmarks in the resume
-            available_bookmarks = self.bookmark_manager.detect_bookmarks(resume_bytes)
+            with trace_span("bookmarks.detect") as span:
+                available_bookmarks = self.bookmark_manager.detect_bookmarks(resume_bytes)
+                span.set(bookmarks=len(available_bookmarks))
             
             if not available_bookmarks:
                 raise ValueError("No bookmarks found in resume template. Please add bookmarks first.")
@@ -346,9 +355,11 @@ class ResumeInjector:
                 raise ValueError("Failed to inject points. No valid insertion points found.")
             
             # Save to BytesIO
-            output = io.BytesIO()
-            doc.save(output)
-            output.seek(0)
+            with trace_span("docx.save") as span:
+                output = io.BytesIO()
+                doc.save(output)
+                output.seek(0)
+                span.set(bytes=len(output.getvalue()), points=sum(injections.values()))
             
             return output, injections
             
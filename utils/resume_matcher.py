@@ -14,9 +14,20 @@ logger = logging.getLogger(__name__)
 class ResumeMatcher:
     """Matches job descriptions to the best resume from catalog."""
     
-    def __init__(self):
-        """Initialize resume matcher with catalog and points generator."""
-        self.catalog = ResumeCatalog()
+    def __init__(self, catalog: Optional[ResumeCatalog] = None,
+                 points_generator: Optional[GeminiPointsGenerator] = None):
+        """
+        Initialize resume matcher with catalog and points generator.
+        
+        Args:
+            catalog: Resume catalog to match against (default: loaded from disk)
+            points_generator: Generator used for tech extraction (default: Groq-backed)
+        """
+        self.catalog = catalog or ResumeCatalog()
+        if points_generator is not None:
+            self.points_generator = points_generator
+            return
+        
         try:
             self.points_generator = GeminiPointsGenerator()
         except Exception as e:
@@ -2,6 +2,7 @@
 Security Utilities - Input validation, sanitization, and error handling
 """
 
+import io
 import os
 import re
 from pathlib import Path
@@ -230,9 +231,10 @@ class FileUploadValidator:
         if hasattr(file_obj, 'size'):
             file_size = file_obj.size
         else:
-            content = file_obj.read()
-            file_obj.seek(0)
-            file_size = len(content)
+            # Seek instead of reading the whole upload just to measure it
+            position = file_obj.tell()
+            file_size = file_obj.seek(0, io.SEEK_END) - position
+            file_obj.seek(position)
         
         is_valid, msg = InputSanitizer.validate_file_size(file_size, file_type='text')
         if not is_valid:
@@ -0,0 +1,219 @@
+"""
+Text Input - Uploaded text files without repeated full-size copies
+
+A TextSource wraps the raw bytes of an upload, a file on disk or any readable
+stream:
+- files on disk are memory-mapped;
+- in-memory uploads (Streamlit's UploadedFile is a BytesIO, or anything else
+  with getvalue()) reuse their buffer;
+- other streams are read in chunks and spooled to an anonymous temporary file
+  (then memory-mapped) once they pass spool_threshold bytes.
+
+The encoding is sniffed once from a prefix sample (BOM, then incremental UTF-8
+validation; latin-1 otherwise), and iter_lines() decodes a block of lines at a
+time (UTF-16 input is decoded whole). The cycle parser consumes those lines as
+they come and keeps only the point lines the cycles are built from, so there is
+no full decoded string or list of every line next to the raw bytes. A line that
+turns out not to be UTF-8 after the sample was is decoded as latin-1 on its own
+instead of restarting the file.
+"""
+
+import codecs
+import hashlib
+import io
+import logging
+import mmap
+import os
+import tempfile
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+SNIFF_BYTES = 64 * 1024
+SPOOL_THRESHOLD = 4 * 1024 * 1024
+CHUNK_SIZE = 1024 * 1024
+DECODE_BLOCK = 64 * 1024
+
+BOMS = (
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+
+def sniff_encoding(sample: bytes, complete: bool = False) -> str:
+    """
+    Encoding of a text file judged from its first bytes.
+
+    Args:
+        sample: Prefix of the file
+        complete: Whether sample is the whole file (a truncated multi-byte
+            character at the end of a prefix is not an error)
+
+    Returns:
+        'utf-8-sig' / 'utf-16' when there is a BOM, 'utf-8' if the sample is valid
+        UTF-8, else 'latin-1' (which decodes any bytes)
+    """
+    for bom, encoding in BOMS:
+        if sample.startswith(bom):
+            return encoding
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=complete)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return 'latin-1'
+
+
+class TextSource:
+    """Raw bytes of one text input plus its sniffed encoding."""
+
+    __slots__ = ("name", "encoding", "_data", "_map", "_file", "_line_encoding", "_start")
+
+    def __init__(self, data, name: str = "", sniff_bytes: int = SNIFF_BYTES,
+                 _map: Optional[mmap.mmap] = None, _file=None):
+        self.name = name
+        self._data = data  # bytes or mmap
+        self._map = _map
+        self._file = _file
+        sample = data[:sniff_bytes]
+        self.encoding = sniff_encoding(sample, complete=len(sample) == len(data))
+        # Lines after a UTF-8 BOM are plain UTF-8
+        self._start = len(codecs.BOM_UTF8) if self.encoding == 'utf-8-sig' else 0
+        self._line_encoding = 'utf-8' if self.encoding == 'utf-8-sig' else self.encoding
+
+    @classmethod
+    def open(cls, source: Union[str, Path, bytes, io.IOBase], name: Optional[str] = None,
+             spool_threshold: int = SPOOL_THRESHOLD, sniff_bytes: int = SNIFF_BYTES) -> "TextSource":
+        """
+        Wrap a path, bytes, or readable binary stream (read from its current position).
+
+        Args:
+            source: Input to read
+            name: Display name (defaults to the path or the stream's name)
+            spool_threshold: Streams larger than this go to a temporary file instead of memory
+            sniff_bytes: Size of the prefix sample used to pick the encoding
+        """
+        if isinstance(source, (str, Path)):
+            path = Path(source)
+            f = open(path, 'rb')
+            return cls._mapped(f, name or path.name, sniff_bytes)
+
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            return cls(bytes(source), name or "", sniff_bytes)
+
+        name = name or getattr(source, 'name', "") or ""
+        getvalue = getattr(source, 'getvalue', None)
+        if getvalue is not None and (not hasattr(source, 'tell') or source.tell() == 0):
+            # getvalue() shares a BytesIO's buffer instead of copying it
+            return cls(getvalue(), name, sniff_bytes)
+
+        chunks = []
+        size = 0
+        while size <= spool_threshold:
+            chunk = source.read(CHUNK_SIZE)
+            if not chunk:
+                return cls(b"".join(chunks), name, sniff_bytes)
+            chunks.append(chunk)
+            size += len(chunk)
+
+        spool = tempfile.TemporaryFile()
+        try:
+            for chunk in chunks:
+                spool.write(chunk)
+            chunks = None
+            while True:
+                chunk = source.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                spool.write(chunk)
+            spool.flush()
+        except BaseException:
+            spool.close()
+            raise
+        logger.debug(f"Spooled {name or 'upload'} to disk ({spool.tell()} bytes)")
+        return cls._mapped(spool, name, sniff_bytes)
+
+    @classmethod
+    def _mapped(cls, f, name: str, sniff_bytes: int) -> "TextSource":
+        try:
+            if os.fstat(f.fileno()).st_size == 0:
+                f.close()
+                return cls(b"", name, sniff_bytes)
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except BaseException:
+            f.close()
+            raise
+        return cls(mapped, name, sniff_bytes, _map=mapped, _file=f)
+
+    @property
+    def is_mapped(self) -> bool:
+        """Whether the bytes are memory-mapped from disk rather than held in memory."""
+        return self._map is not None
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def digest(self) -> str:
+        """SHA-256 of the raw bytes (hashed in place, no copy)."""
+        return hashlib.sha256(self._data).hexdigest()
+
+    def _decode_lines(self, raw: bytes):
+        try:
+            return raw.decode(self._line_encoding).split('\n')
+        except UnicodeDecodeError:
+            lines = []
+            for line in raw.split(b'\n'):
+                try:
+                    lines.append(line.decode(self._line_encoding))
+                except UnicodeDecodeError:
+                    lines.append(line.decode('latin-1'))
+            return lines
+
+    def iter_lines(self) -> Iterator[str]:
+        """
+        Decoded lines, split on '\\n' exactly like read_text().split('\\n').
+
+        For ASCII-compatible encodings the bytes are decoded in blocks of about
+        DECODE_BLOCK bytes, cut at line ends.
+        """
+        if self.encoding == 'utf-16':
+            yield from self.read_text().split('\n')
+            return
+
+        data = self._data
+        start = self._start
+        end = len(data)
+        while start + DECODE_BLOCK < end:
+            stop = data.rfind(b'\n', start, start + DECODE_BLOCK)
+            if stop < 0:  # a line longer than a block
+                stop = data.find(b'\n', start + DECODE_BLOCK)
+                if stop < 0:
+                    break
+            yield from self._decode_lines(data[start:stop])
+            start = stop + 1
+        yield from self._decode_lines(data[start:end])
+
+    def read_text(self) -> str:
+        """The whole input decoded (one decode in the common case)."""
+        try:
+            return str(self._data, self.encoding)
+        except UnicodeDecodeError:
+            # Valid UTF-8 prefix with bad bytes later: decode the odd lines as latin-1
+            logger.debug(f"{self.name or 'Input'}: invalid UTF-8 after the sniffed prefix")
+            return "\n".join(self.iter_lines())
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._data = b""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -1,5 +1,8 @@
 import re
 
+from .cycle_document import CycleDocument
+from .deduplicator import DedupFilter
+
 class TextProcessor:
     def __init__(self):
         # More flexible patterns to handle various formats
@@ -84,49 +87,93 @@ class TextProcessor:
             return ' ' * indent + '• ' + stripped
         return line
 
-    def process_text(self, text, points_per_cycle):
-        """Process the input text and extract points in cycles."""
-        if not text or not text.strip():
+    @staticmethod
+    def cycle_points(processed_text):
+        """The points of processed text (every line except the 'Cycle N:' headers)."""
+        if isinstance(processed_text, CycleDocument):
+            return processed_text.all_points()
+        return CycleDocument.parse(processed_text).all_points()
+
+    def process_text(self, text, points_per_cycle, dedup=None, similarity_threshold=0.95, history=None):
+        """Process the input text and extract points in cycles, rendered as text.
+
+        Takes the same arguments as build_cycles.
+        """
+        return self.build_cycles(text, points_per_cycle, dedup, similarity_threshold, history).render()
+
+    def build_cycles(self, text, points_per_cycle, dedup=None, similarity_threshold=0.95, history=None):
+        """Process the input text and extract points in cycles.
+        
+        Args:
+            text: Headings followed by their points, as a string or an iterable of
+                lines (e.g. TextSource.iter_lines(), decoded lazily)
+            points_per_cycle: Points taken from each heading per cycle
+            dedup: None, 'exact' / 'fuzzy' to drop duplicate points within each cycle,
+                or 'global' to drop points repeated anywhere in the output
+            similarity_threshold: How similar (0-1) points must be to count as duplicates in 'fuzzy' mode
+            history: Digests of points used before (e.g. a PointHistory); those points are
+                dropped too (with 'exact' dedup if dedup is None), and cycles left without
+                points are omitted
+
+        Returns:
+            CycleDocument (render() gives the processed text)
+        """
+        if not text or (isinstance(text, str) and not text.strip()):
             raise ValueError("Input text cannot be empty")
 
         if not isinstance(points_per_cycle, int) or points_per_cycle < 1:
             raise ValueError("Points per cycle must be a positive integer")
 
-        # Split text into lines but preserve original content for bullets
-        lines = text.split('\n')
-        # Don't remove blank lines - they're structural! Just filter completely empty after stripping
-        lines = [line for line in lines if line.strip() or line == '']
-        
-        if not lines:
-            raise ValueError("No valid text content found after splitting")
-            
-        # Ensure we have at least one heading by setting a default if none is found
-        has_heading = any(self.is_heading(line.strip()) for line in lines)
-        if not has_heading:
-            pass  # Will treat first line as heading below
-            
+        # Validate the mode before doing any work; 'global' uses one filter for all cycles
+        if history is not None and dedup is None:
+            dedup = 'exact'
+        run_filter = DedupFilter(dedup, similarity_threshold, history) if dedup is not None else None
+
+        # Lines are consumed as they come (an iterable such as TextSource.iter_lines()
+        # is never materialized); only the point lines are kept, since cycles
+        # interleave every heading's points
+        lines = text.split('\n') if isinstance(text, str) else text
+
         current_heading = None
         structured_content = {}
-
-        # First pass: organize content
-        for i, line in enumerate(lines):
+        has_content = False
+        has_heading = False
+        # Without any heading, the first line is the heading and the rest its points
+        first_line = None
+        leading_points = []
+
+        index = -1
+        for line in lines:
             line_stripped = line.strip()
-            # Skip lines that are only underscores
+            # Don't remove blank lines - they're structural! Just drop whitespace-only ones
+            if not line_stripped and line != '':
+                continue
+            index += 1
+            has_content = has_content or bool(line_stripped)
+            # Skip blank lines and lines that are only underscores
             if line_stripped.replace('_', '').strip() == '':
                 continue
-            
-            # If no heading is found and this is the first line, treat it as a heading
-            if current_heading is None and i == 0 and not has_heading:
-                current_heading = line_stripped
-                structured_content[current_heading] = []
-            elif self.is_heading(line_stripped):
+
+            if self.is_heading(line_stripped):
+                if not has_heading:
+                    has_heading = True
+                    leading_points = []
                 current_heading = line_stripped
                 structured_content[current_heading] = []
             elif current_heading is not None:
                 # Any line after a heading that is not itself a heading is a point
                 # (whether it has a bullet symbol or not)
-                if line_stripped:  # Only add non-empty lines
-                    structured_content[current_heading].append(line)
+                structured_content[current_heading].append(line)
+            elif index == 0:
+                first_line = line_stripped
+            elif first_line is not None and not has_heading:
+                leading_points.append(line)
+
+        if not has_content:
+            raise ValueError("Input text cannot be empty")
+
+        if not has_heading and first_line is not None:
+            structured_content = {first_line: leading_points}
 
         if not structured_content:
             raise ValueError("""No valid headings or bullet points found in the input text. 
@@ -141,7 +188,7 @@ Heading 2
 • Item B""")
             
         # Second pass: extract points in cycles
-        result = []
+        document = CycleDocument()
         
         # Get the maximum number of points across all headings
         max_points = max(len(points) for points in structured_content.values()) if structured_content else 0
@@ -166,7 +213,12 @@ You can use •, -, *, +, or numbers (1. 2.) for bullet points.""")
             start_idx = current_cycle * points_per_cycle
             end_idx = start_idx + points_per_cycle
 
-            cycle_content = [f"Cycle {current_cycle + 1}:"]
+            cycle_points = []
+            # Duplicates are dropped as the cycle is built (per cycle unless 'global')
+            if dedup is None or dedup == 'global' or current_cycle == 0:
+                dedup_filter = run_filter
+            else:
+                dedup_filter = DedupFilter(dedup, similarity_threshold, history)
             
             # Organize points by heading within each cycle
             for heading, points in structured_content.items():
@@ -174,17 +226,18 @@ You can use •, -, *, +, or numbers (1. 2.) for bullet points.""")
                 if heading_points:  # Only add points for this cycle
                     for point in heading_points:
                         # Extract point without bullet
-                        extracted = self.extract_bullet_point(point)
-                        if extracted:
-                            cycle_content.append(extracted)
-                        else:
-                            cycle_content.append(point.strip())
+                        extracted = self.extract_bullet_point(point) or point.strip()
+                        if dedup_filter is None or dedup_filter.add(extracted):
+                            cycle_points.append(extracted)
 
-            result.extend(cycle_content)
+            # A cycle can only come out empty when history removed all of its points
+            if cycle_points:
+                document.add_cycle(cycle_points)
             current_cycle += 1
 
-        if not result:
+        if not document and history is not None:
+            raise ValueError("Every point has been used before (all are in the point history).")
+        if not document:
             raise ValueError("Failed to generate output. Please check your input format.")
 
-        final_text = "\n".join(result)
-        return final_text
\ No newline at end of file
+        return document
\ No newline at end of file
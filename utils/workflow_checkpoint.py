@@ -0,0 +1,185 @@
+"""
+Workflow checkpoints - Persist each automation stage's output so a failed run
+can resume from the first incomplete stage instead of starting over.
+
+Layout (one folder per run):
+    automation_output/runs/<run_id>/
+        run.json        inputs fingerprint and stage status
+        match.json      selected resume and job technologies
+        generate.json   generated points text
+        process.json    points in Cycle format
+        inject.json     injection details and saved resume path
+        resume.docx     updated resume
+        email.lock      created right before sending (idempotency guard)
+        email.json      written after a successful send
+"""
+
+import hashlib
+import json
+import os
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional, Any
+
+logger = logging.getLogger(__name__)
+
+
+class EmailAlreadyAttemptedError(Exception):
+    """An earlier attempt started sending this run's email but never recorded the outcome"""
+
+
+class RunCheckpoint:
+    """Stores stage outputs for one workflow run."""
+
+    STAGES = ['match', 'generate', 'process', 'inject', 'email']
+
+    def __init__(self, base_folder: Path, run_id: str, fingerprint: str):
+        """
+        Open (or create) a run folder.
+
+        Args:
+            base_folder: Workflow output folder (runs are stored under <base>/runs)
+            run_id: Run identifier
+            fingerprint: Hash of the run inputs, used to reject reuse of a run ID
+                for a different job
+
+        Raises:
+            ValueError: If the run ID already belongs to different inputs
+        """
+        self.run_id = run_id
+        self.run_dir = Path(base_folder) / "runs" / run_id
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+        self.manifest_path = self.run_dir / "run.json"
+
+        manifest = self._read_json(self.manifest_path)
+        if manifest and manifest.get('fingerprint') != fingerprint:
+            raise ValueError(f"Run ID {run_id} already exists for different inputs")
+        if not manifest:
+            manifest = {
+                'run_id': run_id,
+                'fingerprint': fingerprint,
+                'created_at': datetime.now().isoformat(),
+                'stages': {},
+            }
+            self._write_json(self.manifest_path, manifest)
+        self.manifest = manifest
+
+    @staticmethod
+    def fingerprint(**inputs) -> str:
+        """Stable hash of the run inputs."""
+        payload = json.dumps(inputs, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    @classmethod
+    def open_for(cls, base_folder: Path, run_id: Optional[str] = None,
+                 rerun_completed: bool = False, **inputs) -> 'RunCheckpoint':
+        """
+        Open the checkpoint for a set of inputs.
+
+        Without an explicit run ID, the ID is derived from the inputs, so rerunning
+        the same job picks up where the previous attempt stopped.
+
+        Args:
+            rerun_completed: If the run for these inputs already finished, start a
+                new one (<id>-2, <id>-3, ...) instead of replaying it; an unfinished
+                run is still resumed
+        """
+        fingerprint = cls.fingerprint(**inputs)
+        base_id = run_id or fingerprint[:16]
+        checkpoint = cls(base_folder, base_id, fingerprint)
+        attempt = 1
+        while rerun_completed and checkpoint.first_incomplete_stage() is None:
+            attempt += 1
+            checkpoint = cls(base_folder, f"{base_id}-{attempt}", fingerprint)
+        return checkpoint
+
+    def _read_json(self, path: Path) -> Optional[Any]:
+        try:
+            if path.exists():
+                with open(path, 'r') as f:
+                    return json.load(f)
+        except Exception as e:
+            logger.warning(f"Could not read checkpoint {path}: {e}")
+        return None
+
+    def _write_json(self, path: Path, data: Any):
+        """Write atomically so a crash never leaves a half-written checkpoint."""
+        tmp_path = path.with_suffix(path.suffix + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, path)
+
+    def _mark(self, stage: str, status: str):
+        self.manifest['stages'][stage] = {'status': status, 'at': datetime.now().isoformat()}
+        self._write_json(self.manifest_path, self.manifest)
+
+    def is_complete(self, stage: str) -> bool:
+        """Check if a stage finished in an earlier attempt."""
+        return self.manifest['stages'].get(stage, {}).get('status') == 'complete'
+
+    def first_incomplete_stage(self) -> Optional[str]:
+        """Stage the next attempt starts from (None if the run is finished)."""
+        for stage in self.STAGES:
+            if not self.is_complete(stage):
+                return stage
+        return None
+
+    def load(self, stage: str) -> Optional[Dict]:
+        """Load a completed stage's output."""
+        if not self.is_complete(stage):
+            return None
+        return self._read_json(self.run_dir / f"{stage}.json")
+
+    def save(self, stage: str, data: Dict):
+        """Persist a stage's output and mark it complete."""
+        self._write_json(self.run_dir / f"{stage}.json", data)
+        self._mark(stage, 'complete')
+
+    @property
+    def resume_path(self) -> Path:
+        return self.run_dir / "resume.docx"
+
+    def save_resume(self, resume_bytes: bytes):
+        tmp_path = self.resume_path.with_suffix('.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(resume_bytes)
+        os.replace(tmp_path, self.resume_path)
+
+    def load_resume(self) -> Optional[bytes]:
+        if self.resume_path.exists():
+            return self.resume_path.read_bytes()
+        return None
+
+    # ---- Email idempotency -------------------------------------------------
+
+    @property
+    def email_lock_path(self) -> Path:
+        return self.run_dir / "email.lock"
+
+    def begin_email(self, recipient: str):
+        """
+        Claim the email send for this run.
+
+        Creates the lock file exclusively, so two attempts can never both send.
+
+        Raises:
+            EmailAlreadyAttemptedError: If an earlier attempt claimed the send and
+                its outcome is unknown (e.g. the process died mid-send)
+        """
+        try:
+            fd = os.open(self.email_lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            raise EmailAlreadyAttemptedError(
+                f"An earlier attempt may already have emailed {recipient}. "
+                f"Check your sent folder, then delete {self.email_lock_path} to allow a resend."
+            )
+        with os.fdopen(fd, 'w') as f:
+            f.write(json.dumps({'recipient': recipient, 'started_at': datetime.now().isoformat()}))
+
+    def finish_email(self, recipient: str, sent: bool):
+        """Record the send outcome; a clean failure releases the claim so a retry can send."""
+        if sent:
+            self.save('email', {'recipient': recipient, 'sent_at': datetime.now().isoformat()})
+        else:
+            self.email_lock_path.unlink(missing_ok=True)
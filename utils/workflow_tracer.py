@@ -0,0 +1,199 @@
+"""
+Span-style timing instrumentation for the automation workflow.
+
+A WorkflowTracer records nested spans with monotonic start/end times plus
+counters such as bytes and tokens. Library code (injector, points generator,
+email senders) opens sub-spans with trace_span(); these attach to whichever
+span is current in the calling context and are no-ops when nothing is traced.
+"""
+
+import contextvars
+import itertools
+import json
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+
+_current_span = contextvars.ContextVar('current_span', default=None)
+
+
+class Span:
+    """One timed operation"""
+
+    __slots__ = ('tracer', 'span_id', 'parent_id', 'name', 'depth',
+                 'start', 'end', 'status', 'attributes')
+
+    def __init__(self, tracer: 'WorkflowTracer', span_id: int, parent: Optional['Span'],
+                 name: str, attributes: Dict):
+        self.tracer = tracer
+        self.span_id = span_id
+        self.parent_id = parent.span_id if parent else None
+        self.depth = parent.depth + 1 if parent else 0
+        self.name = name
+        self.start = time.monotonic()
+        self.end = None
+        self.status = None
+        self.attributes = dict(attributes)
+
+    def set(self, **attributes):
+        """Set attributes (e.g. bytes=1024, prompt_tokens=300)."""
+        self.attributes.update(attributes)
+
+    def add(self, key: str, amount: int):
+        """Increment a numeric attribute."""
+        self.attributes[key] = self.attributes.get(key, 0) + amount
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        if self.end is None:
+            return None
+        return round((self.end - self.start) * 1000, 3)
+
+    def to_dict(self) -> Dict:
+        origin = self.tracer.origin
+        return {
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'name': self.name,
+            'depth': self.depth,
+            'start_ms': round((self.start - origin) * 1000, 3),
+            'end_ms': round((self.end - origin) * 1000, 3) if self.end is not None else None,
+            'duration_ms': self.duration_ms,
+            'status': self.status,
+            'attributes': self.attributes,
+        }
+
+
+class _NullSpan:
+    """Stand-in returned by trace_span() when no tracer is active"""
+
+    def set(self, **attributes):
+        pass
+
+    def add(self, key: str, amount: int):
+        pass
+
+
+NULL_SPAN = _NullSpan()
+
+
+class WorkflowTracer:
+    """Collects spans for one workflow run."""
+
+    def __init__(self):
+        self.origin = time.monotonic()
+        self.started_at = datetime.now().isoformat()
+        self.spans: List[Span] = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def start_span(self, name: str, **attributes) -> Span:
+        """Open a span as a child of the current span and make it current."""
+        parent = _current_span.get()
+        if parent is not None and parent.tracer is not self:
+            parent = None
+        with self._lock:
+            span = Span(self, next(self._ids), parent, name, attributes)
+            self.spans.append(span)
+        _current_span.set(span)
+        return span
+
+    def end_span(self, span: Span, status: str = "OK", **attributes) -> Span:
+        """Close a span and make its parent current again."""
+        span.end = time.monotonic()
+        span.status = status
+        span.attributes.update(attributes)
+        parent = next((s for s in self.spans if s.span_id == span.parent_id), None)
+        if _current_span.get() is span:
+            _current_span.set(parent)
+        return span
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        """Time a block as a span; exceptions mark it ERROR and propagate."""
+        span = self.start_span(name, **attributes)
+        try:
+            yield span
+        except BaseException as e:
+            self.end_span(span, "ERROR", error=str(e)[:200])
+            raise
+        self.end_span(span, "OK")
+
+    def close_open_spans(self, status: str = "ABORTED"):
+        """End spans left open by an early return or exception."""
+        for span in reversed(self.spans):
+            if span.end is None:
+                self.end_span(span, status)
+        current = _current_span.get()
+        if current is not None and current.tracer is self:
+            _current_span.set(None)
+
+    def elapsed_ms(self) -> float:
+        return round((time.monotonic() - self.origin) * 1000, 3)
+
+    def to_dicts(self) -> List[Dict]:
+        with self._lock:
+            return [span.to_dict() for span in self.spans]
+
+    def to_jsonl(self) -> str:
+        """Spans as JSON lines (one span per line)."""
+        return "\n".join(json.dumps(span) for span in self.to_dicts())
+
+    def export_jsonl(self, path) -> str:
+        with open(path, 'w') as f:
+            f.write(self.to_jsonl() + "\n")
+        return str(path)
+
+    def stage_durations(self) -> Dict[str, float]:
+        """Seconds spent in each top-level span (summed by name)."""
+        durations = {}
+        for span in self.spans:
+            if span.parent_id is None and span.end is not None:
+                durations[span.name] = durations.get(span.name, 0.0) + (span.end - span.start)
+        return durations
+
+    def summary_rows(self) -> List[Dict]:
+        """Spans in start order with indentation depth, for tables."""
+        rows = []
+        for span in self.spans:
+            tokens = sum(v for k, v in span.attributes.items()
+                         if k.endswith('_tokens') and isinstance(v, (int, float)))
+            rows.append({
+                'name': span.name,
+                'depth': span.depth,
+                'duration_ms': span.duration_ms,
+                'bytes': span.attributes.get('bytes'),
+                'tokens': tokens or None,
+                'status': span.status or 'OPEN',
+            })
+        return rows
+
+    def summary_table(self) -> List[str]:
+        """Fixed-width summary table, one string per line."""
+        lines = [f"{'Span':<36}{'ms':>10}{'bytes':>12}{'tokens':>9}  Status"]
+        for row in self.summary_rows():
+            name = ("  " * row['depth'] + row['name'])[:35]
+            ms = f"{row['duration_ms']:.1f}" if row['duration_ms'] is not None else "-"
+            lines.append(
+                f"{name:<36}{ms:>10}{row['bytes'] or '':>12}{row['tokens'] or '':>9}  {row['status']}"
+            )
+        lines.append(f"{'TOTAL':<36}{self.elapsed_ms():>10.1f}")
+        return lines
+
+
+def current_span():
+    """The span current in this context (NULL_SPAN if none)."""
+    return _current_span.get() or NULL_SPAN
+
+
+@contextmanager
+def trace_span(name: str, **attributes):
+    """Open a sub-span under the current span; does nothing when not tracing."""
+    parent = _current_span.get()
+    if parent is None:
+        yield NULL_SPAN
+        return
+    with parent.tracer.span(name, **attributes) as span:
+        yield span